@@ -0,0 +1,111 @@
+"""관리자 세션 목록 월 샤드(GSI4) 페이지 병합 단위 테스트
+
+- 샤드 경계를 넘어 한 페이지를 채움 (desc/asc)
+- 샤드 중간/경계 커서로 이어 읽기, 범위 끝에서 nextToken 없음
+- 빈 샤드가 길게 이어지면 요청당 조회 수 상한
+- noCampaign: GSI1/GSI4 경로에 캠페인 미연결 필터
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# admin / shared 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'shared'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import admin_handler  # noqa: E402
+from admin_handler import _build_session_list_query, _query_session_list_shards  # noqa: E402
+
+
+class _ShardedTable:
+    """GSI4 월 샤드 쿼리만 흉내 내는 테이블 (Limit / ExclusiveStartKey / 정렬 방향)"""
+
+    def __init__(self, created_ats):
+        self.items = [
+            {'PK': f'SESSION#{c}', 'SK': 'METADATA', 'GSI4PK': f'SESSION_LIST#{c[:7]}', 'GSI4SK': f'SESSION#{c}'}
+            for c in created_ats
+        ]
+        self.queries = []
+
+    def query(self, **kwargs):
+        shard_pk = kwargs['ExpressionAttributeValues'][':pk']
+        self.queries.append(shard_pk)
+        rows = sorted((i for i in self.items if i['GSI4PK'] == shard_pk), key=lambda i: i['GSI4SK'],
+                      reverse=not kwargs['ScanIndexForward'])
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            rows = rows[[r['PK'] for r in rows].index(start['PK']) + 1:]
+        page = rows[:kwargs['Limit']]
+        response = {'Items': page}
+        if len(rows) > kwargs['Limit']:
+            response['LastEvaluatedKey'] = {k: page[-1][k] for k in ('PK', 'SK', 'GSI4PK', 'GSI4SK')}
+        return response
+
+
+CREATED = ['2025-01-10T00:00:00Z', '2025-01-20T00:00:00Z', '2025-03-05T00:00:00Z',
+           '2025-03-06T00:00:00Z', '2025-03-07T00:00:00Z']
+
+
+@pytest.fixture(autouse=True)
+def _months():
+    with patch.object(admin_handler, 'SESSION_LIST_START_MONTH', '2024-12'), \
+            patch.object(admin_handler, 'get_timestamp', return_value='2025-03-15T00:00:00+00:00'):
+        yield
+
+
+def _read_all(table, page_size, ascending):
+    pages, key = [], None
+    while True:
+        items, key = _query_session_list_shards(table, page_size, ascending, key)
+        pages.append([i['GSI4SK'][len('SESSION#'):] for i in items])
+        if not key:
+            return pages
+
+
+class TestSessionListShards:
+
+    def test_desc_pages_cross_shards(self):
+        pages = _read_all(_ShardedTable(CREATED), page_size=2, ascending=False)
+        assert [c for page in pages for c in page] == sorted(CREATED, reverse=True)
+        assert pages[0] == ['2025-03-07T00:00:00Z', '2025-03-06T00:00:00Z']
+        assert pages[1] == ['2025-03-05T00:00:00Z', '2025-01-20T00:00:00Z']
+
+    def test_asc_pages_cross_shards(self):
+        pages = _read_all(_ShardedTable(CREATED), page_size=4, ascending=True)
+        assert pages[0] == CREATED[:4]
+        assert [c for page in pages for c in page] == CREATED
+
+    def test_last_page_has_no_cursor(self):
+        table = _ShardedTable(CREATED)
+        items, key = _query_session_list_shards(table, 50, False)
+        assert len(items) == 5
+        assert key is None
+        # 2025-03 -> 2024-12 네 개 샤드
+        assert table.queries == [f'SESSION_LIST#{m}' for m in ('2025-03', '2025-02', '2025-01', '2024-12')]
+
+    def test_shard_queries_are_capped(self):
+        with patch.object(admin_handler, 'SESSION_LIST_START_MONTH', '2020-01'), \
+                patch.object(admin_handler, 'SESSION_LIST_MAX_SHARD_QUERIES', 3):
+            table = _ShardedTable(['2020-01-01T00:00:00Z'])
+            items, key = _query_session_list_shards(table, 10, False)
+            assert items == []
+            assert key == {'GSI4PK': 'SESSION_LIST#2024-12'}
+            assert len(table.queries) == 3
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            _query_session_list_shards(_ShardedTable(CREATED), 10, False, {'PK': 'SESSION#x', 'GSI1PK': 'SALESREP#a'})
+
+    def test_without_campaign_filter(self):
+        for query_kwargs in (
+            _build_session_list_query(shard='2025-03', without_campaign=True),
+            _build_session_list_query(sales_rep_id='rep@example.com', without_campaign=True),
+        ):
+            assert query_kwargs['FilterExpression'] == 'attribute_not_exists(campaignId) OR campaignId = :no_campaign'
+            assert query_kwargs['ExpressionAttributeValues'][':no_campaign'] == ''
+        assert 'FilterExpression' not in _build_session_list_query(shard='2025-03')
@@ -6,7 +6,11 @@ import logging
 import os
 from decimal import Decimal
 from botocore.exceptions import ClientError, ReadTimeoutError
-from utils import lambda_response, parse_body, get_timestamp, convert_decimal_to_int, serialize_dynamodb_item
+from utils import (
+    lambda_response, parse_body, get_timestamp, convert_decimal_to_int, serialize_dynamodb_item,
+    SESSION_LIST_PK, encode_pagination_token, decode_pagination_token, parse_page_size,
+    session_list_shard, session_list_shard_pk, shift_month
+)
 
 # Configure logging
 logger = logging.getLogger()
@@ -21,8 +25,11 @@ SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
 MESSAGES_TABLE = os.environ.get('MESSAGES_TABLE')
 CAMPAIGNS_TABLE = os.environ.get('CAMPAIGNS_TABLE')
 
-from agent_runtime import AgentCoreClient, get_agent_config_for_session, get_agent_runtime_arn
+from agent_runtime import (
+    AgentCoreClient, get_agent_config_for_session, get_agent_runtime_arn, invalidate_session_routing_cache
+)
 from models.agent_config import AgentConfiguration
+from dynamodb_utils import batch_get_items
 
 # AgentCore 클라이언트 (Summary Agent 호출용)
 agentcore_client = AgentCoreClient()
@@ -49,45 +56,202 @@ def clean_llm_response(content):
     
     return content.strip()
 
+# 세션 목록 페이지 크기 (limit 쿼리 파라미터로 조정)
+SESSION_LIST_DEFAULT_PAGE_SIZE = 50
+SESSION_LIST_MAX_PAGE_SIZE = 100
+# 전체 세션 목록(GSI4) 월 샤드 범위와 요청당 최대 샤드 조회 수
+SESSION_LIST_START_MONTH = os.environ.get('SESSION_LIST_START_MONTH', '2024-01')
+SESSION_LIST_MAX_SHARD_QUERIES = 12
+
+def _build_session_list_query(sales_rep_id=None, campaign_id=None, shard=None, without_campaign=False):
+    """
+    세션 목록 조회용 인덱스 쿼리 파라미터 구성
+
+    모든 경로가 'SESSION#{createdAt}' 정렬 키를 가진 인덱스를 사용하므로
+    테이블 크기와 무관하게 페이지 단위(O(limit))로 읽는다.
+      - campaignId: GSI2 (CAMPAIGN#{id}) — salesRepId가 함께 오면 필터로 적용
+      - salesRepId: GSI1 (SALESREP#{email})
+      - 그 외: GSI4 (SESSION_LIST#{YYYY-MM}) 월 샤드 하나 — 샤드 병합은 _query_session_list_shards
+    without_campaign이면 GSI1/GSI4 경로에 캠페인 미연결 세션만 남기는 필터를 붙인다.
+    """
+    if campaign_id:
+        query_kwargs = {
+            'IndexName': 'GSI2',
+            'KeyConditionExpression': 'GSI2PK = :pk AND begins_with(GSI2SK, :sk_prefix)',
+            'ExpressionAttributeValues': {
+                ':pk': f'CAMPAIGN#{campaign_id}',
+                ':sk_prefix': 'SESSION#'
+            }
+        }
+        if sales_rep_id:
+            query_kwargs['FilterExpression'] = 'GSI1PK = :salesrep'
+            query_kwargs['ExpressionAttributeValues'][':salesrep'] = f'SALESREP#{sales_rep_id}'
+        return query_kwargs
+
+    if sales_rep_id:
+        query_kwargs = {
+            'IndexName': 'GSI1',
+            'KeyConditionExpression': 'GSI1PK = :pk AND begins_with(GSI1SK, :sk_prefix)',
+            'ExpressionAttributeValues': {
+                ':pk': f'SALESREP#{sales_rep_id}',
+                ':sk_prefix': 'SESSION#'
+            }
+        }
+    else:
+        query_kwargs = {
+            'IndexName': 'GSI4',
+            'KeyConditionExpression': 'GSI4PK = :pk',
+            'ExpressionAttributeValues': {':pk': session_list_shard_pk(shard)}
+        }
+
+    if without_campaign:
+        query_kwargs['FilterExpression'] = 'attribute_not_exists(campaignId) OR campaignId = :no_campaign'
+        query_kwargs['ExpressionAttributeValues'][':no_campaign'] = ''
+    return query_kwargs
+
+def _query_session_list_shards(sessions_table, page_size, ascending, start_key=None, without_campaign=False):
+    """
+    월 샤드(GSI4)를 정렬 방향대로 이어 읽어 한 페이지를 만든다.
+
+    샤드 순서: desc는 이번 달부터 SESSION_LIST_START_MONTH까지, asc는 그 반대.
+    nextToken이 가리키는 키:
+      - 샤드 중간: DynamoDB LastEvaluatedKey (GSI4PK로 샤드를 알 수 있다)
+      - 샤드 경계: {'GSI4PK': 다음 샤드} — 그 샤드의 처음부터 읽는다
+    빈 샤드가 길게 이어져도 요청당 SESSION_LIST_MAX_SHARD_QUERIES번까지만 조회하고 커서를 돌려준다.
+
+    Returns:
+        (items, next_key)
+    """
+    current_month = session_list_shard(get_timestamp())
+    step = 1 if ascending else -1
+    last_month = current_month if ascending else SESSION_LIST_START_MONTH
+
+    if start_key:
+        shard_pk = start_key.get('GSI4PK', '')
+        prefix = f'{SESSION_LIST_PK}#'
+        if not shard_pk.startswith(prefix) or len(shard_pk) != len(prefix) + 7:
+            raise ValueError('Invalid pagination token')
+        shard = shard_pk[len(prefix):]
+        exclusive_start_key = start_key if 'PK' in start_key else None
+    else:
+        shard = SESSION_LIST_START_MONTH if ascending else current_month
+        exclusive_start_key = None
+
+    items = []
+    queries = 0
+    while True:
+        query_kwargs = _build_session_list_query(shard=shard, without_campaign=without_campaign)
+        query_kwargs['Limit'] = page_size - len(items)
+        query_kwargs['ScanIndexForward'] = ascending
+        if exclusive_start_key:
+            query_kwargs['ExclusiveStartKey'] = exclusive_start_key
+        response = sessions_table.query(**query_kwargs)
+        queries += 1
+        items.extend(response.get('Items', []))
+
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if last_evaluated_key:
+            if len(items) >= page_size or queries >= SESSION_LIST_MAX_SHARD_QUERIES:
+                return items, last_evaluated_key
+            exclusive_start_key = last_evaluated_key
+            continue
+
+        # 샤드를 다 읽었다 — 범위 끝이면 마지막 페이지
+        if shard == last_month or (shard > last_month if ascending else shard < last_month):
+            return items, None
+        next_shard = shift_month(shard, step)
+        if len(items) >= page_size or queries >= SESSION_LIST_MAX_SHARD_QUERIES:
+            return items, {'GSI4PK': session_list_shard_pk(next_shard)}
+        shard = next_shard
+        exclusive_start_key = None
+
+# 세션 목록 캠페인 정보 보강에 필요한 속성만 조회
+_CAMPAIGN_SUMMARY_PROJECTION = 'PK, campaignName, campaignCode, #description, #status, ownerName, ownerEmail'
+_CAMPAIGN_SUMMARY_NAMES = {'#description': 'description', '#status': 'status'}
+
+def _get_campaigns_by_id(campaign_ids):
+    """
+    캠페인 ID 집합을 BatchGetItem(100개 단위)으로 조회하여 {campaignId: item} 반환
+
+    조회 실패 시 캠페인 정보 없이 계속 진행한다.
+    """
+    campaign_ids = list(campaign_ids)
+    found = {}
+    if campaign_ids and CAMPAIGNS_TABLE:
+        try:
+            items = batch_get_items(
+                CAMPAIGNS_TABLE,
+                [{'PK': f'CAMPAIGN#{cid}', 'SK': 'METADATA'} for cid in campaign_ids],
+                projection_expression=_CAMPAIGN_SUMMARY_PROJECTION,
+                expression_attribute_names=_CAMPAIGN_SUMMARY_NAMES
+            )
+            found = {item['PK'].replace('CAMPAIGN#', '', 1): item for item in items}
+        except Exception as e:
+            logger.warning(f"Failed to batch get campaign info for {len(campaign_ids)} campaigns: {str(e)}")
+            # Continue without campaign info
+    return {cid: found.get(cid) for cid in campaign_ids}
+
 def list_sessions(event, context):
+    """
+    GET /api/admin/sessions
+
+    Query parameters:
+      - salesRepId, campaignId: 필터 (선택)
+      - noCampaign: 'true'면 캠페인 미연결 세션만 (campaignId와 함께 쓸 수 없음)
+      - limit: 페이지 크기 (기본 50, 최대 100)
+      - nextToken: 이전 응답의 nextToken (불투명 커서)
+      - sortOrder: 'desc'(기본, 최신순) | 'asc' — createdAt 기준
+
+    응답의 nextToken이 null이면 마지막 페이지이다.
+    salesRepId와 campaignId를 함께 지정하거나 noCampaign을 쓰면 필터 적용으로 페이지가 limit보다 작을 수 있고,
+    필터 없는 목록은 빈 월 샤드가 길게 이어지면 nextToken과 함께 빈 페이지를 돌려줄 수 있다.
+    """
+    query_params = event.get('queryStringParameters') or {}
+    sales_rep_id = query_params.get('salesRepId')
+    campaign_id = query_params.get('campaignId')
+    without_campaign = (query_params.get('noCampaign') or '').lower() == 'true'
+    if without_campaign and campaign_id:
+        return lambda_response(400, {'error': 'campaignId and noCampaign cannot be combined'})
+    page_size = parse_page_size(
+        query_params.get('limit'),
+        default=SESSION_LIST_DEFAULT_PAGE_SIZE,
+        maximum=SESSION_LIST_MAX_PAGE_SIZE
+    )
+    sort_order = (query_params.get('sortOrder') or 'desc').lower()
+    if sort_order not in ('asc', 'desc'):
+        return lambda_response(400, {'error': 'Invalid sortOrder. Must be "asc" or "desc"'})
+
     try:
-        query_params = event.get('queryStringParameters') or {}
-        sales_rep_id = query_params.get('salesRepId')
-        campaign_id = query_params.get('campaignId')
-    except (KeyError, TypeError, AttributeError):
-        sales_rep_id = None
-        campaign_id = None
-    
+        exclusive_start_key = decode_pagination_token(query_params.get('nextToken'))
+    except ValueError:
+        return lambda_response(400, {'error': 'Invalid nextToken'})
+
     try:
         sessions_table = dynamodb.Table(SESSIONS_TABLE)
-        
-        if sales_rep_id:
-            # Query by sales rep
-            response = sessions_table.query(
-                IndexName='GSI1',
-                KeyConditionExpression='GSI1PK = :pk',
-                ExpressionAttributeValues={':pk': f'SALESREP#{sales_rep_id}'},
-                ScanIndexForward=False
-            )
+
+        if sales_rep_id or campaign_id:
+            query_kwargs = _build_session_list_query(sales_rep_id, campaign_id, without_campaign=without_campaign)
+            query_kwargs['Limit'] = page_size
+            query_kwargs['ScanIndexForward'] = sort_order == 'asc'
+            if exclusive_start_key:
+                query_kwargs['ExclusiveStartKey'] = exclusive_start_key
+
+            response = sessions_table.query(**query_kwargs)
+            items, next_key = response.get('Items', []), response.get('LastEvaluatedKey')
         else:
-            # Scan all sessions
-            response = sessions_table.scan(
-                FilterExpression='SK = :sk AND begins_with(PK, :pk_prefix)',
-                ExpressionAttributeValues={
-                    ':sk': 'METADATA',
-                    ':pk_prefix': 'SESSION#'
-                }
-            )
+            try:
+                items, next_key = _query_session_list_shards(
+                    sessions_table, page_size, sort_order == 'asc', exclusive_start_key,
+                    without_campaign=without_campaign
+                )
+            except ValueError:
+                return lambda_response(400, {'error': 'Invalid nextToken'})
         
         sessions = []
-        for item in response.get('Items', []):
+        for item in items:
             # Skip non-session items (like campaigns)
             if not item['PK'].startswith('SESSION#'):
                 continue
-                
-            # Filter by campaign if specified
-            if campaign_id and item.get('campaignId') != campaign_id:
-                continue
             
             # Extract sessionId from PK (format: SESSION#sessionId)
             session_id = item.get('sessionId') or item['PK'].replace('SESSION#', '')
@@ -109,34 +273,33 @@ def list_sessions(event, context):
                 # PIN 번호는 보안상 세션 목록에서 제외
             }
             
-            # Get detailed campaign info if campaign is associated
-            if item.get('campaignId') and CAMPAIGNS_TABLE:
-                try:
-                    campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
-                    campaign_resp = campaigns_table.get_item(
-                        Key={'PK': f'CAMPAIGN#{item["campaignId"]}', 'SK': 'METADATA'}
-                    )
-                    
-                    if 'Item' in campaign_resp:
-                        campaign = campaign_resp['Item']
-                        # Update campaignName with latest value from campaigns table
-                        session_data['campaignName'] = campaign['campaignName']
-                        session_data['campaignInfo'] = {
-                            'campaignCode': campaign['campaignCode'],
-                            'description': campaign.get('description', ''),
-                            'status': campaign['status'],
-                            'ownerName': campaign['ownerName'],
-                            'ownerEmail': campaign['ownerEmail']
-                        }
-                except Exception as e:
-                    logger.warning(f"Failed to get campaign info for session {session_id}: {str(e)}")
-                    # Continue without campaign info
-            
             sessions.append(session_data)
         
-        return lambda_response(200, {'sessions': sessions})
+        # 페이지 내 고유 캠페인만 BatchGetItem으로 한 번에 조회 (세션별 GetItem 제거)
+        campaigns = _get_campaigns_by_id({s['campaignId'] for s in sessions if s['campaignId']})
+        for session_data in sessions:
+            campaign = campaigns.get(session_data['campaignId'])
+            if not campaign:
+                continue
+            # Update campaignName with latest value from campaigns table
+            session_data['campaignName'] = campaign.get('campaignName', '')
+            session_data['campaignInfo'] = {
+                'campaignCode': campaign.get('campaignCode', ''),
+                'description': campaign.get('description', ''),
+                'status': campaign.get('status', ''),
+                'ownerName': campaign.get('ownerName', ''),
+                'ownerEmail': campaign.get('ownerEmail', '')
+            }
+        
+        return lambda_response(200, {
+            'sessions': sessions,
+            'nextToken': encode_pagination_token(next_key)
+        })
     except ClientError as e:
         error_code = e.response['Error']['Code']
+        if error_code == 'ValidationException' and exclusive_start_key:
+            # 다른 필터 조건에서 발급된 nextToken 재사용 등
+            return lambda_response(400, {'error': 'Invalid nextToken'})
         logger.error(f"DynamoDB error listing sessions: {error_code} - {str(e)}")
         return lambda_response(500, {'error': f'Database error: {error_code}'})
     except Exception as e:
@@ -1460,6 +1623,8 @@ def patch_session(event, context):
             update_kwargs['ExpressionAttributeNames'] = expression_names
 
         sessions_table.update_item(**update_kwargs)
+        if 'campaignId' in body:
+            invalidate_session_routing_cache(session_id)
 
         return lambda_response(200, {
             'message': 'Session updated successfully',
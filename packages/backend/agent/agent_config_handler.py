@@ -18,6 +18,7 @@ import os
 
 from utils import lambda_response, parse_body, generate_id
 from models.agent_config import AgentConfiguration, LEGACY_ROLE_MAP
+from agent_runtime import invalidate_agent_config_cache
 
 dynamodb = boto3.resource('dynamodb')
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
@@ -53,6 +54,7 @@ def create_config(event, context):
     try:
         table = dynamodb.Table(SESSIONS_TABLE)
         table.put_item(Item=config.to_dynamodb_item())
+        invalidate_agent_config_cache(agent_role=config.agent_role)
         return lambda_response(201, config.to_api_response())
     except Exception as e:
         print(f"Failed to create agent config: {str(e)}")
@@ -191,6 +193,7 @@ def update_config(event, context):
             return lambda_response(400, {'error': 'Validation failed', 'details': errors})
 
         table.put_item(Item=config.to_dynamodb_item())
+        invalidate_agent_config_cache(config_id, config.agent_role)
         return lambda_response(200, config.to_api_response())
     except Exception as e:
         print(f"Failed to update agent config: {str(e)}")
@@ -211,6 +214,7 @@ def delete_config(event, context):
             return lambda_response(404, {'error': 'Agent configuration not found'})
 
         table.delete_item(Key={'PK': f'AGENTCONFIG#{config_id}', 'SK': 'METADATA'})
+        invalidate_agent_config_cache(config_id, resp['Item'].get('agentRole'))
         return lambda_response(200, {'message': 'Agent configuration deleted', 'configId': config_id})
     except Exception as e:
         return lambda_response(500, {'error': 'Failed to delete agent configuration'})
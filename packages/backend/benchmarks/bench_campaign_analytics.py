@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+캠페인 분석 집계 마이크로 벤치마크
+
+합성 세션 N개(기본 100,000)에 대해 기존 calculate_campaign_analytics 구현
+(지표마다 세션 목록을 다시 순회하고 타임스탬프를 여러 번 파싱)과
+analytics_engine.summarize_sessions(단일 순회, numpy 사용 가능 시 numpy 경로)의
+CPU 시간을 비교한다.
+
+Usage:
+    python benchmarks/bench_campaign_analytics.py [--sessions 100000] [--repeat 3] [--no-numpy]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'campaign'))
+
+import analytics_engine  # noqa: E402
+from analytics_engine import summarize_sessions  # noqa: E402
+
+STATUSES = ['active', 'completed', 'completed', 'completed', 'expired']
+PURPOSES = ['MIGRATION', 'NEW_ADOPTION', 'COST_OPTIMIZATION', 'MODERNIZATION', 'GENAI', 'SECURITY']
+COMPANIES = [f'Company {i}' for i in range(200)]
+
+
+def build_sessions(count: int, seed: int = 7) -> list[dict]:
+    """GSI 조회 결과 형태의 합성 세션 (일부는 CSAT 피드백 포함)"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sessions = []
+    for i in range(count):
+        created = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 180))
+        status = rng.choice(STATUSES)
+        session = {
+            'PK': f'SESSION#s{i}',
+            'sessionId': f's{i}',
+            'status': status,
+            'createdAt': created.isoformat().replace('+00:00', 'Z'),
+            'consultationPurposes': '|'.join(rng.sample(PURPOSES, rng.randint(0, 3))),
+            'customerInfo': {'name': f'Customer {i}', 'company': rng.choice(COMPANIES)},
+        }
+        if status != 'active':
+            completed = created + timedelta(minutes=rng.randint(5, 240))
+            session['completedAt'] = completed.isoformat().replace('+00:00', 'Z')
+            if rng.random() < 0.3:
+                session['feedback'] = {'rating': rng.randint(1, 5), 'narrative': 'ok'}
+        sessions.append(session)
+    return sessions
+
+
+def legacy_calculate(campaign_id, sessions):
+    """기존 calculate_campaign_analytics 구현 (비교 기준)"""
+    try:
+        total_sessions = len(sessions)
+        active_sessions = len([s for s in sessions if s.get('status') == 'active'])
+        completed_sessions = len([s for s in sessions if s.get('status') == 'completed'])
+        
+        # Calculate completion rate
+        completion_rate = (completed_sessions / total_sessions * 100) if total_sessions > 0 else 0
+        
+        # Calculate average session duration for completed sessions
+        total_duration = 0
+        duration_count = 0
+        
+        for session in sessions:
+            if session.get('completedAt') and session.get('createdAt'):
+                try:
+                    created = datetime.fromisoformat(session['createdAt'].replace('Z', '+00:00'))
+                    completed = datetime.fromisoformat(session['completedAt'].replace('Z', '+00:00'))
+                    duration = (completed - created).total_seconds() / 60  # Convert to minutes
+                    total_duration += duration
+                    duration_count += 1
+                except (ValueError, TypeError):
+                    continue
+        
+        average_duration = total_duration / duration_count if duration_count > 0 else 0
+        
+        # Analyze consultation purposes
+        # 다중 목적은 프론트엔드에서 '|'로 연결되어 저장됨 (예: "NEW_ADOPTION|MIGRATION")
+        # '|', ',', ';' 세 가지 구분자 모두를 분절하여 각 목적을 독립 카운트로 집계한다
+        # (하나의 세션이 N개의 목적을 가지면 각 목적에 +1씩, 중복 허용)
+        purposes_counter = Counter()
+        for session in sessions:
+            purposes = session.get('consultationPurposes', '')
+            if purposes:
+                # Normalize all delimiters ('|', ',', ';') to a single one, then split and trim
+                normalized = purposes.replace('|', ';').replace(',', ';')
+                purpose_list = [p.strip() for p in normalized.split(';') if p.strip()]
+                purposes_counter.update(purpose_list)
+        
+        top_purposes = [
+            {'purpose': purpose, 'count': count}
+            for purpose, count in purposes_counter.most_common(5)
+        ]
+        
+        # Analyze completed sessions by completion date
+        sessions_by_date = defaultdict(int)
+        for session in sessions:
+            # Only count completed sessions
+            if session.get('status') == 'completed' and session.get('completedAt'):
+                try:
+                    completed_date = datetime.fromisoformat(session['completedAt'].replace('Z', '+00:00')).date()
+                    sessions_by_date[completed_date.isoformat()] += 1
+                except (ValueError, TypeError):
+                    continue
+        
+        sessions_timeline = [
+            {'date': date, 'count': count}
+            for date, count in sorted(sessions_by_date.items())
+        ]
+        
+        # Analyze customer companies
+        companies_counter = Counter()
+        for session in sessions:
+            company = session.get('customerInfo', {}).get('company', '')
+            if company:
+                companies_counter[company] += 1
+        
+        customer_companies = [
+            {'company': company, 'sessionCount': count}
+            for company, count in companies_counter.most_common(10)
+        ]
+        
+        # Calculate status distribution
+        status_distribution = Counter(session.get('status', 'unknown') for session in sessions)
+        
+        # Analyze CSAT feedback
+        csat_feedback = []
+        csat_ratings = []
+        
+        for session in sessions:
+            feedback = session.get('feedback')
+            if feedback:
+                rating = feedback.get('rating')
+                narrative = feedback.get('narrative', '')
+                
+                if rating is not None:
+                    csat_ratings.append(int(rating))
+                    csat_feedback.append({
+                        'sessionId': session.get('sessionId', session['PK'].replace('SESSION#', '')),
+                        'customerName': session.get('customerInfo', {}).get('name', 'Unknown'),
+                        'customerCompany': session.get('customerInfo', {}).get('company', 'Unknown'),
+                        'rating': int(rating),
+                        'narrative': narrative,
+                        'completedAt': session.get('completedAt', '')
+                    })
+        
+        # Calculate average CSAT rating
+        average_csat = round(sum(csat_ratings) / len(csat_ratings), 1) if csat_ratings else 0
+        
+        analytics = {
+            'campaignId': campaign_id,
+            'totalSessions': total_sessions,
+            'activeSessions': active_sessions,
+            'completedSessions': completed_sessions,
+            'completionRate': round(completion_rate, 2),
+            'averageSessionDuration': round(average_duration, 2),
+            'topConsultationPurposes': top_purposes,
+            'sessionsByDate': sessions_timeline,
+            'customerCompanies': customer_companies,
+            'statusDistribution': dict(status_distribution),
+            'csatFeedback': csat_feedback,
+            'averageCSAT': average_csat,
+            'totalCSATResponses': len(csat_ratings)
+        }
+        
+        return analytics
+        
+    except Exception as e:
+        raise
+
+
+def measure(calculate, sessions, repeat: int) -> tuple[float, dict]:
+    best = float('inf')
+    result = {}
+    for _ in range(repeat):
+        started = time.process_time()
+        result = calculate(sessions)
+        best = min(best, time.process_time() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Campaign analytics aggregation micro-benchmark')
+    parser.add_argument('--sessions', type=int, default=100_000, help='synthetic sessions')
+    parser.add_argument('--repeat', type=int, default=3, help='repetitions (best time is reported)')
+    parser.add_argument('--no-numpy', action='store_true', help='force the pure-python path')
+    args = parser.parse_args()
+
+    use_numpy = analytics_engine.np is not None and not args.no_numpy
+    sessions = build_sessions(args.sessions)
+
+    legacy_time, legacy = measure(lambda s: legacy_calculate('bench', s), sessions, args.repeat)
+    new_time, new = measure(lambda s: summarize_sessions(s, use_numpy=use_numpy), sessions, args.repeat)
+
+    legacy.pop('campaignId', None)
+    # 피드백 목록은 CSAT 피드 API로 분리되어 분석 응답에서 빠졌다
+    legacy.pop('csatFeedback', None)
+    mismatched = [key for key in legacy if legacy[key] != new.get(key)]
+
+    print(f"sessions    : {args.sessions:,}")
+    print(f"legacy      : {legacy_time * 1000:8.1f} ms CPU")
+    print(f"single-pass : {new_time * 1000:8.1f} ms CPU ({'numpy' if use_numpy else 'pure python'})")
+    if new_time > 0:
+        print(f"speedup     : {legacy_time / new_time:.1f}x")
+    print(f"mismatched  : {mismatched or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+AgentCore SSE 파싱 마이크로 벤치마크
+
+긴 답변 하나에 해당하는 SSE 스트림(이중 인코딩된 chunk 이벤트 N개)을
+기존 라인 파서(iter_lines(chunk_size=10) + 문자열 치환 + 최대 3회 json.loads)와
+증분 디코더(sse_decoder)로 각각 파싱하여 응답당 CPU 시간을 비교한다.
+
+Usage:
+    python benchmarks/bench_sse_decoder.py [--chunks 2000] [--repeat 5] [--read-size 4096]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+from botocore.response import StreamingBody  # noqa: E402
+
+from sse_decoder import decode_agent_event, iter_raw_chunks, iter_sse_events  # noqa: E402
+
+
+def build_stream(num_chunks: int) -> bytes:
+    """AgentCore 형태의 SSE 스트림 (이중 인코딩된 이벤트 JSON)"""
+    lines = []
+    for i in range(num_chunks):
+        event = {'type': 'chunk', 'content': f'토큰{i} token{i} '}
+        lines.append(f'data: {json.dumps(json.dumps(event, ensure_ascii=False), ensure_ascii=False)}\n\n')
+    result = {'type': 'result', 'message': json.dumps({'role': 'assistant', 'content': [{'text': 'done'}]})}
+    lines.append(f'data: {json.dumps(json.dumps(result))}\n\n')
+    return ''.join(lines).encode('utf-8')
+
+
+def legacy_parse(body):
+    """기존 _parse_sse_stream 구현 (비교 기준)"""
+    for line in body.iter_lines(chunk_size=10):
+        if not line:
+            continue
+        line_str = line.decode('utf-8')
+        if line_str.startswith('data: '):
+            line_str = line_str[6:]
+        elif line_str.startswith('data:'):
+            line_str = line_str[5:]
+        else:
+            continue
+        stripped = line_str.strip()
+        if not stripped:
+            continue
+        if stripped.startswith('"') and stripped.endswith('"'):
+            stripped = stripped[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        try:
+            event = json.loads(stripped)
+            if isinstance(event, dict) and 'type' in event:
+                if event.get('type') == 'chunk' and isinstance(event.get('content'), str):
+                    try:
+                        inner = json.loads(event['content'])
+                        if isinstance(inner, dict) and 'type' in inner:
+                            yield inner
+                            continue
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+                if event.get('type') == 'result' and isinstance(event.get('message'), str):
+                    try:
+                        event['message'] = json.loads(event['message'])
+                    except (json.JSONDecodeError, TypeError):
+                        pass
+                yield event
+            else:
+                yield {'type': 'chunk', 'content': stripped}
+        except json.JSONDecodeError:
+            yield {'type': 'chunk', 'content': stripped}
+
+
+def incremental_parse(body, read_size):
+    """sse_decoder 기반 파싱"""
+    for sse_event in iter_sse_events(iter_raw_chunks(body, read_size)):
+        event = decode_agent_event(sse_event.data)
+        if event is not None:
+            yield event
+
+
+def measure(parse, raw: bytes, repeat: int) -> tuple[float, int]:
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        body = StreamingBody(io.BytesIO(raw), len(raw))
+        started = time.process_time()
+        count = sum(1 for _ in parse(body))
+        best = min(best, time.process_time() - started)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='AgentCore SSE parsing micro-benchmark')
+    parser.add_argument('--chunks', type=int, default=2000, help='chunk events per response')
+    parser.add_argument('--repeat', type=int, default=5, help='repetitions (best time is reported)')
+    parser.add_argument('--read-size', type=int, default=4096, help='incremental decoder read size')
+    args = parser.parse_args()
+
+    raw = build_stream(args.chunks)
+    legacy_time, legacy_count = measure(legacy_parse, raw, args.repeat)
+    new_time, new_count = measure(lambda body: incremental_parse(body, args.read_size), raw, args.repeat)
+
+    print(f"stream: {len(raw):,} bytes, {args.chunks} chunk events")
+    print(f"legacy      : {legacy_time * 1000:8.2f} ms CPU ({legacy_count} events)")
+    print(f"incremental : {new_time * 1000:8.2f} ms CPU ({new_count} events, read_size={args.read_size})")
+    if new_time > 0:
+        print(f"speedup     : {legacy_time / new_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
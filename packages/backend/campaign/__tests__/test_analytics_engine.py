@@ -0,0 +1,121 @@
+"""
+analytics_engine.py 단위 테스트
+
+테스트 시나리오:
+1. 단일 순회 집계: 상태/소요 시간/목적/완료일/고객사/CSAT 지표
+2. 잘못된 타임스탬프, customerInfo 누락 등 비정상 세션 처리
+3. numpy 경로와 순수 파이썬 경로의 결과 일치 (UTC가 아닌 오프셋은 파이썬 경로로 대체)
+"""
+
+import os
+import sys
+
+import pytest
+
+# campaign 도메인 경로 추가 (analytics_engine 임포트용)
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..')
+)
+
+import analytics_engine  # noqa: E402
+from analytics_engine import summarize_sessions  # noqa: E402
+
+
+def _session(session_id, status='active', created='2025-01-01T00:00:00Z', completed=None,
+             purposes='', company='Acme', rating=None):
+    session = {
+        'PK': f'SESSION#{session_id}',
+        'sessionId': session_id,
+        'status': status,
+        'createdAt': created,
+        'consultationPurposes': purposes,
+        'customerInfo': {'name': f'Customer {session_id}', 'company': company},
+    }
+    if completed:
+        session['completedAt'] = completed
+    if rating is not None:
+        session['feedback'] = {'rating': rating, 'narrative': f'note {session_id}'}
+    return session
+
+
+SESSIONS = [
+    _session('s1', status='completed', completed='2025-01-01T00:30:00Z',
+             purposes='MIGRATION|NEW_ADOPTION', rating=5),
+    _session('s2', status='completed', completed='2025-01-02T01:00:00+00:00',
+             purposes='MIGRATION, COST', company='Globex', rating=3),
+    _session('s3', purposes='COST;MIGRATION'),
+    _session('s4', status='expired', company=''),
+]
+
+
+class TestSummarizeSessions:
+
+    def test_metrics(self):
+        result = summarize_sessions(SESSIONS, use_numpy=False)
+
+        assert result['totalSessions'] == 4
+        assert result['activeSessions'] == 1
+        assert result['completedSessions'] == 2
+        assert result['completionRate'] == 50.0
+        # (30분 + 1500분) / 2
+        assert result['averageSessionDuration'] == 765.0
+        assert result['topConsultationPurposes'][0] == {'purpose': 'MIGRATION', 'count': 3}
+        assert {p['purpose'] for p in result['topConsultationPurposes']} == {'MIGRATION', 'NEW_ADOPTION', 'COST'}
+        assert result['sessionsByDate'] == [
+            {'date': '2025-01-01', 'count': 1},
+            {'date': '2025-01-02', 'count': 1},
+        ]
+        assert result['customerCompanies'] == [
+            {'company': 'Acme', 'sessionCount': 2},
+            {'company': 'Globex', 'sessionCount': 1},
+        ]
+        assert result['statusDistribution'] == {'completed': 2, 'active': 1, 'expired': 1}
+        assert result['averageCSAT'] == 4.0
+        assert result['totalCSATResponses'] == 2
+        assert result['csatHistogram'] == [{'rating': 3.0, 'count': 1}, {'rating': 5.0, 'count': 1}]
+        assert 'csatFeedback' not in result
+
+    def test_empty(self):
+        result = summarize_sessions([], use_numpy=False)
+        assert result['totalSessions'] == 0
+        assert result['completionRate'] == 0
+        assert result['averageSessionDuration'] == 0
+        assert result['averageCSAT'] == 0
+
+    def test_fractional_ratings_average(self):
+        from decimal import Decimal
+        sessions = [_session('a', rating=Decimal('4.5')), _session('b', rating=Decimal('3'))]
+        result = summarize_sessions(sessions, use_numpy=False)
+
+        # 4.5를 4로 자르면 3.5가 된다
+        assert result['averageCSAT'] == 3.8
+        assert result['csatHistogram'] == [{'rating': 3.0, 'count': 1}, {'rating': 4.5, 'count': 1}]
+
+    def test_malformed_sessions(self):
+        sessions = [
+            {'PK': 'SESSION#x', 'status': 'completed', 'createdAt': 'not-a-date', 'completedAt': '2025-01-01T00:00:00Z'},
+            {'PK': 'SESSION#y', 'status': 'completed', 'completedAt': 'bad', 'customerInfo': None},
+            {'PK': 'SESSION#z', 'feedback': {'rating': None}},
+        ]
+        result = summarize_sessions(sessions, use_numpy=False)
+
+        assert result['totalSessions'] == 3
+        assert result['averageSessionDuration'] == 0
+        assert result['sessionsByDate'] == [{'date': '2025-01-01', 'count': 1}]
+        assert result['statusDistribution'] == {'completed': 2, 'unknown': 1}
+        assert result['totalCSATResponses'] == 0
+
+    @pytest.mark.skipif(analytics_engine.np is None, reason='numpy not installed')
+    def test_numpy_path_matches_python(self):
+        sessions = SESSIONS * 50
+        assert summarize_sessions(sessions, use_numpy=True) == summarize_sessions(sessions, use_numpy=False)
+
+    @pytest.mark.skipif(analytics_engine.np is None, reason='numpy not installed')
+    def test_numpy_path_falls_back_for_non_utc_offsets(self):
+        sessions = SESSIONS + [
+            _session('kst', status='completed', created='2025-01-03T08:00:00+09:00',
+                     completed='2025-01-03T08:45:00+09:00'),
+        ]
+        result = summarize_sessions(sessions, use_numpy=True)
+        assert result == summarize_sessions(sessions, use_numpy=False)
+        assert {'date': '2025-01-03', 'count': 1} in result['sessionsByDate']
@@ -0,0 +1,234 @@
+"""
+캠페인 분석 집계 엔진
+
+calculate_campaign_analytics가 세션 목록을 지표마다 따로 순회하며
+같은 타임스탬프를 여러 번 파싱하던 것을 한 번의 순회로 바꾼다.
+
+  1. 세션마다 필요한 필드를 한 번만 읽고 타임스탬프도 한 번만 파싱하여
+     범주형 값은 Counter에, 수치 값(소요 시간, CSAT)은 열(column) 배열에 모은다.
+  2. 모은 열에서 모든 지표를 계산한다. numpy가 설치되어 있으면 UTC 타임스탬프 열을
+     datetime64 배열로 한 번에 변환하여 소요 시간/완료일을 벡터 연산으로 계산하고,
+     없거나 UTC가 아닌 오프셋이 섞여 있으면 순수 파이썬으로 계산한다.
+
+Lambda 기본 런타임에는 numpy가 없으므로 numpy는 선택 의존성이다.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없는 런타임에서는 순수 파이썬 경로 사용
+    np = None
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        # Python 3.11+는 'Z' 접미사를 직접 파싱한다
+        return datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    except (TypeError, AttributeError):
+        return None
+
+
+def _split_purposes(purposes: str) -> list[str]:
+    # 다중 목적은 '|', ',', ';' 구분자로 저장되며 각 목적을 독립 카운트로 집계한다
+    normalized = purposes.replace('|', ';').replace(',', ';')
+    return [p.strip() for p in normalized.split(';') if p.strip()]
+
+
+class SessionColumns:
+    """세션 목록에서 한 번의 순회로 추출한 분석용 열
+
+    순회 중에는 값을 열(list)에 붙이기만 하고, 범주형 열은 순회가 끝난 뒤
+    Counter(C 구현)로 한 번에 센다. 상담 목적 문자열은 조합 수가 적으므로
+    고유 문자열별로 한 번만 분리한다.
+    """
+
+    __slots__ = (
+        'total', 'statuses', 'durations', 'purposes', 'completed_dates',
+        'companies', 'ratings', 'rating_buckets',
+    )
+
+    def __init__(self):
+        self.total = 0
+        self.statuses = Counter()
+        self.durations: list[float] = []
+        self.purposes = Counter()
+        self.completed_dates = Counter()
+        self.companies = Counter()
+        self.ratings: list[float] = []
+        self.rating_buckets = Counter()
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[dict], use_numpy: bool = False) -> 'SessionColumns':
+        columns = cls()
+        statuses = []
+        purpose_strings = []
+        companies = []
+        raw_ratings = []
+        completed_rows = []
+        empty = {}
+
+        for session in sessions:
+            get = session.get
+            status = get('status', 'unknown')
+            statuses.append(status)
+
+            completed_at = get('completedAt')
+            if completed_at:
+                completed_rows.append((completed_at, get('createdAt'), status))
+
+            purposes = get('consultationPurposes')
+            if purposes:
+                purpose_strings.append(purposes)
+
+            customer_info = get('customerInfo') or empty
+            company = customer_info.get('company', '')
+            if company:
+                companies.append(company)
+
+            feedback = get('feedback')
+            if feedback and feedback.get('rating') is not None:
+                raw_ratings.append(feedback['rating'])
+
+        columns.total = len(statuses)
+        columns.statuses = Counter(statuses)
+        columns.companies = Counter(companies)
+        columns.ratings = [float(rating) for rating in raw_ratings]
+        columns.rating_buckets = Counter(f'{float(rating):g}' for rating in raw_ratings)
+        for purposes, count in Counter(purpose_strings).items():
+            for purpose in _split_purposes(purposes):
+                columns.purposes[purpose] += count
+
+        if not (use_numpy and _timestamp_columns_numpy(columns, completed_rows)):
+            _timestamp_columns_python(columns, completed_rows)
+        return columns
+
+
+def _timestamp_columns_python(columns: SessionColumns, completed_rows: list) -> None:
+    durations = columns.durations
+    completed_dates = []
+    for completed_at, created_at, status in completed_rows:
+        completed = _parse_timestamp(completed_at)
+        if completed is None:
+            continue
+        created = _parse_timestamp(created_at)
+        if created is not None:
+            durations.append((completed - created).total_seconds() / 60)  # minutes
+        if status == 'completed':
+            completed_dates.append(completed.date())
+    columns.completed_dates = Counter(date.isoformat() for date in completed_dates)
+
+
+def _strip_utc(value) -> Optional[str]:
+    """UTC 타임스탬프('Z' 또는 '+00:00')의 오프셋을 떼어 datetime64가 파싱할 수 있게 합니다."""
+    if not isinstance(value, str):
+        return None
+    if value.endswith('Z'):
+        return value[:-1]
+    if value.endswith('+00:00'):
+        return value[:-6]
+    return None
+
+
+def _timestamp_columns_numpy(columns: SessionColumns, completed_rows: list) -> bool:
+    """타임스탬프 열을 datetime64 배열로 변환하여 소요 시간/완료일을 계산합니다.
+
+    UTC가 아닌 오프셋이나 파싱할 수 없는 값이 있으면 False를 반환하고
+    호출자가 순수 파이썬 경로로 계산한다.
+    """
+    if not completed_rows:
+        return True
+    completed_values = []
+    created_values = []
+    for completed_at, created_at, _ in completed_rows:
+        completed = _strip_utc(completed_at)
+        if completed is None:
+            return False
+        completed_values.append(completed)
+        if created_at:
+            created = _strip_utc(created_at)
+            if created is None:
+                return False
+            created_values.append(created)
+        else:
+            created_values.append('NaT')
+    try:
+        completed = np.array(completed_values, dtype='datetime64[us]')
+        created = np.array(created_values, dtype='datetime64[us]')
+    except ValueError:
+        return False
+
+    minutes = (completed - created).astype(np.float64) / 60_000_000
+    valid = ~np.isnat(created)
+    columns.durations = minutes[valid]
+
+    is_completed = np.fromiter((row[2] == 'completed' for row in completed_rows), dtype=bool,
+                               count=len(completed_rows))
+    days, counts = np.unique(completed[is_completed].astype('datetime64[D]'), return_counts=True)
+    columns.completed_dates = Counter({str(day): int(count) for day, count in zip(days, counts)})
+    return True
+
+
+def _mean(values, use_numpy: bool) -> float:
+    if len(values) == 0:
+        return 0
+    if use_numpy:
+        return float(np.mean(values))
+    return sum(values) / len(values)
+
+
+def summarize_sessions(sessions: Iterable[dict], use_numpy: Optional[bool] = None) -> dict:
+    """세션 목록에서 캠페인 분석 지표를 계산합니다.
+
+    Args:
+        sessions: 세션 METADATA 목록 (feedback 병합 포함)
+        use_numpy: None이면 numpy 설치 여부로 결정
+
+    Returns:
+        calculate_campaign_analytics 응답에서 campaignId/calculatedAt을 뺀 지표 dict
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    columns = SessionColumns.from_sessions(sessions, use_numpy=use_numpy)
+
+    total_sessions = columns.total
+    completed_sessions = columns.statuses.get('completed', 0)
+    completion_rate = (completed_sessions / total_sessions * 100) if total_sessions > 0 else 0
+    ratings = columns.ratings
+
+    return {
+        'totalSessions': total_sessions,
+        'activeSessions': columns.statuses.get('active', 0),
+        'completedSessions': completed_sessions,
+        'completionRate': round(completion_rate, 2),
+        'averageSessionDuration': round(_mean(columns.durations, use_numpy), 2),
+        'topConsultationPurposes': [
+            {'purpose': purpose, 'count': count}
+            for purpose, count in columns.purposes.most_common(5)
+        ],
+        'sessionsByDate': [
+            {'date': date, 'count': count}
+            for date, count in sorted(columns.completed_dates.items())
+        ],
+        'customerCompanies': [
+            {'company': company, 'sessionCount': count}
+            for company, count in columns.companies.most_common(10)
+        ],
+        'distinctCompanies': len(columns.companies),
+        'statusDistribution': dict(columns.statuses),
+        'csatHistogram': [
+            {'rating': float(rating), 'count': count}
+            for rating, count in sorted(columns.rating_buckets.items(), key=lambda pair: float(pair[0]))
+        ],
+        'averageCSAT': round(_mean(ratings, use_numpy), 1) if ratings else 0,
+        'totalCSATResponses': len(ratings),
+    }
@@ -3,10 +3,27 @@ import boto3
 import logging
 import os
 from decimal import Decimal
-from datetime import datetime, timezone
-from collections import defaultdict, Counter
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
-from utils import lambda_response, get_timestamp, convert_decimal_to_int, serialize_dynamodb_item
+from utils import (
+    lambda_response, get_timestamp, convert_decimal_to_int, serialize_dynamodb_item,
+    decode_pagination_token, encode_pagination_token, parse_page_size,
+)
+from campaign_aggregates import (
+    aggregate_to_analytics,
+    analytics_key,
+    bucket_to_point,
+    csat_feed_entry,
+    iter_campaign_sessions,
+    query_campaign_buckets,
+    query_csat_feed,
+    summary_key,
+    summary_to_analytics,
+)
+from dynamodb_utils import batch_get_items, iter_query, iter_scan
+from analytics_engine import summarize_sessions
 
 # Configure logging
 logger = logging.getLogger()
@@ -17,8 +34,38 @@ SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
 MESSAGES_TABLE = os.environ.get('MESSAGES_TABLE')
 CAMPAIGNS_TABLE = os.environ.get('CAMPAIGNS_TABLE')
 
+# FEEDBACK 아이템 BatchGetItem(100개 단위) 동시 요청 수
+FEEDBACK_BATCH_CONCURRENCY = int(os.environ.get('FEEDBACK_BATCH_CONCURRENCY', '4'))
+# calculate_campaign_analytics가 읽는 세션 속성만 GSI2에서 조회 (aiAnalysis 등 큰 속성은 전송하지 않음)
+ANALYTICS_SESSION_PROJECTION = (
+    'PK, sessionId, #status, createdAt, completedAt, consultationPurposes, '
+    'customerInfo.company, customerInfo.#name'
+)
+ANALYTICS_SESSION_ATTRIBUTE_NAMES = {'#status': 'status', '#name': 'name'}
+# 캠페인 비교 분석: 한 번에 비교할 수 있는 최대 캠페인 수와 세션 집계 동시 실행 수
+MAX_COMPARISON_CAMPAIGNS = int(os.environ.get('MAX_COMPARISON_CAMPAIGNS', '50'))
+COMPARISON_CONCURRENCY = int(os.environ.get('COMPARISON_CONCURRENCY', '8'))
+# 비교 분석에 필요한 METADATA/ANALYTICS 속성만 조회 (피드백 항목 등 제외)
+COMPARISON_PROJECTION = (
+    'PK, SK, campaignName, campaignCode, #status, startDate, endDate, ownerName, '
+    'totalSessions, #completed, rebuiltAt'
+)
+COMPARISON_ATTRIBUTE_NAMES = {'#status': 'status', '#completed': 'status:completed'}
+# 시계열 조회 기본 기간(일)과 단위별 최대 기간(일)
+TIMESERIES_DEFAULT_DAYS = 30
+TIMESERIES_MAX_DAYS = {'day': 366, 'hour': 31}
+# CSAT 피드 페이지 크기 기본값/최대값
+CSAT_FEED_DEFAULT_PAGE_SIZE = 20
+CSAT_FEED_MAX_PAGE_SIZE = 100
+# 전체 캠페인 요약 스캔의 병렬 세그먼트 수 (1이면 순차 스캔)
+CAMPAIGN_SCAN_SEGMENTS = int(os.environ.get('CAMPAIGN_SCAN_SEGMENTS', '1'))
+
 def get_campaign_analytics(event, context):
-    """Get analytics for a specific campaign"""
+    """Get analytics for a specific campaign
+
+    스트림이 유지하는 CAMPAIGN#{id}/ANALYTICS 집계 아이템을 GetItem 한 번으로 읽는다.
+    집계 아이템이 없거나 rebuiltAt이 없으면(rebuild 전 부분 집계, stale 표시) 세션을 조회하여 직접 계산한다.
+    """
     try:
         campaign_id = event['pathParameters']['campaignId']
         if not campaign_id:
@@ -29,45 +76,61 @@ def get_campaign_analytics(event, context):
     try:
         campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
         sessions_table = dynamodb.Table(SESSIONS_TABLE)
-        
+
+        # Materialized aggregate (stream_handler.update_campaign_analytics가 유지)
+        round_trips = 1
+        aggregate_resp = campaigns_table.get_item(Key=analytics_key(campaign_id))
+        if aggregate_resp.get('Item', {}).get('rebuiltAt'):
+            _log_round_trips(campaign_id, 'aggregate', round_trips)
+            return lambda_response(200, aggregate_to_analytics(campaign_id, aggregate_resp['Item']))
+
         # Check if campaign exists
         campaign_resp = campaigns_table.get_item(
             Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA'}
         )
+        round_trips += 1
         
         if 'Item' not in campaign_resp:
             return lambda_response(404, {'error': 'Campaign not found'})
         
-        # Get all sessions for this campaign using GSI2
-        sessions_resp = sessions_table.query(
-            IndexName='GSI2',
-            KeyConditionExpression='GSI2PK = :pk',
-            ExpressionAttributeValues={':pk': f'CAMPAIGN#{campaign_id}'},
-            ScanIndexForward=False
-        )
-        
-        sessions = sessions_resp.get('Items', [])
+        # Get all sessions for this campaign using GSI2 (모든 페이지)
+        query_stats = {}
+        sessions = list(iter_campaign_sessions(
+            sessions_table,
+            campaign_id,
+            projection_expression=ANALYTICS_SESSION_PROJECTION,
+            expression_attribute_names=ANALYTICS_SESSION_ATTRIBUTE_NAMES,
+            stats=query_stats,
+            newest_first=True,
+        ))
+        round_trips += query_stats.get('requests', 0)
         
         # 각 세션의 피드백 아이템을 조회하여 병합
         # 피드백은 PK=SESSION#{sessionId}, SK=FEEDBACK 으로 별도 저장됨
-        for session in sessions:
-            session_id = session.get('sessionId', session['PK'].replace('SESSION#', ''))
-            try:
-                feedback_resp = sessions_table.get_item(
-                    Key={'PK': f'SESSION#{session_id}', 'SK': 'FEEDBACK'}
-                )
-                if 'Item' in feedback_resp:
-                    feedback_item = feedback_resp['Item']
-                    session['feedback'] = {
-                        'rating': feedback_item.get('rating'),
-                        'narrative': feedback_item.get('feedback', ''),
-                    }
-            except Exception as e:
-                logger.debug(f"No feedback for session {session_id}: {str(e)}")
-                continue
+        # BatchGetItem 100개 단위 배치를 동시에 요청한다 (세션당 GetItem 대신)
+        feedback_keys = [
+            {'PK': f"SESSION#{session.get('sessionId', session['PK'].replace('SESSION#', ''))}", 'SK': 'FEEDBACK'}
+            for session in sessions
+        ]
+        batch_stats = {}
+        feedback_items = batch_get_items(
+            SESSIONS_TABLE,
+            feedback_keys,
+            projection_expression='PK, rating',
+            stats=batch_stats,
+            max_workers=FEEDBACK_BATCH_CONCURRENCY,
+        )
+        round_trips += batch_stats.get('requests', 0)
+
+        feedback_by_pk = {item['PK']: item for item in feedback_items}
+        for session, key in zip(sessions, feedback_keys):
+            feedback_item = feedback_by_pk.get(key['PK'])
+            if feedback_item:
+                session['feedback'] = {'rating': feedback_item.get('rating')}
         
         # Calculate analytics
         analytics = calculate_campaign_analytics(campaign_id, sessions)
+        _log_round_trips(campaign_id, 'recompute', round_trips, sessions=len(sessions))
         
         return lambda_response(200, analytics)
         
@@ -79,120 +142,53 @@ def get_campaign_analytics(event, context):
         logger.error(f"Unexpected error getting campaign analytics {campaign_id}: {str(e)}")
         return lambda_response(500, {'error': 'Failed to get campaign analytics'})
 
+def _log_round_trips(campaign_id, source, round_trips, **fields):
+    """분석 엔드포인트의 DynamoDB 왕복 횟수 메트릭 로그"""
+    metric = {'campaignId': campaign_id, 'source': source, 'roundTrips': round_trips, **fields}
+    logger.info(f"[METRIC] campaign_analytics {json.dumps(metric)}")
+
+def _count_campaign_sessions(sessions_table, campaign_id):
+    """캠페인 세션의 (전체 수, 완료 수)를 status 속성만 페이지 단위로 읽어 계산합니다."""
+    total_sessions = 0
+    completed_sessions = 0
+    for session in iter_campaign_sessions(
+        sessions_table,
+        campaign_id,
+        projection_expression='#status',
+        expression_attribute_names={'#status': 'status'},
+    ):
+        total_sessions += 1
+        if session.get('status') == 'completed':
+            completed_sessions += 1
+    return total_sessions, completed_sessions
+
+def _session_counts(sessions_table, campaign_ids, aggregates):
+    """캠페인별 (세션 수, 완료 수)를 반환합니다.
+
+    사용할 수 있는(rebuiltAt이 있는) 집계 아이템이 없는 캠페인만 세션을 직접 세며,
+    제한된 스레드 풀에서 동시에 수행합니다.
+    """
+    counts = {
+        campaign_id: (int(aggregates[campaign_id].get('totalSessions', 0)),
+                      int(aggregates[campaign_id].get('status:completed', 0)))
+        for campaign_id in campaign_ids if campaign_id in aggregates
+    }
+    missing = [campaign_id for campaign_id in campaign_ids if campaign_id not in counts]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(COMPARISON_CONCURRENCY, len(missing))) as executor:
+            counted = executor.map(lambda cid: _count_campaign_sessions(sessions_table, cid), missing)
+            counts.update(zip(missing, counted))
+    return counts
+
 def calculate_campaign_analytics(campaign_id, sessions):
-    """Calculate comprehensive analytics for a campaign"""
+    """Calculate comprehensive analytics for a campaign
+
+    analytics_engine이 세션 목록을 한 번만 순회하여 모든 지표를 계산한다.
+    """
     try:
-        total_sessions = len(sessions)
-        active_sessions = len([s for s in sessions if s.get('status') == 'active'])
-        completed_sessions = len([s for s in sessions if s.get('status') == 'completed'])
-        
-        # Calculate completion rate
-        completion_rate = (completed_sessions / total_sessions * 100) if total_sessions > 0 else 0
-        
-        # Calculate average session duration for completed sessions
-        total_duration = 0
-        duration_count = 0
-        
-        for session in sessions:
-            if session.get('completedAt') and session.get('createdAt'):
-                try:
-                    created = datetime.fromisoformat(session['createdAt'].replace('Z', '+00:00'))
-                    completed = datetime.fromisoformat(session['completedAt'].replace('Z', '+00:00'))
-                    duration = (completed - created).total_seconds() / 60  # Convert to minutes
-                    total_duration += duration
-                    duration_count += 1
-                except (ValueError, TypeError):
-                    continue
-        
-        average_duration = total_duration / duration_count if duration_count > 0 else 0
-        
-        # Analyze consultation purposes
-        # 다중 목적은 프론트엔드에서 '|'로 연결되어 저장됨 (예: "NEW_ADOPTION|MIGRATION")
-        # '|', ',', ';' 세 가지 구분자 모두를 분절하여 각 목적을 독립 카운트로 집계한다
-        # (하나의 세션이 N개의 목적을 가지면 각 목적에 +1씩, 중복 허용)
-        purposes_counter = Counter()
-        for session in sessions:
-            purposes = session.get('consultationPurposes', '')
-            if purposes:
-                # Normalize all delimiters ('|', ',', ';') to a single one, then split and trim
-                normalized = purposes.replace('|', ';').replace(',', ';')
-                purpose_list = [p.strip() for p in normalized.split(';') if p.strip()]
-                purposes_counter.update(purpose_list)
-        
-        top_purposes = [
-            {'purpose': purpose, 'count': count}
-            for purpose, count in purposes_counter.most_common(5)
-        ]
-        
-        # Analyze completed sessions by completion date
-        sessions_by_date = defaultdict(int)
-        for session in sessions:
-            # Only count completed sessions
-            if session.get('status') == 'completed' and session.get('completedAt'):
-                try:
-                    completed_date = datetime.fromisoformat(session['completedAt'].replace('Z', '+00:00')).date()
-                    sessions_by_date[completed_date.isoformat()] += 1
-                except (ValueError, TypeError):
-                    continue
-        
-        sessions_timeline = [
-            {'date': date, 'count': count}
-            for date, count in sorted(sessions_by_date.items())
-        ]
-        
-        # Analyze customer companies
-        companies_counter = Counter()
-        for session in sessions:
-            company = session.get('customerInfo', {}).get('company', '')
-            if company:
-                companies_counter[company] += 1
-        
-        customer_companies = [
-            {'company': company, 'sessionCount': count}
-            for company, count in companies_counter.most_common(10)
-        ]
-        
-        # Calculate status distribution
-        status_distribution = Counter(session.get('status', 'unknown') for session in sessions)
-        
-        # Analyze CSAT feedback
-        csat_feedback = []
-        csat_ratings = []
-        
-        for session in sessions:
-            feedback = session.get('feedback')
-            if feedback:
-                rating = feedback.get('rating')
-                narrative = feedback.get('narrative', '')
-                
-                if rating is not None:
-                    csat_ratings.append(int(rating))
-                    csat_feedback.append({
-                        'sessionId': session.get('sessionId', session['PK'].replace('SESSION#', '')),
-                        'customerName': session.get('customerInfo', {}).get('name', 'Unknown'),
-                        'customerCompany': session.get('customerInfo', {}).get('company', 'Unknown'),
-                        'rating': int(rating),
-                        'narrative': narrative,
-                        'completedAt': session.get('completedAt', '')
-                    })
-        
-        # Calculate average CSAT rating
-        average_csat = round(sum(csat_ratings) / len(csat_ratings), 1) if csat_ratings else 0
-        
         analytics = {
             'campaignId': campaign_id,
-            'totalSessions': total_sessions,
-            'activeSessions': active_sessions,
-            'completedSessions': completed_sessions,
-            'completionRate': round(completion_rate, 2),
-            'averageSessionDuration': round(average_duration, 2),
-            'topConsultationPurposes': top_purposes,
-            'sessionsByDate': sessions_timeline,
-            'customerCompanies': customer_companies,
-            'statusDistribution': dict(status_distribution),
-            'csatFeedback': csat_feedback,
-            'averageCSAT': average_csat,
-            'totalCSATResponses': len(csat_ratings),
+            **summarize_sessions(sessions),
             'calculatedAt': get_timestamp()
         }
         
@@ -207,18 +203,8 @@ def update_campaign_session_counts(campaign_id):
     try:
         sessions_table = dynamodb.Table(SESSIONS_TABLE)
         
-        # Get all sessions for this campaign using GSI2
-        sessions_resp = sessions_table.query(
-            IndexName='GSI2',
-            KeyConditionExpression='GSI2PK = :pk',
-            ExpressionAttributeValues={':pk': f'CAMPAIGN#{campaign_id}'},
-            ScanIndexForward=False
-        )
-        
-        sessions = sessions_resp.get('Items', [])
-        
-        total_sessions = len(sessions)
-        completed_sessions = len([s for s in sessions if s.get('status') == 'completed'])
+        # Count all sessions for this campaign using GSI2
+        total_sessions, completed_sessions = _count_campaign_sessions(sessions_table, campaign_id)
         
         # Update campaign record
         campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
@@ -240,30 +226,163 @@ def update_campaign_session_counts(campaign_id):
     except Exception as e:
         logger.error(f"Unexpected error updating campaign session counts {campaign_id}: {str(e)}")
 
+def get_campaign_timeseries(event, context):
+    """Get time-bucketed analytics for a campaign
+
+    GET /api/admin/campaigns/{campaignId}/analytics/timeseries?from=YYYY-MM-DD&to=YYYY-MM-DD&granularity=day|hour
+
+    스트림이 유지하는 CAMPAIGN#{id}/DAY#(HOUR#) 버킷을 SK 범위로 조회하므로
+    캠페인 전체 세션을 다시 집계하지 않고 요청 기간의 버킷만 읽는다.
+    데이터가 없는 버킷은 응답에서 생략된다. (from/to 기본값: 최근 30일, UTC)
+    """
+    try:
+        campaign_id = event['pathParameters']['campaignId']
+        if not campaign_id:
+            return lambda_response(400, {'error': 'Campaign ID is required'})
+    except (KeyError, TypeError):
+        return lambda_response(400, {'error': 'Missing campaign ID parameter'})
+
+    params = event.get('queryStringParameters') or {}
+    granularity = params.get('granularity', 'day')
+    if granularity not in TIMESERIES_MAX_DAYS:
+        return lambda_response(400, {'error': 'granularity must be one of: day, hour'})
+
+    try:
+        end = datetime.strptime(params['to'], '%Y-%m-%d').date() if params.get('to') \
+            else datetime.now(timezone.utc).date()
+        start = datetime.strptime(params['from'], '%Y-%m-%d').date() if params.get('from') \
+            else end - timedelta(days=TIMESERIES_DEFAULT_DAYS - 1)
+    except ValueError:
+        return lambda_response(400, {'error': 'from/to must be dates in YYYY-MM-DD format'})
+
+    if start > end:
+        return lambda_response(400, {'error': 'from must not be after to'})
+    if (end - start).days + 1 > TIMESERIES_MAX_DAYS[granularity]:
+        return lambda_response(400, {
+            'error': f'Maximum range for {granularity} granularity is {TIMESERIES_MAX_DAYS[granularity]} days'
+        })
+
+    try:
+        campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
+        buckets = query_campaign_buckets(
+            campaigns_table, campaign_id, start.isoformat(), end.isoformat(), hourly=granularity == 'hour'
+        )
+
+        return lambda_response(200, {
+            'campaignId': campaign_id,
+            'granularity': granularity,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'buckets': [bucket_to_point(item) for item in buckets]
+        })
+
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        logger.error(f"DynamoDB error getting campaign timeseries {campaign_id}: {error_code} - {str(e)}")
+        return lambda_response(500, {'error': f'Database error: {error_code}'})
+    except Exception as e:
+        logger.error(f"Unexpected error getting campaign timeseries {campaign_id}: {str(e)}")
+        return lambda_response(500, {'error': 'Failed to get campaign timeseries'})
+
+def get_campaign_csat_feed(event, context):
+    """Get the CSAT feedback feed for a campaign
+
+    GET /api/admin/campaigns/{campaignId}/analytics/csat?limit=20&nextToken=...&minRating=1&maxRating=3
+
+    chat_handler.handle_feedback가 기록한 CAMPAIGN#{id}/CSAT# 아이템을 완료 시각 최신순으로
+    한 페이지씩 읽는다. 응답의 nextToken이 null이면 마지막 페이지이다.
+    평점 필터를 지정하면 페이지가 limit보다 작을 수 있다.
+    """
+    try:
+        campaign_id = event['pathParameters']['campaignId']
+        if not campaign_id:
+            return lambda_response(400, {'error': 'Campaign ID is required'})
+    except (KeyError, TypeError):
+        return lambda_response(400, {'error': 'Missing campaign ID parameter'})
+
+    params = event.get('queryStringParameters') or {}
+    page_size = parse_page_size(
+        params.get('limit'), default=CSAT_FEED_DEFAULT_PAGE_SIZE, maximum=CSAT_FEED_MAX_PAGE_SIZE
+    )
+    try:
+        min_rating = float(params['minRating']) if params.get('minRating') else None
+        max_rating = float(params['maxRating']) if params.get('maxRating') else None
+    except ValueError:
+        return lambda_response(400, {'error': 'minRating/maxRating must be numbers'})
+    if min_rating is not None and max_rating is not None and min_rating > max_rating:
+        return lambda_response(400, {'error': 'minRating must not be greater than maxRating'})
+
+    try:
+        exclusive_start_key = decode_pagination_token(params.get('nextToken'))
+    except ValueError:
+        return lambda_response(400, {'error': 'Invalid nextToken'})
+    if exclusive_start_key and exclusive_start_key.get('PK') != f'CAMPAIGN#{campaign_id}':
+        return lambda_response(400, {'error': 'Invalid nextToken'})
+
+    try:
+        campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
+        items, last_key = query_csat_feed(
+            campaigns_table, campaign_id, page_size,
+            exclusive_start_key=exclusive_start_key, min_rating=min_rating, max_rating=max_rating,
+        )
+
+        return lambda_response(200, {
+            'campaignId': campaign_id,
+            'feedback': [csat_feed_entry(item) for item in items],
+            'nextToken': encode_pagination_token(last_key)
+        })
+
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        if error_code == 'ValidationException' and exclusive_start_key:
+            return lambda_response(400, {'error': 'Invalid nextToken'})
+        logger.error(f"DynamoDB error getting campaign CSAT feed {campaign_id}: {error_code} - {str(e)}")
+        return lambda_response(500, {'error': f'Database error: {error_code}'})
+    except Exception as e:
+        logger.error(f"Unexpected error getting campaign CSAT feed {campaign_id}: {str(e)}")
+        return lambda_response(500, {'error': 'Failed to get campaign CSAT feed'})
+
 def get_campaigns_summary_analytics(event, context):
-    """Get summary analytics across all campaigns"""
+    """Get summary analytics across all campaigns
+
+    ownerId 없이 호출하면 스트림이 유지하는 전체 요약 아이템(CAMPAIGN_SUMMARY/ANALYTICS) 하나를 읽는다.
+    rebuild 이후 반영하지 못한 변경분이 있으면(rebuiltAt 없음) stale로 표시하고,
+    요약 아이템이 없으면 캠페인을 스캔하여 계산한 값을 stale로 반환한다. 세션은 세지 않는다.
+    """
     try:
         owner_id = event.get('queryStringParameters', {}).get('ownerId') if event.get('queryStringParameters') else None
         
         campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
-        
-        # Get all campaigns
+        stats = {}
+
+        if not owner_id:
+            item = campaigns_table.get_item(Key=summary_key()).get('Item')
+            stats['requests'] = 1
+            if item:
+                _log_round_trips(None, 'summary', stats['requests'], stale=not item.get('rebuiltAt'))
+                return lambda_response(200, {**summary_to_analytics(item), 'stale': not item.get('rebuiltAt')})
+        
+        # Get all campaigns (모든 페이지)
         if owner_id:
-            campaigns_resp = campaigns_table.query(
+            campaigns = list(iter_query(
+                campaigns_table,
+                stats=stats,
                 IndexName='GSI1',
                 KeyConditionExpression='GSI1PK = :pk',
                 ExpressionAttributeValues={':pk': f'OWNER#{owner_id}'}
-            )
+            ))
         else:
-            campaigns_resp = campaigns_table.scan(
+            campaigns = list(iter_scan(
+                campaigns_table,
+                segments=CAMPAIGN_SCAN_SEGMENTS,
+                stats=stats,
                 FilterExpression='SK = :sk AND begins_with(PK, :pk_prefix)',
                 ExpressionAttributeValues={
                     ':sk': 'METADATA',
                     ':pk_prefix': 'CAMPAIGN#'
                 }
-            )
-        
-        campaigns = campaigns_resp.get('Items', [])
+            ))
+        _log_round_trips(None, 'owner' if owner_id else 'scan', stats['requests'], campaigns=len(campaigns))
         
         # Calculate summary statistics
         total_campaigns = len(campaigns)
@@ -311,6 +430,9 @@ def get_campaigns_summary_analytics(event, context):
             'campaignStatusDistribution': dict(status_distribution),
             'calculatedAt': get_timestamp()
         }
+        if not owner_id:
+            # 요약 아이템이 rebuild되기 전의 METADATA 기준 근사치
+            summary['stale'] = True
         
         return lambda_response(200, summary)
         
@@ -345,38 +467,48 @@ def get_campaign_comparison_analytics(event, context):
         if not campaign_ids or not isinstance(campaign_ids, list):
             return lambda_response(400, {'error': 'Campaign IDs list is required'})
 
-        if len(campaign_ids) > 10:
-            return lambda_response(400, {'error': 'Maximum 10 campaigns can be compared at once'})
+        # 순서를 유지하며 중복 제거
+        campaign_ids = list(dict.fromkeys(str(cid) for cid in campaign_ids))
+        if len(campaign_ids) > MAX_COMPARISON_CAMPAIGNS:
+            return lambda_response(400, {
+                'error': f'Maximum {MAX_COMPARISON_CAMPAIGNS} campaigns can be compared at once'
+            })
 
-        campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
         sessions_table = dynamodb.Table(SESSIONS_TABLE)
 
+        # 캠페인 METADATA와 스트림 집계(ANALYTICS)를 BatchGetItem으로 한 번에 조회
+        campaign_items = batch_get_items(
+            CAMPAIGNS_TABLE,
+            [
+                key
+                for campaign_id in campaign_ids
+                for key in ({'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA'}, analytics_key(campaign_id))
+            ],
+            projection_expression=COMPARISON_PROJECTION,
+            expression_attribute_names=COMPARISON_ATTRIBUTE_NAMES,
+            max_workers=FEEDBACK_BATCH_CONCURRENCY,
+        )
+        campaigns = {}
+        aggregates = {}
+        for item in campaign_items:
+            campaign_id = item['PK'].replace('CAMPAIGN#', '', 1)
+            if item['SK'] == 'METADATA':
+                campaigns[campaign_id] = item
+            elif item.get('rebuiltAt'):
+                aggregates[campaign_id] = item
+
+        counts = _session_counts(sessions_table, list(campaigns), aggregates)
+
         comparison_data = []
 
         for campaign_id in campaign_ids:
-            # Get campaign info
-            campaign_resp = campaigns_table.get_item(
-                Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA'}
-            )
-
-            if 'Item' not in campaign_resp:
+            if campaign_id not in campaigns:
                 continue  # Skip non-existent campaigns
 
-            campaign = campaign_resp['Item']
-
-            # Get sessions for this campaign using GSI2
-            sessions_resp = sessions_table.query(
-                IndexName='GSI2',
-                KeyConditionExpression='GSI2PK = :pk',
-                ExpressionAttributeValues={':pk': f'CAMPAIGN#{campaign_id}'},
-                ScanIndexForward=False
-            )
-
-            sessions = sessions_resp.get('Items', [])
+            campaign = campaigns[campaign_id]
+            total_sessions, completed_sessions = counts[campaign_id]
 
             # Calculate basic metrics
-            total_sessions = len(sessions)
-            completed_sessions = len([s for s in sessions if s.get('status') == 'completed'])
             completion_rate = (completed_sessions / total_sessions * 100) if total_sessions > 0 else 0
 
             comparison_data.append({
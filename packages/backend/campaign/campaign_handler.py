@@ -7,6 +7,10 @@ from decimal import Decimal
 from botocore.exceptions import ClientError
 from utils import lambda_response, parse_body, get_timestamp, generate_id, convert_decimal_to_int, serialize_dynamodb_item, build_update_expression
 from models.agent_config import LEGACY_ROLE_MAP
+from agent_runtime import invalidate_campaign_routing_cache, invalidate_session_routing_cache
+from campaign_aggregates import (
+    delete_bucket_items, delete_csat_feed_items, empty_campaign_aggregate, iter_campaign_sessions,
+)
 
 # Configure logging
 logger = logging.getLogger()
@@ -181,6 +185,16 @@ def create_campaign(event, context):
         campaigns_table.put_item(Item=campaign_record)
         
         logger.info(f"Created campaign {campaign_id} with code {campaign_code}")
+
+        # 세션이 없는 상태의 분석 집계를 rebuiltAt과 함께 기록하여 이후 스트림 반영분만으로
+        # 정확한 집계가 유지되게 한다 (실패하면 rebuild 전까지 분석 API가 재계산 경로를 사용)
+        try:
+            campaigns_table.put_item(
+                Item=empty_campaign_aggregate(campaign_id),
+                ConditionExpression='attribute_not_exists(PK)',
+            )
+        except Exception as aggregate_err:
+            logger.warning(f"Failed to initialize analytics aggregate for campaign {campaign_id}: {str(aggregate_err)}")
         
         # CampaignCreated 도메인 이벤트 트리거 실행
         try:
@@ -413,6 +427,7 @@ def update_campaign(event, context):
             update_params['ExpressionAttributeNames'] = expression_names
         
         campaigns_table.update_item(**update_params)
+        invalidate_campaign_routing_cache(campaign_id)
         
         # Get updated campaign
         updated_resp = campaigns_table.get_item(
@@ -508,6 +523,12 @@ def delete_campaign(event, context):
         campaigns_table.delete_item(
             Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA'}
         )
+        campaigns_table.delete_item(
+            Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'ANALYTICS'}
+        )
+        delete_bucket_items(campaigns_table, campaign_id)
+        delete_csat_feed_items(campaigns_table, campaign_id)
+        invalidate_campaign_routing_cache(campaign_id)
         
         logger.info(f"Deleted campaign {campaign_id}")
         
@@ -544,20 +565,9 @@ def get_campaign_sessions(event, context):
         
         campaign = campaign_resp['Item']
         
-        # Get sessions associated with campaign using GSI2
-        sessions_resp = sessions_table.query(
-            IndexName='GSI2',
-            KeyConditionExpression='GSI2PK = :pk',
-            ExpressionAttributeValues={':pk': f'CAMPAIGN#{campaign_id}'},
-            ScanIndexForward=False
-        )
-        
+        # Get sessions associated with campaign using GSI2 (모든 페이지)
         sessions = []
-        for item in sessions_resp.get('Items', []):
-            # Skip campaign records
-            if item['PK'].startswith('CAMPAIGN#'):
-                continue
-                
+        for item in iter_campaign_sessions(sessions_table, campaign_id, newest_first=True):
             session_id = item.get('sessionId') or item['PK'].replace('SESSION#', '')
             
             sessions.append({
@@ -638,6 +648,7 @@ def associate_session_with_campaign(event, context):
                 ':gsi2sk': f'SESSION#{timestamp}'
             }
         )
+        invalidate_session_routing_cache(session_id)
         
         logger.info(f"Associated session {session_id} with campaign {campaign_id}")
         
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Backfill script to add session list index keys (GSI4PK/GSI4SK) to existing sessions
+
+관리자 세션 목록(GET /api/admin/sessions)은 GSI4 인덱스를 페이지 단위로 조회한다.
+인덱스 도입 이전에 생성된 세션 METADATA 아이템에는 GSI4 키가 없으므로
+이 스크립트로 한 번 백필해야 목록에 노출된다. 여러 번 실행해도 안전하다.
+
+GSI4PK는 createdAt 월 단위 샤드(SESSION_LIST#{YYYY-MM})이며, 샤딩 이전 값(SESSION_LIST)으로
+기록된 아이템도 샤드 키로 다시 쓴다. 가장 오래된 샤드를 출력하므로
+SESSION_LIST_START_MONTH를 그보다 늦게 설정하지 않도록 한다.
+"""
+
+import boto3
+import json
+import logging
+from botocore.exceptions import ClientError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SESSION_LIST_PK = 'SESSION_LIST'
+
+
+def backfill_session_list_index(sessions_table_name, region='ap-northeast-2', dry_run=False):
+    """
+    Add GSI4PK/GSI4SK to session METADATA items that are missing them (or still use the unsharded key)
+
+    Args:
+        sessions_table_name (str): Name of the sessions table
+        region (str): AWS region
+        dry_run (bool): Only count items that would be updated
+    """
+
+    dynamodb = boto3.resource('dynamodb', region_name=region)
+    sessions_table = dynamodb.Table(sessions_table_name)
+
+    scan_kwargs = {
+        'FilterExpression': (
+            'SK = :sk AND begins_with(PK, :pk_prefix) '
+            'AND (attribute_not_exists(GSI4PK) OR GSI4PK = :legacy_pk)'
+        ),
+        'ExpressionAttributeValues': {
+            ':sk': 'METADATA',
+            ':pk_prefix': 'SESSION#',
+            ':legacy_pk': SESSION_LIST_PK
+        },
+        'ProjectionExpression': 'PK, SK, createdAt'
+    }
+
+    updated_count = 0
+    skipped_count = 0
+    failed_count = 0
+    earliest_shard = None
+
+    while True:
+        response = sessions_table.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            created_at = item.get('createdAt')
+            if not created_at:
+                logger.warning(f"Skipping {item['PK']}: missing createdAt")
+                skipped_count += 1
+                continue
+
+            shard = created_at[:7]
+            earliest_shard = min(earliest_shard or shard, shard)
+
+            if dry_run:
+                updated_count += 1
+                continue
+
+            try:
+                sessions_table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression='SET GSI4PK = :gsi4pk, GSI4SK = :gsi4sk',
+                    ConditionExpression='attribute_exists(PK)',
+                    ExpressionAttributeValues={
+                        ':gsi4pk': f'{SESSION_LIST_PK}#{shard}',
+                        ':gsi4sk': f'SESSION#{created_at}'
+                    }
+                )
+                updated_count += 1
+            except ClientError as e:
+                logger.error(f"Failed to backfill {item['PK']}: {e}")
+                failed_count += 1
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        scan_kwargs['ExclusiveStartKey'] = last_key
+
+    logger.info(f"Backfill completed. Updated: {updated_count}, Skipped: {skipped_count}, Failed: {failed_count}")
+    if earliest_shard:
+        logger.info(f"Earliest session list shard: {earliest_shard}")
+
+    return {
+        'updated': updated_count,
+        'skipped': skipped_count,
+        'failed': failed_count,
+        'earliestShard': earliest_shard,
+        'dryRun': dry_run
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = [arg for arg in sys.argv[1:] if arg != '--dry-run']
+    if len(args) != 1:
+        print("Usage: python backfill_session_list_index.py <sessions_table_name> [--dry-run]")
+        sys.exit(1)
+
+    try:
+        result = backfill_session_list_index(args[0], dry_run='--dry-run' in sys.argv)
+        print(f"Backfill completed: {json.dumps(result, indent=2)}")
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Rebuild script for materialized campaign analytics aggregates (CAMPAIGN#{id}/ANALYTICS)
+
+캠페인 분석 API는 세션 스트림 소비자가 유지하는 집계 아이템을 GetItem으로 읽는다.
+집계 도입 이전의 세션/피드백을 반영하거나 스트림 반영 실패로 생긴 오차를 바로잡을 때
+이 스크립트로 원본 세션과 FEEDBACK 아이템에서 집계를 다시 계산한다.
+API는 rebuiltAt이 있는 집계만 사용하므로, 배포 후 한 번 실행해야 기존 캠페인이 집계 경로를 쓰고
+반영 실패로 stale 표시된(rebuiltAt이 지워진) 집계도 이 스크립트로 다시 사용할 수 있게 된다.
+전체 캠페인을 대상으로 실행하면 요약 API가 읽는 전체 요약(CAMPAIGN_SUMMARY/ANALYTICS)도
+캠페인 METADATA와 다시 계산한 캠페인별 집계로부터 다시 만든다.
+캠페인 시계열 버킷과 CSAT 피드(CAMPAIGN#{id}/CSAT#...)도 함께 다시 쓰므로
+CSAT 피드 도입 이전에 제출된 피드백도 이 스크립트로 피드에 채워진다.
+여러 번 실행해도 안전하며, 스트림 반영과 경합하지 않도록 트래픽이 적을 때 실행한다.
+"""
+
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared'))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild_campaign_analytics(sessions_table_name, campaigns_table_name, campaign_id=None,
+                               region='ap-northeast-2', dry_run=False):
+    """
+    Recalculate CAMPAIGN#{id}/ANALYTICS aggregates from sessions and feedback
+
+    Args:
+        sessions_table_name (str): Name of the sessions table
+        campaigns_table_name (str): Name of the campaigns table
+        campaign_id (str): Rebuild a single campaign (default: all campaigns)
+        region (str): AWS region
+        dry_run (bool): Compute aggregates without writing them
+    """
+    os.environ.setdefault('AWS_DEFAULT_REGION', region)
+    import boto3
+    from campaign_aggregates import rebuild_campaign_aggregate, rebuild_summary_aggregate
+
+    dynamodb = boto3.resource('dynamodb', region_name=region)
+    sessions_table = dynamodb.Table(sessions_table_name)
+    campaigns_table = dynamodb.Table(campaigns_table_name)
+
+    if campaign_id:
+        campaign_ids = [campaign_id]
+    else:
+        campaign_ids = []
+        scan_kwargs = {
+            'FilterExpression': 'SK = :sk AND begins_with(PK, :pk_prefix)',
+            'ExpressionAttributeValues': {
+                ':sk': 'METADATA',
+                ':pk_prefix': 'CAMPAIGN#'
+            },
+            'ProjectionExpression': 'campaignId'
+        }
+        while True:
+            response = campaigns_table.scan(**scan_kwargs)
+            campaign_ids.extend(item['campaignId'] for item in response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            scan_kwargs['ExclusiveStartKey'] = last_key
+
+    rebuilt_count = 0
+    failed_count = 0
+
+    for cid in campaign_ids:
+        try:
+            item = rebuild_campaign_aggregate(sessions_table, campaigns_table, cid, dry_run=dry_run)
+            logger.info(
+                f"{'[dry-run] ' if dry_run else ''}Rebuilt campaign {cid}: "
+                f"{int(item.get('totalSessions', 0))} sessions, {int(item.get('csatCount', 0))} CSAT responses"
+            )
+            rebuilt_count += 1
+        except Exception as e:
+            logger.error(f"Failed to rebuild campaign {cid}: {e}")
+            failed_count += 1
+
+    summary_rebuilt = False
+    if not campaign_id:
+        summary = rebuild_summary_aggregate(campaigns_table, dry_run=dry_run)
+        summary_rebuilt = True
+        logger.info(
+            f"{'[dry-run] ' if dry_run else ''}Rebuilt campaign summary: "
+            f"{summary.get('totalCampaigns', 0)} campaigns, {summary.get('totalSessions', 0)} sessions"
+        )
+
+    logger.info(f"Rebuild completed. Rebuilt: {rebuilt_count}, Failed: {failed_count}")
+
+    return {
+        'rebuilt': rebuilt_count,
+        'failed': failed_count,
+        'summaryRebuilt': summary_rebuilt,
+        'dryRun': dry_run
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Rebuild campaign analytics aggregates')
+    parser.add_argument('sessions_table_name')
+    parser.add_argument('campaigns_table_name')
+    parser.add_argument('--campaign-id', help='rebuild a single campaign')
+    parser.add_argument('--region', default='ap-northeast-2')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        result = rebuild_campaign_analytics(
+            args.sessions_table_name,
+            args.campaigns_table_name,
+            campaign_id=args.campaign_id,
+            region=args.region,
+            dry_run=args.dry_run,
+        )
+        print(f"Rebuild completed: {json.dumps(result, indent=2)}")
+    except Exception as e:
+        logger.error(f"Rebuild failed: {e}")
+        sys.exit(1)
@@ -3,10 +3,12 @@ import boto3
 import os
 from decimal import Decimal
 from utils import lambda_response, parse_body, get_timestamp, generate_id, get_ttl_timestamp, validate_session_id, verify_csrf_token
+from campaign_aggregates import csat_feed_item
 
 dynamodb = boto3.resource('dynamodb')
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
 MESSAGES_TABLE = os.environ.get('MESSAGES_TABLE')
+CAMPAIGNS_TABLE = os.environ.get('CAMPAIGNS_TABLE')
 
 
 def update_consultation_purposes(event, context):
@@ -83,6 +85,7 @@ def handle_feedback(event, context):
         session_resp = sessions_table.get_item(Key={'PK': f'SESSION#{session_id}', 'SK': 'METADATA'})
         if 'Item' not in session_resp:
             return lambda_response(404, {'error': 'Session not found'})
+        session = session_resp['Item']
     except Exception as e:
         print(f"Database error checking session: {str(e)}")
         return lambda_response(500, {'error': 'Database error'})
@@ -100,17 +103,39 @@ def handle_feedback(event, context):
         'timestamp': timestamp,
         'ttl': ttl_value
     }
+    # 캠페인 분석 집계가 세션 조회 없이 캠페인을 찾을 수 있도록 함께 저장
+    feed_item = None
+    if session.get('campaignId'):
+        feedback_item['campaignId'] = session['campaignId']
+        feed_item = csat_feed_item(session['campaignId'], session_id, feedback_item, session)
+        # 재제출 시 이전 CSAT 피드 아이템을 지울 수 있도록 피드 키를 함께 저장
+        feedback_item['csatFeedSK'] = feed_item['SK']
     
     try:
-        sessions_table.put_item(Item=feedback_item)
+        previous = sessions_table.put_item(Item=feedback_item, ReturnValues='ALL_OLD').get('Attributes', {})
         print(f"Feedback saved for session {session_id}: rating={rating}, feedback_length={len(feedback)}")
-        
-        return lambda_response(200, {
-            'message': 'Feedback submitted successfully',
-            'sessionId': session_id,
-            'rating': rating
-        })
     except Exception as e:
         print(f"Failed to save feedback for session {session_id}: {str(e)}")
         return lambda_response(500, {'error': 'Failed to save feedback'})
 
+    # 캠페인 CSAT 피드 (분석 API는 평균/히스토그램만 반환하고 피드백 목록은 이 피드에서 페이지로 읽는다)
+    # 피드 기록 실패는 제출 실패로 처리하지 않으며 rebuild_campaign_analytics로 복구할 수 있다
+    if feed_item and CAMPAIGNS_TABLE:
+        try:
+            campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
+            campaigns_table.put_item(Item=feed_item)
+            # 세션 완료 등으로 피드 키가 바뀐 재제출이면 이전 항목을 지워 세션당 한 항목을 유지
+            previous_sk = previous.get('csatFeedSK')
+            if previous_sk and (previous.get('campaignId'), previous_sk) != (session['campaignId'], feed_item['SK']):
+                campaigns_table.delete_item(
+                    Key={'PK': f"CAMPAIGN#{previous['campaignId']}", 'SK': previous_sk}
+                )
+        except Exception as e:
+            print(f"Failed to write CSAT feed item for session {session_id}: {str(e)}")
+
+    return lambda_response(200, {
+        'message': 'Feedback submitted successfully',
+        'sessionId': session_id,
+        'rating': rating
+    })
+
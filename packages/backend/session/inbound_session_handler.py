@@ -12,6 +12,7 @@ from botocore.exceptions import ClientError
 from utils import (
     lambda_response, parse_body, get_timestamp,
     generate_session_id, get_ttl_timestamp, generate_csrf_token,
+    session_list_index_keys,
 )
 
 logger = logging.getLogger()
@@ -214,6 +215,7 @@ def _create_new_inbound_session(
         'GSI2SK': f'SESSION#{timestamp}',
         'GSI3PK': gsi3_pk,
         'GSI3SK': f'SESSION#{timestamp}',
+        **session_list_index_keys(timestamp),
     }
 
     sessions_table = dynamodb.Table(SESSIONS_TABLE)
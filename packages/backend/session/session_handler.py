@@ -1,7 +1,7 @@
 import json
 import boto3
 import os
-from utils import lambda_response, parse_body, get_timestamp, generate_id, generate_session_id, get_ttl_timestamp, generate_csrf_token, validate_session_id, secure_compare
+from utils import lambda_response, parse_body, get_timestamp, generate_id, generate_session_id, get_ttl_timestamp, generate_csrf_token, validate_session_id, secure_compare, session_list_index_keys
 
 dynamodb = boto3.resource('dynamodb')
 cognito = boto3.client('cognito-idp')
@@ -55,7 +55,8 @@ def create_session(event, context):
         'createdAt': timestamp,
         'ttl': get_ttl_timestamp(30),  # 30 days TTL
         'GSI1PK': f'SALESREP#{sales_rep_email}',
-        'GSI1SK': f'SESSION#{timestamp}'
+        'GSI1SK': f'SESSION#{timestamp}',
+        **session_list_index_keys(timestamp)
     }
     
     # Add campaign association if provided
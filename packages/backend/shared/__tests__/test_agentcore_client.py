@@ -0,0 +1,169 @@
+"""AgentCoreClient 단위 테스트
+
+- 엔트리포인트 프로파일별 botocore Config (pool, adaptive retry, timeout)
+- 프로세스 공유 클라이언트 옵션
+- payload 내용 대신 크기/해시/소요 시간 구조화 로그, 샘플링된 DEBUG payload 로그
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+
+# shared 모듈 경로 추가
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), '..'
+    ),
+)
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import agent_runtime
+from agent_runtime import AgentCoreClient, build_agentcore_config
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_clients():
+    agent_runtime._shared_agentcore_clients.clear()
+    yield
+    agent_runtime._shared_agentcore_clients.clear()
+
+
+class TestAgentCoreClientConfig:
+
+    def test_profile_config(self):
+        stream = build_agentcore_config('stream')
+        analysis = build_agentcore_config('analysis')
+
+        assert stream.read_timeout == agent_runtime.AGENTCORE_READ_TIMEOUTS['stream']
+        assert analysis.read_timeout == agent_runtime.AGENTCORE_READ_TIMEOUTS['analysis']
+        assert stream.connect_timeout == agent_runtime.AGENTCORE_CONNECT_TIMEOUT
+        assert stream.max_pool_connections == agent_runtime.AGENTCORE_MAX_POOL_CONNECTIONS
+        assert stream.retries['mode'] == 'adaptive'
+
+    def test_unknown_profile_rejected(self):
+        with pytest.raises(ValueError):
+            build_agentcore_config('batch')
+
+    @patch.object(agent_runtime.boto3, 'client')
+    def test_clients_created_lazily_per_profile(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+        client = AgentCoreClient(shared=False)
+        assert mock_client.call_count == 0
+
+        stream = client.get_client('stream')
+        assert client.get_client('stream') is stream
+        assert client.client is not stream
+        assert mock_client.call_count == 2
+        read_timeouts = {c.kwargs['config'].read_timeout for c in mock_client.call_args_list}
+        assert read_timeouts == set(agent_runtime.AGENTCORE_READ_TIMEOUTS.values())
+
+    @patch.object(agent_runtime.boto3, 'client')
+    def test_shared_clients_reused_across_instances(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+        first = AgentCoreClient(shared=True)
+        second = AgentCoreClient(shared=True)
+        private = AgentCoreClient(shared=False)
+
+        assert first.get_client('stream') is second.get_client('stream')
+        assert private.get_client('stream') is not first.get_client('stream')
+        assert mock_client.call_count == 2
+
+    def test_stream_entrypoint_uses_stream_profile(self):
+        client = AgentCoreClient(shared=False)
+        stream_client = MagicMock()
+        body = b'data: {"type": "chunk", "content": "hi"}\n\n'
+        stream_client.invoke_agent_runtime.return_value = {
+            'contentType': 'text/event-stream',
+            'response': [body],
+        }
+        client._clients['stream'] = stream_client
+
+        events = list(client.invoke_stream_chunks('arn:agent', 's1', 'hello'))
+
+        assert events == [{'type': 'chunk', 'content': 'hi'}]
+        payload = json.loads(stream_client.invoke_agent_runtime.call_args.kwargs['payload'])
+        assert payload['entrypoint'] == 'stream'
+
+    def test_invoke_uses_analysis_profile(self):
+        client = AgentCoreClient(shared=False)
+        analysis_client = MagicMock()
+        analysis_client.invoke_agent_runtime.return_value = {
+            'contentType': 'application/json',
+            'response': io.BytesIO(b'{"summary": "ok"}'),
+        }
+        client._clients['analysis'] = analysis_client
+
+        assert client.invoke('arn:agent', 's1', {'prompt': 'x'}) == {'summary': 'ok'}
+
+
+def _json_client(body=b'{"summary": "ok"}'):
+    analysis_client = MagicMock()
+    analysis_client.invoke_agent_runtime.return_value = {
+        'contentType': 'application/json',
+        'response': io.BytesIO(body),
+    }
+    return analysis_client
+
+
+def _logged_events(caplog):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == 'agent_runtime']
+
+
+class TestAgentCoreInvokeLogging:
+
+    def test_invoke_logs_size_and_hash_not_content(self, caplog, capsys):
+        client = AgentCoreClient(shared=False)
+        client._clients['analysis'] = _json_client()
+        secret = 'conversation-history-' * 100
+
+        with caplog.at_level(logging.INFO, logger='agent_runtime'):
+            client.invoke('arn:agent', 's1', {'conversation_history': secret})
+
+        events = _logged_events(caplog)
+        assert [e['event'] for e in events] == ['agentcore_invoke_start', 'agentcore_invoke_complete']
+        assert events[0]['payloadBytes'] > len(secret)
+        assert len(events[0]['payloadSha256']) == 16
+        assert events[1]['responseChars'] == len('{"summary": "ok"}')
+        assert 'durationMs' in events[1]
+        assert secret not in caplog.text
+        assert secret not in capsys.readouterr().out
+
+    def test_invoke_silent_above_info(self, caplog):
+        client = AgentCoreClient(shared=False)
+        client._clients['analysis'] = _json_client()
+
+        with caplog.at_level(logging.WARNING, logger='agent_runtime'):
+            client.invoke('arn:agent', 's1', {'prompt': 'x'})
+
+        assert _logged_events(caplog) == []
+
+    def test_sampled_payload_debug_log(self, caplog):
+        client = AgentCoreClient(shared=False)
+        client._clients['analysis'] = _json_client()
+
+        with patch.object(agent_runtime, 'AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE', 1.0), \
+                caplog.at_level(logging.DEBUG, logger='agent_runtime'):
+            client.invoke('arn:agent', 's1', {'prompt': 'sampled'})
+
+        payload_logs = [e for e in _logged_events(caplog) if e['event'] == 'agentcore_invoke_start_payload']
+        assert len(payload_logs) == 1
+        assert json.loads(payload_logs[0]['payload']) == {'prompt': 'sampled'}
+
+    def test_payload_not_logged_when_sampling_disabled(self, caplog):
+        client = AgentCoreClient(shared=False)
+        client._clients['analysis'] = _json_client()
+
+        with patch.object(agent_runtime, 'AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE', 0.0), \
+                caplog.at_level(logging.DEBUG, logger='agent_runtime'):
+            client.invoke('arn:agent', 's1', {'prompt': 'hidden'})
+
+        assert 'hidden' not in caplog.text
@@ -0,0 +1,937 @@
+"""캠페인 분석 집계(CAMPAIGN#{id}/ANALYTICS) 테스트 (moto 기반)
+
+- 세션/피드백 기여값 계산과 증감분
+- 스트림 레코드 반영 결과 == 원본 재계산(rebuild) 결과 == 기존 calculate_campaign_analytics
+- 집계에 영향 없는 변경은 쓰기 생략, 같은 eventID 재전달은 한 번만 반영, 반영 실패 시 stale 표시
+- get_campaign_analytics는 rebuiltAt이 있는 집계 아이템만 GetItem 한 번으로 응답
+- get_campaign_comparison_analytics는 집계 아이템을 재사용하고 없는 캠페인만 세션을 센다
+- 전체 캠페인 요약(CAMPAIGN_SUMMARY/ANALYTICS): 캠페인/세션 스트림 반영 == rebuild, 요약 API는 GetItem 한 번, 후보 충돌 재시도
+- 시계열 버킷(DAY#/HOUR#): 스트림 반영 == rebuild, from/to 범위 조회
+- 스케치 모드: 고객사/상담 목적 스케치의 스트림 반영 == rebuild, 조건부 쓰기 충돌 재시도
+- CSAT 피드(CAMPAIGN#{id}/CSAT#...): 피드백 제출 시 기록, 최신순 커서 페이지와 평점 필터
+"""
+
+import json
+import os
+import sys
+from collections import Counter
+from unittest.mock import ANY, patch
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+from moto import mock_aws
+
+# shared / stream / campaign 도메인 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'stream'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'campaign'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'session'))
+
+os.environ['SESSIONS_TABLE'] = 'test-sessions-table'
+os.environ['CAMPAIGNS_TABLE'] = 'test-campaigns-table'
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import campaign_aggregates  # noqa: E402
+import campaign_analytics  # noqa: E402
+import chat_handler  # noqa: E402
+import dynamodb_utils  # noqa: E402
+import stream_handler  # noqa: E402
+from campaign_aggregates import (  # noqa: E402
+    aggregate_to_analytics,
+    analytics_key,
+    build_campaign_aggregate,
+    diff_contributions,
+    rebuild_campaign_aggregate,
+    session_contribution,
+)
+
+CAMPAIGN_ID = 'camp-1'
+_serializer = TypeSerializer()
+
+
+def _image(item):
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def _record(event_name, old=None, new=None, event_id=None):
+    ddb = {}
+    if old is not None:
+        ddb['OldImage'] = _image(old)
+    if new is not None:
+        ddb['NewImage'] = _image(new)
+    record = {'eventName': event_name, 'dynamodb': ddb}
+    if event_id:
+        record['eventID'] = event_id
+    return record
+
+
+def _session(session_id, status='active', company='Acme', purposes='MIGRATION|NEW_ADOPTION',
+             created='2025-01-01T00:00:00Z', completed=None, campaign_id=CAMPAIGN_ID):
+    item = {
+        'PK': f'SESSION#{session_id}',
+        'SK': 'METADATA',
+        'sessionId': session_id,
+        'status': status,
+        'campaignId': campaign_id,
+        'GSI2PK': f'CAMPAIGN#{campaign_id}',
+        'GSI2SK': f'SESSION#{created}',
+        'createdAt': created,
+        'consultationPurposes': purposes,
+        'customerInfo': {'name': f'Customer {session_id}', 'company': company},
+    }
+    if completed:
+        item['completedAt'] = completed
+    return item
+
+
+def _feedback(session_id, rating, text='good'):
+    from decimal import Decimal
+    return {
+        'PK': f'SESSION#{session_id}',
+        'SK': 'FEEDBACK',
+        'sessionId': session_id,
+        'rating': Decimal(str(rating)),
+        'feedback': text,
+        'campaignId': CAMPAIGN_ID,
+        'timestamp': '2025-01-03T09:30:00Z',
+    }
+
+
+def _comparable(analytics):
+    result = dict(analytics)
+    result.pop('calculatedAt', None)
+    return json.loads(json.dumps(result, default=float))
+
+
+@pytest.fixture
+def tables():
+    with mock_aws():
+        resource = boto3.resource('dynamodb')
+        sessions = resource.create_table(
+            TableName='test-sessions-table',
+            KeySchema=[
+                {'AttributeName': 'PK', 'KeyType': 'HASH'},
+                {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'PK', 'AttributeType': 'S'},
+                {'AttributeName': 'SK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI2PK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI2SK', 'AttributeType': 'S'},
+            ],
+            GlobalSecondaryIndexes=[{
+                'IndexName': 'GSI2',
+                'KeySchema': [
+                    {'AttributeName': 'GSI2PK', 'KeyType': 'HASH'},
+                    {'AttributeName': 'GSI2SK', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            }],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        campaigns = resource.create_table(
+            TableName='test-campaigns-table',
+            KeySchema=[
+                {'AttributeName': 'PK', 'KeyType': 'HASH'},
+                {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'PK', 'AttributeType': 'S'},
+                {'AttributeName': 'SK', 'AttributeType': 'S'},
+            ],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        campaigns.put_item(Item={'PK': f'CAMPAIGN#{CAMPAIGN_ID}', 'SK': 'METADATA', 'campaignId': CAMPAIGN_ID})
+        with patch.object(stream_handler, 'dynamodb', resource), \
+                patch.object(campaign_analytics, 'dynamodb', resource), \
+                patch.object(chat_handler, 'dynamodb', resource), \
+                patch.object(dynamodb_utils, 'dynamodb', resource):
+            yield sessions, campaigns
+
+
+def _apply(sessions_table, record):
+    """테이블 상태를 레코드대로 바꾸고 스트림 소비자를 호출"""
+    ddb = record['dynamodb']
+    new = ddb.get('NewImage')
+    old = ddb.get('OldImage')
+    if new:
+        sessions_table.put_item(Item=campaign_aggregates.deserialize_image(new))
+    else:
+        item = campaign_aggregates.deserialize_image(old)
+        sessions_table.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+    stream_handler.update_campaign_analytics(record)
+
+
+class TestContributions:
+
+    def test_session_contribution(self):
+        contribution = session_contribution(_session(
+            's1', status='completed', completed='2025-01-01T00:30:00Z', purposes='A|B, C'))
+        assert contribution['totalSessions'] == 1
+        assert contribution['status:completed'] == 1
+        assert contribution['durationCount'] == 1
+        assert float(contribution['durationSum']) == 30.0
+        assert contribution['completedOn:2025-01-01'] == 1
+        assert {k for k in contribution if k.startswith('purpose:')} == {'purpose:A', 'purpose:B', 'purpose:C'}
+        assert contribution['company:Acme'] == 1
+
+    def test_status_change_delta(self):
+        before = _session('s1')
+        after = _session('s1', status='completed', completed='2025-01-02T00:00:00Z')
+        delta = diff_contributions(session_contribution(before), session_contribution(after))
+        assert delta['status:active'] == -1
+        assert delta['status:completed'] == 1
+        assert delta['completedOn:2025-01-02'] == 1
+        assert 'totalSessions' not in delta
+
+    def test_fractional_rating_keeps_precision(self):
+        contribution = campaign_aggregates.feedback_contribution(_feedback('s1', 4.5))
+        assert float(contribution['csatSum']) == 4.5
+        assert contribution['csatRating:4.5'] == 1
+
+        point = campaign_aggregates.bucket_to_point({'SK': 'DAY#2025-01-03', 'csatSum': 7.5, 'csatCount': 2})
+        assert point['averageCSAT'] == 3.8
+
+    def test_irrelevant_change_has_no_delta(self):
+        before = _session('s1')
+        after = {**before, 'locale': 'en'}
+        assert diff_contributions(session_contribution(before), session_contribution(after)) == {}
+
+
+class TestStreamMaintainedAggregate:
+
+    @pytest.fixture(autouse=True)
+    def histogram_mode(self):
+        # 기존 calculate_campaign_analytics와 정확히 비교하기 위해 히스토그램 모드로 검증
+        with patch.object(campaign_aggregates, 'SKETCHES_ENABLED', False), \
+                patch.object(stream_handler, 'SKETCHES_ENABLED', False):
+            yield
+
+    def test_stream_matches_rebuild_and_legacy(self, tables):
+        sessions_table, campaigns_table = tables
+        s1 = _session('s1')
+        s2 = _session('s2', company='Globex', purposes='COST')
+        s3 = _session('s3', purposes='')
+        for s in (s1, s2, s3):
+            _apply(sessions_table, _record('INSERT', new=s))
+
+        s1_done = {**s1, 'status': 'completed', 'completedAt': '2025-01-01T01:00:00Z'}
+        _apply(sessions_table, _record('MODIFY', old=s1, new=s1_done))
+        s2_done = {**s2, 'status': 'completed', 'completedAt': '2025-01-03T00:20:00Z'}
+        _apply(sessions_table, _record('MODIFY', old=s2, new=s2_done))
+        _apply(sessions_table, _record('INSERT', new=_feedback('s1', 4.5)))
+        _apply(sessions_table, _record('INSERT', new=_feedback('s2', 2)))
+        _apply(sessions_table, _record('MODIFY', old=_feedback('s2', 2), new=_feedback('s2', 3, 'ok')))
+        _apply(sessions_table, _record('REMOVE', old=s3))
+
+        aggregate = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        streamed = aggregate_to_analytics(CAMPAIGN_ID, aggregate)
+
+        rebuilt_item = rebuild_campaign_aggregate(sessions_table, campaigns_table, CAMPAIGN_ID, dry_run=True)
+        rebuilt = aggregate_to_analytics(CAMPAIGN_ID, rebuilt_item)
+
+        sessions = [s1_done, s2_done]
+        sessions[0] = {**sessions[0], 'feedback': {'rating': 4.5, 'narrative': 'good'}}
+        sessions[1] = {**sessions[1], 'feedback': {'rating': 3, 'narrative': 'ok'}}
+        legacy = campaign_analytics.calculate_campaign_analytics(CAMPAIGN_ID, sessions)
+
+        assert _comparable(streamed) == _comparable(rebuilt) == _comparable(legacy)
+        assert streamed['totalSessions'] == 2
+        # (4.5 + 3) / 2, 평점을 정수로 자르지 않는다
+        assert streamed['averageCSAT'] == 3.8
+        assert streamed['csatHistogram'] == [{'rating': 3.0, 'count': 1}, {'rating': 4.5, 'count': 1}]
+        assert 'csatFeedback' not in streamed
+
+    def test_irrelevant_modify_skips_write(self, tables):
+        sessions_table, _ = tables
+        s1 = _session('s1')
+        with patch.object(campaign_aggregates, 'get_timestamp', wraps=campaign_aggregates.get_timestamp) as ts:
+            stream_handler.update_campaign_analytics(_record('MODIFY', old=s1, new={**s1, 'locale': 'en'}))
+        assert ts.call_count == 0
+
+    def test_redelivered_record_applied_once(self, tables):
+        sessions_table, campaigns_table = tables
+        s1 = _session('s1')
+        insert = _record('INSERT', new=s1, event_id='evt-1')
+        _apply(sessions_table, insert)
+        # Lambda가 실패한 배치를 다시 전달
+        stream_handler.update_campaign_analytics(insert)
+
+        aggregate = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert aggregate['totalSessions'] == 1
+        day = campaigns_table.get_item(Key={'PK': f'CAMPAIGN#{CAMPAIGN_ID}', 'SK': 'DAY#2025-01-01'})['Item']
+        assert day['created'] == 1
+
+    def test_failed_apply_marks_aggregate_stale(self, tables):
+        sessions_table, campaigns_table = tables
+        rebuild_campaign_aggregate(sessions_table, campaigns_table, CAMPAIGN_ID)
+
+        with patch.object(stream_handler, 'apply_session_aggregate_updates', side_effect=RuntimeError('throttled')):
+            with pytest.raises(RuntimeError):
+                _apply(sessions_table, _record('INSERT', new=_session('s1'), event_id='evt-1'))
+
+        aggregate = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert 'rebuiltAt' not in aggregate
+        assert aggregate['staleAt']
+
+    def test_new_campaign_aggregate_stays_exact(self, tables):
+        sessions_table, campaigns_table = tables
+        campaigns_table.put_item(Item=campaign_aggregates.empty_campaign_aggregate(CAMPAIGN_ID))
+        s1 = _session('s1')
+        _apply(sessions_table, _record('INSERT', new=s1))
+        _apply(sessions_table, _record('MODIFY', old=s1, new={
+            **s1, 'status': 'completed', 'completedAt': '2025-01-01T00:30:00Z'}))
+
+        aggregate = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert aggregate['rebuiltAt']
+        rebuilt = rebuild_campaign_aggregate(sessions_table, campaigns_table, CAMPAIGN_ID, dry_run=True)
+        assert _comparable(aggregate_to_analytics(CAMPAIGN_ID, aggregate)) == \
+            _comparable(aggregate_to_analytics(CAMPAIGN_ID, rebuilt))
+
+    def test_campaign_change_moves_contribution(self, tables):
+        sessions_table, campaigns_table = tables
+        s1 = _session('s1')
+        _apply(sessions_table, _record('INSERT', new=s1))
+        moved = {**s1, 'campaignId': 'camp-2'}
+        _apply(sessions_table, _record('MODIFY', old=s1, new=moved))
+
+        old_agg = aggregate_to_analytics(
+            CAMPAIGN_ID, campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item'])
+        new_agg = aggregate_to_analytics(
+            'camp-2', campaigns_table.get_item(Key=analytics_key('camp-2'))['Item'])
+        assert old_agg['totalSessions'] == 0
+        assert old_agg['customerCompanies'] == []
+        assert new_agg['totalSessions'] == 1
+
+
+class TestGetCampaignAnalytics:
+
+    def test_single_get_item_when_aggregate_exists(self, tables):
+        _, campaigns_table = tables
+        campaigns_table.put_item(Item={
+            **analytics_key(CAMPAIGN_ID),
+            **build_campaign_aggregate([_session('s1')]),
+            'rebuiltAt': '2025-01-01T00:00:00Z',
+            'updatedAt': '2025-01-01T00:00:00Z',
+        })
+        event = {'pathParameters': {'campaignId': CAMPAIGN_ID}}
+
+        with patch.object(campaign_analytics, 'calculate_campaign_analytics') as legacy:
+            response = campaign_analytics.get_campaign_analytics(event, None)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['totalSessions'] == 1
+        assert body['calculatedAt'] == '2025-01-01T00:00:00Z'
+        legacy.assert_not_called()
+
+    def test_partial_aggregate_before_rebuild_is_not_served(self, tables):
+        sessions_table, _ = tables
+        sessions_table.put_item(Item=_session('s0'))
+        # rebuild 전에 스트림이 만든 아이템은 이후 세션만 담고 있다
+        _apply(sessions_table, _record('INSERT', new=_session('s1')))
+        event = {'pathParameters': {'campaignId': CAMPAIGN_ID}}
+
+        body = json.loads(campaign_analytics.get_campaign_analytics(event, None)['body'])
+
+        assert body['totalSessions'] == 2
+
+    def test_falls_back_without_aggregate(self, tables):
+        sessions_table, _ = tables
+        sessions_table.put_item(Item=_session('s1'))
+        event = {'pathParameters': {'campaignId': CAMPAIGN_ID}}
+
+        response = campaign_analytics.get_campaign_analytics(event, None)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['totalSessions'] == 1
+
+    def test_fallback_batches_feedback_reads(self, tables, caplog):
+        import logging
+        sessions_table, _ = tables
+        with sessions_table.batch_writer() as writer:
+            for i in range(250):
+                writer.put_item(Item=_session(f's{i:03d}', created=f'2025-01-01T00:{i % 60:02d}:{i % 50:02d}Z'))
+                if i % 2 == 0:
+                    writer.put_item(Item=_feedback(f's{i:03d}', 4))
+        event = {'pathParameters': {'campaignId': CAMPAIGN_ID}}
+
+        with caplog.at_level(logging.INFO):
+            response = campaign_analytics.get_campaign_analytics(event, None)
+
+        body = json.loads(response['body'])
+        assert body['totalCSATResponses'] == 125
+        metrics = [r.getMessage() for r in caplog.records if 'campaign_analytics' in r.getMessage()]
+        metric = json.loads(metrics[-1].split('campaign_analytics ', 1)[1])
+        # aggregate GetItem + campaign GetItem + GSI2 query + BatchGetItem 3회
+        assert metric['roundTrips'] == 6
+        assert metric['source'] == 'recompute'
+
+    def test_session_counts_skip_campaign_triggers(self, tables):
+        sessions_table, campaigns_table = tables
+        sessions_table.put_item(Item=_session('s1', status='completed', completed='2025-01-01T01:00:00Z'))
+        sessions_table.put_item(Item=_session('s2'))
+        # 캠페인 트리거도 GSI2PK=CAMPAIGN#{id}를 가진다
+        sessions_table.put_item(Item={
+            'PK': 'TRIGGER#t1', 'SK': 'METADATA', 'status': 'active',
+            'GSI2PK': f'CAMPAIGN#{CAMPAIGN_ID}', 'GSI2SK': 'TRIGGER#t1',
+        })
+
+        campaign_analytics.update_campaign_session_counts(CAMPAIGN_ID)
+
+        campaign = campaigns_table.get_item(Key={'PK': f'CAMPAIGN#{CAMPAIGN_ID}', 'SK': 'METADATA'})['Item']
+        assert campaign['sessionCount'] == 2
+        assert campaign['completedSessionCount'] == 1
+
+    def test_recompute_reads_only_analytics_fields(self, tables):
+        sessions_table, _ = tables
+        for i, status in enumerate(['active', 'completed', 'completed']):
+            session = _session(f's{i}', status=status, company=f'Co{i % 2}',
+                               completed='2025-01-02T00:00:00Z' if status == 'completed' else None)
+            session['aiAnalysis'] = {'summary': 'x' * 5000}
+            session['csrfToken'] = 'secret'
+            sessions_table.put_item(Item=session)
+        sessions_table.put_item(Item=_feedback('s1', 5))
+        event = {'pathParameters': {'campaignId': CAMPAIGN_ID}}
+
+        with patch.object(campaign_analytics, 'calculate_campaign_analytics',
+                          wraps=campaign_analytics.calculate_campaign_analytics) as calculate:
+            slim = json.loads(campaign_analytics.get_campaign_analytics(event, None)['body'])
+            captured = calculate.call_args.args[1]
+
+        full = campaign_analytics.calculate_campaign_analytics(CAMPAIGN_ID, [
+            {**item, 'feedback': {'rating': 5}} if item['sessionId'] == 's1' else item
+            for item in sessions_table.scan()['Items'] if item['SK'] == 'METADATA'
+        ])
+        assert _comparable(slim) == _comparable(full)
+        assert all('aiAnalysis' not in s and 'csrfToken' not in s for s in captured)
+        assert all(set(s['customerInfo']) <= {'company', 'name'} for s in captured)
+
+
+class TestCampaignComparison:
+
+    def _campaign(self, campaigns_table, campaign_id):
+        campaigns_table.put_item(Item={
+            'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA', 'campaignId': campaign_id,
+            'campaignName': f'Campaign {campaign_id}', 'campaignCode': campaign_id.upper(),
+            'status': 'active', 'startDate': '2025-01-01', 'endDate': '2025-12-31', 'ownerName': 'Owner',
+        })
+
+    def test_uses_aggregates_and_counts_the_rest(self, tables):
+        sessions_table, campaigns_table = tables
+        self._campaign(campaigns_table, CAMPAIGN_ID)
+        self._campaign(campaigns_table, 'camp-2')
+        # camp-1: 스트림 집계 사용 (세션 조회 없음)
+        campaigns_table.put_item(Item={
+            **analytics_key(CAMPAIGN_ID),
+            **build_campaign_aggregate([
+                _session('a'), _session('b', status='completed', completed='2025-01-02T00:00:00Z'),
+            ]),
+            'rebuiltAt': '2025-01-01T00:00:00Z',
+        })
+        # camp-2: 집계 아이템 없음 -> GSI 조회
+        sessions_table.put_item(Item=_session('c', campaign_id='camp-2', status='completed',
+                                              completed='2025-01-02T00:00:00Z'))
+        event = {
+            'httpMethod': 'GET',
+            'queryStringParameters': {'campaignIds': f'{CAMPAIGN_ID},camp-2,missing,camp-2'},
+        }
+
+        with patch.object(campaign_analytics, '_count_campaign_sessions',
+                          wraps=campaign_analytics._count_campaign_sessions) as count:
+            response = campaign_analytics.get_campaign_comparison_analytics(event, None)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        rows = {row['campaignId']: row for row in body['campaigns']}
+        assert set(rows) == {CAMPAIGN_ID, 'camp-2'}
+        assert (rows[CAMPAIGN_ID]['totalSessions'], rows[CAMPAIGN_ID]['completedSessions']) == (2, 1)
+        assert (rows['camp-2']['totalSessions'], rows['camp-2']['completionRate']) == (1, 100.0)
+        assert [c.args[1] for c in count.call_args_list] == ['camp-2']
+
+    def test_more_than_ten_campaigns_allowed(self, tables):
+        _, campaigns_table = tables
+        ids = [f'c{i}' for i in range(12)]
+        for cid in ids:
+            self._campaign(campaigns_table, cid)
+        event = {'httpMethod': 'GET', 'queryStringParameters': {'campaignIds': ','.join(ids)}}
+
+        response = campaign_analytics.get_campaign_comparison_analytics(event, None)
+
+        assert response['statusCode'] == 200
+        assert len(json.loads(response['body'])['campaigns']) == 12
+
+    def test_limit_enforced(self, tables):
+        ids = ','.join(f'c{i}' for i in range(campaign_analytics.MAX_COMPARISON_CAMPAIGNS + 1))
+        event = {'httpMethod': 'GET', 'queryStringParameters': {'campaignIds': ids}}
+
+        response = campaign_analytics.get_campaign_comparison_analytics(event, None)
+
+        assert response['statusCode'] == 400
+
+
+class TestCampaignSummary:
+
+    def _campaign(self, campaign_id, name, status='active'):
+        return {
+            'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA', 'campaignId': campaign_id,
+            'campaignName': name, 'status': status,
+        }
+
+    def _apply_campaign(self, campaigns_table, record):
+        ddb = record['dynamodb']
+        if ddb.get('NewImage'):
+            campaigns_table.put_item(Item=campaign_aggregates.deserialize_image(ddb['NewImage']))
+        else:
+            item = campaign_aggregates.deserialize_image(ddb['OldImage'])
+            campaigns_table.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+        stream_handler.update_campaign_summary(record)
+
+    def _summary(self, campaigns_table):
+        item = campaigns_table.get_item(Key=campaign_aggregates.summary_key())['Item']
+        return {k: v for k, v in item.items() if k not in ('rebuiltAt', 'updatedAt') and v != 0}
+
+    def test_stream_matches_rebuild(self, tables):
+        sessions_table, campaigns_table = tables
+        campaigns_table.delete_item(Key={'PK': f'CAMPAIGN#{CAMPAIGN_ID}', 'SK': 'METADATA'})
+        campaign_aggregates.rebuild_summary_aggregate(campaigns_table)
+        c1 = self._campaign(CAMPAIGN_ID, 'First')
+        c2 = self._campaign('camp-2', 'Second')
+        c3 = self._campaign('camp-3', 'Third', status='draft')
+        for campaign in (c1, c2, c3):
+            self._apply_campaign(campaigns_table, _record('INSERT', new=campaign))
+        self._apply_campaign(campaigns_table, _record('MODIFY', old=c1, new={**c1, 'campaignName': 'First!'}))
+        self._apply_campaign(campaigns_table, _record('MODIFY', old=c2, new={**c2, 'status': 'completed'}))
+        self._apply_campaign(campaigns_table, _record('REMOVE', old=c3))
+
+        s1 = _session('s1')
+        s2 = _session('s2', campaign_id='camp-2')
+        s3 = _session('s3', campaign_id='camp-2')
+        for s in (s1, s2, s3):
+            _apply(sessions_table, _record('INSERT', new=s))
+        for s in (s1, s2):
+            _apply(sessions_table, _record('MODIFY', old=s, new={
+                **s, 'status': 'completed', 'completedAt': '2025-01-02T00:00:00Z'}))
+        # 후보가 된 뒤의 이름 변경도 후보 항목에 반영된다
+        c2_done = {**c2, 'status': 'completed'}
+        self._apply_campaign(campaigns_table, _record('MODIFY', old=c2_done, new={**c2_done, 'campaignName': 'Second!'}))
+
+        rebuilt = campaign_aggregates.rebuild_summary_aggregate(campaigns_table, dry_run=True)
+        assert self._summary(campaigns_table) == {
+            k: v for k, v in rebuilt.items() if k not in ('rebuiltAt', 'updatedAt')
+        }
+
+        body = json.loads(campaign_analytics.get_campaigns_summary_analytics({}, None)['body'])
+        assert body['stale'] is False
+        assert body['totalCampaigns'] == 2
+        assert body['activeCampaigns'] == 1
+        assert body['campaignStatusDistribution'] == {'active': 1, 'completed': 1}
+        assert body['totalSessionsAcrossCampaigns'] == 3
+        assert body['totalCompletedSessions'] == 2
+        assert [(c['campaignName'], c['completionRate']) for c in body['topPerformingCampaigns']] == [
+            ('First!', 100.0), ('Second!', 50.0),
+        ]
+
+    def test_redelivered_records_applied_once(self, tables):
+        sessions_table, campaigns_table = tables
+        campaign_aggregates.rebuild_summary_aggregate(campaigns_table)
+        campaign_record = _record('INSERT', new=self._campaign('camp-2', 'Second'), event_id='evt-c')
+        session_record = _record('INSERT', new=_session('s1'), event_id='evt-s')
+        for _ in range(2):
+            self._apply_campaign(campaigns_table, campaign_record)
+            _apply(sessions_table, session_record)
+
+        summary = self._summary(campaigns_table)
+        assert (summary['totalCampaigns'], summary['totalSessions']) == (2, 1)
+        assert summary['topCampaigns'][CAMPAIGN_ID]['sessions'] == 1
+
+    def test_bounded_top_candidates(self, tables):
+        sessions_table, campaigns_table = tables
+        campaign_aggregates.rebuild_summary_aggregate(campaigns_table)
+        with patch.object(campaign_aggregates, 'SUMMARY_TOP_CANDIDATES', 2):
+            for i, status in enumerate(('active', 'completed', 'completed')):
+                _apply(sessions_table, _record('INSERT', new=_session(f's{i}', status=status, campaign_id=f'c{i}')))
+
+        top = self._summary(campaigns_table)['topCampaigns']
+        # 완료율이 가장 낮은 c0이 밀려난다
+        assert sorted(top) == ['c1', 'c2']
+
+    def test_conflicting_top_update_is_retried(self, tables):
+        sessions_table, campaigns_table = tables
+        _apply(sessions_table, _record('INSERT', new=_session('s1')))
+        campaign_aggregates.rebuild_summary_aggregate(campaigns_table)
+        read_top = campaign_aggregates._read_summary_top
+        calls = []
+
+        def racing_read(table):
+            calls.append(1)
+            # 첫 읽기는 CAMPAIGN_ID가 후보가 되기 전 상태를 본다
+            return {} if len(calls) == 1 else read_top(table)
+
+        with patch.object(campaign_aggregates, '_read_summary_top', side_effect=racing_read):
+            _apply(sessions_table, _record('INSERT', new=_session('s2')))
+
+        summary = self._summary(campaigns_table)
+        assert len(calls) == 2
+        assert summary['totalSessions'] == 2
+        assert summary['topCampaigns'][CAMPAIGN_ID]['sessions'] == 2
+
+    def test_exhausted_retries_mark_summary_stale(self, tables):
+        sessions_table, campaigns_table = tables
+        _apply(sessions_table, _record('INSERT', new=_session('s1')))
+        campaign_aggregates.rebuild_summary_aggregate(campaigns_table)
+
+        with patch.object(campaign_aggregates, '_read_summary_top', return_value={}):
+            _apply(sessions_table, _record('INSERT', new=_session('s2')))
+
+        item = campaigns_table.get_item(Key=campaign_aggregates.summary_key())['Item']
+        assert item['totalSessions'] == 2
+        assert 'rebuiltAt' not in item
+        body = json.loads(campaign_analytics.get_campaigns_summary_analytics({}, None)['body'])
+        assert body['stale'] is True
+
+    def test_summary_endpoint_single_get_item(self, tables, caplog):
+        _, campaigns_table = tables
+        campaigns_table.put_item(Item={
+            **campaign_aggregates.summary_key(), 'totalCampaigns': 2, 'campaignStatus:active': 2,
+            'totalSessions': 5, 'completedSessions': 2, 'rebuiltAt': '2025-01-01T00:00:00Z',
+            'topCampaigns': {
+                CAMPAIGN_ID: {'campaignName': 'First', 'sessions': 4, 'completed': 1},
+                'camp-2': {'campaignName': 'Second', 'sessions': 1, 'completed': 1},
+            },
+        })
+
+        with patch.object(campaign_analytics, 'iter_scan') as scan, \
+                patch.object(campaign_analytics, 'batch_get_items') as batch, \
+                patch.object(campaign_analytics, '_session_counts') as count, \
+                caplog.at_level('INFO'):
+            response = campaign_analytics.get_campaigns_summary_analytics({}, None)
+
+        scan.assert_not_called()
+        batch.assert_not_called()
+        count.assert_not_called()
+        body = json.loads(response['body'])
+        assert body['stale'] is False
+        assert body['totalCampaigns'] == 2
+        assert body['overallCompletionRate'] == 40.0
+        assert [c['campaignId'] for c in body['topPerformingCampaigns']] == ['camp-2', CAMPAIGN_ID]
+        assert '"roundTrips": 1' in caplog.text
+
+    def test_summary_endpoint_without_rollup_is_stale(self, tables, caplog):
+        _, campaigns_table = tables
+        stream_handler.update_campaign_summary(_record('INSERT', new=self._campaign('camp-2', 'Second')))
+        campaigns_table.delete_item(Key=campaign_aggregates.summary_key())
+
+        with patch.object(campaign_analytics, 'iter_scan', wraps=campaign_analytics.iter_scan) as scan, \
+                caplog.at_level('INFO'):
+            response = campaign_analytics.get_campaigns_summary_analytics({}, None)
+
+        scan.assert_called_once()
+        body = json.loads(response['body'])
+        assert body['stale'] is True
+        assert body['totalCampaigns'] == 1
+        # 요약 GetItem + 스캔 페이지 수
+        assert '"roundTrips": 2' in caplog.text
+
+    def test_rebuild_removes_deleted_campaigns(self, tables):
+        _, campaigns_table = tables
+        campaigns_table.put_item(Item={
+            **campaign_aggregates.summary_key(), 'totalCampaigns': 2,
+            'topCampaigns': {'gone': {'campaignName': 'Gone', 'sessions': 1, 'completed': 1}},
+        })
+        campaigns_table.put_item(Item={
+            **analytics_key(CAMPAIGN_ID), 'campaignId': CAMPAIGN_ID, 'totalSessions': 1,
+        })
+
+        campaign_aggregates.rebuild_summary_aggregate(campaigns_table)
+
+        summary = self._summary(campaigns_table)
+        assert summary['totalCampaigns'] == 1
+        assert list(summary['topCampaigns']) == [CAMPAIGN_ID]
+
+
+class TestTimeBuckets:
+
+    def _buckets(self, campaigns_table, campaign_id=CAMPAIGN_ID):
+        items = campaigns_table.query(
+            KeyConditionExpression=boto3.dynamodb.conditions.Key('PK').eq(f'CAMPAIGN#{campaign_id}')
+        )['Items']
+        return {
+            item['SK']: {k: v for k, v in item.items() if k not in ('updatedAt', 'PK', 'SK', 'campaignId') and v}
+            for item in items if item['SK'].startswith(('DAY#', 'HOUR#'))
+        }
+
+    def test_session_contributions(self):
+        buckets = campaign_aggregates.session_bucket_contributions(_session(
+            's1', status='completed', created='2025-01-01T23:50:00Z', completed='2025-01-02T00:20:00Z'), hourly=True)
+        assert buckets['DAY#2025-01-01'] == Counter({'created': 1})
+        assert buckets['HOUR#2025-01-01T23'] == Counter({'created': 1})
+        assert buckets['DAY#2025-01-02']['completed'] == 1
+        assert float(buckets['DAY#2025-01-02']['durationSum']) == 30.0
+        assert buckets['HOUR#2025-01-02T00']['durationCount'] == 1
+
+    def test_stream_matches_rebuild(self, tables):
+        sessions_table, campaigns_table = tables
+        s1 = _session('s1', created='2025-01-01T10:00:00Z')
+        s2 = _session('s2', created='2025-01-02T10:00:00Z')
+        s3 = _session('s3', created='2025-01-02T11:00:00Z', campaign_id='camp-2')
+        with patch.object(campaign_aggregates, 'HOURLY_BUCKETS', True):
+            for s in (s1, s2, s3):
+                _apply(sessions_table, _record('INSERT', new=s))
+            s1_done = {**s1, 'status': 'completed', 'completedAt': '2025-01-02T10:30:00Z'}
+            _apply(sessions_table, _record('MODIFY', old=s1, new=s1_done))
+            # s3가 이 캠페인으로 이동
+            s3_moved = {**s3, 'campaignId': CAMPAIGN_ID, 'GSI2PK': f'CAMPAIGN#{CAMPAIGN_ID}'}
+            _apply(sessions_table, _record('MODIFY', old=s3, new=s3_moved))
+            _apply(sessions_table, _record('INSERT', new=_feedback('s1', 4)))
+            _apply(sessions_table, _record('REMOVE', old=s2))
+
+            streamed = self._buckets(campaigns_table)
+            rebuild_campaign_aggregate(sessions_table, campaigns_table, CAMPAIGN_ID)
+            rebuilt = self._buckets(campaigns_table)
+
+        assert streamed == rebuilt
+        assert streamed['DAY#2025-01-01'] == {'created': 1}
+        assert streamed['DAY#2025-01-02']['created'] == 1  # s3 (s2는 삭제)
+        assert streamed['DAY#2025-01-02']['completed'] == 1
+        assert streamed['DAY#2025-01-03'] == {'csatSum': 4, 'csatCount': 1}
+        assert 'HOUR#2025-01-02T10' in streamed
+        # 이동한 세션의 기여는 이전 캠페인 버킷에서 0이 된다
+        assert all(not bucket for bucket in self._buckets(campaigns_table, 'camp-2').values())
+
+    def test_timeseries_endpoint_reads_requested_range(self, tables):
+        sessions_table, campaigns_table = tables
+        for day in range(1, 10):
+            _apply(sessions_table, _record('INSERT', new=_session(
+                f's{day}', status='completed',
+                created=f'2025-01-{day:02d}T00:00:00Z', completed=f'2025-01-{day:02d}T00:10:00Z')))
+        event = {
+            'pathParameters': {'campaignId': CAMPAIGN_ID},
+            'queryStringParameters': {'from': '2025-01-03', 'to': '2025-01-05'},
+        }
+
+        response = campaign_analytics.get_campaign_timeseries(event, None)
+
+        body = json.loads(response['body'])
+        assert [b['bucket'] for b in body['buckets']] == ['2025-01-03', '2025-01-04', '2025-01-05']
+        assert body['buckets'][0] == {
+            'bucket': '2025-01-03', 'createdSessions': 1, 'completedSessions': 1,
+            'averageSessionDuration': 10.0, 'averageCSAT': 0, 'totalCSATResponses': 0,
+        }
+
+    def test_timeseries_validation(self, tables):
+        def call(params):
+            return campaign_analytics.get_campaign_timeseries(
+                {'pathParameters': {'campaignId': CAMPAIGN_ID}, 'queryStringParameters': params}, None)
+
+        assert call({'from': '2025-01-05', 'to': '2025-01-01'})['statusCode'] == 400
+        assert call({'from': 'yesterday'})['statusCode'] == 400
+        assert call({'granularity': 'minute'})['statusCode'] == 400
+        assert call({'from': '2025-01-01', 'to': '2025-03-01', 'granularity': 'hour'})['statusCode'] == 400
+        assert call(None)['statusCode'] == 200
+
+
+class TestSketchMode:
+
+    @pytest.fixture(autouse=True)
+    def sketch_mode(self):
+        with patch.object(campaign_aggregates, 'SKETCHES_ENABLED', True), \
+                patch.object(stream_handler, 'SKETCHES_ENABLED', True):
+            yield
+
+    def test_stream_matches_rebuild(self, tables):
+        sessions_table, campaigns_table = tables
+        s1 = _session('s1', company='Acme', purposes='MIGRATION|COST')
+        s2 = _session('s2', company='Globex', purposes='COST')
+        s3 = _session('s3', company='Acme', purposes='MIGRATION', campaign_id='camp-2')
+        for s in (s1, s2, s3):
+            _apply(sessions_table, _record('INSERT', new=s))
+        s2_changed = {**s2, 'customerInfo': {'name': 'Customer s2', 'company': 'Initech'}}
+        _apply(sessions_table, _record('MODIFY', old=s2, new=s2_changed))
+        s3_moved = {**s3, 'campaignId': CAMPAIGN_ID, 'GSI2PK': f'CAMPAIGN#{CAMPAIGN_ID}'}
+        _apply(sessions_table, _record('MODIFY', old=s3, new=s3_moved))
+
+        aggregate = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert not any(attr.startswith(('company:', 'purpose:')) for attr in aggregate)
+        assert aggregate['sketchVersion'] == 4
+        streamed = aggregate_to_analytics(CAMPAIGN_ID, aggregate)
+        rebuilt = aggregate_to_analytics(CAMPAIGN_ID, rebuild_campaign_aggregate(
+            sessions_table, campaigns_table, CAMPAIGN_ID, dry_run=True))
+
+        expected_companies = [
+            {'company': 'Acme', 'sessionCount': 2}, {'company': 'Initech', 'sessionCount': 1},
+        ]
+        expected_purposes = [{'purpose': 'MIGRATION', 'count': 2}, {'purpose': 'COST', 'count': 2}]
+        for analytics in (streamed, rebuilt):
+            assert analytics['customerCompanies'] == expected_companies
+            assert sorted(analytics['topConsultationPurposes'], key=lambda p: p['purpose']) == \
+                sorted(expected_purposes, key=lambda p: p['purpose'])
+            assert analytics['totalSessions'] == 3
+        # HyperLogLog는 삭제를 반영하지 않으므로 스트림 쪽은 Globex까지 센다 (rebuild로 보정)
+        assert rebuilt['distinctCompanies'] == 2
+        assert streamed['distinctCompanies'] == 3
+
+        moved_from = campaigns_table.get_item(Key=analytics_key('camp-2'))['Item']
+        assert aggregate_to_analytics('camp-2', moved_from)['customerCompanies'] == []
+
+    def test_redelivered_sketch_change_applied_once(self, tables):
+        sessions_table, campaigns_table = tables
+        s1 = _session('s1', company='Acme')
+        _apply(sessions_table, _record('INSERT', new=s1, event_id='evt-1'))
+        # 고객사만 바뀌면 ADD할 증감분 없이 스케치만 갱신된다
+        change = _record('MODIFY', old=s1, new={**s1, 'customerInfo': {'name': 'c', 'company': 'Globex'}},
+                         event_id='evt-2')
+        _apply(sessions_table, change)
+        stream_handler.update_campaign_analytics(change)
+
+        aggregate = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert aggregate['sketchVersion'] == 2
+        assert aggregate_to_analytics(CAMPAIGN_ID, aggregate)['customerCompanies'] == [
+            {'company': 'Globex', 'sessionCount': 1},
+        ]
+
+    def _apply_sketch(self, campaigns_table, removed=None, added=None, event_id=None):
+        return campaign_aggregates.apply_session_aggregate_updates(
+            campaigns_table, event_id, [], [(CAMPAIGN_ID, removed, added)])
+
+    def test_irrelevant_modify_skips_sketch_write(self, tables):
+        _, campaigns_table = tables
+        s1 = _session('s1')
+        with patch.object(campaigns_table, 'get_item') as get_item, \
+                patch.object(campaign_aggregates, 'apply_stream_updates', return_value=True) as apply:
+            self._apply_sketch(campaigns_table, s1, {**s1, 'status': 'completed'}, event_id='evt-1')
+        get_item.assert_not_called()
+        assert apply.call_args.args[2] == [None]
+
+    def test_sketch_write_shares_marker_transaction(self, tables):
+        _, campaigns_table = tables
+        with patch.object(campaigns_table, 'update_item') as update_item:
+            self._apply_sketch(campaigns_table, added=_session('s1'), event_id='evt-1')
+            # 재전달된 레코드는 마커 조건에 걸려 스케치도 다시 쓰지 않는다
+            assert not self._apply_sketch(campaigns_table, added=_session('s1'), event_id='evt-1')
+        update_item.assert_not_called()
+
+        item = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert item['sketchVersion'] == 1
+        assert campaigns_table.get_item(Key={'PK': 'STREAM_EVENT#evt-1', 'SK': 'APPLIED'}).get('Item')
+
+    def test_conflicting_write_is_retried(self, tables):
+        _, campaigns_table = tables
+        self._apply_sketch(campaigns_table, added=_session('s1'))
+        real_get = campaigns_table.get_item
+        calls = []
+
+        def racing_get(**kwargs):
+            item = real_get(**kwargs)
+            calls.append(kwargs)
+            if len(calls) == 1:
+                # 첫 읽기 직후 다른 소비자가 먼저 갱신
+                self._apply_sketch(campaigns_table, added=_session('s2'))
+            return item
+
+        with patch.object(campaigns_table, 'get_item', side_effect=racing_get):
+            assert self._apply_sketch(campaigns_table, added=_session('s3', company='Globex'))
+        assert len(calls) == 3  # 첫 시도, 경합한 갱신, 재시도
+
+        item = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert item['sketchVersion'] == 3
+        assert aggregate_to_analytics(CAMPAIGN_ID, item)['customerCompanies'] == [
+            {'company': 'Acme', 'sessionCount': 2}, {'company': 'Globex', 'sessionCount': 1},
+        ]
+
+    def test_exhausted_retries_mark_aggregate_stale(self, tables):
+        sessions_table, campaigns_table = tables
+        self._apply_sketch(campaigns_table, added=_session('s1'))
+
+        # 항상 스케치가 없던 상태를 읽으면 sketchVersion 조건이 계속 실패한다
+        with patch.object(campaign_aggregates, '_read_campaign_state', return_value={}):
+            _apply(sessions_table, _record('INSERT', new=_session('s2'), event_id='evt-2'))
+
+        item = campaigns_table.get_item(Key=analytics_key(CAMPAIGN_ID))['Item']
+        assert item['totalSessions'] == 1
+        assert item['sketchVersion'] == 1
+        assert item['staleAt']
+
+
+class TestCsatFeed:
+
+    def _submit(self, sessions_table, session, rating, text='good'):
+        sessions_table.put_item(Item=session)
+        event = {
+            'pathParameters': {'sessionId': session['sessionId']},
+            'body': json.dumps({'rating': rating, 'feedback': text}),
+        }
+        with patch.object(chat_handler, 'verify_csrf_token', return_value=True), \
+                patch.object(chat_handler, 'validate_session_id', return_value=True):
+            return chat_handler.handle_feedback(event, None)
+
+    def _feed(self, **params):
+        event = {'pathParameters': {'campaignId': CAMPAIGN_ID}, 'queryStringParameters': params or None}
+        response = campaign_analytics.get_campaign_csat_feed(event, None)
+        return response['statusCode'], json.loads(response['body'])
+
+    def test_feedback_submission_writes_feed_item(self, tables):
+        sessions_table, campaigns_table = tables
+        session = _session('s1', status='completed', completed='2025-01-02T00:00:00Z')
+        assert self._submit(sessions_table, session, 4.5, 'great')['statusCode'] == 200
+        # 재제출은 같은 피드 아이템을 덮어쓴다
+        assert self._submit(sessions_table, session, 3, 'fine')['statusCode'] == 200
+
+        status, body = self._feed()
+        assert status == 200
+        assert body['nextToken'] is None
+        assert len(body['feedback']) == 1
+        entry = body['feedback'][0]
+        assert entry['rating'] == 3.0
+        assert entry['narrative'] == 'fine'
+        assert entry['customerCompany'] == 'Acme'
+        assert entry['completedAt'] == '2025-01-02T00:00:00Z'
+
+        rebuild_campaign_aggregate(sessions_table, campaigns_table, CAMPAIGN_ID)
+        assert self._feed()[1]['feedback'] == body['feedback']
+
+    def test_resubmit_after_completion_keeps_one_entry(self, tables):
+        sessions_table, campaigns_table = tables
+        session = _session('s1')
+        self._submit(sessions_table, session, 2, 'waiting')
+        # 세션이 완료되어 피드 키(완료 시각)가 바뀐 뒤 재제출
+        self._submit(sessions_table, {**session, 'status': 'completed', 'completedAt': '2025-01-03T00:00:00Z'}, 5)
+
+        _, body = self._feed()
+        assert [(entry['rating'], entry['completedAt']) for entry in body['feedback']] == [
+            (5.0, '2025-01-03T00:00:00Z'),
+        ]
+        feedback = sessions_table.get_item(Key={'PK': 'SESSION#s1', 'SK': 'FEEDBACK'})['Item']
+        assert feedback['csatFeedSK'] == 'CSAT#2025-01-03T00:00:00Z#s1'
+
+    def test_pages_newest_first_with_rating_filter(self, tables):
+        sessions_table, _ = tables
+        for day in range(1, 8):
+            session = _session(f's{day}', status='completed', completed=f'2025-01-{day:02d}T00:00:00Z')
+            self._submit(sessions_table, session, 5 if day % 2 else 2)
+
+        seen = []
+        token = None
+        while True:
+            params = {'limit': '3'}
+            if token:
+                params['nextToken'] = token
+            status, body = self._feed(**params)
+            assert status == 200
+            assert len(body['feedback']) <= 3
+            seen.extend(entry['sessionId'] for entry in body['feedback'])
+            token = body['nextToken']
+            if not token:
+                break
+        assert seen == [f's{day}' for day in range(7, 0, -1)]
+
+        _, low = self._feed(maxRating='3')
+        assert [entry['sessionId'] for entry in low['feedback']] == ['s6', 's4', 's2']
+
+    def test_validation(self, tables):
+        assert self._feed(minRating='4', maxRating='2')[0] == 400
+        assert self._feed(minRating='high')[0] == 400
+        assert self._feed(nextToken='not-a-token')[0] == 400
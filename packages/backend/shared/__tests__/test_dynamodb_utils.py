@@ -0,0 +1,201 @@
+"""dynamodb_utils 단위 테스트
+
+batch_get_items: 100개 단위 분할, 중복 키 제거, UnprocessedKeys 재시도, 배치 동시 요청
+iter_query / iter_scan: LastEvaluatedKey 페이지 추적, ProjectionExpression, 병렬 세그먼트 스캔
+"""
+
+import os
+import sys
+
+# shared 모듈 경로 추가
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), '..'
+    ),
+)
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import dynamodb_utils
+from dynamodb_utils import batch_get_items, iter_query, iter_scan
+
+TABLE = 'test-table'
+
+
+def _key(i):
+    return {'PK': f'CAMPAIGN#{i}', 'SK': 'METADATA'}
+
+
+def _echo_batch_get(RequestItems):
+    """요청한 키를 그대로 아이템으로 돌려주는 fake BatchGetItem"""
+    keys = RequestItems[TABLE]['Keys']
+    return {'Responses': {TABLE: [dict(k) for k in keys]}, 'UnprocessedKeys': {}}
+
+
+class TestBatchGetItems:
+
+    def test_chunks_by_100_keys(self):
+        fake = MagicMock()
+        fake.batch_get_item.side_effect = _echo_batch_get
+        stats = {}
+        with patch.object(dynamodb_utils, 'dynamodb', fake):
+            items = batch_get_items(TABLE, [_key(i) for i in range(250)], stats=stats)
+
+        assert len(items) == 250
+        assert fake.batch_get_item.call_count == 3
+        assert stats['requests'] == 3
+        sizes = [len(c.kwargs['RequestItems'][TABLE]['Keys']) for c in fake.batch_get_item.call_args_list]
+        assert sizes == [100, 100, 50]
+
+    def test_duplicate_keys_removed(self):
+        fake = MagicMock()
+        fake.batch_get_item.side_effect = _echo_batch_get
+        with patch.object(dynamodb_utils, 'dynamodb', fake):
+            items = batch_get_items(TABLE, [_key(1), _key(1), _key(2)])
+
+        assert len(items) == 2
+        assert fake.batch_get_item.call_count == 1
+
+    def test_projection_passed_through(self):
+        fake = MagicMock()
+        fake.batch_get_item.side_effect = _echo_batch_get
+        with patch.object(dynamodb_utils, 'dynamodb', fake):
+            batch_get_items(
+                TABLE, [_key(1)],
+                projection_expression='PK, #status',
+                expression_attribute_names={'#status': 'status'},
+            )
+
+        request = fake.batch_get_item.call_args.kwargs['RequestItems'][TABLE]
+        assert request['ProjectionExpression'] == 'PK, #status'
+        assert request['ExpressionAttributeNames'] == {'#status': 'status'}
+
+    def test_unprocessed_keys_retried(self):
+        fake = MagicMock()
+        fake.batch_get_item.side_effect = [
+            {
+                'Responses': {TABLE: [_key(1)]},
+                'UnprocessedKeys': {TABLE: {'Keys': [_key(2)]}},
+            },
+            {'Responses': {TABLE: [_key(2)]}, 'UnprocessedKeys': {}},
+        ]
+        with patch.object(dynamodb_utils, 'dynamodb', fake), patch.object(dynamodb_utils.time, 'sleep'):
+            items = batch_get_items(TABLE, [_key(1), _key(2)])
+
+        assert items == [_key(1), _key(2)]
+        assert fake.batch_get_item.call_count == 2
+
+    def test_gives_up_after_max_retries(self):
+        fake = MagicMock()
+        fake.batch_get_item.return_value = {
+            'Responses': {TABLE: []},
+            'UnprocessedKeys': {TABLE: {'Keys': [_key(1)]}},
+        }
+        with patch.object(dynamodb_utils, 'dynamodb', fake), patch.object(dynamodb_utils.time, 'sleep'):
+            with pytest.raises(RuntimeError):
+                batch_get_items(TABLE, [_key(1)], max_retries=2)
+
+        assert fake.batch_get_item.call_count == 3
+
+    def test_concurrent_batches(self):
+        fake = MagicMock()
+        fake.batch_get_item.side_effect = _echo_batch_get
+        stats = {}
+        with patch.object(dynamodb_utils, 'dynamodb', fake):
+            items = batch_get_items(TABLE, [_key(i) for i in range(350)], stats=stats, max_workers=4)
+
+        assert sorted(item['PK'] for item in items) == sorted(_key(i)['PK'] for i in range(350))
+        assert stats['requests'] == 4
+
+    def test_empty_keys(self):
+        fake = MagicMock()
+        with patch.object(dynamodb_utils, 'dynamodb', fake):
+            assert batch_get_items(TABLE, []) == []
+        fake.batch_get_item.assert_not_called()
+
+
+def _paged(items, page_size):
+    """ExclusiveStartKey(인덱스)를 따라 page_size씩 돌려주는 fake Query/Scan"""
+    def operation(**kwargs):
+        start = kwargs.get('ExclusiveStartKey', {}).get('i', 0)
+        resp = {'Items': items[start:start + page_size]}
+        if start + page_size < len(items):
+            resp['LastEvaluatedKey'] = {'i': start + page_size}
+        return resp
+    return operation
+
+
+class TestIterQuery:
+
+    def test_follows_last_evaluated_key(self):
+        table = MagicMock()
+        table.query.side_effect = _paged([{'n': i} for i in range(25)], 10)
+        stats = {}
+
+        items = list(iter_query(table, stats=stats, IndexName='GSI2', KeyConditionExpression='GSI2PK = :pk'))
+
+        assert [item['n'] for item in items] == list(range(25))
+        assert table.query.call_count == 3
+        assert stats['requests'] == 3
+        assert table.query.call_args_list[2].kwargs['ExclusiveStartKey'] == {'i': 20}
+
+    def test_lazy_until_consumed(self):
+        table = MagicMock()
+        table.query.side_effect = _paged([{'n': i} for i in range(25)], 10)
+
+        items = iter_query(table)
+        assert table.query.call_count == 0
+        next(items)
+        assert table.query.call_count == 1
+
+    def test_projection_merges_attribute_names(self):
+        table = MagicMock()
+        table.query.return_value = {'Items': []}
+
+        list(iter_query(
+            table,
+            projection_expression='#status',
+            expression_attribute_names={'#status': 'status'},
+            ExpressionAttributeNames={'#pk': 'GSI2PK'},
+        ))
+
+        kwargs = table.query.call_args.kwargs
+        assert kwargs['ProjectionExpression'] == '#status'
+        assert kwargs['ExpressionAttributeNames'] == {'#pk': 'GSI2PK', '#status': 'status'}
+
+
+class TestIterScan:
+
+    def test_sequential_scan(self):
+        table = MagicMock()
+        table.scan.side_effect = _paged([{'n': i} for i in range(5)], 2)
+
+        assert [item['n'] for item in iter_scan(table)] == list(range(5))
+        assert 'Segment' not in table.scan.call_args.kwargs
+
+    def test_parallel_segments(self):
+        segment_items = {s: [{'segment': s, 'n': i} for i in range(7)] for s in range(3)}
+
+        def scan(**kwargs):
+            assert kwargs['TotalSegments'] == 3
+            return _paged(segment_items[kwargs['Segment']], 3)(**kwargs)
+
+        table = MagicMock()
+        table.scan.side_effect = scan
+        stats = {}
+
+        items = list(iter_scan(table, segments=3, stats=stats))
+
+        assert sorted((i['segment'], i['n']) for i in items) == [(s, n) for s in range(3) for n in range(7)]
+        assert stats['requests'] == 9
+
+    def test_segment_error_propagates(self):
+        table = MagicMock()
+        table.scan.side_effect = RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            list(iter_scan(table, segments=2))
@@ -0,0 +1,94 @@
+"""utils 페이지네이션 헬퍼 단위 테스트
+
+관리자 세션 목록 커서 페이지네이션에 사용되는
+encode/decode_pagination_token, parse_page_size, session_list_index_keys 검증
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+# shared 모듈 경로 추가
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), '..'
+    ),
+)
+
+import pytest
+from utils import (
+    SESSION_LIST_PK,
+    decode_pagination_token,
+    encode_pagination_token,
+    parse_page_size,
+    session_list_index_keys,
+    shift_month,
+)
+
+
+class TestPaginationToken:
+    """nextToken 인코딩/디코딩 테스트"""
+
+    def test_round_trip(self):
+        key = {
+            'PK': 'SESSION#abc',
+            'SK': 'METADATA',
+            'GSI4PK': f'{SESSION_LIST_PK}#2025-01',
+            'GSI4SK': 'SESSION#2025-01-01T00:00:00+00:00',
+        }
+        token = encode_pagination_token(key)
+        assert isinstance(token, str)
+        assert decode_pagination_token(token) == key
+
+    def test_decimal_values_serialized(self):
+        token = encode_pagination_token({'PK': 'X', 'count': Decimal('3')})
+        assert decode_pagination_token(token) == {'PK': 'X', 'count': 3}
+
+    def test_empty_key_returns_none(self):
+        assert encode_pagination_token(None) is None
+        assert encode_pagination_token({}) is None
+
+    def test_empty_token_returns_none(self):
+        assert decode_pagination_token(None) is None
+        assert decode_pagination_token('') is None
+
+    @pytest.mark.parametrize('token', ['not-base64!!', 'bm90LWpzb24', 'W10=', 'e30='])
+    def test_invalid_token_raises(self, token):
+        with pytest.raises(ValueError):
+            decode_pagination_token(token)
+
+
+class TestParsePageSize:
+    """limit 파라미터 파싱 테스트"""
+
+    def test_default(self):
+        assert parse_page_size(None) == 50
+        assert parse_page_size('') == 50
+
+    def test_clamped_to_range(self):
+        assert parse_page_size('500', maximum=100) == 100
+        assert parse_page_size('0') == 1
+        assert parse_page_size('-3') == 1
+
+    def test_invalid_falls_back_to_default(self):
+        assert parse_page_size('abc', default=20) == 20
+
+
+class TestSessionListIndexKeys:
+
+    def test_keys(self):
+        keys = session_list_index_keys('2025-01-01T00:00:00+00:00')
+        assert keys == {
+            'GSI4PK': f'{SESSION_LIST_PK}#2025-01',
+            'GSI4SK': 'SESSION#2025-01-01T00:00:00+00:00',
+        }
+
+    @pytest.mark.parametrize('shard, months, expected', [
+        ('2025-01', -1, '2024-12'),
+        ('2024-12', 1, '2025-01'),
+        ('2025-06', 0, '2025-06'),
+        ('2025-03', -15, '2023-12'),
+    ])
+    def test_shift_month(self, shard, months, expected):
+        assert shift_month(shard, months) == expected
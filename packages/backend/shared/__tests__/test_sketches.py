@@ -0,0 +1,124 @@
+"""근사 집계 스케치(HyperLogLog / Count-Min / Space-Saving) 단위 테스트
+
+- 설정한 오차 범위 안의 추정
+- 음수 증감, merge, 직렬화 왕복
+"""
+
+import os
+import sys
+from collections import Counter
+
+# shared 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from sketches import CountMinSketch, HyperLogLog, SpaceSaving
+
+
+def _zipf_stream(keys: int, total: int) -> list[str]:
+    """상위 키에 빈도가 몰린 결정적 스트림"""
+    weights = [1 / (rank + 1) for rank in range(keys)]
+    scale = total / sum(weights)
+    stream = []
+    for rank, weight in enumerate(weights):
+        stream.extend([f'key-{rank}'] * max(int(weight * scale), 1))
+    return stream
+
+
+class TestHyperLogLog:
+
+    def test_precision_from_error(self):
+        assert HyperLogLog.from_error(0.02).precision == 12
+        assert HyperLogLog.from_error(0.005).precision == 16
+
+    @pytest.mark.parametrize('cardinality', [10, 1000, 50000])
+    def test_estimate_within_error(self, cardinality):
+        hll = HyperLogLog(12)
+        for i in range(cardinality):
+            hll.add(f'company-{i}')
+            hll.add(f'company-{i}')  # 중복은 세지 않는다
+        # 표준 오차 약 1.6%, 3 시그마 허용
+        assert abs(hll.estimate() - cardinality) <= max(cardinality * 0.05, 1)
+
+    def test_merge_and_round_trip(self):
+        a, b = HyperLogLog(10), HyperLogLog(10)
+        for i in range(3000):
+            a.add(f'c-{i}')
+        for i in range(2000, 5000):
+            b.add(f'c-{i}')
+        a.merge(b)
+        restored = HyperLogLog(10, a.to_bytes())
+        assert restored.estimate() == a.estimate()
+        assert abs(a.estimate() - 5000) <= 5000 * 0.1
+
+    def test_merge_rejects_other_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestCountMinSketch:
+
+    def test_dimensions_from_error(self):
+        cms = CountMinSketch.from_error(0.01, 0.01)
+        assert (cms.width, cms.depth) == (272, 5)
+
+    def test_estimates_never_undercount_and_stay_within_epsilon(self):
+        cms = CountMinSketch.from_error(0.01, 0.01)
+        stream = _zipf_stream(2000, 50000)
+        truth = Counter(stream)
+        for key in stream:
+            cms.add(key)
+        assert cms.total == len(stream)
+        for key, count in truth.items():
+            estimate = cms.estimate(key)
+            assert estimate >= count
+            assert estimate - count <= 0.01 * len(stream) * 2
+
+    def test_decrement(self):
+        cms = CountMinSketch(64, 4)
+        cms.add('a', 5)
+        cms.add('a', -2)
+        assert cms.estimate('a') == 3
+        assert cms.total == 3
+
+    def test_merge_and_round_trip(self):
+        a, b = CountMinSketch(64, 4), CountMinSketch(64, 4)
+        a.add('x', 3)
+        b.add('x', 4)
+        a.merge(b)
+        restored = CountMinSketch(64, 4, a.to_bytes())
+        assert restored.estimate('x') == 7
+        assert restored.total == 7
+
+
+class TestSpaceSaving:
+
+    def test_heavy_hitters_are_tracked(self):
+        stream = _zipf_stream(5000, 50000)
+        ss = SpaceSaving(capacity=100)
+        for key in stream:
+            ss.add(key)
+        truth = Counter(stream)
+        threshold = len(stream) / 100
+        heavy = {key for key, count in truth.items() if count > threshold}
+        assert heavy and heavy <= set(ss.candidates())
+
+    def test_remove_drops_exhausted_keys(self):
+        ss = SpaceSaving(capacity=2)
+        ss.add('a', 2)
+        ss.remove('a')
+        assert ss.to_dict() == {'a': [1, 0]}
+        ss.remove('a')
+        assert ss.candidates() == []
+
+    def test_merge_keeps_capacity(self):
+        a, b = SpaceSaving(capacity=3), SpaceSaving(capacity=3)
+        for key, count in {'a': 10, 'b': 5, 'c': 1}.items():
+            a.add(key, count)
+        for key, count in {'a': 2, 'd': 8, 'e': 1}.items():
+            b.add(key, count)
+        a.merge(b)
+        restored = SpaceSaving(3, a.to_dict())
+        assert set(restored.candidates()) == {'a', 'd', 'b'}
+        assert restored.counters['a'][0] == 12
@@ -0,0 +1,152 @@
+"""SlackTriggerExecutor 연결 재사용/속도 제한/회로 차단 단위 테스트"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import requests
+
+# shared 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, KeyedCircuitBreaker  # noqa: E402
+from rate_limiter import KeyedRateLimiter  # noqa: E402
+from triggers.slack_trigger import SlackTriggerExecutor  # noqa: E402
+
+URL = 'https://hooks.slack.com/triggers/T000/1'
+OTHER_URL = 'https://hooks.slack.com/triggers/T000/2'
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status_code, headers=None):
+    return MagicMock(status_code=status_code, text='', headers=headers or {})
+
+
+def _executor(clock, responses, rate=100, burst=100, threshold=3, cooldown=30):
+    executor = SlackTriggerExecutor(
+        timeout=1,
+        rate_limiter=KeyedRateLimiter(rate, burst, clock=clock),
+        circuit_breaker=KeyedCircuitBreaker(threshold, cooldown, clock=clock),
+        max_wait_seconds=0,
+    )
+    session = MagicMock()
+    session.post.side_effect = responses
+    patcher = patch.object(executor, '_session', return_value=session)
+    patcher.start()
+    return executor, session, patcher
+
+
+class TestSessions:
+
+    def test_one_pooled_session_per_host(self):
+        executor = SlackTriggerExecutor()
+        first = executor._session(URL)
+        assert executor._session(OTHER_URL) is first
+        assert executor._session('https://example.com/hook') is not first
+        assert executor.stats()['sessions'] == 2
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures_and_recovers(self):
+        clock = _Clock()
+        responses = [_response(500)] * 3 + [_response(200)]
+        executor, session, patcher = _executor(clock, responses)
+        try:
+            assert [executor.execute(URL, {}) for _ in range(3)] == [False] * 3
+            assert executor.circuit_breaker.state(URL) == OPEN
+
+            # 쿨다운 동안은 호출하지 않는다
+            assert executor.execute(URL, {}) is False
+            assert session.post.call_count == 3
+
+            clock.now += 30
+            assert executor.circuit_breaker.state(URL) == HALF_OPEN
+            assert executor.execute(URL, {}) is True
+            assert executor.circuit_breaker.state(URL) == CLOSED
+        finally:
+            patcher.stop()
+
+        stats = executor.stats()
+        assert (stats['sent'], stats['succeeded'], stats['failed'], stats['shortCircuited']) == (4, 1, 3, 1)
+        assert stats['circuits']['opened'] == 1
+
+    def test_half_open_allows_single_probe(self):
+        clock = _Clock()
+        breaker = KeyedCircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=clock)
+        breaker.record_failure(URL)
+        clock.now += 10
+        assert breaker.allow(URL) is True
+        assert breaker.allow(URL) is False
+        breaker.record_failure(URL)
+        assert breaker.state(URL) == OPEN
+
+    def test_timeouts_count_as_failures(self):
+        clock = _Clock()
+        executor, _, patcher = _executor(clock, requests.Timeout(), threshold=1)
+        try:
+            assert executor.execute(URL, {}) is False
+        finally:
+            patcher.stop()
+        assert executor.circuit_breaker.state(URL) == OPEN
+
+    def test_429_opens_for_retry_after(self):
+        clock = _Clock()
+        executor, _, patcher = _executor(clock, [_response(429, {'Retry-After': '7'}), _response(200)])
+        try:
+            assert executor.execute(URL, {}) is False
+            assert executor.circuit_breaker.state(URL) == OPEN
+            clock.now += 7
+            assert executor.execute(URL, {}) is True
+        finally:
+            patcher.stop()
+
+    def test_endpoints_are_isolated(self):
+        clock = _Clock()
+        executor, _, patcher = _executor(clock, [_response(500), _response(200)], threshold=1)
+        try:
+            assert executor.execute(URL, {}) is False
+            assert executor.execute(OTHER_URL, {}) is True
+        finally:
+            patcher.stop()
+
+
+class TestRateLimit:
+
+    def test_over_limit_calls_are_skipped(self):
+        clock = _Clock()
+        executor, session, patcher = _executor(clock, [_response(200)] * 5, rate=1, burst=2)
+        try:
+            assert [executor.execute(URL, {}) for _ in range(3)] == [True, True, False]
+            assert executor.execute(OTHER_URL, {}) is True
+            clock.now += 1
+            assert executor.execute(URL, {}) is True
+        finally:
+            patcher.stop()
+
+        assert session.post.call_count == 4
+        assert executor.stats()['rateLimited'] == 1
+
+    def test_short_wait_is_absorbed(self):
+        clock = _Clock()
+        executor, session, patcher = _executor(clock, [_response(200)] * 2, rate=10, burst=1)
+        executor.max_wait_seconds = 1
+
+        def sleep(seconds):
+            clock.now += seconds
+
+        try:
+            with patch('triggers.slack_trigger.time.sleep', side_effect=sleep) as sleeper:
+                assert executor.execute(URL, {}) is True
+                assert executor.execute(URL, {}) is True
+        finally:
+            patcher.stop()
+        assert sleeper.call_count == 1
+        assert session.post.call_count == 2
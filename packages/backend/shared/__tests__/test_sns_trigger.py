@@ -0,0 +1,164 @@
+"""SNS 배치 발행 단위 테스트
+
+- SNSTriggerExecutor.publish_batch: Topic별 그룹화, 10건 단위 PublishBatch (moto)
+- 부분 실패: 발신자 오류가 아닌 항목만 한 번 재시도, 항목별 결과
+- TriggerManager.sns_batch(): 스트림 배치 동안 모았다가 성공 시에만 한 번에 발행, 실패 항목은 아웃박스로
+  (아웃박스가 없거나 넣지 못하면 레코드 ID를 돌려준다)
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+# shared 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from models.trigger import Trigger  # noqa: E402
+from trigger_manager import TriggerManager  # noqa: E402
+from trigger_outbox import LocalQueue, TriggerOutbox  # noqa: E402
+from triggers.sns_trigger import SNSTriggerExecutor  # noqa: E402
+
+TOPIC_A = 'arn:aws:sns:ap-northeast-2:123456789012:topic-a'
+TOPIC_B = 'arn:aws:sns:ap-northeast-2:123456789012:topic-b'
+
+
+def _sns_trigger(trigger_id, topic_arn):
+    return Trigger(trigger_id=trigger_id, trigger_type='sns', event_type='SessionInactivated',
+                   delivery_endpoint=topic_arn, is_global=True)
+
+
+class TestPublishBatch:
+
+    @mock_aws
+    def test_groups_by_topic_in_batches_of_ten(self):
+        executor = SNSTriggerExecutor()
+        topic_a = executor.sns.create_topic(Name='topic-a')['TopicArn']
+        topic_b = executor.sns.create_topic(Name='topic-b')['TopicArn']
+        entries = [(topic_a if i % 3 else topic_b, {'event_type': 'SessionInactivated', 'i': i}) for i in range(30)]
+
+        with patch.object(executor.sns, 'publish_batch', wraps=executor.sns.publish_batch) as publish_batch, \
+                patch.object(executor.sns, 'publish') as publish:
+            results = executor.publish_batch(entries)
+
+        assert results == [True] * 30
+        publish.assert_not_called()
+        # topic-a 20건 -> 2회, topic-b 10건 -> 1회
+        assert publish_batch.call_count == 3
+        assert {call.kwargs['TopicArn'] for call in publish_batch.call_args_list} == {topic_a, topic_b}
+        assert all(len(call.kwargs['PublishBatchRequestEntries']) <= 10 for call in publish_batch.call_args_list)
+
+    def test_partial_failure_retries_only_service_faults(self):
+        executor = SNSTriggerExecutor()
+        executor.sns = MagicMock()
+        executor.sns.publish_batch.side_effect = [
+            {
+                'Successful': [{'Id': '0', 'MessageId': 'm0'}],
+                'Failed': [
+                    {'Id': '1', 'Code': 'InternalError', 'SenderFault': False},
+                    {'Id': '2', 'Code': 'InvalidParameter', 'SenderFault': True},
+                ],
+            },
+            {'Successful': [{'Id': '1', 'MessageId': 'm1'}], 'Failed': []},
+        ]
+
+        results = executor.publish_batch([(TOPIC_A, {'i': i}) for i in range(3)])
+
+        assert results == [True, True, False]
+        retry_entries = executor.sns.publish_batch.call_args_list[1].kwargs['PublishBatchRequestEntries']
+        assert [entry['Id'] for entry in retry_entries] == ['1']
+
+    def test_call_error_marks_chunk_failed(self):
+        executor = SNSTriggerExecutor()
+        executor.sns = MagicMock()
+        executor.sns.publish_batch.side_effect = [RuntimeError('throttled'), {'Successful': [{'Id': '1'}]}]
+
+        assert executor.publish_batch([(TOPIC_A, {}), (TOPIC_B, {})]) == [False, True]
+
+
+class TestManagerSnsBatch:
+
+    def _manager(self, triggers, publish_results=None, outbox=None):
+        manager = TriggerManager(outbox=outbox, sns_batching=True)
+        sns = MagicMock()
+        sns.publish_batch.side_effect = lambda entries: (publish_results or [True] * len(entries))
+        manager._executors['sns'] = sns
+        patcher = patch.object(manager, 'get_triggers_for_event', return_value=triggers)
+        patcher.start()
+        return manager, sns, patcher
+
+    def test_sns_triggers_are_published_once_per_batch(self):
+        triggers = [_sns_trigger('a', TOPIC_A), _sns_trigger('b', TOPIC_B)]
+        manager, sns, patcher = self._manager(triggers)
+        try:
+            with manager.sns_batch():
+                for i in range(5):
+                    summary = manager.execute_triggers('SessionInactivated', {'session_id': f's{i}', 'x': ''})
+                    assert summary['batched'] == 2
+                sns.publish_batch.assert_not_called()
+        finally:
+            patcher.stop()
+
+        sns.execute.assert_not_called()
+        [entries] = sns.publish_batch.call_args.args
+        assert len(entries) == 10
+        assert entries[0] == (TOPIC_A, {'session_id': 's0', 'x': 'None'})
+
+    def test_failed_entries_fall_back_to_outbox(self):
+        queue = LocalQueue()
+        triggers = [_sns_trigger('a', TOPIC_A), _sns_trigger('b', TOPIC_B)]
+        manager, _, patcher = self._manager(triggers, publish_results=[True, False], outbox=TriggerOutbox(queue))
+        try:
+            with manager.sns_batch():
+                manager.execute_triggers('SessionInactivated', {'session_id': 's1'}, 'camp-1')
+        finally:
+            patcher.stop()
+
+        [message] = queue.bodies()
+        assert (message['triggerId'], message['campaignId']) == ('b', 'camp-1')
+
+    def test_failed_batch_is_not_published(self):
+        manager, sns, patcher = self._manager([_sns_trigger('a', TOPIC_A)])
+        try:
+            with pytest.raises(RuntimeError):
+                with manager.sns_batch():
+                    manager.execute_triggers('SessionInactivated', {'session_id': 's1'})
+                    raise RuntimeError('stream record failed')
+        finally:
+            patcher.stop()
+
+        # Lambda가 배치를 다시 전달하면 그때 다시 모아 발행한다
+        sns.publish_batch.assert_not_called()
+        assert manager._sns_buffer is None
+
+    def test_unsent_entries_report_their_records(self):
+        triggers = [_sns_trigger('a', TOPIC_A)]
+        manager, _, patcher = self._manager(triggers, publish_results=[True, False])
+        try:
+            with manager.sns_batch() as failed_records:
+                for seq in ('100', '200'):
+                    manager.sns_record(seq)
+                    manager.execute_triggers('SessionInactivated', {'session_id': seq})
+        finally:
+            patcher.stop()
+
+        assert failed_records == ['200']
+
+    def test_disabled_batching_publishes_directly(self):
+        manager = TriggerManager(sns_batching=False)
+        sns = MagicMock()
+        sns.execute.return_value = True
+        manager._executors['sns'] = sns
+        with patch.object(manager, 'get_triggers_for_event', return_value=[_sns_trigger('a', TOPIC_A)]):
+            with manager.sns_batch():
+                summary = manager.execute_triggers('SessionInactivated', {})
+
+        assert summary['succeeded'] == 1
+        sns.publish_batch.assert_not_called()
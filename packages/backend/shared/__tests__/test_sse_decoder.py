@@ -0,0 +1,148 @@
+"""SSE 증분 디코더 및 AgentCoreClient._parse_sse_stream 단위 테스트
+
+- 버퍼 경계(라인, CRLF, UTF-8 멀티바이트)에 무관한 이벤트 조립
+- 줄 끝은 CRLF/CR/LF만 인식 (\u2028 등은 data 값에 유지)
+- 여러 줄 data:, event:/id: 필드, 주석 라인
+- AgentCore 이벤트 이중 인코딩 해제
+- read1() 우선 읽기
+"""
+
+import json
+import os
+import sys
+
+# shared 모듈 경로 추가
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), '..'
+    ),
+)
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import pytest
+
+from agent_runtime import AgentCoreClient
+from sse_decoder import SSEEvent, decode_agent_event, iter_raw_chunks, iter_sse_events
+
+
+def _split(data: bytes, size: int) -> list[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _stream_bytes(events: list[dict]) -> bytes:
+    return ''.join(f'data: {json.dumps(e, ensure_ascii=False)}\n\n' for e in events).encode('utf-8')
+
+
+class TestIterSseEvents:
+
+    @pytest.mark.parametrize('size', [1, 3, 7, 64, 4096])
+    def test_events_independent_of_chunk_boundaries(self, size):
+        events = [
+            {'type': 'chunk', 'content': '안녕하세요 '},
+            {'type': 'chunk', 'content': 'world'},
+            {'type': 'result', 'message': 'done'},
+        ]
+        raw = _stream_bytes(events).replace(b'\n', b'\r\n')
+
+        parsed = [json.loads(e.data) for e in iter_sse_events(_split(raw, size))]
+        assert parsed == events
+
+    def test_multiline_data_event_and_id(self):
+        raw = (
+            b': keep-alive\n'
+            b'event: tool\n'
+            b'id: 7\n'
+            b'data: line1\n'
+            b'data:line2\n'
+            b'\n'
+            b'data: next\n'
+            b'\n'
+        )
+        assert list(iter_sse_events([raw])) == [
+            SSEEvent('line1\nline2', 'tool', '7'),
+            SSEEvent('next', 'message', '7'),
+        ]
+
+    @pytest.mark.parametrize('size', [1, 5, 4096])
+    def test_only_cr_lf_split_lines(self, size):
+        # \u2028, \x85, \x0c 등은 줄 끝이 아니라 data 값의 일부
+        content = 'a\u2028b\x85c\x0cd\x1ee'
+        raw = f'data: {content}\r\ndata: x\rdata: y\n\r\n'.encode('utf-8')
+        assert list(iter_sse_events(_split(raw, size))) == [SSEEvent(f'{content}\nx\ny')]
+
+    def test_cr_at_chunk_end_waits_for_lf(self):
+        assert list(iter_sse_events([b'data: a\r', b'\n', b'\r', b'\ndata: b\r'])) == [
+            SSEEvent('a'), SSEEvent('b'),
+        ]
+
+    def test_trailing_event_without_blank_line(self):
+        assert list(iter_sse_events([b'data: a\n\n', b'data: b'])) == [
+            SSEEvent('a'), SSEEvent('b'),
+        ]
+
+
+class TestDecodeAgentEvent:
+
+    def test_plain_json_event(self):
+        assert decode_agent_event('{"type": "chunk", "content": "Hi"}') == {'type': 'chunk', 'content': 'Hi'}
+
+    def test_double_encoded_event(self):
+        inner = {'type': 'chunk', 'content': 'say "hi"\nbye'}
+        data = json.dumps(json.dumps(inner))
+        assert decode_agent_event(data) == inner
+
+    def test_nested_event_in_chunk_content(self):
+        tool = {'type': 'tool', 'toolName': 'search', 'status': 'running'}
+        data = json.dumps({'type': 'chunk', 'content': json.dumps(tool)})
+        assert decode_agent_event(data) == tool
+
+    def test_result_message_parsed(self):
+        message = {'role': 'assistant', 'content': [{'text': 'ok'}]}
+        data = json.dumps({'type': 'result', 'message': json.dumps(message)})
+        assert decode_agent_event(data)['message'] == message
+
+    def test_non_event_payloads_become_chunks(self):
+        assert decode_agent_event('plain text') == {'type': 'chunk', 'content': 'plain text'}
+        assert decode_agent_event('"quoted"') == {'type': 'chunk', 'content': 'quoted'}
+        assert decode_agent_event('{"a": 1}') == {'type': 'chunk', 'content': '{"a": 1}'}
+        assert decode_agent_event('   ') is None
+
+
+class TestIterRawChunks:
+
+    def test_prefers_read1(self):
+        class _Raw:
+            def __init__(self):
+                self.parts = [b'ab', b'c']
+                self.sizes = []
+
+            def read1(self, size):
+                self.sizes.append(size)
+                return self.parts.pop(0) if self.parts else b''
+
+        class _Body:
+            def __init__(self):
+                self._raw_stream = _Raw()
+
+            def iter_chunks(self, size):
+                raise AssertionError('read1 should be preferred')
+
+        body = _Body()
+        assert list(iter_raw_chunks(body, 4096)) == [b'ab', b'c']
+        assert body._raw_stream.sizes == [4096, 4096, 4096]
+
+
+class TestParseSseStream:
+
+    def test_parse_sse_stream_end_to_end(self):
+        events = [
+            {'type': 'chunk', 'content': 'Hel'},
+            {'type': 'tool', 'toolName': 'kb', 'status': 'complete'},
+            {'type': 'chunk', 'content': 'lo'},
+        ]
+        raw = ''.join(f'data: {json.dumps(json.dumps(e))}\n\n' for e in events).encode('utf-8')
+        response = {'contentType': 'text/event-stream', 'response': _split(raw, 5)}
+
+        assert list(AgentCoreClient._parse_sse_stream(response)) == events
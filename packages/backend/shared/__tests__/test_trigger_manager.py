@@ -0,0 +1,249 @@
+"""TriggerManager 동시 실행 단위 테스트
+
+- 전체 소요 시간이 트리거 수의 합이 아니라 가장 느린 트리거를 따라감
+- 동시 실행 수 상한, 트리거별 타임아웃 예산, 실패/예외 집계
+- TriggerRegistry: 이벤트 타입별 스냅샷 캐시, (event_type, campaign_id) 매칭, 버전 스탬프 무효화 (moto)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+# shared / trigger 도메인 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'trigger'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import dynamodb_utils  # noqa: E402
+import trigger_api_handler  # noqa: E402
+from models.trigger import Trigger  # noqa: E402
+from trigger_manager import TriggerManager  # noqa: E402
+from trigger_registry import TriggerRegistry  # noqa: E402
+
+
+class _FakeExecutor:
+    """엔드포인트 이름으로 지연/결과를 정하는 실행기 (예: 'sleep:0.2', 'fail', 'raise')"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def execute(self, endpoint, payload):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if endpoint.startswith('sleep:'):
+                time.sleep(float(endpoint.split(':')[1]))
+            if endpoint == 'fail':
+                return False
+            if endpoint == 'raise':
+                raise RuntimeError('boom')
+            return True
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def _trigger(trigger_id, endpoint):
+    return Trigger(trigger_id=trigger_id, trigger_type='fake', event_type='SessionCompleted',
+                   delivery_endpoint=endpoint, is_global=True)
+
+
+def _manager(triggers, **kwargs):
+    manager = TriggerManager(**kwargs)
+    executor = _FakeExecutor()
+    manager._executors['fake'] = executor
+    patcher = patch.object(manager, 'get_triggers_for_event', return_value=triggers)
+    patcher.start()
+    return manager, executor, patcher
+
+
+class TestExecuteTriggers:
+
+    def test_latency_tracks_slowest_trigger(self):
+        triggers = [_trigger(f't{i}', 'sleep:0.3') for i in range(6)]
+        manager, executor, patcher = _manager(triggers, max_concurrency=8, timeout_seconds=2)
+        try:
+            started = time.monotonic()
+            summary = manager.execute_triggers('SessionCompleted', {'event_type': 'SessionCompleted'})
+            elapsed = time.monotonic() - started
+        finally:
+            patcher.stop()
+
+        assert summary['total'] == 6
+        assert summary['succeeded'] == 6
+        assert elapsed < 1.0  # 순차 실행이면 1.8초
+        assert executor.max_running == 6
+
+    def test_concurrency_is_bounded(self):
+        triggers = [_trigger(f't{i}', 'sleep:0.1') for i in range(6)]
+        manager, executor, patcher = _manager(triggers, max_concurrency=2, timeout_seconds=2)
+        try:
+            summary = manager.execute_triggers('SessionCompleted', {})
+        finally:
+            patcher.stop()
+
+        assert summary['succeeded'] == 6
+        assert executor.max_running == 2
+
+    def test_slow_trigger_times_out_without_blocking_others(self):
+        triggers = [_trigger('slow', 'sleep:1.5'), _trigger('fast', 'sleep:0.05')]
+        manager, _, patcher = _manager(triggers, max_concurrency=4, timeout_seconds=0.3)
+        try:
+            started = time.monotonic()
+            summary = manager.execute_triggers('SessionCompleted', {})
+            elapsed = time.monotonic() - started
+        finally:
+            patcher.stop()
+
+        statuses = {result['triggerId']: result['status'] for result in summary['results']}
+        assert statuses == {'slow': 'timeout', 'fast': 'succeeded'}
+        assert summary['timedOut'] == 1
+        assert elapsed < 1.0
+
+    def test_queued_trigger_budget_starts_when_it_runs(self):
+        # 슬롯이 하나라 두 번째 트리거는 0.2초 뒤에 시작하지만 자기 예산(0.3초) 안에 끝난다
+        triggers = [_trigger('first', 'sleep:0.2'), _trigger('second', 'sleep:0.2')]
+        manager, _, patcher = _manager(triggers, max_concurrency=1, timeout_seconds=0.3)
+        try:
+            summary = manager.execute_triggers('SessionCompleted', {})
+        finally:
+            patcher.stop()
+
+        assert summary['succeeded'] == 2
+
+    def test_failures_and_exceptions_are_aggregated(self):
+        triggers = [_trigger('ok', 'ok'), _trigger('bad', 'fail'), _trigger('err', 'raise'),
+                    Trigger(trigger_id='unknown', trigger_type='carrier-pigeon', event_type='SessionCompleted',
+                            delivery_endpoint='x', is_global=True)]
+        manager, _, patcher = _manager(triggers, timeout_seconds=1)
+        try:
+            summary = manager.execute_triggers('SessionCompleted', {'field': ''})
+        finally:
+            patcher.stop()
+
+        statuses = [result['status'] for result in summary['results']]
+        assert statuses == ['succeeded', 'failed', 'error', 'failed']
+        assert summary['succeeded'] == 1
+        assert summary['failed'] == 3
+
+    def test_delivery_log_omits_payload(self, capsys):
+        manager, _, patcher = _manager([_trigger('t1', 'ok')], timeout_seconds=1)
+        try:
+            manager.execute_triggers('SessionCompleted', {
+                'event_type': 'SessionCompleted', 'customer_name': 'Hong Gildong',
+                'customer_email': 'hong@example.com', 'customer_company': 'Acme',
+            })
+        finally:
+            patcher.stop()
+
+        out = capsys.readouterr().out
+        assert 'Trigger t1 (fake) SessionCompleted executed successfully' in out
+        for value in ('Hong Gildong', 'hong@example.com', 'Acme'):
+            assert value not in out
+
+    def test_no_triggers(self):
+        manager, _, patcher = _manager([])
+        try:
+            summary = manager.execute_triggers('SessionCompleted', {})
+        finally:
+            patcher.stop()
+        assert summary['total'] == 0
+        assert summary['results'] == []
+
+
+@pytest.fixture
+def trigger_table():
+    with mock_aws():
+        resource = boto3.resource('dynamodb')
+        table = resource.create_table(
+            TableName='test-sessions-table',
+            KeySchema=[
+                {'AttributeName': 'PK', 'KeyType': 'HASH'},
+                {'AttributeName': 'SK', 'KeyType': 'RANGE'},
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'PK', 'AttributeType': 'S'},
+                {'AttributeName': 'SK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI1PK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI1SK', 'AttributeType': 'S'},
+            ],
+            GlobalSecondaryIndexes=[{
+                'IndexName': 'GSI1',
+                'KeySchema': [
+                    {'AttributeName': 'GSI1PK', 'KeyType': 'HASH'},
+                    {'AttributeName': 'GSI1SK', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            }],
+            BillingMode='PAY_PER_REQUEST',
+        )
+        with patch.object(trigger_api_handler, 'dynamodb', resource), \
+                patch.object(trigger_api_handler, 'SESSIONS_TABLE', 'test-sessions-table'), \
+                patch.object(dynamodb_utils, 'dynamodb', resource):
+            yield table
+
+
+def _create(body):
+    response = trigger_api_handler.create_trigger({'body': json.dumps(body)}, None)
+    assert response['statusCode'] == 201
+    return json.loads(response['body'])['triggerId']
+
+
+def _slack(event_type='SessionCompleted', **fields):
+    return {'triggerType': 'slack', 'eventType': event_type,
+            'deliveryEndpoint': 'https://hooks.slack.com/services/x', **fields}
+
+
+class TestTriggerRegistry:
+
+    def test_matching_is_served_from_snapshot(self, trigger_table):
+        global_id = _create(_slack(isGlobal=True))
+        camp_id = _create(_slack(campaignId='camp-1'))
+        _create(_slack(campaignId='camp-2'))
+        _create(_slack(event_type='SessionCreated', isGlobal=True))
+
+        registry = TriggerRegistry(trigger_table, ttl=60, version_check_seconds=60)
+        with patch.object(trigger_table, 'query', wraps=trigger_table.query) as query:
+            for _ in range(100):
+                matched = registry.get_triggers('SessionCompleted', 'camp-1')
+            assert {t.trigger_id for t in matched} == {global_id, camp_id}
+            assert [t.trigger_id for t in registry.get_triggers('SessionCompleted')] == [global_id]
+            assert len(registry.get_triggers('SessionCreated', 'camp-1')) == 1
+        assert query.call_count == 2  # 이벤트 타입당 한 번
+
+    def test_inactive_triggers_are_excluded(self, trigger_table):
+        trigger_id = _create(_slack(isGlobal=True))
+        trigger_api_handler.update_trigger(
+            {'pathParameters': {'triggerId': trigger_id}, 'body': json.dumps({'status': 'inactive'})}, None)
+        assert TriggerRegistry(trigger_table).get_triggers('SessionCompleted') == []
+
+    def test_version_bump_invalidates_snapshots(self, trigger_table):
+        _create(_slack(isGlobal=True))
+        registry = TriggerRegistry(trigger_table, ttl=60, version_check_seconds=0)
+        assert len(registry.get_triggers('SessionCompleted', 'camp-1')) == 1
+
+        new_id = _create(_slack(campaignId='camp-1'))
+        assert new_id in {t.trigger_id for t in registry.get_triggers('SessionCompleted', 'camp-1')}
+
+        trigger_api_handler.delete_trigger({'pathParameters': {'triggerId': new_id}}, None)
+        assert new_id not in {t.trigger_id for t in registry.get_triggers('SessionCompleted', 'camp-1')}
+
+    def test_version_is_checked_at_most_once_per_interval(self, trigger_table):
+        registry = TriggerRegistry(trigger_table, ttl=60, version_check_seconds=60)
+        with patch.object(trigger_table, 'get_item', wraps=trigger_table.get_item) as get_item:
+            for _ in range(50):
+                registry.get_triggers('SessionCompleted', 'camp-1')
+        assert get_item.call_count == 1
@@ -0,0 +1,245 @@
+"""트리거 아웃박스 단위 테스트
+
+- TriggerManager 아웃박스 모드: 직접 전송 없이 큐에 넣고, 넣지 못한 트리거만 직접 전송
+- OutboxWorker: 지수 백오프 재시도, 최대 시도 후 DLQ, 엔드포인트별 속도 제한/회로 차단 지연
+- SQSQueue: 10개 단위 send_message_batch (moto)
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+# shared 모듈 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from circuit_breaker import KeyedCircuitBreaker  # noqa: E402
+from models.trigger import Trigger  # noqa: E402
+from rate_limiter import KeyedRateLimiter, TokenBucket  # noqa: E402
+from trigger_manager import TriggerManager  # noqa: E402
+from trigger_outbox import (  # noqa: E402
+    LocalQueue,
+    OutboxWorker,
+    SQSQueue,
+    TriggerOutbox,
+    outbox_message,
+    retry_delay,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Endpoint:
+    """엔드포인트별로 처음 fail_times번 실패하는 전송 함수"""
+
+    def __init__(self, fail_times=None):
+        self.fail_times = fail_times or {}
+        self.calls = []
+
+    def __call__(self, trigger, event_data):
+        self.calls.append((trigger.delivery_endpoint, event_data))
+        attempts = sum(1 for endpoint, _ in self.calls if endpoint == trigger.delivery_endpoint)
+        return attempts > self.fail_times.get(trigger.delivery_endpoint, 0)
+
+
+def _trigger(trigger_id, endpoint='https://hooks.slack.com/a'):
+    return Trigger(trigger_id=trigger_id, trigger_type='slack', event_type='SessionCompleted',
+                   delivery_endpoint=endpoint, is_global=True)
+
+
+def _drain(worker, queue, clock, rounds=50):
+    """큐가 빌 때까지 다음 메시지가 보이는 시점으로 시계를 옮기며 처리합니다."""
+    summaries = []
+    for _ in range(rounds):
+        records = queue.receive()
+        if not records:
+            visible_at = queue.next_visible_at()
+            if visible_at is None:
+                break
+            clock.now = visible_at
+            continue
+        summaries.append(worker.process(records))
+    return summaries
+
+
+class TestRetryDelay:
+
+    def test_exponential_with_bounded_jitter(self):
+        assert [retry_delay(n, base=2, rng=lambda low, high: high) for n in range(1, 6)] == [2, 4, 8, 16, 32]
+        assert [retry_delay(n, base=2, rng=lambda low, high: low) for n in range(1, 6)] == [1, 2, 4, 8, 16]
+
+    def test_capped_at_sqs_maximum(self):
+        assert retry_delay(20, base=2, rng=lambda low, high: high) == 900
+
+
+class TestTokenBucket:
+
+    def test_burst_then_refill(self):
+        clock = _Clock()
+        bucket = TokenBucket(rate=1, capacity=3, clock=clock)
+        assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+        assert bucket.try_acquire() == pytest.approx(1.0)
+        clock.now += 0.5
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert bucket.try_acquire() == 0
+
+    def test_keys_are_independent(self):
+        limiter = KeyedRateLimiter(rate=1, capacity=1, clock=_Clock())
+        assert limiter.try_acquire('a') == 0
+        assert limiter.try_acquire('a') > 0
+        assert limiter.try_acquire('b') == 0
+        assert limiter.stats() == {'keys': 2, 'allowed': 2, 'limited': 1}
+
+
+class TestManagerOutboxMode:
+
+    def test_triggers_are_queued_not_sent(self):
+        queue = LocalQueue()
+        triggers = [_trigger('t1'), _trigger('t2', 'arn:aws:sns:ap-northeast-2:123:topic')]
+        manager = TriggerManager(outbox=TriggerOutbox(queue))
+        with patch.object(manager, 'get_triggers_for_event', return_value=triggers), \
+                patch.object(manager, 'deliver') as deliver:
+            summary = manager.execute_triggers('SessionCompleted', {'session_id': 's1'}, 'camp-1')
+
+        deliver.assert_not_called()
+        assert summary['queued'] == 2
+        messages = queue.bodies()
+        assert [m['triggerId'] for m in messages] == ['t1', 't2']
+        assert messages[0]['attempt'] == 1
+        assert messages[0]['campaignId'] == 'camp-1'
+        assert messages[0]['eventData'] == {'session_id': 's1'}
+
+    def test_enqueue_failure_falls_back_to_direct_dispatch(self):
+        class _HalfBrokenQueue(LocalQueue):
+            def send(self, entries):
+                super().send(entries[:1])
+                return list(range(1, len(entries)))
+
+        queue = _HalfBrokenQueue()
+        manager = TriggerManager(outbox=TriggerOutbox(queue))
+        with patch.object(manager, 'get_triggers_for_event', return_value=[_trigger('t1'), _trigger('t2')]), \
+                patch.object(manager, 'deliver', return_value=True) as deliver:
+            summary = manager.execute_triggers('SessionCompleted', {})
+
+        assert len(queue) == 1
+        assert deliver.call_count == 1
+        assert {r['triggerId']: r['status'] for r in summary['results']} == {'t1': 'queued', 't2': 'succeeded'}
+
+
+class TestOutboxWorker:
+
+    def test_delivers_and_retries_with_backoff(self):
+        clock = _Clock()
+        queue = LocalQueue(clock)
+        endpoint = _Endpoint({'https://hooks.slack.com/a': 2})
+        worker = OutboxWorker(queue, endpoint, dead_letter_queue=LocalQueue(clock), base_delay=2,
+                              rng=lambda low, high: high)
+        TriggerOutbox(queue).enqueue([_trigger('t1')], 'SessionCompleted', {'k': 'v'})
+
+        started = clock.now
+        summaries = _drain(worker, queue, clock)
+
+        assert [s['retried'] for s in summaries] == [1, 1, 0]
+        assert summaries[-1]['delivered'] == 1
+        assert clock.now - started == 2 + 4
+        assert endpoint.calls[-1] == ('https://hooks.slack.com/a', {'k': 'v'})
+
+    def test_dead_letters_after_max_attempts(self):
+        clock = _Clock()
+        queue, dlq = LocalQueue(clock), LocalQueue(clock)
+        worker = OutboxWorker(queue, _Endpoint({'https://hooks.slack.com/a': 99}), dead_letter_queue=dlq,
+                              max_attempts=3, base_delay=1)
+        TriggerOutbox(queue).enqueue([_trigger('t1')], 'SessionCompleted', {})
+
+        summaries = _drain(worker, queue, clock)
+
+        assert sum(s['retried'] for s in summaries) == 2
+        assert summaries[-1]['deadLettered'] == 1
+        assert len(queue) == 0
+        [dead] = dlq.bodies()
+        assert dead['triggerId'] == 't1'
+        assert dead['attempt'] == 3
+        assert 'failedAt' in dead
+
+    def test_rate_limited_messages_are_deferred_without_consuming_attempts(self):
+        clock = _Clock()
+        queue = LocalQueue(clock)
+        endpoint = _Endpoint()
+        limiter = KeyedRateLimiter(rate=1, capacity=2, clock=clock)
+        worker = OutboxWorker(queue, endpoint, rate_limiter=limiter)
+        slack = [_trigger(f's{i}') for i in range(5)]
+        other = [_trigger('o1', 'https://hooks.slack.com/b')]
+        TriggerOutbox(queue).enqueue(slack + other, 'SessionCompleted', {})
+
+        first = worker.process(queue.receive())
+        assert (first['delivered'], first['deferred']) == (3, 3)  # a 2건 + b 1건 전송
+
+        summaries = _drain(worker, queue, clock)
+        assert sum(s['delivered'] for s in summaries) == 3
+        assert len(endpoint.calls) == 6
+        assert all(s['retried'] == 0 for s in summaries)
+
+    def test_open_circuit_defers_without_consuming_attempts(self):
+        clock = _Clock()
+        queue = LocalQueue(clock)
+        endpoint = _Endpoint()
+        breaker = KeyedCircuitBreaker(failure_threshold=1, cooldown_seconds=30, clock=clock)
+        breaker.record_failure('https://hooks.slack.com/a')
+        manager = TriggerManager()
+        manager._executors['slack'].circuit_breaker = breaker
+        worker = OutboxWorker(queue, endpoint, max_attempts=1, circuit_retry_after=manager.circuit_retry_after)
+        TriggerOutbox(queue).enqueue([_trigger('t1'), _trigger('o1', 'https://hooks.slack.com/b')],
+                                     'SessionCompleted', {})
+
+        started = clock.now
+        first = worker.process(queue.receive())
+        assert (first['delivered'], first['shortCircuited'], first['deadLettered']) == (1, 1, 0)
+
+        summaries = _drain(worker, queue, clock)
+        assert summaries[-1]['delivered'] == 1
+        assert clock.now - started == 30
+        assert [call[0] for call in endpoint.calls] == ['https://hooks.slack.com/b', 'https://hooks.slack.com/a']
+
+    def test_requeue_failure_is_reported_as_batch_item_failure(self):
+        class _BrokenQueue(LocalQueue):
+            def send(self, entries):
+                raise RuntimeError('sqs down')
+
+        worker = OutboxWorker(_BrokenQueue(), _Endpoint({'https://hooks.slack.com/a': 1}))
+        record = {'messageId': 'm1', 'body': json.dumps(outbox_message(_trigger('t1'), 'SessionCompleted', {}))}
+        summary = worker.process([record, {'messageId': 'bad', 'body': 'not json'}])
+
+        assert summary['batchItemFailures'] == [{'itemIdentifier': 'm1'}]
+        assert summary['invalid'] == 1
+
+
+class TestSQSQueue:
+
+    @mock_aws
+    def test_send_batches_of_ten(self):
+        sqs = boto3.client('sqs')
+        queue_url = sqs.create_queue(QueueName='trigger-outbox')['QueueUrl']
+        queue = SQSQueue(queue_url, sqs)
+        messages = [(outbox_message(_trigger(f't{i}'), 'SessionCompleted', {}), 0) for i in range(23)]
+
+        with patch.object(sqs, 'send_message_batch', wraps=sqs.send_message_batch) as send:
+            assert queue.send(messages) == []
+        assert send.call_count == 3
+
+        attributes = sqs.get_queue_attributes(QueueUrl=queue_url, AttributeNames=['ApproximateNumberOfMessages'])
+        assert attributes['Attributes']['ApproximateNumberOfMessages'] == '23'
@@ -0,0 +1,175 @@
+"""TTLCache 및 agent_runtime 구성 조회 캐시 단위 테스트
+
+- TTL 만료, LRU 제거, hit/miss 카운터
+- get_agent_config_for_session의 warm 인스턴스 캐시 및 invalidate 훅
+"""
+
+import os
+import sys
+
+# shared 모듈 경로 추가
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), '..'
+    ),
+)
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import agent_runtime
+from ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+
+    def _cache(self, **kwargs):
+        cache = TTLCache(**kwargs)
+        clock = _Clock()
+        cache._now = clock
+        return cache, clock
+
+    def test_hit_and_miss_counters(self):
+        cache, _ = self._cache(maxsize=10, ttl=60)
+        assert cache.get('a') is None
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_entry_expires_after_ttl(self):
+        cache, clock = self._cache(maxsize=10, ttl=60)
+        cache.set('a', 1)
+        clock.now += 59
+        assert cache.get('a') == 1
+        clock.now += 2
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache, _ = self._cache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # a를 최근 사용으로 갱신
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.evictions == 1
+
+    def test_none_value_is_cached(self):
+        cache, _ = self._cache()
+        loader = MagicMock(return_value=None)
+        assert cache.get_or_load('k', loader) is None
+        assert cache.get_or_load('k', loader) is None
+        loader.assert_called_once()
+
+    def test_loader_exception_not_cached(self):
+        cache, _ = self._cache()
+        loader = MagicMock(side_effect=[RuntimeError('boom'), 'ok'])
+        with pytest.raises(RuntimeError):
+            cache.get_or_load('k', loader)
+        assert cache.get_or_load('k', loader) == 'ok'
+
+    def test_invalidate_where(self):
+        cache, _ = self._cache()
+        cache.set(('role', 'consultation'), 1)
+        cache.set(('id', 'c1'), 2)
+        cache.invalidate_where(lambda key: key[0] == 'role')
+        assert cache.get(('role', 'consultation')) is None
+        assert cache.get(('id', 'c1')) == 2
+
+
+CONFIG_ITEM = {
+    'PK': 'AGENTCONFIG#cfg-1',
+    'SK': 'METADATA',
+    'configId': 'cfg-1',
+    'agentRole': 'consultation',
+    'systemPrompt': 'You are helpful.',
+}
+
+
+@pytest.fixture
+def fake_tables(monkeypatch):
+    """세션/캠페인/설정 GetItem 응답을 돌려주는 fake DynamoDB"""
+    monkeypatch.setattr(agent_runtime, 'SESSIONS_TABLE', 'sessions')
+    monkeypatch.setenv('CAMPAIGNS_TABLE', 'campaigns')
+    agent_runtime.clear_agent_config_caches()
+
+    responses = {
+        'SESSION#s1': {'Item': {'agentId': 'cfg-1', 'campaignId': 'camp-1'}},
+        'CAMPAIGN#camp-1': {'Item': {'campaignType': 'outbound', 'agentConfigurations': {}}},
+        'AGENTCONFIG#cfg-1': {'Item': dict(CONFIG_ITEM)},
+    }
+    table = MagicMock()
+    table.get_item.side_effect = lambda Key, **kwargs: responses[Key['PK']]
+    fake = MagicMock()
+    fake.Table.return_value = table
+
+    with patch.object(agent_runtime, 'dynamodb', fake):
+        yield table
+
+    agent_runtime.clear_agent_config_caches()
+
+
+class TestAgentConfigCache:
+
+    def test_second_turn_skips_dynamodb(self, fake_tables):
+        _arn, first = agent_runtime.get_agent_config_for_session('s1', 'consultation')
+        calls_after_first = fake_tables.get_item.call_count
+        _arn, second = agent_runtime.get_agent_config_for_session('s1', 'consultation')
+
+        assert calls_after_first == 3
+        assert fake_tables.get_item.call_count == calls_after_first
+        assert first == second
+        assert first is not second  # 캐시 객체 복사본 반환
+
+        stats = agent_runtime.get_agent_config_cache_stats()
+        assert stats['session_routing']['hits'] == 1
+        assert stats['agent_config']['hits'] == 1
+
+    def test_turn_has_no_debug_output_at_info_level(self, fake_tables, capsys):
+        agent_runtime.get_agent_config_for_session('s1', 'consultation')
+        capsys.readouterr()
+        agent_runtime.get_agent_config_for_session('s1', 'consultation')
+
+        # DEBUG 로그는 AGENT_RUNTIME_LOG_LEVEL=DEBUG일 때만 logger로 남는다
+        assert '[DEBUG]' not in capsys.readouterr().out
+
+    def test_invalidate_agent_config(self, fake_tables):
+        agent_runtime.get_agent_config_for_session('s1', 'consultation')
+        agent_runtime.invalidate_agent_config_cache('cfg-1', 'consultation')
+        agent_runtime.get_agent_config_for_session('s1', 'consultation')
+
+        config_reads = [
+            c for c in fake_tables.get_item.call_args_list
+            if c.kwargs['Key']['PK'] == 'AGENTCONFIG#cfg-1'
+        ]
+        assert len(config_reads) == 2
+
+    def test_invalidate_session_routing(self, fake_tables):
+        agent_runtime.get_agent_config_for_session('s1', 'consultation')
+        agent_runtime.invalidate_session_routing_cache('s1')
+        agent_runtime.get_agent_config_for_session('s1', 'consultation')
+
+        session_reads = [
+            c for c in fake_tables.get_item.call_args_list
+            if c.kwargs['Key']['PK'] == 'SESSION#s1'
+        ]
+        assert len(session_reads) == 2
+
+    def test_errors_are_not_cached(self, fake_tables):
+        fake_tables.get_item.side_effect = RuntimeError('throttled')
+        assert agent_runtime._get_session_routing_info('s1') == ('', '')
+        assert len(agent_runtime._session_routing_cache) == 0
@@ -10,13 +10,22 @@ Agent Runtime - AgentCore 호출 클라이언트
   4. agentRuntimeArn이 없으면 SSM 환경 변수에서 기본 에이전트 ARN 사용
 """
 
+import dataclasses
+import hashlib
 import json
+import logging
+import random
+import threading
+import time
 import uuid
 import boto3
 import os
+from botocore.config import Config
 from typing import Optional
 
-from models.agent_config import AgentConfiguration
+from models.agent_config import AgentConfiguration, LEGACY_ROLE_MAP
+from sse_decoder import SSE_READ_SIZE, decode_agent_event, iter_raw_chunks, iter_sse_events
+from ttl_cache import TTLCache
 
 # SSM에서 resolve된 기본 에이전트 ARN (deploy-agents.sh로 등록)
 # 모듈 로드 시점에 환경 변수 읽기
@@ -41,6 +50,69 @@ dynamodb = boto3.resource('dynamodb')
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
 AGENTCORE_REGION = os.environ.get('BEDROCK_REGION', 'ap-northeast-2')
 
+# Warm Lambda 인스턴스 내 구성 조회 캐시 (TTL + LRU)
+# 채팅 턴마다 반복되는 세션 라우팅 / 캠페인 / AgentConfiguration 조회를 생략한다.
+# 같은 프로세스의 변경은 invalidate_* 훅으로 즉시 반영되고,
+# 다른 Lambda 컨테이너에서 발생한 변경은 TTL 만료 후 반영된다.
+AGENT_CONFIG_CACHE_TTL_SECONDS = float(os.environ.get('AGENT_CONFIG_CACHE_TTL_SECONDS', '60'))
+AGENT_CONFIG_CACHE_MAX_SIZE = int(os.environ.get('AGENT_CONFIG_CACHE_MAX_SIZE', '512'))
+
+_session_routing_cache = TTLCache(
+    AGENT_CONFIG_CACHE_MAX_SIZE, AGENT_CONFIG_CACHE_TTL_SECONDS, name='session_routing')
+_campaign_routing_cache = TTLCache(
+    AGENT_CONFIG_CACHE_MAX_SIZE, AGENT_CONFIG_CACHE_TTL_SECONDS, name='campaign_routing')
+# key: ('id', configId) 또는 ('role', agentRole)
+_agent_config_cache = TTLCache(
+    AGENT_CONFIG_CACHE_MAX_SIZE, AGENT_CONFIG_CACHE_TTL_SECONDS, name='agent_config')
+
+
+# invalidate_* 훅은 호출한 프로세스의 캐시만 비운다.
+# 다른 Lambda 컨테이너의 캐시는 그대로이며 AGENT_CONFIG_CACHE_TTL_SECONDS 만료 후 변경을 반영한다.
+def invalidate_session_routing_cache(session_id: str) -> None:
+    """세션의 agentId/campaignId 변경 시 호출합니다. (현재 프로세스 캐시만 무효화)"""
+    _session_routing_cache.invalidate(session_id)
+
+
+def invalidate_campaign_routing_cache(campaign_id: str) -> None:
+    """캠페인의 campaignType/agentConfigurations 변경 또는 삭제 시 호출합니다. (현재 프로세스 캐시만 무효화)"""
+    _campaign_routing_cache.invalidate(campaign_id)
+
+
+def invalidate_agent_config_cache(config_id: Optional[str] = None, agent_role: Optional[str] = None) -> None:
+    """AgentConfiguration 생성/수정/삭제 시 호출합니다. (현재 프로세스 캐시만 무효화)
+
+    config_id 항목과 함께 역할 기반 fallback 항목(레거시 역할 포함)도 제거합니다.
+    agent_role을 모르면 역할 기반 항목을 모두 제거합니다.
+    """
+    if config_id:
+        _agent_config_cache.invalidate(('id', config_id))
+    if agent_role:
+        roles = {agent_role, LEGACY_ROLE_MAP.get(agent_role, agent_role)}
+        for role in roles:
+            _agent_config_cache.invalidate(('role', role))
+    else:
+        _agent_config_cache.invalidate_where(lambda key: key[0] == 'role')
+
+
+def clear_agent_config_caches() -> None:
+    """모든 구성 조회 캐시를 비웁니다."""
+    _session_routing_cache.clear()
+    _campaign_routing_cache.clear()
+    _agent_config_cache.clear()
+
+
+def get_agent_config_cache_stats() -> dict:
+    """구성 조회 캐시별 hit/miss 카운터를 반환합니다."""
+    return {
+        cache.name: cache.stats()
+        for cache in (_session_routing_cache, _campaign_routing_cache, _agent_config_cache)
+    }
+
+
+def _copy_config(config: Optional[AgentConfiguration]) -> Optional[AgentConfiguration]:
+    """캐시된 객체가 호출자 측 수정으로 오염되지 않도록 복사본을 반환합니다."""
+    return dataclasses.replace(config) if config else None
+
 
 def _build_config_payload(config: Optional[AgentConfiguration], locale: str = 'ko') -> dict:
     """AgentConfiguration에서 에이전트 주입용 config dict를 생성합니다.
@@ -65,12 +137,116 @@ def _build_config_payload(config: Optional[AgentConfiguration], locale: str = 'k
     result['locale'] = config.i18n or locale
     return result
 
+# bedrock-agentcore 클라이언트 설정
+# 엔트리포인트별로 read timeout이 다르므로 프로파일마다 별도 botocore 클라이언트를 사용한다.
+#   - stream: SSE 토큰 사이 최대 대기 (도구 실행 중 무응답 구간 포함)
+#   - analysis: 비스트리밍 invoke의 전체 응답 대기 (요약/분석 에이전트)
+AGENTCORE_MAX_POOL_CONNECTIONS = int(os.environ.get('AGENTCORE_MAX_POOL_CONNECTIONS', '25'))
+AGENTCORE_RETRY_MODE = os.environ.get('AGENTCORE_RETRY_MODE', 'adaptive')
+AGENTCORE_MAX_ATTEMPTS = int(os.environ.get('AGENTCORE_MAX_ATTEMPTS', '3'))
+AGENTCORE_CONNECT_TIMEOUT = float(os.environ.get('AGENTCORE_CONNECT_TIMEOUT', '5'))
+AGENTCORE_READ_TIMEOUTS = {
+    'stream': float(os.environ.get('AGENTCORE_STREAM_READ_TIMEOUT', '120')),
+    'analysis': float(os.environ.get('AGENTCORE_ANALYSIS_READ_TIMEOUT', '600')),
+}
+# true면 같은 프로세스의 모든 AgentCoreClient()가 프로파일별 boto3 클라이언트를 공유한다
+AGENTCORE_SHARE_CLIENT = os.environ.get('AGENTCORE_SHARE_CLIENT', 'true').lower() == 'true'
+
+_shared_agentcore_clients = {}
+_shared_agentcore_lock = threading.Lock()
+
+# 구조화 로깅 (레벨 게이트)
+# 호출 payload는 내용 대신 크기/해시/소요 시간만 기록한다.
+# 전체 payload는 DEBUG 레벨에서 AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE 비율(0~1)로만 기록한다.
+logger = logging.getLogger('agent_runtime')
+logger.setLevel(os.environ.get('AGENT_RUNTIME_LOG_LEVEL', 'INFO').upper())
+AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE = float(os.environ.get('AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE', '0'))
+
+
+def _log(level: int, event: str, **fields) -> None:
+    """레벨이 활성화된 경우에만 JSON 한 줄 로그를 기록합니다."""
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps({'event': event, **fields}, ensure_ascii=False, default=str))
+
+
+def _log_invoke_start(event: str, agent_runtime_arn: str, runtime_session_id: str, payload_bytes: bytes) -> None:
+    """호출 시작 로그 (payload 크기/해시) 및 샘플링된 전체 payload DEBUG 로그"""
+    if logger.isEnabledFor(logging.INFO):
+        _log(
+            logging.INFO, event,
+            agentRuntimeArn=agent_runtime_arn,
+            runtimeSessionId=runtime_session_id,
+            payloadBytes=len(payload_bytes),
+            payloadSha256=hashlib.sha256(payload_bytes).hexdigest()[:16],
+        )
+    if (AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE > 0
+            and logger.isEnabledFor(logging.DEBUG)
+            and random.random() < AGENT_RUNTIME_PAYLOAD_LOG_SAMPLE_RATE):
+        _log(
+            logging.DEBUG, f'{event}_payload',
+            runtimeSessionId=runtime_session_id,
+            payload=payload_bytes.decode('utf-8', errors='replace'),
+        )
+
+
+def build_agentcore_config(profile: str) -> Config:
+    """엔트리포인트 프로파일('stream' | 'analysis')별 botocore Config를 생성합니다."""
+    if profile not in AGENTCORE_READ_TIMEOUTS:
+        raise ValueError(f"Unknown AgentCore client profile: {profile}")
+    return Config(
+        max_pool_connections=AGENTCORE_MAX_POOL_CONNECTIONS,
+        connect_timeout=AGENTCORE_CONNECT_TIMEOUT,
+        read_timeout=AGENTCORE_READ_TIMEOUTS[profile],
+        retries={'max_attempts': AGENTCORE_MAX_ATTEMPTS, 'mode': AGENTCORE_RETRY_MODE},
+        tcp_keepalive=True,
+    )
+
+
+def _create_agentcore_client(profile: str):
+    return boto3.client(
+        'bedrock-agentcore',
+        region_name=AGENTCORE_REGION,
+        config=build_agentcore_config(profile),
+    )
+
+
+def _get_shared_agentcore_client(profile: str):
+    """프로세스 공유 bedrock-agentcore 클라이언트 (warm 인스턴스에서 커넥션 풀 재사용)"""
+    client = _shared_agentcore_clients.get(profile)
+    if client is None:
+        with _shared_agentcore_lock:
+            client = _shared_agentcore_clients.get(profile)
+            if client is None:
+                client = _create_agentcore_client(profile)
+                _shared_agentcore_clients[profile] = client
+    return client
+
 
 class AgentCoreClient:
     """AgentCore Runtime 호출 클라이언트"""
 
-    def __init__(self):
-        self.client = boto3.client('bedrock-agentcore', region_name=AGENTCORE_REGION)
+    def __init__(self, shared: Optional[bool] = None):
+        """
+        Args:
+            shared: 프로세스 공유 boto3 클라이언트 사용 여부 (기본: AGENTCORE_SHARE_CLIENT)
+        """
+        self.shared = AGENTCORE_SHARE_CLIENT if shared is None else shared
+        self._clients = {}
+
+    def get_client(self, profile: str = 'analysis'):
+        """엔트리포인트 프로파일에 맞는 bedrock-agentcore 클라이언트를 반환합니다 (지연 생성)."""
+        if self.shared:
+            return _get_shared_agentcore_client(profile)
+        client = self._clients.get(profile)
+        if client is None:
+            client = _create_agentcore_client(profile)
+            self._clients[profile] = client
+        return client
+
+    @property
+    def client(self):
+        """비스트리밍 invoke용 기본 클라이언트 (하위 호환)"""
+        return self.get_client('analysis')
 
     def invoke(
         self,
@@ -84,14 +260,12 @@ class AgentCoreClient:
             runtime_session_id = runtime_session_id + '-' + uuid.uuid4().hex[:10]
 
         try:
-            # payload를 JSON 문자열로 변환하여 bytes로 인코딩
+            # payload를 JSON 문자열로 변환하여 bytes로 인코딩 (로그에는 크기/해시만 기록)
             payload_bytes = json.dumps(payload).encode('utf-8')
-            
-            print(f"[INFO] Invoking AgentCore ARN: {agent_runtime_arn}")
-            print(f"[INFO] Runtime Session ID: {runtime_session_id}")
-            print(f"[INFO] Payload: {json.dumps(payload)}")
-            
-            response = self.client.invoke_agent_runtime(
+            _log_invoke_start('agentcore_invoke_start', agent_runtime_arn, runtime_session_id, payload_bytes)
+            started = time.monotonic()
+
+            response = self.get_client('analysis').invoke_agent_runtime(
                 agentRuntimeArn=agent_runtime_arn,
                 runtimeSessionId=runtime_session_id,
                 payload=payload_bytes,
@@ -99,19 +273,13 @@ class AgentCoreClient:
 
             # contentType에 따라 응답 처리
             content_type = response.get("contentType", "")
-            print(f"[INFO] Response contentType: {content_type}")
             
             if "text/event-stream" in content_type:
-                # 스트리밍 응답 처리: data: 접두사를 제거하고 전체를 합침
-                content = []
-                for line in response["response"].iter_lines(chunk_size=10):
-                    if line:
-                        line_str = line.decode("utf-8")
-                        if line_str.startswith("data: "):
-                            line_str = line_str[6:]
-                        content.append(line_str)
-                # 모든 data 라인을 합쳐서 하나의 JSON으로 파싱 시도
-                result_text = ''.join(content)
+                # 스트리밍 응답 처리: SSE 이벤트의 data를 모두 합침
+                result_text = ''.join(
+                    event.data
+                    for event in iter_sse_events(iter_raw_chunks(response["response"], SSE_READ_SIZE))
+                )
                 
             elif content_type == "application/json":
                 # JSON 응답 처리: StreamingBody.read()로 한 번에 읽기
@@ -122,7 +290,13 @@ class AgentCoreClient:
                 print(f"[WARN] Unexpected contentType: {content_type}")
                 result_text = response["response"].read().decode('utf-8')
 
-            print(f"[INFO] Response length: {len(result_text)} chars")
+            _log(
+                logging.INFO, 'agentcore_invoke_complete',
+                runtimeSessionId=runtime_session_id,
+                contentType=content_type,
+                responseChars=len(result_text),
+                durationMs=round((time.monotonic() - started) * 1000, 1),
+            )
 
             # JSON 파싱 시도, 실패하면 텍스트로 반환
             try:
@@ -185,7 +359,7 @@ class AgentCoreClient:
             if config_dict:
                 payload["config"] = config_dict
 
-            response = self.client.invoke_agent_runtime(
+            response = self.get_client('stream').invoke_agent_runtime(
                 agentRuntimeArn=agent_runtime_arn,
                 runtimeSessionId=runtime_session_id,
                 payload=json.dumps(payload).encode(),
@@ -208,17 +382,19 @@ class AgentCoreClient:
             yield self._handle_error(e)
 
     @staticmethod
-    def _parse_sse_stream(response):
+    def _parse_sse_stream(response, read_size: int = SSE_READ_SIZE):
         """SSE(text/event-stream) 응답을 파싱하여 이벤트 딕셔너리를 yield합니다.
 
-        AgentCore Runtime의 스트리밍 응답에서 SSE data: 라인을 추출하고,
-        JSON 파싱하여 이벤트 타입별로 반환하는 공통 헬퍼입니다.
+        AgentCore Runtime의 스트리밍 응답을 read_size 단위로 읽어 SSE 이벤트로 조립하고
+        (sse_decoder.iter_sse_events), data 페이로드를 이벤트 딕셔너리로 변환합니다
+        (sse_decoder.decode_agent_event).
 
         invoke_stream_chunks에서 SSE 파싱 로직을 재활용합니다.
 
         Args:
             response: invoke_agent_runtime의 응답 딕셔너리.
-                response["response"]가 iter_lines()를 지원해야 합니다.
+                response["response"]는 StreamingBody 또는 bytes iterable이어야 합니다.
+            read_size: 한 번에 읽을 최대 바이트 수
 
         Yields:
             dict: 파싱된 이벤트 딕셔너리. type 필드로 분류:
@@ -227,67 +403,12 @@ class AgentCoreClient:
                 - {"type": "result", "message": "전체 응답 텍스트"}
                 - {"type": "error", "message": "에러 메시지"}
         """
-        content_type = response.get("contentType", "")
-        print(f"[INFO] Stream response contentType: {content_type}")
-
-        # text/event-stream 응답의 SSE data: 라인을 파싱
-        # 각 라인을 순회하며 "data: " 접두사가 있는 라인에서 JSON 이벤트를 추출
-        for line in response["response"].iter_lines(chunk_size=10):
-            if not line:
-                # 빈 라인은 SSE 이벤트 구분자이므로 건너뜀
-                continue
-
-            line_str = line.decode("utf-8")
-
-            # SSE data: 접두사 제거
-            if line_str.startswith("data: "):
-                line_str = line_str[6:]
-            elif line_str.startswith("data:"):
-                line_str = line_str[5:]
-            else:
-                # data: 접두사가 없는 라인 (comment, event, id 등)은 건너뜀
-                continue
-
-            # 빈 데이터 라인 건너뜀
-            stripped = line_str.strip()
-            if not stripped:
-                continue
-
-            # AgentCore SSE 응답은 JSON이 이중 따옴표로 감싸질 수 있음
-            # 예: data: "{"type": "chunk", "content": "Hello"}"
-            # 바깥 따옴표를 제거하여 내부 JSON을 추출
-            if stripped.startswith('"') and stripped.endswith('"'):
-                # 이중 따옴표 감싸기 제거 후 이스케이프된 따옴표 복원
-                inner = stripped[1:-1].replace('\\"', '"').replace('\\\\', '\\')
-                stripped = inner
-
-            # JSON 파싱하여 이벤트 타입별로 yield
-            try:
-                event = json.loads(stripped)
-                if isinstance(event, dict) and "type" in event:
-                    # content가 JSON 문자열로 이중 직렬화된 경우 내부 파싱
-                    if event.get("type") == "chunk" and isinstance(event.get("content"), str):
-                        try:
-                            inner = json.loads(event["content"])
-                            if isinstance(inner, dict) and "type" in inner:
-                                yield inner
-                                continue
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                    # result의 message가 문자열인 경우 파싱
-                    if event.get("type") == "result" and isinstance(event.get("message"), str):
-                        try:
-                            inner_msg = json.loads(event["message"])
-                            event["message"] = inner_msg
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-                    yield event
-                else:
-                    # type 필드가 없는 JSON은 chunk로 래핑
-                    yield {"type": "chunk", "content": json.dumps(event, ensure_ascii=False) if isinstance(event, dict) else stripped}
-            except json.JSONDecodeError:
-                # JSON이 아닌 텍스트 데이터는 chunk로 래핑
-                yield {"type": "chunk", "content": stripped}
+        _log(logging.DEBUG, 'agentcore_stream_response', contentType=response.get("contentType", ""))
+
+        for sse_event in iter_sse_events(iter_raw_chunks(response["response"], read_size)):
+            event = decode_agent_event(sse_event.data)
+            if event is not None:
+                yield event
 
     def invoke_stream_chunks(
         self,
@@ -332,17 +453,32 @@ class AgentCoreClient:
             if config_dict:
                 payload["config"] = config_dict
 
-            print(f"[INFO] Invoking AgentCore stream - ARN: {agent_runtime_arn}")
-            print(f"[INFO] Runtime Session ID: {runtime_session_id}")
+            payload_bytes = json.dumps(payload).encode('utf-8')
+            _log_invoke_start('agentcore_stream_start', agent_runtime_arn, runtime_session_id, payload_bytes)
+            started = time.monotonic()
 
-            response = self.client.invoke_agent_runtime(
+            response = self.get_client('stream').invoke_agent_runtime(
                 agentRuntimeArn=agent_runtime_arn,
                 runtimeSessionId=runtime_session_id,
-                payload=json.dumps(payload).encode('utf-8'),
+                payload=payload_bytes,
             )
 
             # 공통 SSE 파싱 헬퍼를 사용하여 이벤트를 yield
-            yield from self._parse_sse_stream(response)
+            event_count = 0
+            first_event_ms = None
+            for event in self._parse_sse_stream(response):
+                if first_event_ms is None:
+                    first_event_ms = round((time.monotonic() - started) * 1000, 1)
+                event_count += 1
+                yield event
+
+            _log(
+                logging.INFO, 'agentcore_stream_complete',
+                runtimeSessionId=runtime_session_id,
+                events=event_count,
+                firstEventMs=first_event_ms,
+                durationMs=round((time.monotonic() - started) * 1000, 1),
+            )
 
         except Exception as e:
             print(f"[ERROR] AgentCore stream chunks error: {str(e)}")
@@ -399,7 +535,7 @@ def get_agent_runtime_arn(agent_role: str) -> str:
         print(f"[ERROR] No ARN found in env vars for role: {agent_role}")
         return ''
     
-    print(f"[DEBUG] Final ARN for role '{agent_role}': '{base_arn}'")
+    _log(logging.DEBUG, 'agent_runtime_arn', role=agent_role, arn=base_arn)
     return base_arn
 
 
@@ -415,10 +551,14 @@ def get_agent_config_for_session(
       3. 세션 agentId가 비어있으면 → 캠페인의 agentConfigurations[role] 사용
       4. 캠페인 설정도 없으면 → role별 첫 번째 AgentConfig (하위 호환)
 
+    조회 결과는 warm 인스턴스 캐시에 AGENT_CONFIG_CACHE_TTL_SECONDS 동안 보관된다.
+    invalidate_* 훅은 현재 프로세스의 캐시만 비우므로, 다른 Lambda 컨테이너는
+    구성 변경을 TTL이 만료된 뒤에야 반영한다.
+
     Returns:
         (agent_runtime_arn, config): ARN은 환경 변수에서, config는 DynamoDB에서 조회
     """
-    print(f"[DEBUG] get_agent_config_for_session: session={session_id}, role={agent_role}")
+    _log(logging.DEBUG, 'agent_config_for_session', sessionId=session_id, role=agent_role)
 
     # 1. ARN은 환경 변수에서 가져오기 (고정)
     arn = get_agent_runtime_arn(agent_role)
@@ -426,6 +566,12 @@ def get_agent_config_for_session(
     # 2. 세션/캠페인 정보 조회하여 우선순위에 따라 config 결정
     config = _resolve_agent_config(session_id, agent_role)
 
+    if logger.isEnabledFor(logging.DEBUG):
+        _log(logging.DEBUG, 'agent_config_cache', **{
+            name: {'hits': st['hits'], 'misses': st['misses']}
+            for name, st in get_agent_config_cache_stats().items()
+        })
+
     return (arn, config)
 
 
@@ -475,35 +621,20 @@ def get_agent_config_by_role(
     """역할별 사용자 정의 AgentConfiguration을 DynamoDB에서 조회합니다.
     
     ARN은 포함하지 않고, system_prompt, model_id, agent_name만 조회합니다.
+    조회 결과(없음 포함)는 warm 인스턴스 캐시에 TTL 동안 보관됩니다.
     """
-    print(f"[DEBUG] get_agent_config_by_role: role={agent_role}")
+    _log(logging.DEBUG, 'agent_config_by_role', role=agent_role)
     
     if not SESSIONS_TABLE:
         print(f"[WARN] SESSIONS_TABLE not set")
         return None
 
     try:
-        table = dynamodb.Table(SESSIONS_TABLE)
-        print(f"[DEBUG] Querying GSI1 with PK: AGENTCONFIG#{agent_role}")
-        
-        resp = table.query(
-            IndexName='GSI1',
-            KeyConditionExpression='GSI1PK = :pk',
-            ExpressionAttributeValues={
-                ':pk': f'AGENTCONFIG#{agent_role}',
-            },
-            Limit=1
+        config = _agent_config_cache.get_or_load(
+            ('role', agent_role),
+            lambda: _load_agent_config_by_role(agent_role),
         )
-
-        items = resp.get('Items', [])
-        print(f"[DEBUG] Query returned {len(items)} items")
-        
-        if items:
-            print(f"[INFO] Found custom config in DynamoDB")
-            return AgentConfiguration.from_dynamodb_item(items[0])
-
-        print(f"[INFO] No custom config for role={agent_role} in DynamoDB")
-        return None
+        return _copy_config(config)
 
     except Exception as e:
         print(f"[ERROR] Error querying agent config for role {agent_role}: {str(e)}")
@@ -512,6 +643,31 @@ def get_agent_config_by_role(
         return None
 
 
+def _load_agent_config_by_role(agent_role: str) -> Optional[AgentConfiguration]:
+    """GSI1에서 역할별 첫 번째 AgentConfiguration을 조회합니다 (캐시 미스 시)."""
+    table = dynamodb.Table(SESSIONS_TABLE)
+    _log(logging.DEBUG, 'agent_config_query', gsi1pk=f'AGENTCONFIG#{agent_role}')
+    
+    resp = table.query(
+        IndexName='GSI1',
+        KeyConditionExpression='GSI1PK = :pk',
+        ExpressionAttributeValues={
+            ':pk': f'AGENTCONFIG#{agent_role}',
+        },
+        Limit=1
+    )
+
+    items = resp.get('Items', [])
+    _log(logging.DEBUG, 'agent_config_query_result', role=agent_role, items=len(items))
+    
+    if items:
+        print(f"[INFO] Found custom config in DynamoDB")
+        return AgentConfiguration.from_dynamodb_item(items[0])
+
+    print(f"[INFO] No custom config for role={agent_role} in DynamoDB")
+    return None
+
+
 # 하위 호환성을 위한 별칭
 def get_agent_config_for_campaign(
     campaign_id: str,
@@ -529,56 +685,75 @@ def _fallback_config(agent_role: str) -> Optional[AgentConfiguration]:
 
 
 def _get_session_routing_info(session_id: str) -> tuple[str, str]:
-    """세션의 agentId와 campaignId를 조회."""
+    """세션의 agentId와 campaignId를 조회 (warm 인스턴스 캐시 우선)."""
     if not SESSIONS_TABLE:
         return ('', '')
     try:
-        table = dynamodb.Table(SESSIONS_TABLE)
-        resp = table.get_item(
-            Key={'PK': f'SESSION#{session_id}', 'SK': 'METADATA'},
-            ProjectionExpression='agentId, campaignId',
+        return _session_routing_cache.get_or_load(
+            session_id, lambda: _load_session_routing_info(session_id)
         )
-        item = resp.get('Item', {})
-        return (item.get('agentId', '') or '', item.get('campaignId', '') or '')
     except Exception as e:
         print(f"[WARN] Failed to fetch session routing info for {session_id}: {e}")
         return ('', '')
 
 
+def _load_session_routing_info(session_id: str) -> tuple[str, str]:
+    table = dynamodb.Table(SESSIONS_TABLE)
+    resp = table.get_item(
+        Key={'PK': f'SESSION#{session_id}', 'SK': 'METADATA'},
+        ProjectionExpression='agentId, campaignId',
+    )
+    item = resp.get('Item', {})
+    return (item.get('agentId', '') or '', item.get('campaignId', '') or '')
+
+
 def _get_campaign_for_routing(campaign_id: str) -> Optional[dict]:
-    """캠페인의 campaignType과 agentConfigurations 조회."""
-    import os
+    """캠페인의 campaignType과 agentConfigurations 조회 (warm 인스턴스 캐시 우선)."""
     campaigns_table = os.environ.get('CAMPAIGNS_TABLE')
     if not campaigns_table or not campaign_id:
         return None
     try:
-        table = dynamodb.Table(campaigns_table)
-        resp = table.get_item(
-            Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA'},
-            ProjectionExpression='campaignType, agentConfigurations',
+        return _campaign_routing_cache.get_or_load(
+            campaign_id, lambda: _load_campaign_for_routing(campaigns_table, campaign_id)
         )
-        return resp.get('Item')
     except Exception as e:
         print(f"[WARN] Failed to fetch campaign {campaign_id} for routing: {e}")
         return None
 
 
+def _load_campaign_for_routing(campaigns_table: str, campaign_id: str) -> Optional[dict]:
+    table = dynamodb.Table(campaigns_table)
+    resp = table.get_item(
+        Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': 'METADATA'},
+        ProjectionExpression='campaignType, agentConfigurations',
+    )
+    return resp.get('Item')
+
+
 def _get_config_by_id(config_id: str) -> Optional[AgentConfiguration]:
-    """configId로 AgentConfiguration 직접 조회."""
+    """configId로 AgentConfiguration 직접 조회 (warm 인스턴스 캐시 우선)."""
     if not SESSIONS_TABLE or not config_id:
         return None
     try:
-        table = dynamodb.Table(SESSIONS_TABLE)
-        resp = table.get_item(
-            Key={'PK': f'AGENTCONFIG#{config_id}', 'SK': 'METADATA'},
+        config = _agent_config_cache.get_or_load(
+            ('id', config_id), lambda: _load_config_by_id(config_id)
         )
-        item = resp.get('Item')
-        if item:
-            return AgentConfiguration.from_dynamodb_item(item)
+        return _copy_config(config)
     except Exception as e:
         print(f"[WARN] Failed to fetch config {config_id}: {e}")
     return None
 
 
+def _load_config_by_id(config_id: str) -> Optional[AgentConfiguration]:
+    table = dynamodb.Table(SESSIONS_TABLE)
+    resp = table.get_item(
+        Key={'PK': f'AGENTCONFIG#{config_id}', 'SK': 'METADATA'},
+    )
+    item = resp.get('Item')
+    if item:
+        return AgentConfiguration.from_dynamodb_item(item)
+    return None
+
+
 # 공개 API: configId로 AgentConfiguration을 조회한다.
 get_agent_config_by_id = _get_config_by_id
@@ -0,0 +1,1422 @@
+"""
+캠페인 분석 집계 (Materialized Aggregate)
+
+CampaignsTable의 PK=CAMPAIGN#{campaignId}, SK=ANALYTICS 아이템에
+세션/피드백 변경분을 DynamoDB Streams 소비자(stream_handler)에서 누적하여
+캠페인 분석 API가 GetItem 한 번으로 응답하도록 한다.
+
+아이템 속성 (숫자 속성이 없으면 0으로 간주):
+  totalSessions, durationSum, durationCount, csatSum, csatCount
+  status:{status}          상태별 세션 수
+  purpose:{purpose}        상담 목적 히스토그램
+  company:{company}        고객사 히스토그램
+  completedOn:{YYYY-MM-DD} 완료일별 완료 세션 수
+  csatRating:{rating}      CSAT 평점 히스토그램 (0.5 단위)
+
+동적 키를 최상위 속성으로 펼쳐 두면 UpdateItem ADD 한 번으로 처음 보는 키도
+원자적으로 증감할 수 있다 (중첩 Map은 상위 Map이 없으면 ADD가 실패한다).
+
+rebuiltAt이 있는 아이템만 분석 API가 사용한다. 스트림 ADD는 아이템이 없으면 새로 만들므로
+rebuild 전에 생긴 아이템은 그 이전 세션이 빠진 부분 집계이기 때문이다.
+새 캠페인은 생성 시 빈 집계(empty_campaign_aggregate)를 rebuiltAt과 함께 기록한다.
+
+DynamoDB Streams는 at-least-once 전달이고 Lambda는 실패한 배치를 다시 전달하므로,
+스트림 레코드 하나의 증감분은 eventID 적용 마커(STREAM_EVENT#{eventID})와 함께
+TransactWriteItems로 한 번만 반영한다 (apply_stream_updates).
+반영에 실패하면 mark_aggregates_stale로 rebuiltAt을 지워 rebuild 전까지 재계산 경로를 쓰게 한다.
+rebuild_campaign_aggregate로 언제든 원본 세션/피드백에서 재계산할 수 있다.
+
+전체 캠페인 요약 (PK=CAMPAIGN_SUMMARY, SK=ANALYTICS):
+  totalCampaigns, campaignStatus:{status}  캠페인 수/상태별 캠페인 수 (캠페인 스트림)
+  totalSessions, completedSessions         캠페인 세션 수/완료 수 (세션 스트림)
+  topCampaigns  완료율 상위 후보 캠페인 {campaignId: {campaignName, sessions, completed}}
+                최대 SUMMARY_TOP_CANDIDATES개. 후보의 세션 수는 세션 스트림이 증감하고,
+                후보 밖 캠페인은 완료율이 후보 최저보다 높아지면 그 후보를 밀어내고 들어온다.
+                후보의 완료율이 떨어져도 더 높은 후보 밖 캠페인을 알 수 없으므로 근사치이며 rebuild가 정확히 맞춘다.
+요약 API는 이 아이템 하나를 GetItem으로 읽는다. 증감분은 캠페인 집계와 같은 트랜잭션(eventID 마커)으로
+반영되고, 후보 변경은 읽은 상태를 조건으로 걸어 충돌하면 다시 읽어 재시도한다.
+rebuild_summary_aggregate로 캠페인 METADATA와 캠페인별 집계에서 재계산할 수 있다.
+
+캠페인 시계열 버킷 (PK=CAMPAIGN#{campaignId}, SK=DAY#{YYYY-MM-DD} / HOUR#{YYYY-MM-DDTHH}, UTC):
+  created                  해당 버킷에 생성된 세션 수
+  completed                해당 버킷에 완료된 세션 수
+  durationSum/Count        해당 버킷에 완료된 세션의 소요 시간(분)
+  csatSum/Count            해당 버킷에 제출된 CSAT
+정렬 키가 시간순이므로 from/to 조회는 SK BETWEEN으로 필요한 버킷만 읽는다.
+시간 단위 버킷은 CAMPAIGN_HOURLY_BUCKETS=true일 때만 유지한다.
+
+캠페인 CSAT 피드 (PK=CAMPAIGN#{campaignId}, SK=CSAT#{completedAt}#{sessionId}):
+  피드백 항목(고객/평점/서술/완료 시각) 하나당 아이템 하나
+  chat_handler.handle_feedback이 FEEDBACK 저장 시 함께 기록하며, 정렬 키가 완료 시각순이므로
+  피드 API는 최신순 Query + 커서 페이지로 필요한 만큼만 읽는다.
+  집계 아이템에는 평균과 히스토그램만 두어 피드백 수와 무관하게 크기가 일정하다.
+
+스케치 모드 (CAMPAIGN_SKETCHES, 기본 true):
+  company: 히스토그램은 고유 고객사 수만큼 속성이 늘어나 아이템 크기 한도(400KB)에 닿으므로
+  기본으로 고정 크기 스케치(shared/sketches.py)를 같은 ANALYTICS 아이템에 저장한다.
+  CAMPAIGN_SKETCHES=false(정확한 히스토그램)는 고객사 수가 적은 환경에서만 사용한다.
+  sketch:companiesHll      고유 고객사 수 (HyperLogLog, Binary)
+  sketch:companiesCms      고객사별 세션 수 (Count-Min, Binary)
+  sketch:companiesTop      상위 고객사 후보 (Space-Saving, Map)
+  sketch:purposesCms       상담 목적별 세션 수 (Count-Min, Binary)
+  sketch:purposesTop       상위 상담 목적 후보 (Space-Saving, Map)
+  sketch:config            스케치 크기 (precision/width/depth/capacity)
+  sketchVersion            낙관적 동시성 제어용 버전
+  스케치는 ADD로 증감할 수 없으므로 읽은 뒤 새 값을 sketchVersion 조건과 함께 쓰며,
+  이 쓰기는 세션 레코드의 다른 증감분과 같은 트랜잭션(eventID 마커)에 들어간다.
+  오차 범위는 SKETCH_HLL_ERROR / SKETCH_CMS_EPSILON / SKETCH_CMS_DELTA / SKETCH_TOP_CAPACITY로 설정하며,
+  이미 저장된 스케치는 저장된 크기를 계속 사용한다 (설정 변경은 rebuild 후 반영).
+"""
+
+import os
+import time
+
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Iterable, Optional
+
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+from dynamodb_utils import batch_get_items, iter_query, iter_scan
+from sketches import CountMinSketch, HyperLogLog, SpaceSaving
+from utils import get_timestamp
+
+ANALYTICS_SK = 'ANALYTICS'
+
+STATUS_PREFIX = 'status:'
+PURPOSE_PREFIX = 'purpose:'
+COMPANY_PREFIX = 'company:'
+COMPLETED_ON_PREFIX = 'completedOn:'
+CSAT_RATING_PREFIX = 'csatRating:'
+
+SUMMARY_PK = 'CAMPAIGN_SUMMARY'
+CAMPAIGN_STATUS_PREFIX = 'campaignStatus:'
+SUMMARY_TOP_ATTR = 'topCampaigns'
+
+# 요약 응답의 완료율 상위 캠페인 수와 요약 아이템에 유지하는 후보 수
+SUMMARY_TOP_CAMPAIGNS = 5
+SUMMARY_TOP_CANDIDATES = int(os.environ.get('SUMMARY_TOP_CANDIDATES', '20'))
+# 요약 후보/스케치 조건부 트랜잭션 충돌 시 재시도 횟수
+AGGREGATE_UPDATE_MAX_ATTEMPTS = 5
+
+DAY_BUCKET_PREFIX = 'DAY#'
+HOUR_BUCKET_PREFIX = 'HOUR#'
+HOURLY_BUCKETS = os.environ.get('CAMPAIGN_HOURLY_BUCKETS', 'false').lower() == 'true'
+
+SKETCHES_ENABLED = os.environ.get('CAMPAIGN_SKETCHES', 'true').lower() == 'true'
+SKETCH_HLL_ERROR = float(os.environ.get('SKETCH_HLL_ERROR', '0.02'))
+SKETCH_CMS_EPSILON = float(os.environ.get('SKETCH_CMS_EPSILON', '0.01'))
+SKETCH_CMS_DELTA = float(os.environ.get('SKETCH_CMS_DELTA', '0.01'))
+SKETCH_TOP_CAPACITY = int(os.environ.get('SKETCH_TOP_CAPACITY', '100'))
+SKETCH_PREFIX = 'sketch:'
+SKETCH_VERSION_ATTR = 'sketchVersion'
+
+# 스트림 레코드 적용 마커 (스트림 보존 기간 24시간보다 길게 유지)
+STREAM_EVENT_PREFIX = 'STREAM_EVENT#'
+STREAM_EVENT_MARKER_TTL_SECONDS = 2 * 24 * 3600
+
+CSAT_FEED_PREFIX = 'CSAT#'
+# 피드 페이지 하나를 채우기 위한 최대 Query 횟수 (평점 필터로 걸러지는 경우)
+CSAT_FEED_MAX_QUERIES = 5
+
+# 피드 응답 크기 보호를 위한 피드백 서술 최대 길이
+FEEDBACK_NARRATIVE_MAX_CHARS = 1000
+
+_deserializer = TypeDeserializer()
+
+
+def analytics_key(campaign_id: str) -> dict:
+    return {'PK': f'CAMPAIGN#{campaign_id}', 'SK': ANALYTICS_SK}
+
+
+def summary_key() -> dict:
+    return {'PK': SUMMARY_PK, 'SK': ANALYTICS_SK}
+
+
+class AggregateUpdateConflict(Exception):
+    """조건부 집계 갱신이 읽은 뒤 바뀐 상태와 충돌함 (다시 읽어 재시도)"""
+
+
+def deserialize_image(image: Optional[dict]) -> dict:
+    """스트림 레코드의 NewImage/OldImage(DynamoDB JSON)를 파이썬 dict로 변환합니다."""
+    if not image:
+        return {}
+    return {k: _deserializer.deserialize(v) for k, v in image.items()}
+
+
+def split_purposes(purposes: str) -> list[str]:
+    """다중 상담 목적 문자열('|', ',', ';' 구분)을 목록으로 분리합니다."""
+    if not purposes:
+        return []
+    normalized = purposes.replace('|', ';').replace(',', ';')
+    return [p.strip() for p in normalized.split(';') if p.strip()]
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def session_contribution(session: dict) -> Counter:
+    """세션 METADATA 하나가 캠페인 집계에 기여하는 값"""
+    contribution = Counter()
+    if not session:
+        return contribution
+
+    status = session.get('status') or 'unknown'
+    contribution['totalSessions'] += 1
+    contribution[f'{STATUS_PREFIX}{status}'] += 1
+
+    created = _parse_timestamp(session.get('createdAt'))
+    completed = _parse_timestamp(session.get('completedAt'))
+    if created and completed:
+        contribution['durationSum'] += Decimal(str(round((completed - created).total_seconds() / 60, 4)))
+        contribution['durationCount'] += 1
+    if status == 'completed' and completed:
+        contribution[f'{COMPLETED_ON_PREFIX}{completed.date().isoformat()}'] += 1
+
+    for purpose in split_purposes(session.get('consultationPurposes', '')):
+        contribution[f'{PURPOSE_PREFIX}{purpose}'] += 1
+
+    company = (session.get('customerInfo') or {}).get('company', '')
+    if company:
+        contribution[f'{COMPANY_PREFIX}{company}'] += 1
+    return contribution
+
+
+def feedback_contribution(feedback: dict) -> Counter:
+    """FEEDBACK 아이템 하나가 캠페인 CSAT 집계에 기여하는 값"""
+    contribution = Counter()
+    rating = (feedback or {}).get('rating')
+    if rating is not None:
+        contribution['csatSum'] += Decimal(str(rating))
+        contribution['csatCount'] += 1
+        contribution[f'{CSAT_RATING_PREFIX}{rating_bucket(rating)}'] += 1
+    return contribution
+
+
+def rating_bucket(rating) -> str:
+    """CSAT 평점 히스토그램 키 (예: 4.5 -> '4.5', 3 -> '3')"""
+    return f'{float(rating):g}'
+
+
+def diff_contributions(old: Counter, new: Counter) -> dict:
+    """new - old 중 0이 아닌 증감분만 반환합니다 (음수 포함)."""
+    delta = {}
+    for key in set(old) | set(new):
+        value = new.get(key, 0) - old.get(key, 0)
+        if value:
+            delta[key] = value
+    return delta
+
+
+def feedback_entry(session_id: str, feedback: dict, session: Optional[dict] = None) -> dict:
+    """CSAT 피드에 노출할 피드백 항목"""
+    session = session or {}
+    customer_info = session.get('customerInfo') or {}
+    return {
+        'sessionId': session_id,
+        'customerName': customer_info.get('name', 'Unknown'),
+        'customerCompany': customer_info.get('company', 'Unknown'),
+        'rating': Decimal(str(feedback.get('rating'))),
+        'narrative': (feedback.get('feedback') or '')[:FEEDBACK_NARRATIVE_MAX_CHARS],
+        'completedAt': session.get('completedAt', ''),
+    }
+
+
+def csat_feed_item(campaign_id: str, session_id: str, feedback: dict, session: Optional[dict] = None) -> dict:
+    """CSAT 피드 아이템을 만듭니다.
+
+    정렬 키는 제출 시점의 세션 완료 시각(미완료면 생성 시각)이므로 세션이 그 사이 완료되면
+    재제출의 키가 달라진다. 세션당 한 항목을 유지하도록 chat_handler.handle_feedback은
+    FEEDBACK 아이템에 피드 키(csatFeedSK)를 저장하고 재제출 시 이전 키의 아이템을 지운다.
+    """
+    session = session or {}
+    sort_at = session.get('completedAt') or session.get('createdAt') or feedback.get('timestamp', '')
+    item = {
+        'PK': f'CAMPAIGN#{campaign_id}',
+        'SK': f'{CSAT_FEED_PREFIX}{sort_at}#{session_id}',
+        'campaignId': campaign_id,
+        **feedback_entry(session_id, feedback, session),
+        'submittedAt': feedback.get('timestamp', ''),
+    }
+    if feedback.get('ttl'):
+        item['ttl'] = feedback['ttl']
+    return item
+
+
+def query_csat_feed(
+    campaigns_table,
+    campaign_id: str,
+    limit: int,
+    exclusive_start_key: Optional[dict] = None,
+    min_rating: Optional[float] = None,
+    max_rating: Optional[float] = None,
+) -> tuple[list[dict], Optional[dict]]:
+    """CSAT 피드를 완료 시각 최신순으로 한 페이지 조회합니다.
+
+    평점 필터는 FilterExpression으로 적용한다. 남은 개수만큼만 Limit으로 읽으므로
+    limit을 넘겨 읽지 않고, 걸러진 만큼은 최대 CSAT_FEED_MAX_QUERIES번까지 이어서 채운다.
+
+    Returns:
+        (피드 아이템 목록, 다음 페이지 ExclusiveStartKey 또는 None)
+    """
+    kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'CAMPAIGN#{campaign_id}') & Key('SK').begins_with(CSAT_FEED_PREFIX),
+        'ScanIndexForward': False,
+    }
+    rating_filter = None
+    if min_rating is not None:
+        rating_filter = Attr('rating').gte(Decimal(str(min_rating)))
+    if max_rating is not None:
+        upper = Attr('rating').lte(Decimal(str(max_rating)))
+        rating_filter = upper if rating_filter is None else rating_filter & upper
+    if rating_filter is not None:
+        kwargs['FilterExpression'] = rating_filter
+
+    items: list[dict] = []
+    last_key = exclusive_start_key
+    for _ in range(CSAT_FEED_MAX_QUERIES):
+        if last_key:
+            kwargs['ExclusiveStartKey'] = last_key
+        resp = campaigns_table.query(Limit=limit - len(items), **kwargs)
+        items.extend(resp.get('Items', []))
+        last_key = resp.get('LastEvaluatedKey')
+        if not last_key or len(items) >= limit:
+            break
+    return items, last_key
+
+
+def csat_feed_entry(item: dict) -> dict:
+    """CSAT 피드 아이템을 API 응답 항목으로 변환합니다."""
+    return {
+        'sessionId': item.get('sessionId', ''),
+        'customerName': item.get('customerName', 'Unknown'),
+        'customerCompany': item.get('customerCompany', 'Unknown'),
+        'rating': float(item.get('rating', 0)),
+        'narrative': item.get('narrative', ''),
+        'completedAt': item.get('completedAt', ''),
+        'submittedAt': item.get('submittedAt', ''),
+    }
+
+
+def apply_campaign_delta(
+    campaigns_table,
+    campaign_id: str,
+    delta: dict,
+    set_attributes: Optional[dict] = None,
+    remove_attributes: Iterable[str] = (),
+) -> bool:
+    """캠페인 집계 아이템에 증감분을 원자적으로 반영합니다.
+
+    Returns:
+        UpdateItem 수행 여부 (변경분이 없으면 False)
+    """
+    if not campaign_id:
+        return False
+    return _apply_delta(
+        campaigns_table, analytics_key(campaign_id), delta, set_attributes, remove_attributes,
+        base_attributes={'campaignId': campaign_id},
+    )
+
+
+def _apply_delta(
+    table,
+    key: dict,
+    delta: dict,
+    set_attributes: Optional[dict],
+    remove_attributes: Iterable[str],
+    base_attributes: Optional[dict] = None,
+) -> bool:
+    update = _delta_update(key, delta, set_attributes, remove_attributes, base_attributes)
+    if update is None:
+        return False
+    table.update_item(**update)
+    return True
+
+
+def _delta_update(
+    key: dict,
+    delta: dict,
+    set_attributes: Optional[dict] = None,
+    remove_attributes: Iterable[str] = (),
+    base_attributes: Optional[dict] = None,
+    extra: Optional[dict] = None,
+) -> Optional[dict]:
+    """증감분을 반영하는 UpdateItem 인자 (변경분이 없으면 None)
+
+    Args:
+        extra: 직접 만든 식 조각 {'set': [...], 'remove': [...], 'names', 'values', 'condition'}
+    """
+    set_attributes = set_attributes or {}
+    remove_attributes = list(remove_attributes)
+    extra = extra or {}
+    if not (delta or set_attributes or remove_attributes or extra.get('set') or extra.get('remove')):
+        return None
+
+    names = {}
+    values = {':updated_at': get_timestamp()}
+    add_parts = []
+    set_parts = ['updatedAt = :updated_at']
+    remove_parts = []
+
+    for i, (attr, value) in enumerate(sorted((base_attributes or {}).items())):
+        names[f'#b{i}'] = attr
+        values[f':b{i}'] = value
+        set_parts.append(f'#b{i} = :b{i}')
+    for i, (attr, value) in enumerate(sorted(delta.items())):
+        names[f'#a{i}'] = attr
+        values[f':a{i}'] = value if isinstance(value, Decimal) else Decimal(value)
+        add_parts.append(f'#a{i} :a{i}')
+    for i, (attr, value) in enumerate(sorted(set_attributes.items())):
+        names[f'#s{i}'] = attr
+        values[f':s{i}'] = value
+        set_parts.append(f'#s{i} = :s{i}')
+    for i, attr in enumerate(remove_attributes):
+        names[f'#r{i}'] = attr
+        remove_parts.append(f'#r{i}')
+    set_parts.extend(extra.get('set', ()))
+    remove_parts.extend(extra.get('remove', ()))
+    names.update(extra.get('names') or {})
+    values.update(extra.get('values') or {})
+
+    expression = 'SET ' + ', '.join(set_parts)
+    if add_parts:
+        expression += ' ADD ' + ', '.join(add_parts)
+    if remove_parts:
+        expression += ' REMOVE ' + ', '.join(remove_parts)
+
+    kwargs = {
+        'Key': key,
+        'UpdateExpression': expression,
+        'ExpressionAttributeValues': values,
+    }
+    if names:
+        kwargs['ExpressionAttributeNames'] = names
+    if extra.get('condition'):
+        kwargs['ConditionExpression'] = extra['condition']
+    return kwargs
+
+
+def campaign_delta_update(campaign_id: str, delta: dict, extra: Optional[dict] = None) -> Optional[dict]:
+    """캠페인 집계 아이템 증감분의 UpdateItem 인자 (apply_stream_updates 용도)"""
+    if not campaign_id:
+        return None
+    return _delta_update(analytics_key(campaign_id), delta, base_attributes={'campaignId': campaign_id}, extra=extra)
+
+
+def summary_delta_update(delta: dict, extra: Optional[dict] = None) -> Optional[dict]:
+    """전체 요약 아이템 증감분의 UpdateItem 인자 (apply_stream_updates 용도)"""
+    return _delta_update(summary_key(), {key: value for key, value in delta.items() if value}, extra=extra)
+
+
+def bucket_delta_updates(campaign_id: str, bucket_deltas: dict) -> list[dict]:
+    """시계열 버킷별 증감분의 UpdateItem 인자 목록 (apply_stream_updates 용도)"""
+    if not campaign_id:
+        return []
+    updates = []
+    for sk, delta in sorted(bucket_deltas.items()):
+        update = _delta_update(bucket_key(campaign_id, sk), delta, base_attributes={'campaignId': campaign_id})
+        if update is not None:
+            updates.append(update)
+    return updates
+
+
+def apply_stream_updates(
+    campaigns_table,
+    event_id: Optional[str],
+    updates: Iterable[Optional[dict]],
+) -> bool:
+    """스트림 레코드 하나의 집계 갱신을 한 번만 반영합니다.
+
+    모든 UpdateItem과 eventID 적용 마커(attribute_not_exists 조건)를 하나의 TransactWriteItems로
+    기록하므로 Lambda가 배치를 다시 전달해도 같은 레코드의 ADD가 두 번 반영되지 않는다.
+    eventID가 없으면 마커 없이 트랜잭션으로만 반영한다.
+
+    Returns:
+        이미 반영된 레코드면 False, 그 외에는 True (반영할 변경분이 없어도 True)
+
+    Raises:
+        AggregateUpdateConflict: 갱신에 건 조건(읽은 상태)이 맞지 않아 트랜잭션이 취소됨
+    """
+    updates = [update for update in updates if update is not None]
+    if not updates:
+        return True
+
+    transact_items = []
+    if event_id:
+        transact_items.append({'Put': {
+            'TableName': campaigns_table.name,
+            'Item': {
+                'PK': f'{STREAM_EVENT_PREFIX}{event_id}',
+                'SK': 'APPLIED',
+                'ttl': int(time.time()) + STREAM_EVENT_MARKER_TTL_SECONDS,
+            },
+            'ConditionExpression': 'attribute_not_exists(PK)',
+        }})
+    transact_items.extend({'Update': {'TableName': campaigns_table.name, **update}} for update in updates)
+
+    try:
+        campaigns_table.meta.client.transact_write_items(TransactItems=transact_items)
+        return True
+    except ClientError as e:
+        reasons = e.response.get('CancellationReasons') or []
+        if event_id and reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+            print(f"Skipping already applied stream record {event_id}")
+            return False
+        if any(reason.get('Code') == 'ConditionalCheckFailed' for reason in reasons):
+            raise AggregateUpdateConflict(str(e)) from e
+        raise
+
+
+def mark_aggregates_stale(campaigns_table, campaign_ids: Iterable[str], summary: bool = False) -> None:
+    """반영하지 못한 변경분이 있는 집계의 rebuiltAt을 지워 rebuild 전까지 API가 재계산 경로(요약은 stale 표시)를 쓰게 합니다.
+
+    없는 아이템은 만들지 않으며, 실패는 경고만 남긴다.
+    """
+    keys = [analytics_key(campaign_id) for campaign_id in dict.fromkeys(campaign_ids) if campaign_id]
+    if summary:
+        keys.append(summary_key())
+    for key in keys:
+        try:
+            campaigns_table.update_item(
+                Key=key,
+                UpdateExpression='SET staleAt = :now REMOVE rebuiltAt',
+                ConditionExpression='attribute_exists(PK)',
+                ExpressionAttributeValues={':now': get_timestamp()},
+            )
+            print(f"[WARN] Marked aggregate {key['PK']}/{key['SK']} stale - run rebuild_campaign_analytics")
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                print(f"[WARN] Failed to mark aggregate {key['PK']} stale: {str(e)}")
+
+
+def campaign_contribution(campaign: dict) -> Counter:
+    """캠페인 METADATA 하나가 전체 요약에 기여하는 값"""
+    contribution = Counter()
+    if not campaign:
+        return contribution
+    contribution['totalCampaigns'] += 1
+    contribution[f'{CAMPAIGN_STATUS_PREFIX}{campaign.get("status") or "unknown"}'] += 1
+    return contribution
+
+
+def summary_session_delta(campaign_id: str, delta: dict) -> Counter:
+    """캠페인 집계 증감분 중 전체 요약에 반영할 세션 수 증감분"""
+    summary_delta = Counter()
+    if campaign_id:
+        summary_delta['totalSessions'] += delta.get('totalSessions', 0)
+        summary_delta['completedSessions'] += delta.get(f'{STATUS_PREFIX}completed', 0)
+    return summary_delta
+
+
+def _completion_rate(entry: dict) -> float:
+    # 세션이 없는 후보는 가장 먼저 밀려난다
+    sessions = _int(entry.get('sessions'))
+    return _int(entry.get('completed')) / sessions if sessions > 0 else -1.0
+
+
+def _top_entry(name: str, sessions: int, completed: int) -> dict:
+    return {'campaignName': name, 'sessions': Decimal(sessions), 'completed': Decimal(completed)}
+
+
+def _read_summary_top(campaigns_table) -> Optional[dict]:
+    """요약 아이템의 상위 후보 맵 (요약이 rebuild되지 않아 후보가 없으면 None)"""
+    item = campaigns_table.get_item(
+        Key=summary_key(),
+        ProjectionExpression='#top',
+        ExpressionAttributeNames={'#top': SUMMARY_TOP_ATTR},
+        ConsistentRead=True,
+    ).get('Item') or {}
+    return item.get(SUMMARY_TOP_ATTR)
+
+
+def _equals_condition(name: str, value_name: str, value: int) -> str:
+    # ADD로만 쌓이는 카운터는 0이면 속성이 없을 수 있다
+    if value == 0:
+        return f'(attribute_not_exists({name}) OR {name} = {value_name})'
+    return f'{name} = {value_name}'
+
+
+def summary_top_parts(
+    top: dict,
+    member_deltas: dict,
+    candidates: dict,
+    load_name: Callable[[str], str],
+    capacity: Optional[int] = None,
+) -> tuple[Optional[dict], set]:
+    """세션 수 증감을 상위 후보 맵에 반영하는 식 조각을 만듭니다.
+
+    Args:
+        top: 읽은 후보 맵
+        member_deltas: 후보인 캠페인의 {campaignId: (세션 증감, 완료 증감)}
+        candidates: 후보가 아닌 캠페인의 {campaignId: (반영 후 세션 수, 반영 후 완료 수)}
+        load_name: 새로 들어오는 캠페인의 이름 조회 함수
+
+    Returns:
+        (식 조각 또는 None, 새로 후보가 된 캠페인 ID 집합)
+        식 조각에는 읽은 상태가 그대로인지 확인하는 조건이 들어 있다.
+    """
+    capacity = capacity or SUMMARY_TOP_CANDIDATES
+    top = {campaign_id: dict(entry) for campaign_id, entry in top.items()}
+    read_size = len(top)
+    names = {'#top': SUMMARY_TOP_ATTR}
+    values = {}
+    set_parts = []
+    remove_parts = []
+    conditions = []
+
+    for i, (campaign_id, (sessions_delta, completed_delta)) in enumerate(sorted(member_deltas.items())):
+        names.update({f'#tm{i}': campaign_id, '#ts': 'sessions', '#tcm': 'completed'})
+        values[f':tms{i}'] = Decimal(sessions_delta)
+        values[f':tmc{i}'] = Decimal(completed_delta)
+        set_parts.append(f'#top.#tm{i}.#ts = #top.#tm{i}.#ts + :tms{i}')
+        set_parts.append(f'#top.#tm{i}.#tcm = #top.#tm{i}.#tcm + :tmc{i}')
+        conditions.append(f'attribute_exists(#top.#tm{i})')
+        top[campaign_id]['sessions'] = _int(top[campaign_id].get('sessions')) + sessions_delta
+        top[campaign_id]['completed'] = _int(top[campaign_id].get('completed')) + completed_delta
+
+    inserted = set()
+    for i, (campaign_id, (sessions, completed)) in enumerate(sorted(candidates.items())):
+        names[f'#tn{i}'] = campaign_id
+        # 다른 레코드가 먼저 후보로 넣었다면 이 증감분이 빠지므로 충돌로 처리한다
+        conditions.append(f'attribute_not_exists(#top.#tn{i})')
+        entry = _top_entry('', sessions, completed)
+        if sessions <= 0:
+            continue
+        if len(top) >= capacity:
+            evictable = [cid for cid in top if cid not in member_deltas]
+            if not evictable:
+                continue
+            lowest = min(evictable, key=lambda cid: (_completion_rate(top[cid]), cid))
+            if _completion_rate(entry) <= _completion_rate(top[lowest]):
+                continue
+            names[f'#te{i}'] = lowest
+            remove_parts.append(f'#top.#te{i}')
+            conditions.append(f'attribute_exists(#top.#te{i})')
+            del top[lowest]
+        entry['campaignName'] = load_name(campaign_id)
+        values[f':tn{i}'] = entry
+        set_parts.append(f'#top.#tn{i} = :tn{i}')
+        top[campaign_id] = entry
+        inserted.add(campaign_id)
+
+    if not (set_parts or remove_parts):
+        return None, inserted
+    if inserted:
+        # 동시에 다른 후보가 들어와 크기 한도를 넘지 않도록 읽은 크기를 조건으로 건다
+        values[':tsize'] = read_size
+        conditions.append('size(#top) = :tsize')
+    return {
+        'set': set_parts,
+        'remove': remove_parts,
+        'names': names,
+        'values': values,
+        'condition': ' AND '.join(conditions),
+    }, inserted
+
+
+def _merge_extras(*extras: Optional[dict]) -> Optional[dict]:
+    """_delta_update 식 조각들을 하나로 합칩니다 (조건은 AND)."""
+    extras = [extra for extra in extras if extra]
+    if not extras:
+        return None
+    merged = {'set': [], 'remove': [], 'names': {}, 'values': {}}
+    conditions = []
+    for extra in extras:
+        merged['set'].extend(extra.get('set', ()))
+        merged['remove'].extend(extra.get('remove', ()))
+        merged['names'].update(extra.get('names') or {})
+        merged['values'].update(extra.get('values') or {})
+        if extra.get('condition'):
+            conditions.append(f'({extra["condition"]})')
+    if conditions:
+        merged['condition'] = ' AND '.join(conditions)
+    return merged
+
+
+def apply_session_aggregate_updates(
+    campaigns_table,
+    event_id: Optional[str],
+    deltas: list,
+    sketch_changes: Iterable[tuple] = (),
+    max_attempts: int = AGGREGATE_UPDATE_MAX_ATTEMPTS,
+) -> bool:
+    """세션 레코드 하나의 캠페인 집계/스케치/버킷/전체 요약 증감분을 한 트랜잭션으로 반영합니다.
+
+    스케치와 요약의 상위 후보 맵은 ADD로 갱신할 수 없으므로 읽은 값에서 새 값을 계산하고,
+    읽은 상태(sketchVersion, 후보 맵, 새 후보의 세션 수)를 조건으로 걸어 같은 트랜잭션에 넣는다.
+    충돌하면 다시 읽어 재시도하고, 재시도를 모두 소진하면 ADD 증감분만 반영한 뒤
+    빠진 스케치의 캠페인 집계와 요약을 stale로 표시한다.
+    트랜잭션 전 읽기: 세션 수가 바뀌면 후보 맵 GetItem 한 번, 스케치가 바뀌거나 후보가 아닌
+    캠페인은 캠페인 집계 GetItem 한 번 (새로 후보가 될 때만 캠페인 이름을 한 번 더 읽는다).
+
+    Args:
+        deltas: [(campaign_id, 집계 증감분, 버킷 증감분)]
+        sketch_changes: [(campaign_id, 뺄 이전 세션 이미지, 더할 새 세션 이미지)]
+
+    Returns:
+        apply_stream_updates와 같음 (이미 반영된 레코드면 False)
+    """
+    sketch_changes = [
+        (campaign_id, removed, added) for campaign_id, removed, added in sketch_changes
+        if campaign_id and sketch_fields(removed) != sketch_fields(added)
+    ]
+    summary_delta = Counter()
+    top_deltas = {}
+    for campaign_id, delta, _ in deltas:
+        session_delta = summary_session_delta(campaign_id, delta)
+        summary_delta.update(session_delta)
+        if session_delta['totalSessions'] or session_delta['completedSessions']:
+            top_deltas[campaign_id] = (session_delta['totalSessions'], session_delta['completedSessions'])
+
+    def _updates(top_extra=None, campaign_extras=None):
+        campaign_extras = dict(campaign_extras or {})
+        updates = []
+        for campaign_id, delta, bucket_deltas in deltas:
+            updates.append(campaign_delta_update(campaign_id, delta, extra=campaign_extras.pop(campaign_id, None)))
+            updates.extend(bucket_delta_updates(campaign_id, bucket_deltas))
+        for campaign_id, extra in campaign_extras.items():
+            updates.append(campaign_delta_update(campaign_id, {}, extra=extra))
+        updates.append(summary_delta_update(summary_delta, extra=top_extra))
+        return updates
+
+    if not (top_deltas or sketch_changes):
+        return apply_stream_updates(campaigns_table, event_id, _updates())
+
+    load_name = lambda cid: campaigns_table.get_item(  # noqa: E731
+        Key={'PK': f'CAMPAIGN#{cid}', 'SK': 'METADATA'}, ProjectionExpression='campaignName',
+    ).get('Item', {}).get('campaignName', '')
+
+    top = None
+    for _ in range(max_attempts):
+        top = _read_summary_top(campaigns_table) if top_deltas else None
+        sketch_ids = {campaign_id for campaign_id, _, _ in sketch_changes}
+        read_ids = sketch_ids | {cid for cid in top_deltas if top is not None and cid not in top}
+        items = {campaign_id: _read_campaign_state(campaigns_table, campaign_id) for campaign_id in sorted(read_ids)}
+
+        campaign_extras = {}
+        for campaign_id, removed, added in sketch_changes:
+            campaign_extras[campaign_id] = sketch_update_parts(items[campaign_id], removed, added)
+
+        top_extra = None
+        if top is not None:
+            members = {cid: change for cid, change in top_deltas.items() if cid in top}
+            current = {
+                cid: (_int(items[cid].get('totalSessions')), _int(items[cid].get(f'{STATUS_PREFIX}completed')))
+                for cid in top_deltas if cid not in top
+            }
+            candidates = {
+                cid: (sessions + top_deltas[cid][0], completed + top_deltas[cid][1])
+                for cid, (sessions, completed) in current.items()
+            }
+            top_extra, inserted = summary_top_parts(top, members, candidates, load_name=load_name)
+            # 새 후보의 세션 수는 읽은 집계 값에서 계산했으므로 그 값이 그대로일 때만 반영한다
+            for campaign_id in inserted:
+                campaign_extras[campaign_id] = _merge_extras(campaign_extras.get(campaign_id), {
+                    'names': {'#cc': f'{STATUS_PREFIX}completed'},
+                    'values': {':ct': Decimal(current[campaign_id][0]), ':cc': Decimal(current[campaign_id][1])},
+                    'condition': ' AND '.join([
+                        _equals_condition('totalSessions', ':ct', current[campaign_id][0]),
+                        _equals_condition('#cc', ':cc', current[campaign_id][1]),
+                    ]),
+                })
+        try:
+            return apply_stream_updates(campaigns_table, event_id, _updates(top_extra, campaign_extras))
+        except AggregateUpdateConflict:
+            continue
+
+    print(f"Aggregate update for stream record {event_id} gave up after {max_attempts} conflicting attempts")
+    applied = apply_stream_updates(campaigns_table, event_id, _updates())
+    if applied:
+        mark_aggregates_stale(
+            campaigns_table, [campaign_id for campaign_id, _, _ in sketch_changes], summary=top is not None,
+        )
+    return applied
+
+
+def apply_campaign_summary_update(
+    campaigns_table,
+    event_id: Optional[str],
+    old_campaign: dict,
+    new_campaign: dict,
+    max_attempts: int = AGGREGATE_UPDATE_MAX_ATTEMPTS,
+) -> bool:
+    """캠페인 METADATA 레코드 하나를 전체 요약(캠페인 수, 상태 분포, 후보 이름/삭제)에 반영합니다.
+
+    Returns:
+        apply_stream_updates와 같음 (이미 반영된 레코드면 False)
+    """
+    campaign = new_campaign or old_campaign
+    campaign_id = campaign.get('campaignId') or campaign.get('PK', '').replace('CAMPAIGN#', '', 1)
+    delta = diff_contributions(campaign_contribution(old_campaign), campaign_contribution(new_campaign))
+    renamed = bool(old_campaign and new_campaign) and \
+        old_campaign.get('campaignName', '') != new_campaign.get('campaignName', '')
+    removed = not new_campaign
+
+    for _ in range(max_attempts if (renamed or removed) else 1):
+        extra = None
+        top = _read_summary_top(campaigns_table) if (renamed or removed) else None
+        if top is not None:
+            names = {'#top': SUMMARY_TOP_ATTR, '#tm': campaign_id}
+            if campaign_id not in top:
+                extra = {'names': names, 'condition': 'attribute_not_exists(#top.#tm)'}
+            elif removed:
+                extra = {'remove': ['#top.#tm'], 'names': names, 'condition': 'attribute_exists(#top.#tm)'}
+            else:
+                extra = {
+                    'set': ['#top.#tm.#tname = :tname'],
+                    'names': {**names, '#tname': 'campaignName'},
+                    'values': {':tname': new_campaign.get('campaignName', '')},
+                    'condition': 'attribute_exists(#top.#tm)',
+                }
+        try:
+            return apply_stream_updates(campaigns_table, event_id, [summary_delta_update(delta, extra=extra)])
+        except AggregateUpdateConflict:
+            continue
+
+    print(f"Summary update for campaign {campaign_id} gave up after {max_attempts} conflicting attempts")
+    applied = apply_stream_updates(campaigns_table, event_id, [summary_delta_update(delta)])
+    if applied:
+        mark_aggregates_stale(campaigns_table, [], summary=True)
+    return applied
+
+
+def bucket_key(campaign_id: str, bucket_sk: str) -> dict:
+    return {'PK': f'CAMPAIGN#{campaign_id}', 'SK': bucket_sk}
+
+
+def _bucket_sks(timestamp: Optional[datetime], hourly: bool) -> list[str]:
+    if timestamp is None:
+        return []
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    sks = [f'{DAY_BUCKET_PREFIX}{timestamp.date().isoformat()}']
+    if hourly:
+        sks.append(f'{HOUR_BUCKET_PREFIX}{timestamp.strftime("%Y-%m-%dT%H")}')
+    return sks
+
+
+def session_bucket_contributions(session: dict, hourly: Optional[bool] = None) -> dict:
+    """세션 METADATA 하나가 시계열 버킷별로 기여하는 값 {bucket_sk: Counter}"""
+    hourly = HOURLY_BUCKETS if hourly is None else hourly
+    buckets: dict = {}
+    if not session:
+        return buckets
+
+    created = _parse_timestamp(session.get('createdAt'))
+    completed = _parse_timestamp(session.get('completedAt'))
+    for sk in _bucket_sks(created, hourly):
+        buckets.setdefault(sk, Counter())['created'] += 1
+    for sk in _bucket_sks(completed, hourly):
+        bucket = buckets.setdefault(sk, Counter())
+        if session.get('status') == 'completed':
+            bucket['completed'] += 1
+        if created:
+            bucket['durationSum'] += Decimal(str(round((completed - created).total_seconds() / 60, 4)))
+            bucket['durationCount'] += 1
+    return buckets
+
+
+def feedback_bucket_contributions(feedback: dict, hourly: Optional[bool] = None) -> dict:
+    """FEEDBACK 아이템 하나가 제출 시각 버킷에 기여하는 CSAT 값 {bucket_sk: Counter}"""
+    hourly = HOURLY_BUCKETS if hourly is None else hourly
+    # 평점 히스토그램은 캠페인 집계에만 둔다
+    contribution = Counter({
+        key: value for key, value in feedback_contribution(feedback).items()
+        if not key.startswith(CSAT_RATING_PREFIX)
+    })
+    if not contribution:
+        return {}
+    return {
+        sk: Counter(contribution)
+        for sk in _bucket_sks(_parse_timestamp((feedback or {}).get('timestamp')), hourly)
+    }
+
+
+def diff_bucket_contributions(old: dict, new: dict) -> dict:
+    """버킷별 new - old 증감분 (변경 없는 버킷 제외)"""
+    deltas = {}
+    for sk in set(old) | set(new):
+        delta = diff_contributions(old.get(sk, Counter()), new.get(sk, Counter()))
+        if delta:
+            deltas[sk] = delta
+    return deltas
+
+
+def apply_bucket_deltas(campaigns_table, campaign_id: str, bucket_deltas: dict) -> int:
+    """시계열 버킷별 증감분을 반영합니다.
+
+    Returns:
+        UpdateItem 수행 횟수
+    """
+    updates = bucket_delta_updates(campaign_id, bucket_deltas)
+    for update in updates:
+        campaigns_table.update_item(**update)
+    return len(updates)
+
+
+def build_bucket_items(
+    campaign_id: str,
+    sessions: Iterable[dict],
+    feedback_by_session: Optional[dict] = None,
+    hourly: Optional[bool] = None,
+) -> dict:
+    """세션/피드백 원본에서 시계열 버킷 아이템을 계산합니다 (rebuild 용도). {bucket_sk: item}"""
+    feedback_by_session = feedback_by_session or {}
+    totals: dict = {}
+    for session in sessions:
+        contributions = [session_bucket_contributions(session, hourly)]
+        session_id = session.get('sessionId') or session.get('PK', '').replace('SESSION#', '')
+        feedback = feedback_by_session.get(session_id)
+        if feedback:
+            contributions.append(feedback_bucket_contributions(feedback, hourly))
+        for buckets in contributions:
+            for sk, contribution in buckets.items():
+                totals.setdefault(sk, Counter()).update(contribution)
+
+    items = {}
+    for sk, counter in totals.items():
+        item = {**bucket_key(campaign_id, sk), 'campaignId': campaign_id}
+        for key, value in counter.items():
+            if value:
+                item[key] = value if isinstance(value, Decimal) else Decimal(value)
+        items[sk] = item
+    return items
+
+
+def query_campaign_buckets(
+    campaigns_table,
+    campaign_id: str,
+    start: str,
+    end: str,
+    hourly: bool = False,
+) -> list[dict]:
+    """[start, end] 기간(YYYY-MM-DD, 양 끝 포함)의 버킷만 SK 범위로 조회하여 시간순으로 반환합니다."""
+    if hourly:
+        lower = f'{HOUR_BUCKET_PREFIX}{start}T00'
+        upper = f'{HOUR_BUCKET_PREFIX}{end}T23'
+    else:
+        lower = f'{DAY_BUCKET_PREFIX}{start}'
+        upper = f'{DAY_BUCKET_PREFIX}{end}'
+    return list(iter_query(
+        campaigns_table,
+        KeyConditionExpression=Key('PK').eq(f'CAMPAIGN#{campaign_id}') & Key('SK').between(lower, upper),
+    ))
+
+
+def bucket_to_point(item: dict) -> dict:
+    """버킷 아이템을 시계열 API 응답 항목으로 변환합니다."""
+    sk = item['SK']
+    prefix = HOUR_BUCKET_PREFIX if sk.startswith(HOUR_BUCKET_PREFIX) else DAY_BUCKET_PREFIX
+    duration_count = _int(item.get('durationCount'))
+    csat_count = _int(item.get('csatCount'))
+    return {
+        'bucket': sk[len(prefix):],
+        'createdSessions': _int(item.get('created')),
+        'completedSessions': _int(item.get('completed')),
+        'averageSessionDuration': (
+            round(float(item.get('durationSum', 0) or 0) / duration_count, 2) if duration_count > 0 else 0
+        ),
+        'averageCSAT': round(float(item.get('csatSum', 0) or 0) / csat_count, 1) if csat_count > 0 else 0,
+        'totalCSATResponses': csat_count,
+    }
+
+
+def build_campaign_aggregate(
+    sessions: Iterable[dict],
+    feedback_by_session: Optional[dict] = None,
+    use_sketches: Optional[bool] = None,
+) -> dict:
+    """세션/피드백 원본에서 집계 아이템 속성을 계산합니다 (rebuild 용도).
+
+    use_sketches가 참이면(None이면 CAMPAIGN_SKETCHES 설정) 고객사/상담 목적은
+    히스토그램 대신 스케치 속성으로 저장한다.
+    """
+    if use_sketches is None:
+        use_sketches = SKETCHES_ENABLED
+    feedback_by_session = feedback_by_session or {}
+    totals = Counter()
+    attributes = {}
+    sketches = CampaignSketches.create() if use_sketches else None
+    for session in sessions:
+        contribution = session_contribution(session)
+        if sketches is not None:
+            contribution = without_sketch_keys(contribution)
+            sketches.apply_session(session)
+        totals.update(contribution)
+        session_id = session.get('sessionId') or session.get('PK', '').replace('SESSION#', '')
+        feedback = feedback_by_session.get(session_id)
+        if feedback and feedback.get('rating') is not None:
+            totals.update(feedback_contribution(feedback))
+
+    for key, value in totals.items():
+        if value:
+            attributes[key] = value if isinstance(value, Decimal) else Decimal(value)
+    if sketches is not None:
+        attributes.update(sketches.to_attributes())
+        attributes[SKETCH_VERSION_ATTR] = 1
+    return attributes
+
+
+class CampaignSketches:
+    """캠페인 하나의 고객사/상담 목적 스케치 묶음
+
+    companies: 고유 수(HyperLogLog) + 빈도(Count-Min) + 상위 후보(Space-Saving)
+    purposes:  빈도(Count-Min) + 상위 후보(Space-Saving)
+    상위 K는 Space-Saving 후보를 Count-Min 추정값으로 정렬하여 구한다.
+    """
+
+    def __init__(self, config: dict):
+        self.config = {key: int(value) for key, value in config.items()}
+        width, depth = self.config['cmsWidth'], self.config['cmsDepth']
+        self.company_hll = HyperLogLog(self.config['hllPrecision'])
+        self.company_cms = CountMinSketch(width, depth)
+        self.company_top = SpaceSaving(self.config['topCapacity'])
+        self.purpose_cms = CountMinSketch(width, depth)
+        self.purpose_top = SpaceSaving(self.config['topCapacity'])
+
+    @classmethod
+    def create(cls) -> 'CampaignSketches':
+        """환경 변수의 오차 범위로 빈 스케치를 생성합니다."""
+        cms = CountMinSketch.from_error(SKETCH_CMS_EPSILON, SKETCH_CMS_DELTA)
+        return cls({
+            'hllPrecision': HyperLogLog.from_error(SKETCH_HLL_ERROR).precision,
+            'cmsWidth': cms.width,
+            'cmsDepth': cms.depth,
+            'topCapacity': SKETCH_TOP_CAPACITY,
+        })
+
+    @classmethod
+    def from_item(cls, item: dict) -> Optional['CampaignSketches']:
+        """집계 아이템에 저장된 스케치를 복원합니다. 스케치가 없으면 None."""
+        config = item.get(f'{SKETCH_PREFIX}config')
+        if not config:
+            return None
+        sketches = cls(config)
+        width, depth = sketches.config['cmsWidth'], sketches.config['cmsDepth']
+        capacity = sketches.config['topCapacity']
+        sketches.company_hll = HyperLogLog(
+            sketches.config['hllPrecision'], _binary(item.get(f'{SKETCH_PREFIX}companiesHll')),
+        )
+        sketches.company_cms = CountMinSketch(width, depth, _binary(item.get(f'{SKETCH_PREFIX}companiesCms')))
+        sketches.company_top = SpaceSaving(capacity, item.get(f'{SKETCH_PREFIX}companiesTop'))
+        sketches.purpose_cms = CountMinSketch(width, depth, _binary(item.get(f'{SKETCH_PREFIX}purposesCms')))
+        sketches.purpose_top = SpaceSaving(capacity, item.get(f'{SKETCH_PREFIX}purposesTop'))
+        return sketches
+
+    def apply_session(self, session: dict, sign: int = 1) -> None:
+        """세션 하나의 고객사/상담 목적을 더하거나(sign=1) 뺍니다(sign=-1).
+
+        HyperLogLog는 삭제를 지원하지 않으므로 뺄 때는 고유 수 추정에 반영되지 않는다.
+        """
+        company, purposes = sketch_fields(session)
+        if company:
+            self.company_cms.add(company, sign)
+            if sign > 0:
+                self.company_hll.add(company)
+                self.company_top.add(company, sign)
+            else:
+                self.company_top.remove(company, -sign)
+        for purpose in purposes:
+            self.purpose_cms.add(purpose, sign)
+            if sign > 0:
+                self.purpose_top.add(purpose, sign)
+            else:
+                self.purpose_top.remove(purpose, -sign)
+
+    def merge(self, other: 'CampaignSketches') -> None:
+        self.company_hll.merge(other.company_hll)
+        self.company_cms.merge(other.company_cms)
+        self.company_top.merge(other.company_top)
+        self.purpose_cms.merge(other.purpose_cms)
+        self.purpose_top.merge(other.purpose_top)
+
+    def distinct_companies(self) -> int:
+        return self.company_hll.estimate()
+
+    def top_companies(self, k: int) -> list[tuple[str, int]]:
+        return _top_k(self.company_top, self.company_cms, k)
+
+    def top_purposes(self, k: int) -> list[tuple[str, int]]:
+        return _top_k(self.purpose_top, self.purpose_cms, k)
+
+    def to_attributes(self) -> dict:
+        return {
+            f'{SKETCH_PREFIX}config': dict(self.config),
+            f'{SKETCH_PREFIX}companiesHll': self.company_hll.to_bytes(),
+            f'{SKETCH_PREFIX}companiesCms': self.company_cms.to_bytes(),
+            f'{SKETCH_PREFIX}companiesTop': self.company_top.to_dict(),
+            f'{SKETCH_PREFIX}purposesCms': self.purpose_cms.to_bytes(),
+            f'{SKETCH_PREFIX}purposesTop': self.purpose_top.to_dict(),
+        }
+
+
+def _binary(value) -> Optional[bytes]:
+    # boto3는 Binary 속성을 Binary 래퍼로 반환한다
+    if value is None:
+        return None
+    return bytes(getattr(value, 'value', value))
+
+
+def _top_k(candidates: SpaceSaving, frequencies: CountMinSketch, k: int) -> list[tuple[str, int]]:
+    ranked = [(key, frequencies.estimate(key)) for key in candidates.candidates()]
+    ranked = [(key, count) for key, count in ranked if count > 0]
+    ranked.sort(key=lambda pair: (-pair[1], pair[0]))
+    return ranked[:k]
+
+
+def sketch_fields(session: dict) -> tuple[str, list[str]]:
+    """스케치에 반영되는 세션 필드 (고객사, 상담 목적 목록)"""
+    if not session:
+        return '', []
+    company = (session.get('customerInfo') or {}).get('company', '')
+    return company, split_purposes(session.get('consultationPurposes', ''))
+
+
+def without_sketch_keys(delta: dict) -> dict:
+    """스케치 모드에서 스케치가 대신하는 company:/purpose: 키를 뺀 증감분"""
+    return {
+        key: value for key, value in delta.items()
+        if not key.startswith((COMPANY_PREFIX, PURPOSE_PREFIX))
+    }
+
+
+def _read_campaign_state(campaigns_table, campaign_id: str) -> dict:
+    """조건부 갱신에 필요한 캠페인 집계 속성(세션 수, 스케치, sketchVersion)을 강한 일관성으로 읽습니다."""
+    names = {'#v': SKETCH_VERSION_ATTR, '#completed': f'{STATUS_PREFIX}completed'}
+    projection = ['totalSessions', '#completed', '#v']
+    for i, attr in enumerate(sorted(CampaignSketches.create().to_attributes())):
+        names[f'#k{i}'] = attr
+        projection.append(f'#k{i}')
+    return campaigns_table.get_item(
+        Key=analytics_key(campaign_id),
+        ProjectionExpression=', '.join(projection),
+        ExpressionAttributeNames=names,
+        ConsistentRead=True,
+    ).get('Item') or {}
+
+
+def sketch_update_parts(item: dict, removed: Optional[dict] = None, added: Optional[dict] = None) -> dict:
+    """읽은 캠페인 집계의 스케치에 세션 변경분을 반영한 값을 쓰는 식 조각을 만듭니다.
+
+    읽은 sketchVersion이 그대로일 때만 쓰도록 조건을 건다 (campaign_delta_update의 extra 용도).
+
+    Args:
+        removed: 빼야 할 이전 세션 이미지 (없으면 None)
+        added: 더해야 할 새 세션 이미지 (없으면 None)
+    """
+    sketches = CampaignSketches.from_item(item) or CampaignSketches.create()
+    if removed:
+        sketches.apply_session(removed, sign=-1)
+    if added:
+        sketches.apply_session(added, sign=1)
+
+    version = int(item.get(SKETCH_VERSION_ATTR, 0))
+    names = {'#skv': SKETCH_VERSION_ATTR}
+    values = {':sknext': version + 1}
+    set_parts = ['#skv = :sknext']
+    for i, (attr, value) in enumerate(sorted(sketches.to_attributes().items())):
+        names[f'#sk{i}'] = attr
+        values[f':sk{i}'] = value
+        set_parts.append(f'#sk{i} = :sk{i}')
+    if version:
+        condition = '#skv = :skcur'
+        values[':skcur'] = version
+    else:
+        condition = 'attribute_not_exists(#skv)'
+    return {'set': set_parts, 'names': names, 'values': values, 'condition': condition}
+
+
+def iter_campaign_sessions(
+    sessions_table,
+    campaign_id: str,
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[dict] = None,
+    stats: Optional[dict] = None,
+    newest_first: bool = False,
+):
+    """캠페인에 연결된 세션 METADATA를 GSI2에서 모든 페이지에 걸쳐 yield 합니다.
+
+    GSI2에는 캠페인 트리거(GSI2SK=TRIGGER#...)도 함께 있으므로 SESSION# 정렬 키만 읽는다.
+    projection_expression으로 필요한 속성만 전송받는다.
+    """
+    return iter_query(
+        sessions_table,
+        projection_expression=projection_expression,
+        expression_attribute_names=expression_attribute_names,
+        stats=stats,
+        IndexName='GSI2',
+        KeyConditionExpression=Key('GSI2PK').eq(f'CAMPAIGN#{campaign_id}') & Key('GSI2SK').begins_with('SESSION#'),
+        FilterExpression=Attr('SK').eq('METADATA') & Attr('PK').begins_with('SESSION#'),
+        ScanIndexForward=not newest_first,
+    )
+
+
+def rebuild_campaign_aggregate(sessions_table, campaigns_table, campaign_id: str, dry_run: bool = False) -> dict:
+    """원본 세션/피드백에서 캠페인 집계 아이템을 다시 계산하여 덮어씁니다.
+
+    스트림이 반영 중인 변경과 경합할 수 있으므로 트래픽이 적을 때 실행한다.
+
+    Returns:
+        저장한(또는 dry_run 시 저장할) 집계 아이템
+    """
+    sessions = list(iter_campaign_sessions(sessions_table, campaign_id))
+
+    feedback_keys = [
+        {'PK': s['PK'], 'SK': 'FEEDBACK'} for s in sessions if s.get('PK')
+    ]
+    feedback_items = batch_get_items(sessions_table.name, feedback_keys) if feedback_keys else []
+    feedback_by_session = {
+        item.get('sessionId') or item['PK'].replace('SESSION#', ''): item for item in feedback_items
+    }
+
+    timestamp = get_timestamp()
+    item = {
+        **analytics_key(campaign_id),
+        'campaignId': campaign_id,
+        **build_campaign_aggregate(sessions, feedback_by_session),
+        'rebuiltAt': timestamp,
+        'updatedAt': timestamp,
+    }
+    if not dry_run:
+        campaigns_table.put_item(Item=item)
+        _replace_bucket_items(campaigns_table, campaign_id, build_bucket_items(campaign_id, sessions, feedback_by_session))
+        _replace_items(
+            campaigns_table, campaign_id, (CSAT_FEED_PREFIX,),
+            build_csat_feed_items(campaign_id, sessions, feedback_by_session),
+        )
+    return item
+
+
+def empty_campaign_aggregate(campaign_id: str) -> dict:
+    """세션이 없는 새 캠페인의 집계 아이템 (생성 시 기록하면 rebuild 없이 바로 집계를 사용할 수 있다)"""
+    timestamp = get_timestamp()
+    return {
+        **analytics_key(campaign_id),
+        'campaignId': campaign_id,
+        **build_campaign_aggregate([]),
+        'rebuiltAt': timestamp,
+        'updatedAt': timestamp,
+    }
+
+
+def build_csat_feed_items(campaign_id: str, sessions: Iterable[dict], feedback_by_session: dict) -> dict:
+    """세션/피드백 원본에서 CSAT 피드 아이템을 계산합니다 (rebuild 용도). {sk: item}"""
+    items = {}
+    for session in sessions:
+        session_id = session.get('sessionId') or session.get('PK', '').replace('SESSION#', '')
+        feedback = feedback_by_session.get(session_id)
+        if feedback and feedback.get('rating') is not None:
+            item = csat_feed_item(campaign_id, session_id, feedback, session)
+            items[item['SK']] = item
+    return items
+
+
+def delete_bucket_items(campaigns_table, campaign_id: str) -> None:
+    """캠페인의 시계열 버킷을 모두 삭제합니다 (캠페인 삭제 시)."""
+    _replace_bucket_items(campaigns_table, campaign_id, {})
+
+
+def delete_csat_feed_items(campaigns_table, campaign_id: str) -> None:
+    """캠페인의 CSAT 피드 아이템을 모두 삭제합니다 (캠페인 삭제 시)."""
+    _replace_items(campaigns_table, campaign_id, (CSAT_FEED_PREFIX,), {})
+
+
+def _replace_bucket_items(campaigns_table, campaign_id: str, bucket_items: dict) -> None:
+    """캠페인의 시계열 버킷을 새로 계산한 것으로 교체합니다 (없어진 버킷은 삭제)."""
+    _replace_items(campaigns_table, campaign_id, (DAY_BUCKET_PREFIX, HOUR_BUCKET_PREFIX), bucket_items)
+
+
+def _replace_items(campaigns_table, campaign_id: str, prefixes: tuple, items_by_sk: dict) -> None:
+    """캠페인 파티션에서 주어진 SK 접두사의 아이템을 새로 계산한 것으로 교체합니다."""
+    stale = []
+    for prefix in prefixes:
+        stale.extend(
+            item['SK'] for item in iter_query(
+                campaigns_table,
+                projection_expression='SK',
+                KeyConditionExpression=Key('PK').eq(f'CAMPAIGN#{campaign_id}') & Key('SK').begins_with(prefix),
+            )
+            if item['SK'] not in items_by_sk
+        )
+    timestamp = get_timestamp()
+    with campaigns_table.batch_writer() as writer:
+        for sk in stale:
+            writer.delete_item(Key={'PK': f'CAMPAIGN#{campaign_id}', 'SK': sk})
+        for new_item in items_by_sk.values():
+            writer.put_item(Item={**new_item, 'updatedAt': timestamp})
+
+
+def _int(value) -> int:
+    return int(value or 0)
+
+
+def aggregate_to_analytics(campaign_id: str, item: dict) -> dict:
+    """집계 아이템을 캠페인 분석 API 응답 형태로 변환합니다."""
+    statuses = {}
+    purposes = Counter()
+    companies = Counter()
+    completed_on = {}
+    csat_ratings = {}
+    for attr, value in item.items():
+        if attr.startswith(STATUS_PREFIX):
+            if _int(value) > 0:
+                statuses[attr[len(STATUS_PREFIX):]] = _int(value)
+        elif attr.startswith(PURPOSE_PREFIX):
+            if _int(value) > 0:
+                purposes[attr[len(PURPOSE_PREFIX):]] = _int(value)
+        elif attr.startswith(COMPANY_PREFIX):
+            if _int(value) > 0:
+                companies[attr[len(COMPANY_PREFIX):]] = _int(value)
+        elif attr.startswith(COMPLETED_ON_PREFIX):
+            if _int(value) > 0:
+                completed_on[attr[len(COMPLETED_ON_PREFIX):]] = _int(value)
+        elif attr.startswith(CSAT_RATING_PREFIX):
+            if _int(value) > 0:
+                csat_ratings[attr[len(CSAT_RATING_PREFIX):]] = _int(value)
+
+    total_sessions = _int(item.get('totalSessions'))
+    completed_sessions = statuses.get('completed', 0)
+    duration_count = _int(item.get('durationCount'))
+    duration_sum = float(item.get('durationSum', 0) or 0)
+    csat_count = _int(item.get('csatCount'))
+    csat_sum = float(item.get('csatSum', 0) or 0)
+
+    sketches = CampaignSketches.from_item(item)
+    if sketches is not None:
+        # 스케치 모드: 상위 K와 고유 고객사 수는 근사값 (Count-Min은 과대 추정만 한다)
+        top_purposes = sketches.top_purposes(5)
+        top_companies = sketches.top_companies(10)
+        distinct_companies = sketches.distinct_companies()
+    else:
+        top_purposes = purposes.most_common(5)
+        top_companies = companies.most_common(10)
+        distinct_companies = len(companies)
+
+    return {
+        'campaignId': campaign_id,
+        'totalSessions': total_sessions,
+        'activeSessions': statuses.get('active', 0),
+        'completedSessions': completed_sessions,
+        'completionRate': round(completed_sessions / total_sessions * 100, 2) if total_sessions > 0 else 0,
+        'averageSessionDuration': round(duration_sum / duration_count, 2) if duration_count > 0 else 0,
+        'topConsultationPurposes': [
+            {'purpose': purpose, 'count': count} for purpose, count in top_purposes
+        ],
+        'sessionsByDate': [
+            {'date': date, 'count': count} for date, count in sorted(completed_on.items())
+        ],
+        'customerCompanies': [
+            {'company': company, 'sessionCount': count} for company, count in top_companies
+        ],
+        'distinctCompanies': distinct_companies,
+        'statusDistribution': statuses,
+        'csatHistogram': [
+            {'rating': float(rating), 'count': count}
+            for rating, count in sorted(csat_ratings.items(), key=lambda pair: float(pair[0]))
+        ],
+        'averageCSAT': round(csat_sum / csat_count, 1) if csat_count > 0 else 0,
+        'totalCSATResponses': csat_count,
+        'calculatedAt': item.get('updatedAt', ''),
+    }
+
+
+def build_summary_aggregate(
+    campaigns: Iterable[dict],
+    campaign_aggregates: dict,
+    capacity: Optional[int] = None,
+) -> dict:
+    """캠페인 METADATA와 캠페인별 집계 아이템에서 전체 요약 속성을 계산합니다 (rebuild 용도)."""
+    capacity = capacity or SUMMARY_TOP_CANDIDATES
+    totals = Counter()
+    entries = {}
+    for campaign in campaigns:
+        campaign_id = campaign.get('campaignId') or campaign.get('PK', '').replace('CAMPAIGN#', '', 1)
+        totals.update(campaign_contribution(campaign))
+        aggregate = campaign_aggregates.get(campaign_id) or {}
+        sessions = _int(aggregate.get('totalSessions'))
+        completed = _int(aggregate.get(f'{STATUS_PREFIX}completed'))
+        totals['totalSessions'] += sessions
+        totals['completedSessions'] += completed
+        if sessions > 0:
+            entries[campaign_id] = _top_entry(campaign.get('campaignName', ''), sessions, completed)
+
+    ranked = sorted(entries, key=lambda cid: (-_completion_rate(entries[cid]), cid))[:capacity]
+    attributes = {key: Decimal(value) for key, value in totals.items() if value}
+    attributes[SUMMARY_TOP_ATTR] = {campaign_id: entries[campaign_id] for campaign_id in ranked}
+    return attributes
+
+
+def rebuild_summary_aggregate(campaigns_table, dry_run: bool = False) -> dict:
+    """캠페인 METADATA와 캠페인별 집계(ANALYTICS)에서 전체 요약 아이템을 다시 계산하여 덮어씁니다."""
+    campaigns = list(iter_scan(
+        campaigns_table,
+        projection_expression='PK, campaignId, campaignName, #status',
+        expression_attribute_names={'#status': 'status'},
+        FilterExpression=Attr('SK').eq('METADATA') & Attr('PK').begins_with('CAMPAIGN#'),
+    ))
+    aggregate_keys = [{'PK': c['PK'], 'SK': ANALYTICS_SK} for c in campaigns]
+    aggregate_items = batch_get_items(
+        campaigns_table.name,
+        aggregate_keys,
+        projection_expression='PK, totalSessions, #completed',
+        expression_attribute_names={'#completed': f'{STATUS_PREFIX}completed'},
+    ) if aggregate_keys else []
+    campaign_aggregates = {item['PK'].replace('CAMPAIGN#', '', 1): item for item in aggregate_items}
+
+    timestamp = get_timestamp()
+    item = {
+        **summary_key(),
+        **build_summary_aggregate(campaigns, campaign_aggregates),
+        'rebuiltAt': timestamp,
+        'updatedAt': timestamp,
+    }
+    if not dry_run:
+        campaigns_table.put_item(Item=item)
+    return item
+
+
+def summary_to_analytics(item: dict) -> dict:
+    """전체 요약 아이템을 요약 분석 API 응답 형태로 변환합니다."""
+    statuses = {
+        attr[len(CAMPAIGN_STATUS_PREFIX):]: _int(value)
+        for attr, value in item.items()
+        if attr.startswith(CAMPAIGN_STATUS_PREFIX) and _int(value) > 0
+    }
+    total_sessions = _int(item.get('totalSessions'))
+    completed_sessions = _int(item.get('completedSessions'))
+
+    # 완료율 상위 캠페인: 후보 중 세션이 있는 것만
+    top = item.get(SUMMARY_TOP_ATTR) or {}
+    ranked = sorted(
+        (cid for cid, entry in top.items() if _int(entry.get('sessions')) > 0),
+        key=lambda cid: (-_completion_rate(top[cid]), cid),
+    )[:SUMMARY_TOP_CAMPAIGNS]
+
+    return {
+        'totalCampaigns': _int(item.get('totalCampaigns')),
+        'activeCampaigns': statuses.get('active', 0),
+        'totalSessionsAcrossCampaigns': total_sessions,
+        'totalCompletedSessions': completed_sessions,
+        'overallCompletionRate': round(completed_sessions / total_sessions * 100, 2) if total_sessions > 0 else 0,
+        'topPerformingCampaigns': [
+            {
+                'campaignId': cid,
+                'campaignName': top[cid].get('campaignName', ''),
+                'sessionCount': _int(top[cid].get('sessions')),
+                'completedSessionCount': _int(top[cid].get('completed')),
+                'completionRate': round(_completion_rate(top[cid]) * 100, 2),
+            }
+            for cid in ranked
+        ],
+        'campaignStatusDistribution': statuses,
+        'calculatedAt': item.get('updatedAt') or get_timestamp(),
+    }
@@ -0,0 +1,133 @@
+"""
+Circuit Breaker - 엔드포인트별 회로 차단기
+
+계속 실패하는 외부 엔드포인트로의 호출을 쿨다운 동안 바로 실패 처리하여
+죽은 엔드포인트가 매번 타임아웃만큼 트리거 예산을 잡아먹지 않게 합니다.
+
+상태:
+  - closed: 정상 호출. 연속 실패가 failure_threshold에 도달하면 open
+  - open: cooldown_seconds 동안 호출하지 않고 바로 실패 (short-circuit)
+  - half_open: 쿨다운이 지나면 탐침 호출 하나만 허용. 성공하면 closed, 실패하면 다시 open
+
+스레드 안전하며, 키 수는 maxsize로 제한한다 (LRU 제거).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class _Circuit:
+    __slots__ = ('state', 'failures', 'opened_until', 'probing')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_until = 0.0
+        self.probing = False
+
+
+class KeyedCircuitBreaker:
+    """키(엔드포인트)별 회로 차단기"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = float(cooldown_seconds)
+        self.maxsize = max(1, int(maxsize))
+        self._clock = clock
+        self._circuits: 'OrderedDict[Hashable, _Circuit]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.short_circuited = 0
+        self.opened = 0
+
+    def _circuit(self, key: Hashable) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+            while len(self._circuits) > self.maxsize:
+                self._circuits.popitem(last=False)
+        self._circuits.move_to_end(key)
+        return circuit
+
+    def allow(self, key: Hashable) -> bool:
+        """호출해도 되는지 확인합니다. open 상태거나 탐침이 진행 중이면 False."""
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == OPEN and self._clock() >= circuit.opened_until:
+                circuit.state = HALF_OPEN
+                circuit.probing = False
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def release(self, key: Hashable) -> None:
+        """allow() 뒤 실제로 호출하지 않았을 때 half_open 탐침 자격을 돌려줍니다."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None and circuit.state == HALF_OPEN:
+                circuit.probing = False
+
+    def record_success(self, key: Hashable) -> None:
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+
+    def record_failure(self, key: Hashable, open_for: Optional[float] = None) -> None:
+        """실패를 기록합니다. open_for를 주면(예: 429 Retry-After) 횟수와 상관없이 그 시간 동안 연다."""
+        with self._lock:
+            circuit = self._circuit(key)
+            circuit.failures += 1
+            if open_for is not None or circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                self._open(circuit, self.cooldown_seconds if open_for is None else open_for)
+
+    def _open(self, circuit: _Circuit, seconds: float) -> None:
+        if circuit.state != OPEN:
+            self.opened += 1
+        circuit.state = OPEN
+        circuit.probing = False
+        circuit.opened_until = self._clock() + seconds
+
+    def retry_after(self, key: Hashable) -> float:
+        """open 상태면 탐침 호출이 허용될 때까지 남은 시간(초), 아니면 0."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state != OPEN:
+                return 0.0
+            return max(0.0, circuit.opened_until - self._clock())
+
+    def state(self, key: Hashable) -> str:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and self._clock() >= circuit.opened_until:
+                return HALF_OPEN
+            return circuit.state
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = [circuit.state for circuit in self._circuits.values()]
+            return {
+                'keys': len(states),
+                'open': states.count(OPEN),
+                'halfOpen': states.count(HALF_OPEN),
+                'opened': self.opened,
+                'shortCircuited': self.short_circuited,
+            }
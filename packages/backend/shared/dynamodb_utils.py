@@ -0,0 +1,255 @@
+"""
+DynamoDB Utilities
+
+여러 도메인 핸들러가 공통으로 사용하는 DynamoDB 읽기 헬퍼입니다.
+
+batch_get_items:
+  - BatchGetItem 요청당 최대 100개 키 제한에 맞춰 자동 분할
+  - 중복 키 제거 (BatchGetItem은 중복 키 요청 시 ValidationException)
+  - UnprocessedKeys는 지수 백오프(jitter 포함)로 재시도
+  - max_workers > 1이면 100개 단위 배치를 동시에 요청
+
+iter_query / iter_scan:
+  - LastEvaluatedKey를 끝까지 따라가며 아이템을 하나씩 yield (페이지 단위 메모리)
+  - 선택적 ProjectionExpression
+  - iter_scan은 segments > 1이면 병렬 세그먼트 스캔
+"""
+
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
+import boto3
+
+dynamodb = boto3.resource('dynamodb')
+
+# BatchGetItem 요청당 최대 키 개수 (DynamoDB 제한)
+BATCH_GET_MAX_KEYS = 100
+
+
+def _key_fingerprint(key: dict) -> tuple:
+    return tuple(sorted(key.items()))
+
+
+def _dedupe_keys(keys: list[dict]) -> list[dict]:
+    seen = set()
+    unique = []
+    for key in keys:
+        fingerprint = _key_fingerprint(key)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        unique.append(key)
+    return unique
+
+
+def batch_get_items(
+    table_name: str,
+    keys: list[dict],
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[dict] = None,
+    max_retries: int = 5,
+    base_delay: float = 0.05,
+    stats: Optional[dict] = None,
+    max_workers: int = 1,
+) -> list[dict]:
+    """여러 키를 BatchGetItem으로 조회합니다.
+
+    Args:
+        table_name: 대상 테이블 이름
+        keys: 기본 키 dict 목록 (예: [{'PK': ..., 'SK': ...}])
+        projection_expression: 필요한 속성만 읽을 때 지정 (키 속성을 포함해야 매핑 가능)
+        expression_attribute_names: projection_expression의 예약어 치환
+        max_retries: UnprocessedKeys 재시도 횟수
+        base_delay: 재시도 기본 대기 시간(초), 시도마다 2배
+        stats: 전달 시 'requests'(BatchGetItem 호출 수)를 누적
+        max_workers: 100개 단위 배치를 동시에 요청할 최대 스레드 수 (1이면 순차)
+
+    Returns:
+        조회된 아이템 목록 (순서 보장하지 않음, 없는 키는 제외)
+
+    재시도 후에도 남은 UnprocessedKeys가 있으면 RuntimeError를 발생시킵니다.
+    """
+    unique_keys = _dedupe_keys(keys)
+    chunks = [
+        unique_keys[start:start + BATCH_GET_MAX_KEYS]
+        for start in range(0, len(unique_keys), BATCH_GET_MAX_KEYS)
+    ]
+
+    def fetch(chunk):
+        return _batch_get_chunk(
+            table_name, chunk, projection_expression, expression_attribute_names, max_retries, base_delay,
+        )
+
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            results = list(executor.map(fetch, chunks))
+    else:
+        results = [fetch(chunk) for chunk in chunks]
+
+    items: list[dict] = []
+    for chunk_items, request_count in results:
+        items.extend(chunk_items)
+        if stats is not None:
+            stats['requests'] = stats.get('requests', 0) + request_count
+    return items
+
+
+def _batch_get_chunk(
+    table_name: str,
+    keys: list[dict],
+    projection_expression: Optional[str],
+    expression_attribute_names: Optional[dict],
+    max_retries: int,
+    base_delay: float,
+) -> tuple[list[dict], int]:
+    """100개 이하 키 한 묶음을 UnprocessedKeys가 없어질 때까지 조회합니다.
+
+    Returns:
+        (아이템 목록, BatchGetItem 호출 수)
+    """
+    request: dict = {'Keys': keys}
+    if projection_expression:
+        request['ProjectionExpression'] = projection_expression
+    if expression_attribute_names:
+        request['ExpressionAttributeNames'] = expression_attribute_names
+
+    items: list[dict] = []
+    request_items = {table_name: request}
+    request_count = 0
+    attempt = 0
+    while request_items:
+        resp = dynamodb.batch_get_item(RequestItems=request_items)
+        request_count += 1
+        items.extend(resp.get('Responses', {}).get(table_name, []))
+
+        request_items = resp.get('UnprocessedKeys') or {}
+        if not request_items:
+            break
+        if attempt >= max_retries:
+            remaining = len(request_items.get(table_name, {}).get('Keys', []))
+            raise RuntimeError(
+                f"BatchGetItem on {table_name} left {remaining} unprocessed keys after {max_retries} retries"
+            )
+        time.sleep(base_delay * (2 ** attempt) * (0.5 + random.random() / 2))
+        attempt += 1
+
+    return items, request_count
+
+
+def _with_projection(kwargs: dict, projection_expression: Optional[str],
+                     expression_attribute_names: Optional[dict]) -> dict:
+    kwargs = dict(kwargs)
+    if projection_expression:
+        kwargs['ProjectionExpression'] = projection_expression
+    if expression_attribute_names:
+        kwargs['ExpressionAttributeNames'] = {
+            **kwargs.get('ExpressionAttributeNames', {}), **expression_attribute_names,
+        }
+    return kwargs
+
+
+def _iter_pages(operation, kwargs: dict, stats: Optional[dict]) -> Iterator[list[dict]]:
+    """LastEvaluatedKey가 없어질 때까지 Query/Scan 페이지를 순서대로 반환합니다."""
+    kwargs = dict(kwargs)
+    while True:
+        resp = operation(**kwargs)
+        if stats is not None:
+            stats['requests'] = stats.get('requests', 0) + 1
+        yield resp.get('Items', [])
+        last_key = resp.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def iter_query(
+    table,
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[dict] = None,
+    stats: Optional[dict] = None,
+    **query_kwargs,
+) -> Iterator[dict]:
+    """Query 결과를 모든 페이지에 걸쳐 아이템 단위로 yield 합니다.
+
+    Args:
+        table: boto3 Table 리소스
+        projection_expression: 필요한 속성만 읽을 때 지정
+        expression_attribute_names: projection_expression의 예약어 치환 (query_kwargs의 것과 병합)
+        stats: 전달 시 'requests'(Query 호출 수)를 누적
+        **query_kwargs: Table.query 인자 (IndexName, KeyConditionExpression 등)
+    """
+    kwargs = _with_projection(query_kwargs, projection_expression, expression_attribute_names)
+    for page in _iter_pages(table.query, kwargs, stats):
+        yield from page
+
+
+def iter_scan(
+    table,
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[dict] = None,
+    stats: Optional[dict] = None,
+    segments: int = 1,
+    **scan_kwargs,
+) -> Iterator[dict]:
+    """Scan 결과를 모든 페이지에 걸쳐 아이템 단위로 yield 합니다.
+
+    segments > 1이면 Segment/TotalSegments로 나누어 세그먼트마다 스레드 하나가 스캔한다.
+    세그먼트 스레드는 크기가 제한된 큐로 페이지를 넘기므로 소비 속도보다 앞서 읽지 않으며,
+    아이템 순서는 보장하지 않는다.
+    """
+    kwargs = _with_projection(scan_kwargs, projection_expression, expression_attribute_names)
+    if segments <= 1:
+        for page in _iter_pages(table.scan, kwargs, stats):
+            yield from page
+        return
+
+    pages: queue.Queue = queue.Queue(maxsize=segments * 2)
+    stop = threading.Event()
+    lock = threading.Lock()
+    done = object()
+
+    def put(entry) -> bool:
+        # 소비자가 멈춘 뒤에는 큐가 가득 차도 스레드가 막히지 않도록 stop을 확인하며 넣는다
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment):
+        segment_stats = {}
+        try:
+            segment_kwargs = {**kwargs, 'Segment': segment, 'TotalSegments': segments}
+            for page in _iter_pages(table.scan, segment_kwargs, segment_stats):
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            if stats is not None:
+                with lock:
+                    stats['requests'] = stats.get('requests', 0) + segment_stats.get('requests', 0)
+            put(done)
+
+    executor = ThreadPoolExecutor(max_workers=segments, thread_name_prefix='ddb-scan')
+    try:
+        for segment in range(segments):
+            executor.submit(scan_segment, segment)
+        remaining = segments
+        while remaining:
+            page = pages.get()
+            if page is done:
+                remaining -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
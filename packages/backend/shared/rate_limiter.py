@@ -0,0 +1,81 @@
+"""
+Rate Limiter - 엔드포인트별 토큰 버킷
+
+외부 엔드포인트(Slack Webhook 등)의 호출 빈도를 warm Lambda 인스턴스 안에서 제한합니다.
+토큰이 없으면 기다리지 않고 다음 토큰까지 남은 시간을 돌려주므로,
+호출자가 지연 재전송(SQS DelaySeconds 등)으로 처리할 수 있다.
+
+스레드 안전하며, 키 수는 maxsize로 제한한다 (LRU 제거).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError('rate must be positive and capacity at least 1')
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 가져옵니다. 성공하면 0, 부족하면 다시 시도할 때까지 남은 초를 반환합니다."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+
+class KeyedRateLimiter:
+    """키(엔드포인트)별 TokenBucket 모음"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.maxsize = max(1, int(maxsize))
+        self._clock = clock
+        self._buckets: 'OrderedDict[Hashable, TokenBucket]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def try_acquire(self, key: Hashable) -> float:
+        """key의 토큰을 가져옵니다. 반환값은 TokenBucket.try_acquire와 같다."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity, self._clock)
+                while len(self._buckets) > self.maxsize:
+                    self._buckets.popitem(last=False)
+            self._buckets.move_to_end(key)
+
+        wait = bucket.try_acquire()
+        with self._lock:
+            if wait:
+                self.limited += 1
+            else:
+                self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'keys': len(self._buckets), 'allowed': self.allowed, 'limited': self.limited}
@@ -0,0 +1,180 @@
+"""
+병합 가능한 근사 집계 스케치 (Mergeable Sketches)
+
+세션이 수십만 개인 캠페인에서도 고객사/상담 목적 통계를 고정 크기 상태로 유지하기 위한
+스케치 구현입니다. 모든 스케치는 같은 설정끼리 merge할 수 있고 바이트/Map으로 직렬화되어
+캠페인 집계 아이템(CAMPAIGN#{id}/ANALYTICS)에 저장된다.
+
+HyperLogLog:
+  - 고유 고객사 수 추정, 상대 오차 약 1.04/sqrt(2^precision)
+  - 삭제를 지원하지 않으므로 한 번이라도 관측된 고객사를 센다 (rebuild로 보정)
+
+CountMinSketch:
+  - 키별 빈도 추정, 오차 <= epsilon * 전체 합계 (확률 1 - delta)
+  - 음수 증감(세션 삭제/변경)을 지원한다
+
+SpaceSaving:
+  - 상위 K 후보 추적, 빈도가 N/capacity를 넘는 키는 반드시 포함
+  - 후보의 최종 순위는 CountMinSketch 추정값으로 매긴다
+"""
+
+import hashlib
+import math
+from array import array
+from typing import Iterable, Optional
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _hash64(value: str, salt: bytes = b'') -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8, salt=salt).digest(), 'big')
+
+
+def _hash_pair(value: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+
+
+class HyperLogLog:
+    """고유 원소 수 추정 스케치"""
+
+    def __init__(self, precision: int = 12, registers: Optional[bytes] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError('precision must be between 4 and 16')
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError('register size does not match precision')
+
+    @classmethod
+    def from_error(cls, relative_error: float) -> 'HyperLogLog':
+        """상대 표준 오차(예: 0.02)를 만족하는 최소 precision으로 생성합니다."""
+        precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(min(max(precision, 4), 16))
+
+    def add(self, value: str) -> None:
+        x = _hash64(value)
+        index = x >> (64 - self.precision)
+        remaining = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if other.precision != self.precision:
+            raise ValueError('cannot merge HyperLogLog sketches with different precision')
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = self.size
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # 작은 범위 보정 (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+
+class CountMinSketch:
+    """빈도 추정 스케치 (음수 증감 지원)"""
+
+    def __init__(self, width: int, depth: int, counters: Optional[bytes] = None):
+        if width < 1 or depth < 1:
+            raise ValueError('width and depth must be positive')
+        self.width = width
+        self.depth = depth
+        self.counters = array('i')
+        if counters is not None:
+            self.counters.frombytes(counters)
+            if len(self.counters) != width * depth:
+                raise ValueError('counter size does not match width/depth')
+        else:
+            self.counters.extend([0] * (width * depth))
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float) -> 'CountMinSketch':
+        """오차 epsilon(전체 합계 대비), 실패 확률 delta를 만족하는 크기로 생성합니다."""
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+
+    def _cells(self, key: str) -> Iterable[int]:
+        h1, h2 = _hash_pair(key)
+        for row in range(self.depth):
+            yield row * self.width + ((h1 + row * h2) & _MASK_64) % self.width
+
+    @property
+    def total(self) -> int:
+        """반영된 전체 합계 (모든 행의 합이 같으므로 첫 행의 합)"""
+        return sum(self.counters[:self.width])
+
+    def add(self, key: str, count: int = 1) -> None:
+        for cell in self._cells(key):
+            self.counters[cell] += count
+
+    def estimate(self, key: str) -> int:
+        return max(min(self.counters[cell] for cell in self._cells(key)), 0)
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError('cannot merge CountMinSketch sketches with different dimensions')
+        for i, value in enumerate(other.counters):
+            self.counters[i] += value
+
+    def to_bytes(self) -> bytes:
+        return self.counters.tobytes()
+
+
+class SpaceSaving:
+    """상위 K 후보 추적 (Space-Saving)
+
+    counters: {key: [count, error]} — count는 과대 추정값, count - error가 하한
+    """
+
+    def __init__(self, capacity: int = 100, counters: Optional[dict] = None):
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+        self.capacity = capacity
+        self.counters = {key: [int(c), int(e)] for key, (c, e) in (counters or {}).items()}
+
+    def _min_count(self) -> int:
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def add(self, key: str, count: int = 1) -> None:
+        if key in self.counters:
+            self.counters[key][0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[key] = [count, 0]
+        else:
+            evicted = min(self.counters, key=lambda k: self.counters[k][0])
+            floor = self.counters.pop(evicted)[0]
+            self.counters[key] = [floor + count, floor]
+
+    def remove(self, key: str, count: int = 1) -> None:
+        """삭제된 관측을 반영합니다. 추적 중이 아닌 키는 무시한다 (근사)."""
+        if key in self.counters:
+            self.counters[key][0] -= count
+            if self.counters[key][0] <= 0:
+                del self.counters[key]
+
+    def merge(self, other: 'SpaceSaving') -> None:
+        self_floor = self._min_count()
+        other_floor = other._min_count()
+        merged = {}
+        for key in set(self.counters) | set(other.counters):
+            count_a, error_a = self.counters.get(key, [self_floor, self_floor])
+            count_b, error_b = other.counters.get(key, [other_floor, other_floor])
+            merged[key] = [count_a + count_b, error_a + error_b]
+        top = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:self.capacity]
+        self.counters = dict(top)
+
+    def candidates(self) -> list[str]:
+        return list(self.counters)
+
+    def to_dict(self) -> dict:
+        return {key: list(value) for key, value in self.counters.items()}
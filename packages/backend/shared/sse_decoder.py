@@ -0,0 +1,155 @@
+"""
+SSE(text/event-stream) 증분 디코더
+
+AgentCore Runtime 스트리밍 응답을 버퍼 단위로 읽어 SSE 이벤트로 조립합니다.
+
+  - 설정 가능한 읽기 크기 (AGENTCORE_SSE_READ_SIZE, 기본 4096 bytes)
+  - 가능한 경우 read1()으로 "도착한 만큼" 읽어 큰 버퍼에서도 첫 토큰 지연이 늘지 않음
+  - 여러 줄 data: 필드 결합, event: / id: 필드, 주석(:) 라인 처리
+  - UTF-8 증분 디코딩 (멀티바이트 문자가 버퍼 경계에서 잘려도 안전)
+  - AgentCore 이벤트 JSON의 이중 인코딩을 한 번의 흐름으로 해제 (decode_agent_event)
+"""
+
+import codecs
+import json
+import os
+import re
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+SSE_READ_SIZE = int(os.environ.get('AGENTCORE_SSE_READ_SIZE', '4096'))
+# SSE 명세의 줄 끝은 CRLF / CR / LF 뿐이다 (str.splitlines()는 \u2028 등에서도 나누므로 사용하지 않음)
+_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+
+
+class SSEEvent(NamedTuple):
+    """조립된 SSE 이벤트"""
+    data: str
+    event: str = 'message'
+    id: Optional[str] = None
+
+
+def iter_raw_chunks(body, read_size: int = SSE_READ_SIZE) -> Iterator[bytes]:
+    """응답 본문을 bytes 청크 단위로 읽습니다.
+
+    botocore StreamingBody.read(n)은 n 바이트가 모일 때까지 블로킹하므로
+    하위 urllib3 스트림의 read1()을 우선 사용하여 도착한 데이터를 즉시 반환받는다.
+    read1()이 없으면 iter_chunks(), 그 외에는 bytes iterable로 취급한다.
+    """
+    raw = getattr(body, '_raw_stream', None)
+    read1 = getattr(raw, 'read1', None)
+    if read1 is not None:
+        while True:
+            chunk = read1(read_size)
+            if not chunk:
+                return
+            yield chunk
+    elif hasattr(body, 'iter_chunks'):
+        yield from body.iter_chunks(read_size)
+    else:
+        yield from body
+
+
+def iter_sse_events(chunks: Iterable[bytes]) -> Iterator[SSEEvent]:
+    """bytes 청크 스트림을 SSE 이벤트로 조립합니다.
+
+    빈 라인에서 이벤트를 확정하며, 스트림이 빈 라인 없이 끝나도 남은 data는 이벤트로 반환한다.
+    여러 data: 라인은 '\\n'으로 결합된다 (SSE 명세).
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    data_lines: list[str] = []
+    event_name = ''
+    last_id: Optional[str] = None
+
+    for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        lines = []
+        pos = 0
+        for match in _LINE_BREAK.finditer(text):
+            # 청크 끝의 '\r'은 다음 청크의 '\n'과 이어진 CRLF일 수 있으므로 보류
+            if match.end() == len(text) and match.group() == '\r':
+                break
+            lines.append(text[pos:match.start()])
+            pos = match.end()
+        pending = text[pos:]
+
+        for line in lines:
+            if not line:
+                if data_lines:
+                    yield SSEEvent('\n'.join(data_lines), event_name or 'message', last_id)
+                data_lines = []
+                event_name = ''
+                continue
+            if line[0] == ':':
+                continue
+
+            field, sep, value = line.partition(':')
+            if sep and value[:1] == ' ':
+                value = value[1:]
+            if field == 'data':
+                data_lines.append(value)
+            elif field == 'event':
+                event_name = value
+            elif field == 'id':
+                last_id = value
+
+    tail = (pending + decoder.decode(b'', final=True)).rstrip('\r')
+    if tail.startswith('data:'):
+        value = tail[5:]
+        data_lines.append(value[1:] if value[:1] == ' ' else value)
+    if data_lines:
+        yield SSEEvent('\n'.join(data_lines), event_name or 'message', last_id)
+
+
+def decode_agent_event(data: str) -> Optional[dict]:
+    """AgentCore SSE data 페이로드를 이벤트 딕셔너리로 변환합니다.
+
+    AgentCore는 이벤트 JSON을 다시 JSON 문자열로 감싸 보내는 경우가 있다
+    (예: data: "{\\"type\\": \\"chunk\\", ...}"). 첫 글자로 인코딩 형태를 판별하여
+    필요한 경우에만 json.loads를 수행하며, 일반 텍스트 청크는 파싱을 시도하지 않는다.
+
+    Returns:
+        이벤트 딕셔너리. 빈 데이터면 None.
+    """
+    text = data.strip()
+    if not text:
+        return None
+
+    value = text
+    if text[0] == '"':
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            value = text[1:-1] if len(text) > 1 and text[-1] == '"' else text
+        if isinstance(value, str):
+            value = value.strip()
+    if isinstance(value, str) and value[:1] == '{':
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            pass
+
+    if not isinstance(value, dict):
+        return {'type': 'chunk', 'content': value if isinstance(value, str) else text}
+    if 'type' not in value:
+        return {'type': 'chunk', 'content': json.dumps(value, ensure_ascii=False)}
+
+    event_type = value['type']
+    if event_type == 'chunk':
+        content = value.get('content')
+        # content에 이벤트 JSON이 다시 직렬화된 경우만 내부 파싱
+        if isinstance(content, str) and content[:1] == '{' and '"type"' in content:
+            try:
+                inner = json.loads(content)
+                if isinstance(inner, dict) and 'type' in inner:
+                    return inner
+            except json.JSONDecodeError:
+                pass
+    elif event_type == 'result':
+        message = value.get('message')
+        if isinstance(message, str) and message[:1] in ('{', '['):
+            try:
+                value['message'] = json.loads(message)
+            except json.JSONDecodeError:
+                pass
+    return value
@@ -3,24 +3,66 @@ Trigger Manager
 
 도메인 이벤트에 반응하여 등록된 트리거를 조회하고 실행하는 핵심 관리 클래스입니다.
 event_data dict를 그대로 JSON payload로 전송합니다.
+
+트리거 실행:
+  - 매칭된 트리거를 스레드 풀에서 동시에 실행 (최대 TRIGGER_MAX_CONCURRENCY개)
+  - 트리거마다 실행 시작 시점부터 TRIGGER_TIMEOUT_SECONDS 예산을 두고,
+    예산을 넘긴 트리거는 timeout으로 기록한 뒤 기다리지 않는다
+  - 전체 소요 시간은 트리거 수의 합이 아니라 가장 느린 엔드포인트를 따라간다
+  - 실행 결과를 집계하여 반환하고 [METRIC] 로그로 남긴다
+
+아웃박스 모드 (outbox 지정 시, 스트림 핸들러):
+  - 직접 전송하지 않고 트리거별 전송 메시지를 큐에 넣은 뒤 바로 반환 (status=queued)
+  - 전송/재시도/DLQ는 trigger_outbox.OutboxWorker가 deliver()로 처리
+  - 큐에 넣지 못한 트리거만 이 자리에서 직접 전송한다
+
+SNS 배치 모드 (TRIGGER_SNS_BATCH=true, sns_batch() 컨텍스트 안):
+  - SNS 트리거는 바로 발행하지 않고 모아 두었다가 (status=batched)
+    컨텍스트가 예외 없이 끝날 때만 Topic별 PublishBatch(최대 10개)로 발행
+    (예외로 끝나면 버리고, Lambda가 배치를 다시 전달할 때 다시 모은다)
+  - 재시도 후에도 실패한 항목은 아웃박스가 있으면 큐에 넣어 워커가 재시도한다
+  - 발행도 큐 넣기도 못한 항목의 스트림 레코드(sns_record로 지정)는 컨텍스트 값 목록에 담아
+    핸들러가 batchItemFailures로 돌려주게 한다
 """
 
 import json
 import boto3
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from typing import Optional
 
-from models.trigger import Trigger, TriggerStatus
+from models.trigger import Trigger
+from trigger_outbox import TriggerOutbox
+from trigger_registry import TriggerRegistry
 
 dynamodb = boto3.resource('dynamodb')
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
+TRIGGER_MAX_CONCURRENCY = int(os.environ.get('TRIGGER_MAX_CONCURRENCY', '8'))
+TRIGGER_TIMEOUT_SECONDS = float(os.environ.get('TRIGGER_TIMEOUT_SECONDS', '5'))
+TRIGGER_SNS_BATCH = os.environ.get('TRIGGER_SNS_BATCH', 'false').lower() == 'true'
 
 
 class TriggerManager:
     """Trigger 시스템의 핵심 관리 클래스"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        outbox: Optional[TriggerOutbox] = None,
+        sns_batching: Optional[bool] = None,
+    ):
         self.table = dynamodb.Table(SESSIONS_TABLE) if SESSIONS_TABLE else None
+        self.registry = TriggerRegistry(self.table) if self.table else None
+        self.max_concurrency = max(1, max_concurrency or TRIGGER_MAX_CONCURRENCY)
+        self.timeout_seconds = timeout_seconds or TRIGGER_TIMEOUT_SECONDS
+        self.outbox = outbox
+        self.sns_batching = TRIGGER_SNS_BATCH if sns_batching is None else sns_batching
+        # sns_batch() 컨텍스트 안에서만 list: (trigger, event_type, event_data, campaign_id, record_id)
+        self._sns_buffer: Optional[list] = None
+        self._sns_record_id: Optional[str] = None
         self._executors = {}
         self._register_executors()
 
@@ -29,55 +71,241 @@ class TriggerManager:
         from triggers.slack_trigger import SlackTriggerExecutor
         from triggers.sns_trigger import SNSTriggerExecutor
 
-        self._executors['slack'] = SlackTriggerExecutor()
-        self._executors['sns'] = SNSTriggerExecutor()
+        # 실행기 자체의 네트워크 타임아웃도 트리거 예산에 맞춰 스레드가 예산 뒤에 오래 남지 않게 한다
+        self._executors['slack'] = SlackTriggerExecutor(timeout=self.timeout_seconds)
+        self._executors['sns'] = SNSTriggerExecutor(timeout=self.timeout_seconds)
+
+    def executor_stats(self) -> dict:
+        """stats()를 제공하는 실행기의 상태 카운터 (트리거 유형별)"""
+        return {
+            trigger_type: executor.stats()
+            for trigger_type, executor in self._executors.items()
+            if hasattr(executor, 'stats')
+        }
+
+    @contextmanager
+    def sns_batch(self):
+        """컨텍스트 동안 SNS 트리거를 모아 두었다가 끝날 때 Topic별 PublishBatch로 발행합니다.
+
+        컨텍스트 안에서 예외가 나면 발행하지 않고 버린 뒤 예외를 다시 던진다 (재전달 시 중복 발행 방지).
+        배치 모드가 꺼져 있거나 이미 컨텍스트 안이면 아무 일도 하지 않는다.
+
+        Yields:
+            발행하지 못한 SNS 트리거의 스트림 레코드 ID 목록 (컨텍스트가 끝난 뒤 채워진다)
+        """
+        failed_records = []
+        if not self.sns_batching or self._sns_buffer is not None:
+            yield failed_records
+            return
+        self._sns_buffer = []
+        try:
+            yield failed_records
+        except BaseException:
+            print(f"Discarding {len(self._sns_buffer)} buffered SNS triggers after stream batch failure")
+            raise
+        else:
+            metric = self.flush_sns(self._sns_buffer)
+            failed_records.extend(metric['failedRecords'])
+        finally:
+            self._sns_buffer = None
+            self._sns_record_id = None
+
+    def sns_record(self, record_id: Optional[str]) -> None:
+        """이후 모으는 SNS 트리거가 속한 스트림 레코드 ID (SequenceNumber)를 지정합니다."""
+        self._sns_record_id = record_id
+
+    def flush_sns(self, buffered: list) -> dict:
+        """모아 둔 SNS 트리거를 발행하고 결과를 집계합니다.
+
+        Returns:
+            [METRIC] 항목과 'failedRecords' (발행도 큐 넣기도 못한 항목의 레코드 ID 목록)
+        """
+        if not buffered:
+            return {'total': 0, 'published': 0, 'failed': 0, 'requeued': 0, 'topics': 0, 'durationMs': 0.0,
+                    'failedRecords': []}
+
+        started = time.monotonic()
+        executor = self._executors['sns']
+        try:
+            outcomes = executor.publish_batch([
+                (trigger.delivery_endpoint, _payload(event_data)) for trigger, _, event_data, _, _ in buffered
+            ])
+        except Exception as e:
+            print(f"SNS batch publish failed: {str(e)}")
+            outcomes = [False] * len(buffered)
+
+        failed = [entry for entry, published in zip(buffered, outcomes) if not published]
+        requeued = 0
+        unsent = []
+        for trigger, event_type, event_data, campaign_id, record_id in failed:
+            try:
+                if self.outbox and not self.outbox.enqueue([trigger], event_type, event_data, campaign_id):
+                    requeued += 1
+                    continue
+            except Exception as e:
+                print(f"Failed to enqueue SNS trigger {trigger.trigger_id}: {str(e)}")
+            print(f"SNS trigger {trigger.trigger_id} not delivered for stream record {record_id}")
+            unsent.append(record_id)
+
+        metric = {
+            'total': len(buffered),
+            'published': len(buffered) - len(failed),
+            'failed': len(failed),
+            'requeued': requeued,
+            'unsent': len(unsent),
+            'topics': len({trigger.delivery_endpoint for trigger, _, _, _, _ in buffered}),
+            'durationMs': round((time.monotonic() - started) * 1000, 1),
+        }
+        print(f"[METRIC] trigger_sns_batch {json.dumps(metric)}")
+        metric['failedRecords'] = sorted({record_id for record_id in unsent if record_id})
+        return metric
 
     def get_triggers_for_event(self, event_type: str, campaign_id: Optional[str] = None) -> list[Trigger]:
-        """특정 이벤트 타입에 대한 활성 트리거를 조회합니다."""
-        if not self.table:
+        """특정 이벤트 타입에 대한 활성 트리거를 조회합니다.
+
+        warm 컨테이너의 TriggerRegistry 스냅샷에서 찾으므로 레코드마다 GSI1을 조회하지 않는다.
+        """
+        if not self.registry:
             print("TriggerManager: No table configured")
             return []
 
-        triggers = []
-
         try:
-            resp = self.table.query(
-                IndexName='GSI1',
-                KeyConditionExpression='GSI1PK = :pk',
-                ExpressionAttributeValues={':pk': f'EVENT#{event_type}'}
-            )
-            for item in resp.get('Items', []):
-                trigger = Trigger.from_dynamodb_item(item)
-                if trigger.status == TriggerStatus.ACTIVE.value:
-                    if trigger.is_global or trigger.campaign_id == campaign_id:
-                        triggers.append(trigger)
+            return self.registry.get_triggers(event_type, campaign_id)
         except Exception as e:
             print(f"Error querying triggers for event {event_type}: {str(e)}")
+            return []
 
-        return triggers
+    def execute_triggers(self, event_type: str, event_data: dict, campaign_id: Optional[str] = None) -> dict:
+        """이벤트에 대한 모든 활성 트리거를 동시에 실행하고 결과를 집계합니다.
 
-    def execute_triggers(self, event_type: str, event_data: dict, campaign_id: Optional[str] = None):
-        """이벤트에 대한 모든 활성 트리거를 실행합니다."""
+        Returns:
+            {'eventType', 'total', 'succeeded', 'failed', 'timedOut', 'durationMs', 'results'}
+            아웃박스/SNS 배치 모드에서는 'queued', 'batched'도 포함
+            results 항목: {'triggerId', 'triggerType', 'status', 'durationMs'}
+            status: succeeded | failed | timeout | error | queued | batched
+        """
         triggers = self.get_triggers_for_event(event_type, campaign_id)
 
         if not triggers:
             print(f"No active triggers for event {event_type}")
-            return
+            return _summarize(event_type, [], 0.0)
 
         print(f"Executing {len(triggers)} triggers for event {event_type}")
 
-        for trigger in triggers:
+        started = time.monotonic()
+        results = []
+        if self._sns_buffer is not None:
+            batched = [trigger for trigger in triggers if trigger.trigger_type == 'sns']
+            self._sns_buffer.extend(
+                (trigger, event_type, event_data, campaign_id, self._sns_record_id) for trigger in batched
+            )
+            results = [_result(trigger, 'batched') for trigger in batched]
+            triggers = [trigger for trigger in triggers if trigger.trigger_type != 'sns']
+
+        if triggers and self.outbox:
+            results.extend(self._enqueue(triggers, event_type, event_data, campaign_id))
+        elif triggers:
+            results.extend(self._dispatch(triggers, event_data))
+        summary = _summarize(event_type, results, time.monotonic() - started)
+        metric = {key: value for key, value in summary.items() if key != 'results'}
+        print(f"[METRIC] trigger_dispatch {json.dumps(metric)}")
+        return summary
+
+    def _enqueue(self, triggers: list[Trigger], event_type: str, event_data: dict,
+                 campaign_id: Optional[str]) -> list[dict]:
+        """트리거를 아웃박스에 넣습니다. 넣지 못한 트리거는 직접 전송한다."""
+        try:
+            unsent = self.outbox.enqueue(triggers, event_type, event_data, campaign_id)
+        except Exception as e:
+            print(f"Failed to enqueue triggers for event {event_type}: {str(e)}")
+            unsent = list(triggers)
+
+        unsent_ids = {id(trigger) for trigger in unsent}
+        results = [_result(trigger, 'queued') for trigger in triggers if id(trigger) not in unsent_ids]
+        if unsent:
+            print(f"Dispatching {len(unsent)} triggers directly after enqueue failure")
+            results.extend(self._dispatch(unsent, event_data))
+        return results
+
+    def _dispatch(self, triggers: list[Trigger], event_data: dict) -> list[dict]:
+        """트리거를 최대 max_concurrency개씩 동시에 실행합니다.
+
+        대기 중인 트리거는 슬롯이 나면 시작하며, 각 트리거의 타임아웃은 실제 시작 시점부터 잰다.
+        타임아웃된 스레드는 취소할 수 없으므로 결과만 timeout으로 기록하고 기다리지 않는다.
+        """
+        started_at: dict[int, float] = {}
+        finished_at: dict[int, float] = {}
+
+        def run(index: int, trigger: Trigger) -> bool:
+            started_at[index] = time.monotonic()
             try:
-                self._execute_trigger(trigger, event_data)
-            except Exception as e:
-                print(f"Failed to execute trigger {trigger.trigger_id}: {str(e)}")
+                return self.deliver(trigger, event_data)
+            finally:
+                finished_at[index] = time.monotonic()
 
-    def _execute_trigger(self, trigger: Trigger, event_data: dict) -> bool:
-        """단일 트리거를 실행합니다. event_data를 그대로 JSON payload로 전송."""
-        # 빈 문자열 필드를 "None"으로 치환
-        payload = {k: (v if v != '' else 'None') for k, v in event_data.items()}
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(triggers)), thread_name_prefix='trigger'
+        )
+        futures = {pool.submit(run, index, trigger): index for index, trigger in enumerate(triggers)}
+        outcomes: dict[int, tuple[str, float]] = {}
+        pending = set(futures)
+        try:
+            while pending:
+                now = time.monotonic()
+                deadlines = [
+                    started_at[futures[f]] + self.timeout_seconds
+                    for f in pending if futures[f] in started_at
+                ]
+                # 아직 시작하지 않은 트리거가 있으면 시작 시점을 놓치지 않도록 짧게 기다린다
+                wait_for = min(deadlines) - now if deadlines else self.timeout_seconds
+                if len(deadlines) < len(pending):
+                    wait_for = min(wait_for, 0.05)
+                done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
 
-        print(f"Trigger {trigger.trigger_id} payload: {json.dumps(payload, ensure_ascii=False)}")
+                for future in done:
+                    index = futures[future]
+                    elapsed = finished_at.get(index, time.monotonic()) - started_at.get(index, time.monotonic())
+                    try:
+                        status = 'succeeded' if future.result() else 'failed'
+                    except Exception as e:
+                        print(f"Failed to execute trigger {triggers[index].trigger_id}: {str(e)}")
+                        status = 'error'
+                    outcomes[index] = (status, elapsed)
+
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started_at and now - started_at[index] >= self.timeout_seconds:
+                        print(f"Trigger {triggers[index].trigger_id} timed out after {self.timeout_seconds}s")
+                        outcomes[index] = ('timeout', now - started_at[index])
+                        pending.discard(future)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return [
+            {
+                'triggerId': trigger.trigger_id,
+                'triggerType': trigger.trigger_type,
+                'status': outcomes[index][0],
+                'durationMs': round(outcomes[index][1] * 1000, 1),
+            }
+            for index, trigger in enumerate(triggers)
+        ]
+
+    def circuit_retry_after(self, trigger: Trigger) -> float:
+        """트리거 엔드포인트의 회로가 열려 있으면 다시 호출할 수 있을 때까지 남은 시간(초), 아니면 0."""
+        circuit_breaker = getattr(self._executors.get(trigger.trigger_type), 'circuit_breaker', None)
+        if circuit_breaker is None:
+            return 0.0
+        return circuit_breaker.retry_after(trigger.delivery_endpoint)
+
+    def deliver(self, trigger: Trigger, event_data: dict) -> bool:
+        """단일 트리거를 실행합니다. event_data를 그대로 JSON payload로 전송.
+
+        payload에는 고객 이름/이메일/회사가 들어 있으므로 로그에는 트리거 ID, 이벤트 유형, 결과만 남긴다.
+        """
+        payload = _payload(event_data)
+        event_type = event_data.get('event_type', '')
 
         executor = self._executors.get(trigger.trigger_type)
         if not executor:
@@ -86,8 +314,32 @@ class TriggerManager:
 
         success = executor.execute(trigger.delivery_endpoint, payload)
         if success:
-            print(f"Trigger {trigger.trigger_id} ({trigger.trigger_type}) executed successfully")
+            print(f"Trigger {trigger.trigger_id} ({trigger.trigger_type}) {event_type} executed successfully")
         else:
-            print(f"Trigger {trigger.trigger_id} ({trigger.trigger_type}) execution failed")
+            print(f"Trigger {trigger.trigger_id} ({trigger.trigger_type}) {event_type} execution failed")
 
         return success
+
+
+def _payload(event_data: dict) -> dict:
+    # 빈 문자열 필드를 "None"으로 치환
+    return {k: (v if v != '' else 'None') for k, v in event_data.items()}
+
+
+def _result(trigger: Trigger, status: str) -> dict:
+    return {'triggerId': trigger.trigger_id, 'triggerType': trigger.trigger_type, 'status': status, 'durationMs': 0.0}
+
+
+def _summarize(event_type: str, results: list[dict], elapsed: float) -> dict:
+    statuses = [result['status'] for result in results]
+    return {
+        'eventType': event_type,
+        'total': len(results),
+        'succeeded': statuses.count('succeeded'),
+        'failed': statuses.count('failed') + statuses.count('error'),
+        'timedOut': statuses.count('timeout'),
+        'queued': statuses.count('queued'),
+        'batched': statuses.count('batched'),
+        'durationMs': round(elapsed * 1000, 1),
+        'results': results,
+    }
@@ -0,0 +1,313 @@
+"""
+Trigger Outbox - 트리거 전송 큐와 재시도 워커
+
+스트림 Lambda가 Slack/SNS로 직접 전송하면 실패한 전송은 로그만 남고 사라지고,
+재시도하려면 스트림 배치 전체를 다시 처리해야 한다. 아웃박스 모드에서는:
+
+  1. 스트림 핸들러(TriggerManager)가 매칭된 트리거마다 전송 메시지를 SQS에 넣고 바로 반환
+  2. 워커 Lambda(trigger_outbox_worker)가 메시지를 받아 전송
+     - 엔드포인트 회로 차단기가 열려 있으면 전송하지 않고 attempt를 올리지 않은 채
+       회로가 탐침을 허용하는 시점으로 지연 재전송 (shortCircuited)
+     - 엔드포인트별 토큰 버킷(TRIGGER_ENDPOINT_RATE_PER_SECOND / TRIGGER_ENDPOINT_BURST)을 넘으면
+       attempt를 올리지 않고 다음 토큰 시점으로 지연 재전송 (deferred)
+       토큰 버킷은 컨테이너 단위이므로 엔드포인트 전체 한도는 대략 설정값 × 동시 실행 수이다
+     - 실패하면 지수 백오프(TRIGGER_OUTBOX_BASE_DELAY_SECONDS * 2^(attempt-1), 지터 포함)로 재전송 (retried)
+     - TRIGGER_OUTBOX_MAX_ATTEMPTS번 실패하면 DLQ로 이동 (dead_lettered)
+  3. 재전송/DLQ 전송 자체가 실패한 메시지만 batchItemFailures로 돌려 SQS가 다시 전달하게 한다
+
+메시지 형식:
+  {'triggerId', 'triggerType', 'deliveryEndpoint', 'eventType', 'campaignId',
+   'eventData', 'attempt', 'enqueuedAt'}
+
+큐 구현:
+  - SQSQueue: send_message_batch(10개 단위)로 전송
+  - LocalQueue: 테스트/로컬 실행용 인메모리 대기열 (DelaySeconds 지원)
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Callable, Optional
+
+import boto3
+
+from models.trigger import Trigger
+from rate_limiter import KeyedRateLimiter
+from utils import get_timestamp
+
+TRIGGER_OUTBOX_QUEUE_URL = os.environ.get('TRIGGER_OUTBOX_QUEUE_URL')
+TRIGGER_OUTBOX_DLQ_URL = os.environ.get('TRIGGER_OUTBOX_DLQ_URL')
+TRIGGER_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('TRIGGER_OUTBOX_MAX_ATTEMPTS', '5'))
+TRIGGER_OUTBOX_BASE_DELAY_SECONDS = float(os.environ.get('TRIGGER_OUTBOX_BASE_DELAY_SECONDS', '2'))
+TRIGGER_ENDPOINT_RATE_PER_SECOND = float(os.environ.get('TRIGGER_ENDPOINT_RATE_PER_SECOND', '1'))
+TRIGGER_ENDPOINT_BURST = float(os.environ.get('TRIGGER_ENDPOINT_BURST', '5'))
+
+# SQS DelaySeconds 상한
+MAX_DELAY_SECONDS = 900
+SQS_BATCH_SIZE = 10
+
+
+def outbox_message(trigger: Trigger, event_type: str, event_data: dict, campaign_id: Optional[str] = None) -> dict:
+    """트리거 하나의 첫 전송 메시지를 만듭니다."""
+    return {
+        'triggerId': trigger.trigger_id,
+        'triggerType': trigger.trigger_type,
+        'deliveryEndpoint': trigger.delivery_endpoint,
+        'eventType': event_type,
+        'campaignId': campaign_id,
+        'eventData': event_data,
+        'attempt': 1,
+        'enqueuedAt': get_timestamp(),
+    }
+
+
+def message_trigger(message: dict) -> Trigger:
+    """메시지에서 전송에 필요한 Trigger를 복원합니다."""
+    return Trigger(
+        trigger_id=message['triggerId'],
+        trigger_type=message['triggerType'],
+        event_type=message['eventType'],
+        delivery_endpoint=message['deliveryEndpoint'],
+        campaign_id=message.get('campaignId'),
+    )
+
+
+def retry_delay(
+    attempt: int,
+    base: float = TRIGGER_OUTBOX_BASE_DELAY_SECONDS,
+    rng: Callable[[float, float], float] = random.uniform,
+) -> int:
+    """attempt번째 실패 뒤 재전송 지연(초). 지수 백오프의 절반 이상을 보장하는 지터를 둔다."""
+    ceiling = min(base * (2 ** (attempt - 1)), MAX_DELAY_SECONDS)
+    return min(max(1, math.ceil(rng(ceiling / 2, ceiling))), MAX_DELAY_SECONDS)
+
+
+def _defer_delay(wait: float) -> int:
+    """지연 재전송 DelaySeconds (1초 이상, SQS 상한 이하)"""
+    return min(max(1, math.ceil(wait)), MAX_DELAY_SECONDS)
+
+
+class SQSQueue:
+    """SQS 큐 (send_message_batch 10개 단위)"""
+
+    def __init__(self, queue_url: str, client=None):
+        self.queue_url = queue_url
+        self.sqs = client or boto3.client('sqs')
+
+    def send(self, entries: list[tuple[dict, int]]) -> list[int]:
+        """(메시지, 지연 초) 목록을 전송하고 실패한 항목의 인덱스를 반환합니다."""
+        failed = []
+        for start in range(0, len(entries), SQS_BATCH_SIZE):
+            chunk = entries[start:start + SQS_BATCH_SIZE]
+            try:
+                response = self.sqs.send_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {
+                            'Id': str(start + offset),
+                            'MessageBody': json.dumps(body, ensure_ascii=False),
+                            'DelaySeconds': int(delay),
+                        }
+                        for offset, (body, delay) in enumerate(chunk)
+                    ],
+                )
+            except Exception as e:
+                print(f"Failed to send outbox batch to {self.queue_url}: {str(e)}")
+                failed.extend(range(start, start + len(chunk)))
+                continue
+            for failure in response.get('Failed', []):
+                print(f"Outbox message rejected: {failure.get('Code')} - {failure.get('Message')}")
+                failed.append(int(failure['Id']))
+        return sorted(failed)
+
+
+class LocalQueue:
+    """테스트/로컬 실행용 인메모리 큐. receive()는 SQS 이벤트 레코드 형식을 돌려준다."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._messages: list[tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+
+    def send(self, entries: list[tuple[dict, int]]) -> list[int]:
+        now = self._clock()
+        with self._lock:
+            for body, delay in entries:
+                self._messages.append((now + delay, str(uuid.uuid4()), json.dumps(body, ensure_ascii=False)))
+        return []
+
+    def receive(self, max_messages: int = SQS_BATCH_SIZE) -> list[dict]:
+        now = self._clock()
+        with self._lock:
+            visible = [m for m in self._messages if m[0] <= now][:max_messages]
+            for message in visible:
+                self._messages.remove(message)
+        return [{'messageId': message_id, 'body': body} for _, message_id, body in visible]
+
+    def bodies(self) -> list[dict]:
+        """대기 중인 모든 메시지 (지연 중인 것 포함)"""
+        with self._lock:
+            return [json.loads(body) for _, _, body in self._messages]
+
+    def next_visible_at(self) -> Optional[float]:
+        with self._lock:
+            return min((m[0] for m in self._messages), default=None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._messages)
+
+
+class TriggerOutbox:
+    """스트림 핸들러 쪽 전송 대기열 (TriggerManager가 사용)"""
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    @classmethod
+    def from_env(cls) -> Optional['TriggerOutbox']:
+        """TRIGGER_OUTBOX_QUEUE_URL이 설정된 경우에만 아웃박스를 사용합니다."""
+        return cls(SQSQueue(TRIGGER_OUTBOX_QUEUE_URL)) if TRIGGER_OUTBOX_QUEUE_URL else None
+
+    def enqueue(
+        self,
+        triggers: list[Trigger],
+        event_type: str,
+        event_data: dict,
+        campaign_id: Optional[str] = None,
+    ) -> list[Trigger]:
+        """트리거별 전송 메시지를 큐에 넣고, 넣지 못한 트리거를 반환합니다."""
+        messages = [outbox_message(trigger, event_type, event_data, campaign_id) for trigger in triggers]
+        failed = self.queue.send([(message, 0) for message in messages])
+        return [triggers[index] for index in failed]
+
+
+class OutboxWorker:
+    """아웃박스 메시지를 전송하는 워커 (재시도/지연/DLQ 처리)
+
+    deliver(trigger, event_data) -> bool 은 보통 TriggerManager.deliver이다.
+    """
+
+    def __init__(
+        self,
+        queue,
+        deliver: Callable[[Trigger, dict], bool],
+        dead_letter_queue=None,
+        rate_limiter: Optional[KeyedRateLimiter] = None,
+        circuit_retry_after: Optional[Callable[[Trigger], float]] = None,
+        max_attempts: int = TRIGGER_OUTBOX_MAX_ATTEMPTS,
+        base_delay: float = TRIGGER_OUTBOX_BASE_DELAY_SECONDS,
+        rng: Callable[[float, float], float] = random.uniform,
+    ):
+        self.queue = queue
+        self.deliver = deliver
+        self.dead_letter_queue = dead_letter_queue
+        self.rate_limiter = rate_limiter
+        self.circuit_retry_after = circuit_retry_after
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.rng = rng
+
+    @classmethod
+    def from_env(
+        cls,
+        deliver: Callable[[Trigger, dict], bool],
+        circuit_retry_after: Optional[Callable[[Trigger], float]] = None,
+    ) -> 'OutboxWorker':
+        return cls(
+            queue=SQSQueue(TRIGGER_OUTBOX_QUEUE_URL),
+            deliver=deliver,
+            dead_letter_queue=SQSQueue(TRIGGER_OUTBOX_DLQ_URL) if TRIGGER_OUTBOX_DLQ_URL else None,
+            rate_limiter=KeyedRateLimiter(TRIGGER_ENDPOINT_RATE_PER_SECOND, TRIGGER_ENDPOINT_BURST),
+            circuit_retry_after=circuit_retry_after,
+        )
+
+    def process(self, records: list[dict]) -> dict:
+        """SQS 레코드 배치를 처리합니다.
+
+        Returns:
+            {'total', 'delivered', 'deferred', 'shortCircuited', 'retried', 'deadLettered', 'invalid',
+             'requeueFailed', 'durationMs', 'batchItemFailures'}
+        """
+        started = time.monotonic()
+        counts = Counter()
+        failures = []
+        for record in records:
+            try:
+                message = json.loads(record['body'])
+                message_trigger(message)
+            except (KeyError, TypeError, ValueError) as e:
+                # 형식이 잘못된 메시지는 재시도해도 처리할 수 없으므로 버린다
+                print(f"Dropping invalid outbox message {record.get('messageId')}: {str(e)}")
+                counts['invalid'] += 1
+                continue
+
+            status = self._process_message(message)
+            if status is None:
+                failures.append({'itemIdentifier': record['messageId']})
+                counts['requeueFailed'] += 1
+            else:
+                counts[status] += 1
+
+        summary = {
+            'total': len(records),
+            'delivered': counts['delivered'],
+            'deferred': counts['deferred'],
+            'shortCircuited': counts['shortCircuited'],
+            'retried': counts['retried'],
+            'deadLettered': counts['deadLettered'],
+            'invalid': counts['invalid'],
+            'requeueFailed': counts['requeueFailed'],
+            'durationMs': round((time.monotonic() - started) * 1000, 1),
+        }
+        print(f"[METRIC] trigger_outbox {json.dumps(summary)}")
+        summary['batchItemFailures'] = failures
+        return summary
+
+    def _process_message(self, message: dict) -> Optional[str]:
+        """메시지 하나를 처리하고 상태를 반환합니다. 재전송에 실패하면 None."""
+        trigger = message_trigger(message)
+        attempt = int(message.get('attempt', 1))
+
+        # 회로가 열린 엔드포인트는 호출하지 않으므로 시도로 세지 않는다 (토큰도 쓰지 않음)
+        if self.circuit_retry_after is not None:
+            wait = self.circuit_retry_after(trigger)
+            if wait:
+                return 'shortCircuited' if self._send(self.queue, message, _defer_delay(wait)) else None
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.try_acquire(trigger.delivery_endpoint)
+            if wait:
+                return 'deferred' if self._send(self.queue, message, _defer_delay(wait)) else None
+
+        try:
+            success = self.deliver(trigger, message.get('eventData') or {})
+        except Exception as e:
+            print(f"Outbox delivery error for trigger {trigger.trigger_id}: {str(e)}")
+            success = False
+        if success:
+            return 'delivered'
+
+        if attempt >= self.max_attempts:
+            print(f"Trigger {trigger.trigger_id} failed {attempt} times - moving to dead-letter queue")
+            if self.dead_letter_queue is None:
+                return 'deadLettered'
+            dead = {**message, 'failedAt': get_timestamp()}
+            return 'deadLettered' if self._send(self.dead_letter_queue, dead, 0) else None
+
+        delay = retry_delay(attempt, self.base_delay, self.rng)
+        print(f"Trigger {trigger.trigger_id} attempt {attempt} failed - retrying in {delay}s")
+        return 'retried' if self._send(self.queue, {**message, 'attempt': attempt + 1}, delay) else None
+
+    @staticmethod
+    def _send(queue, message: dict, delay: int) -> bool:
+        try:
+            return not queue.send([(message, delay)])
+        except Exception as e:
+            print(f"Failed to requeue outbox message: {str(e)}")
+            return False
@@ -0,0 +1,125 @@
+"""
+Trigger Registry - Warm Lambda 인스턴스용 트리거 조회 캐시
+
+스트림 레코드마다 GSI1(EVENT#{event_type})을 조회하던 것을 이벤트 타입별 스냅샷으로 바꾼다.
+스냅샷은 활성 트리거를 전역 트리거 목록과 캠페인별 dict로 나눠 두므로
+(event_type, campaign_id) 매칭은 dict 조회 두 번이다.
+
+무효화:
+  - trigger_api_handler가 트리거를 생성/수정/삭제하면 버전 스탬프 아이템
+    (PK=TRIGGER_REGISTRY, SK=VERSION)의 version을 올린다
+  - 레지스트리는 TRIGGER_REGISTRY_VERSION_CHECK_SECONDS마다 한 번 버전을 읽어
+    바뀌었으면 스냅샷을 모두 버린다 (다른 Lambda 함수의 변경도 반영)
+  - 버전 갱신이 누락되어도 TRIGGER_REGISTRY_TTL_SECONDS 뒤에는 다시 읽는다
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from boto3.dynamodb.conditions import Key
+
+from dynamodb_utils import iter_query
+from models.trigger import Trigger, TriggerStatus
+from ttl_cache import TTLCache
+from utils import get_timestamp
+
+TRIGGER_REGISTRY_TTL_SECONDS = float(os.environ.get('TRIGGER_REGISTRY_TTL_SECONDS', '300'))
+TRIGGER_REGISTRY_VERSION_CHECK_SECONDS = float(os.environ.get('TRIGGER_REGISTRY_VERSION_CHECK_SECONDS', '5'))
+REGISTRY_VERSION_KEY = {'PK': 'TRIGGER_REGISTRY', 'SK': 'VERSION'}
+
+
+def bump_registry_version(table) -> None:
+    """트리거 변경을 다른 컨테이너의 레지스트리에 알리기 위해 버전 스탬프를 올립니다."""
+    table.update_item(
+        Key=REGISTRY_VERSION_KEY,
+        UpdateExpression='ADD #version :one SET updatedAt = :updated_at',
+        ExpressionAttributeNames={'#version': 'version'},
+        ExpressionAttributeValues={':one': 1, ':updated_at': get_timestamp()},
+    )
+
+
+class EventTriggers:
+    """이벤트 타입 하나의 활성 트리거 스냅샷"""
+
+    __slots__ = ('global_triggers', 'by_campaign')
+
+    def __init__(self, triggers: list[Trigger]):
+        self.global_triggers: list[Trigger] = []
+        self.by_campaign: dict[str, list[Trigger]] = {}
+        for trigger in triggers:
+            if trigger.status != TriggerStatus.ACTIVE.value:
+                continue
+            if trigger.is_global:
+                self.global_triggers.append(trigger)
+            elif trigger.campaign_id:
+                self.by_campaign.setdefault(trigger.campaign_id, []).append(trigger)
+
+    def match(self, campaign_id: Optional[str]) -> list[Trigger]:
+        return self.global_triggers + self.by_campaign.get(campaign_id, []) if campaign_id \
+            else list(self.global_triggers)
+
+
+class TriggerRegistry:
+    """이벤트 타입별 활성 트리거 스냅샷 캐시 (TTL + 버전 스탬프 무효화)"""
+
+    def __init__(
+        self,
+        table,
+        ttl: float = TRIGGER_REGISTRY_TTL_SECONDS,
+        version_check_seconds: float = TRIGGER_REGISTRY_VERSION_CHECK_SECONDS,
+    ):
+        self.table = table
+        self.version_check_seconds = version_check_seconds
+        self._snapshots = TTLCache(maxsize=64, ttl=ttl, name='trigger_registry')
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at: Optional[float] = None
+
+    def get_triggers(self, event_type: str, campaign_id: Optional[str] = None) -> list[Trigger]:
+        """이벤트에 매칭되는 활성 트리거 (전역 트리거 + 캠페인 트리거)"""
+        self._check_version()
+        snapshot = self._snapshots.get_or_load(event_type, lambda: self._load(event_type))
+        return snapshot.match(campaign_id)
+
+    def invalidate(self) -> None:
+        """같은 프로세스에서 트리거를 변경했을 때 즉시 스냅샷을 버립니다."""
+        self._snapshots.clear()
+        with self._lock:
+            self._version_checked_at = None
+
+    def stats(self) -> dict:
+        return self._snapshots.stats()
+
+    def _load(self, event_type: str) -> EventTriggers:
+        items = iter_query(
+            self.table,
+            IndexName='GSI1',
+            KeyConditionExpression=Key('GSI1PK').eq(f'EVENT#{event_type}'),
+        )
+        return EventTriggers([Trigger.from_dynamodb_item(item) for item in items])
+
+    def _check_version(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_seconds:
+                return
+            self._version_checked_at = now
+
+        try:
+            version = self.table.get_item(
+                Key=REGISTRY_VERSION_KEY,
+                ProjectionExpression='#version',
+                ExpressionAttributeNames={'#version': 'version'},
+            ).get('Item', {}).get('version', 0)
+        except Exception as e:
+            # 버전 확인 실패 시 기존 스냅샷을 계속 사용한다 (TTL이 상한)
+            print(f"Failed to check trigger registry version: {str(e)}")
+            return
+        with self._lock:
+            changed = self._version is not None and version != self._version
+            self._version = version
+        if changed:
+            print(f"Trigger registry version changed to {version} - reloading triggers")
+            self._snapshots.clear()
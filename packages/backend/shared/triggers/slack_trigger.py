@@ -2,15 +2,86 @@
 Slack Trigger Executor
 
 Slack Workflow Webhook을 통해 event_data dict를 그대로 JSON POST합니다.
+
+연결/보호:
+  - 웹훅 호스트별 requests.Session(커넥션 풀)을 재사용하여 이벤트마다 TCP/TLS 핸드셰이크를 하지 않는다
+  - 웹훅 URL별 토큰 버킷(SLACK_WEBHOOK_RATE_PER_SECOND / SLACK_WEBHOOK_BURST)을 넘으면
+    짧은 대기(최대 SLACK_WEBHOOK_MAX_WAIT_SECONDS) 뒤 전송하고, 더 기다려야 하면 바로 실패 처리
+  - 웹훅 URL별 회로 차단기: 연속 SLACK_CIRCUIT_FAILURE_THRESHOLD번 실패하면
+    SLACK_CIRCUIT_COOLDOWN_SECONDS 동안 호출하지 않는다 (429는 Retry-After 동안 차단)
+  - stats()로 전송/실패/제한/차단 카운터를 제공한다
 """
 
 import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+from urllib.parse import urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import KeyedCircuitBreaker
+from rate_limiter import KeyedRateLimiter
+
+
+# 웹훅 요청 타임아웃 기본값(초)
+DEFAULT_TIMEOUT_SECONDS = 5
+SLACK_WEBHOOK_RATE_PER_SECOND = float(os.environ.get('SLACK_WEBHOOK_RATE_PER_SECOND', '1'))
+SLACK_WEBHOOK_BURST = float(os.environ.get('SLACK_WEBHOOK_BURST', '5'))
+SLACK_WEBHOOK_MAX_WAIT_SECONDS = float(os.environ.get('SLACK_WEBHOOK_MAX_WAIT_SECONDS', '1'))
+SLACK_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('SLACK_CIRCUIT_FAILURE_THRESHOLD', '5'))
+SLACK_CIRCUIT_COOLDOWN_SECONDS = float(os.environ.get('SLACK_CIRCUIT_COOLDOWN_SECONDS', '30'))
+# 호스트별 커넥션 풀 크기 (트리거 동시 실행 수와 맞춘다)
+SLACK_POOL_MAXSIZE = int(os.environ.get('TRIGGER_MAX_CONCURRENCY', '8'))
 
 
 class SlackTriggerExecutor:
     """Slack Webhook 트리거 실행기"""
 
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        rate_limiter: Optional[KeyedRateLimiter] = None,
+        circuit_breaker: Optional[KeyedCircuitBreaker] = None,
+        max_wait_seconds: float = SLACK_WEBHOOK_MAX_WAIT_SECONDS,
+    ):
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or KeyedRateLimiter(SLACK_WEBHOOK_RATE_PER_SECOND, SLACK_WEBHOOK_BURST)
+        self.circuit_breaker = circuit_breaker or KeyedCircuitBreaker(
+            SLACK_CIRCUIT_FAILURE_THRESHOLD, SLACK_CIRCUIT_COOLDOWN_SECONDS
+        )
+        self.max_wait_seconds = max_wait_seconds
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    def _session(self, webhook_url: str) -> requests.Session:
+        """웹훅 호스트별로 재사용하는 Session"""
+        host = urlparse(webhook_url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update({'Content-Type': 'application/json'})
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=SLACK_POOL_MAXSIZE))
+                self._sessions[host] = session
+            return session
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _acquire(self, webhook_url: str) -> bool:
+        """토큰을 가져옵니다. max_wait_seconds 안에 생기면 기다린다."""
+        wait = self.rate_limiter.try_acquire(webhook_url)
+        if wait and wait <= self.max_wait_seconds:
+            time.sleep(wait)
+            wait = self.rate_limiter.try_acquire(webhook_url)
+        return not wait
+
     def execute(self, webhook_url: str, payload: dict) -> bool:
         """
         Slack Webhook으로 event_data를 직접 전송합니다.
@@ -22,29 +93,58 @@ class SlackTriggerExecutor:
         Returns:
             성공 여부
         """
+        if not self.circuit_breaker.allow(webhook_url):
+            print("Slack webhook circuit open - skipping")
+            self._count('shortCircuited')
+            return False
+        if not self._acquire(webhook_url):
+            print("Slack webhook rate limited - skipping")
+            self._count('rateLimited')
+            # 호출하지 않았으므로 half_open 탐침 자격을 돌려준다
+            self.circuit_breaker.release(webhook_url)
+            return False
+
+        self._count('sent')
         try:
             print(f"Slack webhook payload: {json.dumps(payload, ensure_ascii=False)}")
 
-            response = requests.post(
-                webhook_url,
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=5
-            )
+            response = self._session(webhook_url).post(webhook_url, json=payload, timeout=self.timeout)
 
             if response.status_code in (200, 202):
                 print(f"Slack webhook sent successfully: {response.status_code}")
+                self.circuit_breaker.record_success(webhook_url)
+                self._count('succeeded')
                 return True
-            else:
-                print(f"Slack webhook failed: {response.status_code} - {response.text}")
-                return False
+
+            print(f"Slack webhook failed: {response.status_code} - {response.text}")
+            retry_after = _retry_after(response) if response.status_code == 429 else None
+            self.circuit_breaker.record_failure(webhook_url, open_for=retry_after)
+            self._count('failed')
+            return False
 
         except requests.Timeout:
             print("Slack webhook timeout")
-            return False
         except requests.ConnectionError:
             print("Slack webhook connection error")
-            return False
         except Exception as e:
             print(f"Slack webhook error: {str(e)}")
-            return False
+        self.circuit_breaker.record_failure(webhook_url)
+        self._count('failed')
+        return False
+
+    def stats(self) -> dict:
+        """전송/실패/속도 제한/회로 차단 카운터"""
+        with self._lock:
+            counters = {name: self._counters[name] for name in ('sent', 'succeeded', 'failed', 'rateLimited',
+                                                                'shortCircuited')}
+            counters['sessions'] = len(self._sessions)
+        counters['circuits'] = self.circuit_breaker.stats()
+        counters['rateLimiter'] = self.rate_limiter.stats()
+        return counters
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
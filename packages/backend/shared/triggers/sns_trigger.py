@@ -2,17 +2,31 @@
 SNS Trigger Executor
 
 Amazon SNS Topic으로 event_data를 JSON 문자열로 발행합니다.
+
+배치 발행 (publish_batch):
+  - 같은 Topic ARN으로 가는 메시지를 PublishBatch 한 번에 최대 10개씩 발행
+  - 일부 항목만 실패하면(Failed) 발신자 오류가 아닌 항목만 한 번 더 발행하고,
+    항목별 성공 여부를 입력 순서대로 돌려준다
 """
 
 import json
 import boto3
+from botocore.config import Config
+from collections import defaultdict
+from typing import Optional
+
+# PublishBatch 한 번에 넣을 수 있는 최대 항목 수
+SNS_BATCH_SIZE = 10
 
 
 class SNSTriggerExecutor:
     """SNS Topic 트리거 실행기"""
 
-    def __init__(self):
-        self.sns = boto3.client('sns')
+    def __init__(self, timeout: Optional[float] = None):
+        # timeout 지정 시 연결/응답 대기와 재시도 횟수를 줄여 트리거 예산 안에서 끝나게 한다
+        config = Config(connect_timeout=timeout, read_timeout=timeout, retries={'max_attempts': 2}) \
+            if timeout else None
+        self.sns = boto3.client('sns', config=config)
 
     def execute(self, topic_arn: str, payload: dict) -> bool:
         """
@@ -26,8 +40,7 @@ class SNSTriggerExecutor:
             성공 여부
         """
         try:
-            message = json.dumps(payload, ensure_ascii=False)
-            subject = f"PreChat {payload.get('event_type', 'Event')}"[:100]
+            message, subject = _message(payload)
 
             response = self.sns.publish(
                 TopicArn=topic_arn,
@@ -42,3 +55,53 @@ class SNSTriggerExecutor:
         except Exception as e:
             print(f"SNS publish error to {topic_arn}: {str(e)}")
             return False
+
+    def publish_batch(self, entries: list[tuple[str, dict]]) -> list[bool]:
+        """
+        (topic_arn, payload) 목록을 Topic별 PublishBatch로 발행합니다.
+
+        Returns:
+            entries와 같은 순서의 항목별 성공 여부
+        """
+        results = [False] * len(entries)
+        by_topic: dict[str, list[int]] = defaultdict(list)
+        for index, (topic_arn, _) in enumerate(entries):
+            by_topic[topic_arn].append(index)
+
+        for topic_arn, indexes in by_topic.items():
+            for start in range(0, len(indexes), SNS_BATCH_SIZE):
+                chunk = indexes[start:start + SNS_BATCH_SIZE]
+                retry = self._publish_chunk(topic_arn, chunk, entries, results)
+                if retry:
+                    print(f"Retrying {len(retry)} failed SNS batch entries to {topic_arn}")
+                    self._publish_chunk(topic_arn, retry, entries, results)
+        return results
+
+    def _publish_chunk(self, topic_arn: str, indexes: list[int], entries: list[tuple[str, dict]],
+                       results: list[bool]) -> list[int]:
+        """한 번의 PublishBatch를 호출하고, 재시도할 만한 실패 항목의 인덱스를 반환합니다."""
+        batch_entries = []
+        for index in indexes:
+            message, subject = _message(entries[index][1])
+            batch_entries.append({'Id': str(index), 'Message': message, 'Subject': subject})
+
+        try:
+            response = self.sns.publish_batch(TopicArn=topic_arn, PublishBatchRequestEntries=batch_entries)
+        except Exception as e:
+            print(f"SNS publish batch error to {topic_arn}: {str(e)}")
+            return []
+
+        for success in response.get('Successful', []):
+            results[int(success['Id'])] = True
+        retry = []
+        for failure in response.get('Failed', []):
+            print(f"SNS batch entry failed to {topic_arn}: {failure.get('Code')} - {failure.get('Message')}")
+            if not failure.get('SenderFault'):
+                retry.append(int(failure['Id']))
+        print(f"SNS batch published: {len(response.get('Successful', []))}/{len(indexes)} to {topic_arn}")
+        return retry
+
+
+def _message(payload: dict) -> tuple[str, str]:
+    """(Message, Subject)"""
+    return json.dumps(payload, ensure_ascii=False), f"PreChat {payload.get('event_type', 'Event')}"[:100]
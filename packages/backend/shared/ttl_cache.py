@@ -0,0 +1,104 @@
+"""
+TTL Cache - Warm Lambda 인스턴스용 인메모리 캐시
+
+크기 상한(LRU 제거)과 항목별 TTL을 가진 프로세스 내 캐시입니다.
+Lambda 컨테이너가 재사용되는 동안 반복되는 DynamoDB 조회를 줄이는 용도이며,
+다른 컨테이너에서 발생한 변경은 TTL 만료 후에 반영됩니다.
+
+스레드 안전하며 hit/miss/eviction 카운터를 제공합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """크기 상한 + TTL 기반 LRU 캐시"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, name: str = ''):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = float(ttl)
+        self.name = name
+        self._data: 'OrderedDict[Hashable, tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """(존재 여부, 값)을 반환합니다. None 값(negative cache)도 구분할 수 있습니다."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._now():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """값을 저장합니다. ttl을 지정하지 않으면 기본 TTL을 사용합니다."""
+        expires_at = self._now() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """캐시 미스 시 loader()로 값을 조회하여 저장 후 반환합니다.
+
+        loader가 예외를 던지면 캐시에 저장하지 않고 예외를 그대로 전파합니다.
+        """
+        found, value = self.lookup(key)
+        if found:
+            return value
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """predicate(key)가 참인 항목을 모두 제거합니다."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """hit/miss 카운터 스냅샷 (로그/메트릭 출력용)"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRate': round(self.hits / total, 4) if total else 0.0,
+            }
@@ -102,6 +102,63 @@ def verify_csrf_token(event, session_id):
 def get_timestamp():
     return datetime.now(timezone.utc).isoformat()
 
+# 관리자 세션 목록 전용 인덱스(GSI4) 파티션 키 접두사
+# 세션 METADATA 아이템에만 기록되는 sparse 인덱스이므로 WSCONN#/DISCUSSION# 등은 제외됨
+# 모든 세션 쓰기가 한 파티션에 몰리지 않도록 createdAt 월(YYYY-MM) 단위로 샤딩한다
+SESSION_LIST_PK = 'SESSION_LIST'
+
+def session_list_shard(created_at):
+    """createdAt(ISO 8601)이 속한 세션 목록 샤드 (YYYY-MM)"""
+    return created_at[:7]
+
+def session_list_shard_pk(shard):
+    """샤드(YYYY-MM)의 GSI4 파티션 키"""
+    return f'{SESSION_LIST_PK}#{shard}'
+
+def shift_month(shard, months):
+    """YYYY-MM 샤드를 months만큼 이동 ('2025-01', -1 -> '2024-12')"""
+    year, month = int(shard[:4]), int(shard[5:7])
+    index = year * 12 + (month - 1) + months
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+def session_list_index_keys(created_at):
+    """세션 목록 인덱스(GSI4) 키 생성 — 월 샤드 안에서 createdAt 순 페이지 조회용"""
+    return {
+        'GSI4PK': session_list_shard_pk(session_list_shard(created_at)),
+        'GSI4SK': f'SESSION#{created_at}'
+    }
+
+def encode_pagination_token(last_evaluated_key):
+    """DynamoDB LastEvaluatedKey를 클라이언트용 불투명 토큰(nextToken)으로 인코딩"""
+    import base64
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(serialize_dynamodb_item(last_evaluated_key), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_pagination_token(token):
+    """nextToken을 ExclusiveStartKey로 디코딩. 형식이 잘못되면 ValueError 발생"""
+    import base64
+    import binascii
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token.encode('ascii'))
+        key = json.loads(raw.decode('utf-8'))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError('Invalid pagination token') from e
+    if not isinstance(key, dict) or not key:
+        raise ValueError('Invalid pagination token')
+    return key
+
+def parse_page_size(value, default=50, maximum=100):
+    """limit 쿼리 파라미터 파싱 (1 ~ maximum 범위로 보정)"""
+    try:
+        size = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
 def get_ttl_timestamp(days=30):
     """Get TTL timestamp for DynamoDB (30 days from now)"""
     future_date = datetime.now(timezone.utc) + timedelta(days=days)
@@ -1,8 +1,27 @@
 import json
 import boto3
 import os
+from collections import Counter
 from utils import lambda_response, get_timestamp
 from trigger_manager import TriggerManager
+from trigger_outbox import TriggerOutbox
+from campaign_aggregates import (
+    SKETCHES_ENABLED,
+    apply_campaign_summary_update,
+    apply_session_aggregate_updates,
+    apply_stream_updates,
+    bucket_delta_updates,
+    campaign_delta_update,
+    deserialize_image,
+    diff_bucket_contributions,
+    diff_contributions,
+    feedback_bucket_contributions,
+    feedback_contribution,
+    mark_aggregates_stale,
+    session_bucket_contributions,
+    session_contribution,
+    without_sketch_keys,
+)
 
 sqs = boto3.client('sqs')
 dynamodb = boto3.resource('dynamodb')
@@ -10,167 +29,178 @@ ANALYSIS_QUEUE_URL = os.environ.get('ANALYSIS_QUEUE_URL')
 DEFAULT_MODEL_ID = 'apac.anthropic.claude-3-5-sonnet-20241022-v2:0'
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
 MESSAGES_TABLE = os.environ.get('MESSAGES_TABLE')
+CAMPAIGNS_TABLE = os.environ.get('CAMPAIGNS_TABLE')
 
 # Initialize TriggerManager for domain event-driven triggers
-trigger_manager = TriggerManager()
+# TRIGGER_OUTBOX_QUEUE_URL이 있으면 전송을 아웃박스 큐에 넘기고 스트림 처리는 바로 진행한다
+trigger_manager = TriggerManager(outbox=TriggerOutbox.from_env())
 
 def handle_session_stream(event, context):
     """Handle DynamoDB Streams events for session status changes and trigger execution"""
     
-    for record in event.get('Records', []):
-        event_name = record.get('eventName')
+    # SNS 트리거는 배치 끝에서 Topic별 PublishBatch로 발행 (TRIGGER_SNS_BATCH)
+    with trigger_manager.sns_batch() as failed_records:
+        for record in event.get('Records', []):
+            event_name = record.get('eventName')
+            trigger_manager.sns_record(record.get('dynamodb', {}).get('SequenceNumber'))
+
+            # 캠페인 분석 집계 반영 (실패해도 트리거/파일 정리는 계속 진행)
+            try:
+                update_campaign_analytics(record)
+            except Exception as e:
+                print(f"Error updating campaign analytics aggregate: {str(e)}")
         
-        # Handle session METADATA deletion (TTL expiration or explicit admin delete).
-        # REMOVE 이벤트는 SessionsTable의 모든 PK(WSCONN#*, DISCUSSION#*, SESSION#* 등)에서
-        # 발생하므로, 세션 METADATA 삭제일 때만 S3 파일을 정리해야 한다.
-        # 과거에는 sessionId 필드 유무만 확인하여 WebSocket 연결 해제 시에도
-        # uploads/ 하위 파일이 삭제되는 버그가 있었다.
-        if event_name == 'REMOVE':
-            old_image = record.get('dynamodb', {}).get('OldImage', {})
-            pk = old_image.get('PK', {}).get('S', '')
-            sk = old_image.get('SK', {}).get('S', '')
-
-            # 세션 METADATA 삭제가 아닌 경우(WSCONN 연결 해제 등)는 스킵
-            if not (pk.startswith('SESSION#') and sk == 'METADATA'):
-                continue
-
-            session_id = old_image.get('sessionId', {}).get('S', '')
-            if session_id:
-                print(
-                    f"Session {session_id} METADATA removed "
-                    f"(pk={pk}) - cleaning up S3 files"
-                )
-                cleanup_session_files(session_id)
+            # Handle session METADATA deletion (TTL expiration or explicit admin delete).
+            # REMOVE 이벤트는 SessionsTable의 모든 PK(WSCONN#*, DISCUSSION#*, SESSION#* 등)에서
+            # 발생하므로, 세션 METADATA 삭제일 때만 S3 파일을 정리해야 한다.
+            # 과거에는 sessionId 필드 유무만 확인하여 WebSocket 연결 해제 시에도
+            # uploads/ 하위 파일이 삭제되는 버그가 있었다.
+            if event_name == 'REMOVE':
+                old_image = record.get('dynamodb', {}).get('OldImage', {})
+                pk = old_image.get('PK', {}).get('S', '')
+                sk = old_image.get('SK', {}).get('S', '')
+
+                # 세션 METADATA 삭제가 아닌 경우(WSCONN 연결 해제 등)는 스킵
+                if not (pk.startswith('SESSION#') and sk == 'METADATA'):
+                    continue
+
+                session_id = old_image.get('sessionId', {}).get('S', '')
+                if session_id:
+                    print(
+                        f"Session {session_id} METADATA removed "
+                        f"(pk={pk}) - cleaning up S3 files"
+                    )
+                    cleanup_session_files(session_id)
         
-        elif event_name == 'INSERT':
-            new_image = record.get('dynamodb', {}).get('NewImage', {})
-            pk = new_image.get('PK', {}).get('S', '')
-            sk = new_image.get('SK', {}).get('S', '')
+            elif event_name == 'INSERT':
+                new_image = record.get('dynamodb', {}).get('NewImage', {})
+                pk = new_image.get('PK', {}).get('S', '')
+                sk = new_image.get('SK', {}).get('S', '')
             
-            # 세션 생성 이벤트 감지
-            if pk.startswith('SESSION#') and sk == 'METADATA':
-                session_id = new_image.get('sessionId', {}).get('S', '')
-                campaign_id = new_image.get('campaignId', {}).get('S', '')
-                customer_info = new_image.get('customerInfo', {}).get('M', {})
+                # 세션 생성 이벤트 감지
+                if pk.startswith('SESSION#') and sk == 'METADATA':
+                    session_id = new_image.get('sessionId', {}).get('S', '')
+                    campaign_id = new_image.get('campaignId', {}).get('S', '')
+                    customer_info = new_image.get('customerInfo', {}).get('M', {})
                 
-                event_data = {
-                    'event_type': 'SessionCreated',
-                    'session_id': session_id,
-                    'campaign_id': campaign_id,
-                    'campaign_name': new_image.get('campaignName', {}).get('S', ''),
-                    'customer_name': customer_info.get('name', {}).get('S', ''),
-                    'customer_company': customer_info.get('company', {}).get('S', ''),
-                    'customer_email': customer_info.get('email', {}).get('S', ''),
-                    'sales_rep_email': new_image.get('salesRepEmail', {}).get('S', ''),
-                    'message_count': '',
-                    'duration_minutes': '',
-                    'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/sessions/{session_id}" if os.environ.get('CLOUDFRONT_URL') else '',
-                    'event_time': new_image.get('createdAt', {}).get('S', ''),
-                }
+                    event_data = {
+                        'event_type': 'SessionCreated',
+                        'session_id': session_id,
+                        'campaign_id': campaign_id,
+                        'campaign_name': new_image.get('campaignName', {}).get('S', ''),
+                        'customer_name': customer_info.get('name', {}).get('S', ''),
+                        'customer_company': customer_info.get('company', {}).get('S', ''),
+                        'customer_email': customer_info.get('email', {}).get('S', ''),
+                        'sales_rep_email': new_image.get('salesRepEmail', {}).get('S', ''),
+                        'message_count': '',
+                        'duration_minutes': '',
+                        'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/sessions/{session_id}" if os.environ.get('CLOUDFRONT_URL') else '',
+                        'event_time': new_image.get('createdAt', {}).get('S', ''),
+                    }
                 
-                print(f"Session {session_id} created - executing triggers")
-                trigger_manager.execute_triggers('SessionCreated', event_data, campaign_id)
+                    print(f"Session {session_id} created - executing triggers")
+                    trigger_manager.execute_triggers('SessionCreated', event_data, campaign_id)
         
-        elif event_name == 'MODIFY':
-            old_image = record.get('dynamodb', {}).get('OldImage', {})
-            new_image = record.get('dynamodb', {}).get('NewImage', {})
+            elif event_name == 'MODIFY':
+                old_image = record.get('dynamodb', {}).get('OldImage', {})
+                new_image = record.get('dynamodb', {}).get('NewImage', {})
             
-            old_status = old_image.get('status', {}).get('S', '')
-            new_status = new_image.get('status', {}).get('S', '')
+                old_status = old_image.get('status', {}).get('S', '')
+                new_status = new_image.get('status', {}).get('S', '')
             
-            # 세션 완료 이벤트
-            if old_status != 'completed' and new_status == 'completed':
-                session_id = new_image.get('sessionId', {}).get('S', '')
-                campaign_id = new_image.get('campaignId', {}).get('S', '')
-                customer_info = new_image.get('customerInfo', {}).get('M', {})
-                sales_rep_email = new_image.get('salesRepEmail', {}).get('S', '')
+                # 세션 완료 이벤트
+                if old_status != 'completed' and new_status == 'completed':
+                    session_id = new_image.get('sessionId', {}).get('S', '')
+                    campaign_id = new_image.get('campaignId', {}).get('S', '')
+                    customer_info = new_image.get('customerInfo', {}).get('M', {})
+                    sales_rep_email = new_image.get('salesRepEmail', {}).get('S', '')
                 
-                print(f"Session {session_id} completed!")
+                    print(f"Session {session_id} completed!")
                 
-                # 도메인 이벤트 기반 트리거 실행
-                session_data = get_session_details_for_notification(session_id)
-                cloudfront_url = os.environ.get('CLOUDFRONT_URL', '')
-                event_data = {
-                    'event_type': 'SessionCompleted',
-                    'session_id': session_id,
-                    'campaign_id': campaign_id,
-                    'campaign_name': new_image.get('campaignName', {}).get('S', ''),
-                    'customer_name': customer_info.get('name', {}).get('S', ''),
-                    'customer_company': customer_info.get('company', {}).get('S', ''),
-                    'customer_email': customer_info.get('email', {}).get('S', ''),
-                    'sales_rep_email': sales_rep_email,
-                    'message_count': str(session_data.get('message_count', 0)),
-                    'duration_minutes': str(_calc_duration_minutes(
-                        new_image.get('createdAt', {}).get('S', ''),
-                        new_image.get('completedAt', {}).get('S', '')
-                    )),
-                    'admin_url': f"{cloudfront_url}/admin/sessions/{session_id}" if cloudfront_url else '',
-                    'event_time': new_image.get('completedAt', {}).get('S', ''),
-                }
-                trigger_manager.execute_triggers('SessionCompleted', event_data, campaign_id)
+                    # 도메인 이벤트 기반 트리거 실행
+                    session_data = get_session_details_for_notification(session_id)
+                    cloudfront_url = os.environ.get('CLOUDFRONT_URL', '')
+                    event_data = {
+                        'event_type': 'SessionCompleted',
+                        'session_id': session_id,
+                        'campaign_id': campaign_id,
+                        'campaign_name': new_image.get('campaignName', {}).get('S', ''),
+                        'customer_name': customer_info.get('name', {}).get('S', ''),
+                        'customer_company': customer_info.get('company', {}).get('S', ''),
+                        'customer_email': customer_info.get('email', {}).get('S', ''),
+                        'sales_rep_email': sales_rep_email,
+                        'message_count': str(session_data.get('message_count', 0)),
+                        'duration_minutes': str(_calc_duration_minutes(
+                            new_image.get('createdAt', {}).get('S', ''),
+                            new_image.get('completedAt', {}).get('S', '')
+                        )),
+                        'admin_url': f"{cloudfront_url}/admin/sessions/{session_id}" if cloudfront_url else '',
+                        'event_time': new_image.get('completedAt', {}).get('S', ''),
+                    }
+                    trigger_manager.execute_triggers('SessionCompleted', event_data, campaign_id)
                 
-                # 분석 요청 큐잉
-                enqueue_analysis_request(session_id)
+                    # 분석 요청 큐잉
+                    enqueue_analysis_request(session_id)
             
-            # 세션 비활성화 이벤트
-            elif old_status == 'active' and new_status == 'inactive':
-                session_id = new_image.get('sessionId', {}).get('S', '')
-                campaign_id = new_image.get('campaignId', {}).get('S', '')
-                customer_info = new_image.get('customerInfo', {}).get('M', {})
+                # 세션 비활성화 이벤트
+                elif old_status == 'active' and new_status == 'inactive':
+                    session_id = new_image.get('sessionId', {}).get('S', '')
+                    campaign_id = new_image.get('campaignId', {}).get('S', '')
+                    customer_info = new_image.get('customerInfo', {}).get('M', {})
                 
-                event_data = {
-                    'event_type': 'SessionInactivated',
-                    'session_id': session_id,
-                    'campaign_id': campaign_id,
-                    'campaign_name': new_image.get('campaignName', {}).get('S', ''),
-                    'customer_name': customer_info.get('name', {}).get('S', ''),
-                    'customer_company': customer_info.get('company', {}).get('S', ''),
-                    'customer_email': customer_info.get('email', {}).get('S', ''),
-                    'sales_rep_email': '',
-                    'message_count': '',
-                    'duration_minutes': '',
-                    'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/sessions/{session_id}" if os.environ.get('CLOUDFRONT_URL') else '',
-                    'event_time': get_timestamp(),
-                }
-                trigger_manager.execute_triggers('SessionInactivated', event_data, campaign_id)
-
-            # SHIP Assessment 상태 변경 이벤트 감지
-            old_assessment = old_image.get('assessmentStatus', {}).get('S', '')
-            new_assessment = new_image.get('assessmentStatus', {}).get('S', '')
-
-            if old_assessment != new_assessment and new_assessment:
-                session_id = new_image.get('sessionId', {}).get('S', '')
-                campaign_id = new_image.get('campaignId', {}).get('S', '')
-                customer_info = new_image.get('customerInfo', {}).get('M', {})
-                cloudfront_url = os.environ.get('CLOUDFRONT_URL', '')
-
-                # Assessment 상태에 따른 이벤트 타입 매핑
-                assessment_event_map = {
-                    'scanning': 'AssessmentStarted',
-                    'completed': 'AssessmentCompleted',
-                    'failed': 'AssessmentFailed',
-                }
-                assessment_event_type = assessment_event_map.get(new_assessment)
-
-                if assessment_event_type:
                     event_data = {
-                        'event_type': assessment_event_type,
+                        'event_type': 'SessionInactivated',
                         'session_id': session_id,
                         'campaign_id': campaign_id,
                         'campaign_name': new_image.get('campaignName', {}).get('S', ''),
                         'customer_name': customer_info.get('name', {}).get('S', ''),
                         'customer_company': customer_info.get('company', {}).get('S', ''),
                         'customer_email': customer_info.get('email', {}).get('S', ''),
-                        'sales_rep_email': new_image.get('salesRepEmail', {}).get('S', ''),
+                        'sales_rep_email': '',
                         'message_count': '',
                         'duration_minutes': '',
-                        'admin_url': f"{cloudfront_url}/admin/sessions/{session_id}" if cloudfront_url else '',
+                        'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/sessions/{session_id}" if os.environ.get('CLOUDFRONT_URL') else '',
                         'event_time': get_timestamp(),
                     }
-                    print(f"Assessment event: {assessment_event_type} for session {session_id}")
-                    trigger_manager.execute_triggers(assessment_event_type, event_data, campaign_id)
+                    trigger_manager.execute_triggers('SessionInactivated', event_data, campaign_id)
+
+                # SHIP Assessment 상태 변경 이벤트 감지
+                old_assessment = old_image.get('assessmentStatus', {}).get('S', '')
+                new_assessment = new_image.get('assessmentStatus', {}).get('S', '')
+
+                if old_assessment != new_assessment and new_assessment:
+                    session_id = new_image.get('sessionId', {}).get('S', '')
+                    campaign_id = new_image.get('campaignId', {}).get('S', '')
+                    customer_info = new_image.get('customerInfo', {}).get('M', {})
+                    cloudfront_url = os.environ.get('CLOUDFRONT_URL', '')
+
+                    # Assessment 상태에 따른 이벤트 타입 매핑
+                    assessment_event_map = {
+                        'scanning': 'AssessmentStarted',
+                        'completed': 'AssessmentCompleted',
+                        'failed': 'AssessmentFailed',
+                    }
+                    assessment_event_type = assessment_event_map.get(new_assessment)
+
+                    if assessment_event_type:
+                        event_data = {
+                            'event_type': assessment_event_type,
+                            'session_id': session_id,
+                            'campaign_id': campaign_id,
+                            'campaign_name': new_image.get('campaignName', {}).get('S', ''),
+                            'customer_name': customer_info.get('name', {}).get('S', ''),
+                            'customer_company': customer_info.get('company', {}).get('S', ''),
+                            'customer_email': customer_info.get('email', {}).get('S', ''),
+                            'sales_rep_email': new_image.get('salesRepEmail', {}).get('S', ''),
+                            'message_count': '',
+                            'duration_minutes': '',
+                            'admin_url': f"{cloudfront_url}/admin/sessions/{session_id}" if cloudfront_url else '',
+                            'event_time': get_timestamp(),
+                        }
+                        print(f"Assessment event: {assessment_event_type} for session {session_id}")
+                        trigger_manager.execute_triggers(assessment_event_type, event_data, campaign_id)
 
-    return lambda_response(200, {'message': 'Stream processed successfully'})
+    return _stream_response('Stream processed successfully', failed_records)
 
 
 def handle_campaign_stream(event, context):
@@ -181,62 +211,192 @@ def handle_campaign_stream(event, context):
     스트림 기반으로 전환 시 campaign_handler의 트리거 호출을 제거하면 됩니다.
     """
 
-    for record in event.get('Records', []):
-        event_name = record.get('eventName')
-
-        if event_name == 'INSERT':
-            new_image = record.get('dynamodb', {}).get('NewImage', {})
-            pk = new_image.get('PK', {}).get('S', '')
-
-            if pk.startswith('CAMPAIGN#') and new_image.get('SK', {}).get('S', '') == 'METADATA':
-                campaign_id = new_image.get('campaignId', {}).get('S', '')
-                event_data = {
-                    'event_type': 'CampaignCreated',
-                    'session_id': '',
-                    'campaign_id': campaign_id,
-                    'campaign_name': new_image.get('campaignName', {}).get('S', ''),
-                    'customer_name': '',
-                    'customer_company': '',
-                    'customer_email': '',
-                    'sales_rep_email': new_image.get('ownerEmail', {}).get('S', ''),
-                    'message_count': '',
-                    'duration_minutes': '',
-                    'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/campaigns/{campaign_id}" if os.environ.get('CLOUDFRONT_URL') else '',
-                    'event_time': new_image.get('createdAt', {}).get('S', ''),
-                }
-                print(f"Campaign {campaign_id} created - executing triggers")
-                trigger_manager.execute_triggers('CampaignCreated', event_data, campaign_id)
-
-        elif event_name == 'MODIFY':
-            old_image = record.get('dynamodb', {}).get('OldImage', {})
-            new_image = record.get('dynamodb', {}).get('NewImage', {})
-            pk = new_image.get('PK', {}).get('S', '')
-
-            if pk.startswith('CAMPAIGN#') and new_image.get('SK', {}).get('S', '') == 'METADATA':
-                old_status = old_image.get('status', {}).get('S', '')
-                new_status = new_image.get('status', {}).get('S', '')
+    with trigger_manager.sns_batch() as failed_records:
+        for record in event.get('Records', []):
+            event_name = record.get('eventName')
+            trigger_manager.sns_record(record.get('dynamodb', {}).get('SequenceNumber'))
+
+            # 전체 캠페인 요약 반영 (실패해도 트리거 실행은 계속 진행)
+            try:
+                update_campaign_summary(record)
+            except Exception as e:
+                print(f"Error updating campaign summary aggregate: {str(e)}")
 
-                # 캠페인 완료 이벤트 (status → completed)
-                if new_status == 'completed' and old_status != 'completed':
+            if event_name == 'INSERT':
+                new_image = record.get('dynamodb', {}).get('NewImage', {})
+                pk = new_image.get('PK', {}).get('S', '')
+
+                if pk.startswith('CAMPAIGN#') and new_image.get('SK', {}).get('S', '') == 'METADATA':
                     campaign_id = new_image.get('campaignId', {}).get('S', '')
                     event_data = {
-                        'event_type': 'CampaignCompleted',
+                        'event_type': 'CampaignCreated',
                         'session_id': '',
                         'campaign_id': campaign_id,
                         'campaign_name': new_image.get('campaignName', {}).get('S', ''),
                         'customer_name': '',
                         'customer_company': '',
                         'customer_email': '',
-                        'sales_rep_email': '',
-                        'message_count': str(int(new_image.get('sessionCount', {}).get('N', '0'))),
+                        'sales_rep_email': new_image.get('ownerEmail', {}).get('S', ''),
+                        'message_count': '',
                         'duration_minutes': '',
                         'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/campaigns/{campaign_id}" if os.environ.get('CLOUDFRONT_URL') else '',
-                        'event_time': get_timestamp(),
+                        'event_time': new_image.get('createdAt', {}).get('S', ''),
                     }
-                    print(f"Campaign {campaign_id} completed - executing triggers")
-                    trigger_manager.execute_triggers('CampaignCompleted', event_data, campaign_id)
+                    print(f"Campaign {campaign_id} created - executing triggers")
+                    trigger_manager.execute_triggers('CampaignCreated', event_data, campaign_id)
+
+            elif event_name == 'MODIFY':
+                old_image = record.get('dynamodb', {}).get('OldImage', {})
+                new_image = record.get('dynamodb', {}).get('NewImage', {})
+                pk = new_image.get('PK', {}).get('S', '')
+
+                if pk.startswith('CAMPAIGN#') and new_image.get('SK', {}).get('S', '') == 'METADATA':
+                    old_status = old_image.get('status', {}).get('S', '')
+                    new_status = new_image.get('status', {}).get('S', '')
+
+                    # 캠페인 완료 이벤트 (status → completed)
+                    if new_status == 'completed' and old_status != 'completed':
+                        campaign_id = new_image.get('campaignId', {}).get('S', '')
+                        event_data = {
+                            'event_type': 'CampaignCompleted',
+                            'session_id': '',
+                            'campaign_id': campaign_id,
+                            'campaign_name': new_image.get('campaignName', {}).get('S', ''),
+                            'customer_name': '',
+                            'customer_company': '',
+                            'customer_email': '',
+                            'sales_rep_email': '',
+                            'message_count': str(int(new_image.get('sessionCount', {}).get('N', '0'))),
+                            'duration_minutes': '',
+                            'admin_url': f"{os.environ.get('CLOUDFRONT_URL', '')}/admin/campaigns/{campaign_id}" if os.environ.get('CLOUDFRONT_URL') else '',
+                            'event_time': get_timestamp(),
+                        }
+                        print(f"Campaign {campaign_id} completed - executing triggers")
+                        trigger_manager.execute_triggers('CampaignCompleted', event_data, campaign_id)
+
+    return _stream_response('Campaign stream processed successfully', failed_records)
+
+
+def _stream_response(message, failed_records):
+    """스트림 핸들러 응답 (ReportBatchItemFailures)
+
+    SNS 트리거를 발행하지 못한 레코드를 batchItemFailures로 돌려주면 Lambda가
+    가장 앞선 실패 레코드부터 배치를 다시 전달한다.
+    """
+    if failed_records:
+        print(f"Reporting {len(failed_records)} stream records with undelivered SNS triggers")
+    return {
+        **lambda_response(200, {'message': message}),
+        'batchItemFailures': [{'itemIdentifier': record_id} for record_id in failed_records],
+    }
+
 
-    return lambda_response(200, {'message': 'Campaign stream processed successfully'})
+def update_campaign_analytics(record):
+    """세션 METADATA / FEEDBACK 변경분을 캠페인 분석 집계(CAMPAIGN#{id}/ANALYTICS)와
+    시계열 버킷(CAMPAIGN#{id}/DAY#..., HOUR#...), 전체 요약(CAMPAIGN_SUMMARY/ANALYTICS)에 반영합니다.
+
+    OldImage와 NewImage의 기여값 차이만 ADD하므로 INSERT/MODIFY/REMOVE 모두 같은 경로로 처리되며,
+    집계에 영향이 없는 변경(locale 업데이트 등)은 쓰기 없이 건너뛴다.
+    레코드 하나의 갱신은 eventID 마커와 함께 한 트랜잭션으로 기록되어 배치 재전달에도 한 번만 반영된다.
+    반영에 실패한 집계는 stale로 표시하고 예외를 다시 던진다.
+    """
+    ddb = record.get('dynamodb', {})
+    old_item = deserialize_image(ddb.get('OldImage'))
+    new_item = deserialize_image(ddb.get('NewImage'))
+    item = new_item or old_item
+    pk = item.get('PK', '')
+    sk = item.get('SK', '')
+    if not pk.startswith('SESSION#') or not CAMPAIGNS_TABLE:
+        return
+
+    campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
+    event_id = record.get('eventID')
+
+    if sk == 'METADATA':
+        old_campaign_id = old_item.get('campaignId', '')
+        new_campaign_id = new_item.get('campaignId', '')
+        old_contribution = session_contribution(old_item)
+        new_contribution = session_contribution(new_item)
+        old_buckets = session_bucket_contributions(old_item)
+        new_buckets = session_bucket_contributions(new_item)
+        if old_campaign_id == new_campaign_id:
+            deltas = [(
+                new_campaign_id,
+                diff_contributions(old_contribution, new_contribution),
+                diff_bucket_contributions(old_buckets, new_buckets),
+            )]
+        else:
+            # 캠페인 연결 변경: 이전 캠페인에서 빼고 새 캠페인에 더한다
+            deltas = [
+                (old_campaign_id, diff_contributions(old_contribution, Counter()),
+                 diff_bucket_contributions(old_buckets, {})),
+                (new_campaign_id, diff_contributions(Counter(), new_contribution),
+                 diff_bucket_contributions({}, new_buckets)),
+            ]
+        sketch_changes = []
+        if SKETCHES_ENABLED:
+            # 스케치 모드: 고객사/상담 목적은 히스토그램 대신 스케치에 반영한다
+            deltas = [
+                (campaign_id, without_sketch_keys(delta), bucket_deltas)
+                for campaign_id, delta, bucket_deltas in deltas
+            ]
+            if old_campaign_id == new_campaign_id:
+                sketch_changes = [(new_campaign_id, old_item, new_item)]
+            else:
+                sketch_changes = [(old_campaign_id, old_item, None), (new_campaign_id, None, new_item)]
+
+        try:
+            apply_session_aggregate_updates(campaigns_table, event_id, deltas, sketch_changes)
+        except Exception:
+            mark_aggregates_stale(campaigns_table, [campaign_id for campaign_id, _, _ in deltas], summary=True)
+            raise
+
+    elif sk == 'FEEDBACK':
+        # 피드백 항목 자체는 chat_handler.handle_feedback이 CSAT 피드에 기록하고
+        # 여기서는 평균/히스토그램 증감만 반영한다
+        campaign_id = item.get('campaignId', '')
+        if not campaign_id:
+            try:
+                campaign_id = dynamodb.Table(SESSIONS_TABLE).get_item(
+                    Key={'PK': pk, 'SK': 'METADATA'},
+                    ProjectionExpression='campaignId',
+                ).get('Item', {}).get('campaignId', '')
+            except Exception as e:
+                print(f"Failed to load session {pk} for feedback aggregate: {str(e)}")
+
+        delta = diff_contributions(feedback_contribution(old_item), feedback_contribution(new_item))
+        bucket_deltas = diff_bucket_contributions(
+            feedback_bucket_contributions(old_item), feedback_bucket_contributions(new_item)
+        )
+        try:
+            apply_stream_updates(campaigns_table, event_id, [
+                campaign_delta_update(campaign_id, delta),
+                *bucket_delta_updates(campaign_id, bucket_deltas),
+            ])
+        except Exception:
+            mark_aggregates_stale(campaigns_table, [campaign_id])
+            raise
+
+
+def update_campaign_summary(record):
+    """캠페인 METADATA 변경분을 전체 캠페인 요약(CAMPAIGN_SUMMARY/ANALYTICS)에 반영합니다.
+
+    캠페인 수/상태 분포를 증감하고, 상위 후보 캠페인의 이름 변경/삭제를 반영한다.
+    eventID 마커와 한 트랜잭션으로 기록되며, 실패하면 요약을 stale로 표시하고 예외를 다시 던진다.
+    """
+    ddb = record.get('dynamodb', {})
+    old_item = deserialize_image(ddb.get('OldImage'))
+    new_item = deserialize_image(ddb.get('NewImage'))
+    item = new_item or old_item
+    if not item.get('PK', '').startswith('CAMPAIGN#') or item.get('SK') != 'METADATA' or not CAMPAIGNS_TABLE:
+        return
+
+    campaigns_table = dynamodb.Table(CAMPAIGNS_TABLE)
+    try:
+        apply_campaign_summary_update(campaigns_table, record.get('eventID'), old_item, new_item)
+    except Exception:
+        mark_aggregates_stale(campaigns_table, [], summary=True)
+        raise
 
 
 def _calc_duration_minutes(created_at: str, completed_at: str) -> int:
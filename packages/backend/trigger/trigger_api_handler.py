@@ -17,6 +17,7 @@ import os
 
 from utils import lambda_response, parse_body, get_timestamp, generate_id
 from models.trigger import Trigger, VALID_EVENT_TYPES, VALID_TRIGGER_TYPES
+from trigger_registry import bump_registry_version
 
 dynamodb = boto3.resource('dynamodb')
 SESSIONS_TABLE = os.environ.get('SESSIONS_TABLE')
@@ -46,6 +47,7 @@ def create_trigger(event, context):
         table = dynamodb.Table(SESSIONS_TABLE)
         table.put_item(Item=trigger.to_dynamodb_item())
         print(f"Trigger created: {trigger.trigger_id}")
+        _notify_registry(table)
         return lambda_response(201, trigger.to_api_response())
     except Exception as e:
         print(f"Failed to create trigger: {str(e)}")
@@ -152,6 +154,7 @@ def update_trigger(event, context):
     try:
         table.put_item(Item=existing.to_dynamodb_item())
         print(f"Trigger updated: {trigger_id}")
+        _notify_registry(table)
         return lambda_response(200, existing.to_api_response())
     except Exception as e:
         print(f"Failed to update trigger {trigger_id}: {str(e)}")
@@ -173,12 +176,22 @@ def delete_trigger(event, context):
 
         table.delete_item(Key={'PK': f'TRIGGER#{trigger_id}', 'SK': 'METADATA'})
         print(f"Trigger deleted: {trigger_id}")
+        _notify_registry(table)
         return lambda_response(200, {'message': 'Trigger deleted', 'triggerId': trigger_id})
     except Exception as e:
         print(f"Failed to delete trigger {trigger_id}: {str(e)}")
         return lambda_response(500, {'error': 'Failed to delete trigger'})
 
 
+def _notify_registry(table) -> None:
+    """warm 컨테이너의 트리거 레지스트리가 변경을 반영하도록 버전 스탬프를 올립니다."""
+    try:
+        bump_registry_version(table)
+    except Exception as e:
+        # 트리거 변경은 이미 저장되었으므로 실패로 처리하지 않는다 (레지스트리 TTL이 상한)
+        print(f"Failed to bump trigger registry version: {str(e)}")
+
+
 def _get_user_id(event) -> str:
     """Cognito 인증 정보에서 사용자 ID를 추출합니다."""
     try:
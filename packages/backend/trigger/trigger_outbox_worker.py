@@ -0,0 +1,22 @@
+"""
+Trigger Outbox Worker
+
+스트림 핸들러가 아웃박스 큐(TriggerOutboxQueue)에 넣은 트리거 전송 메시지를 처리합니다.
+재시도/지수 백오프/엔드포인트별 속도 제한/회로 차단 지연/DLQ 이동은 trigger_outbox.OutboxWorker가 담당하고,
+재전송에 실패한 메시지만 batchItemFailures로 돌려 SQS가 다시 전달하게 한다.
+"""
+
+import json
+
+from trigger_manager import TriggerManager
+from trigger_outbox import OutboxWorker
+
+trigger_manager = TriggerManager()
+worker = OutboxWorker.from_env(trigger_manager.deliver, trigger_manager.circuit_retry_after)
+
+
+def handle_outbox_batch(event, context):
+    """SQS 이벤트 소스 핸들러 (ReportBatchItemFailures)"""
+    summary = worker.process(event.get('Records', []))
+    print(f"[METRIC] trigger_executors {json.dumps(trigger_manager.executor_stats())}")
+    return {'batchItemFailures': summary['batchItemFailures']}
@@ -0,0 +1,119 @@
+"""
+frame_coalescer.py 단위 테스트
+
+테스트 시나리오:
+1. 첫 청크 즉시 전송, 이후 청크는 크기/시간 기준으로 병합
+2. 비-chunk 이벤트 전 버퍼 flush (순서 보장)
+3. 연결 끊김(send=False) 이후 전송 중단
+4. 프레임 메트릭
+"""
+
+import os
+import sys
+
+# websocket 도메인 경로 추가
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..')
+)
+
+from frame_coalescer import FrameCoalescer  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make(max_bytes=10, max_latency_ms=50, alive=True):
+    sent = []
+    clock = _Clock()
+
+    def send(frame):
+        sent.append(frame)
+        return alive
+
+    coalescer = FrameCoalescer(send, max_bytes=max_bytes, max_latency_ms=max_latency_ms, clock=clock)
+    return coalescer, sent, clock
+
+
+class TestFrameCoalescer:
+
+    def test_first_chunk_sent_immediately(self):
+        coalescer, sent, _ = _make()
+        coalescer.add_chunk('Hi')
+        assert sent == [{'type': 'chunk', 'content': 'Hi'}]
+
+    def test_chunks_merged_until_size_threshold(self):
+        coalescer, sent, _ = _make(max_bytes=9)
+        coalescer.add_chunk('a')
+        for part in ['bcd', 'efg', 'hij', 'k']:
+            coalescer.add_chunk(part)
+        coalescer.flush()
+
+        assert [f['content'] for f in sent] == ['a', 'bcdefghij', 'k']
+        assert ''.join(f['content'] for f in sent) == 'abcdefghijk'
+
+    def test_utf8_bytes_counted(self):
+        coalescer, sent, _ = _make(max_bytes=6)
+        coalescer.add_chunk('x')
+        coalescer.add_chunk('안녕')  # 6 bytes
+        assert sent[-1] == {'type': 'chunk', 'content': '안녕'}
+
+    def test_deadline_flush(self):
+        coalescer, sent, clock = _make(max_bytes=1000, max_latency_ms=50)
+        coalescer.add_chunk('a')
+        coalescer.add_chunk('b')
+        clock.now += 0.02
+        coalescer.add_chunk('c')
+        assert len(sent) == 1
+        clock.now += 0.04
+        coalescer.add_chunk('d')
+        assert sent[-1] == {'type': 'chunk', 'content': 'bcd'}
+
+    def test_poll_flushes_expired_buffer(self):
+        coalescer, sent, clock = _make(max_bytes=1000, max_latency_ms=50)
+        coalescer.add_chunk('a')
+        coalescer.add_chunk('b')
+        coalescer.poll()
+        assert len(sent) == 1
+        clock.now += 0.05
+        coalescer.poll()
+        assert sent[-1] == {'type': 'chunk', 'content': 'b'}
+
+    def test_event_flushes_buffer_first(self):
+        coalescer, sent, _ = _make(max_bytes=1000)
+        coalescer.add_chunk('a')
+        coalescer.add_chunk('b')
+        coalescer.send_event({'type': 'boundary'})
+        coalescer.add_chunk('c')
+        coalescer.send_event({'type': 'tool', 'toolName': 'search'})
+
+        assert sent == [
+            {'type': 'chunk', 'content': 'a'},
+            {'type': 'chunk', 'content': 'b'},
+            {'type': 'boundary'},
+            {'type': 'chunk', 'content': 'c'},
+            {'type': 'tool', 'toolName': 'search'},
+        ]
+
+    def test_stops_after_connection_gone(self):
+        coalescer, sent, _ = _make(alive=False)
+        assert coalescer.add_chunk('a') is False
+        assert coalescer.add_chunk('b') is False
+        assert coalescer.send_event({'type': 'boundary'}) is False
+        assert len(sent) == 1
+
+    def test_metrics(self):
+        coalescer, _, _ = _make(max_bytes=4)
+        for part in ['a', 'b', 'c', 'd', 'e', 'f']:
+            coalescer.add_chunk(part)
+        coalescer.flush()
+
+        metrics = coalescer.metrics()
+        assert metrics['chunksIn'] == 6
+        assert metrics['framesSent'] == 3
+        assert metrics['chunkBytes'] == 6
+        assert metrics['flushReasons'] == {'first': 1, 'size': 1, 'final': 1}
@@ -0,0 +1,96 @@
+"""
+frame_sender.py 단위 테스트
+
+테스트 시나리오:
+1. 제출 순서대로 프레임 전송 (chunk 병합 + 이벤트 순서 보장)
+2. 새 청크 없이도 deadline 경과 시 버퍼 전송
+3. 연결 끊김(send=False) 시 alive=False 및 이후 이벤트 폐기
+4. close()가 남은 프레임을 모두 전송
+"""
+
+import os
+import sys
+import threading
+import time
+
+# websocket 도메인 경로 추가
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..')
+)
+
+from frame_sender import BackgroundFrameSender  # noqa: E402
+
+
+class _Recorder:
+    def __init__(self, alive=True, delay=0.0):
+        self.frames = []
+        self.alive = alive
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, frame):
+        if self.delay:
+            time.sleep(self.delay)
+        with self.lock:
+            self.frames.append(frame)
+        return self.alive
+
+
+class TestBackgroundFrameSender:
+
+    def test_order_preserved(self):
+        rec = _Recorder(delay=0.001)
+        sender = BackgroundFrameSender(rec, max_bytes=1000, max_latency_ms=1000)
+        for part in ['a', 'b', 'c']:
+            sender.submit_chunk(part)
+        sender.submit_event({'type': 'boundary'})
+        sender.submit_chunk('d')
+        sender.submit_event({'type': 'tool', 'toolName': 'search'})
+        assert sender.close() is True
+
+        assert rec.frames == [
+            {'type': 'chunk', 'content': 'a'},
+            {'type': 'chunk', 'content': 'bc'},
+            {'type': 'boundary'},
+            {'type': 'chunk', 'content': 'd'},
+            {'type': 'tool', 'toolName': 'search'},
+        ]
+
+    def test_deadline_flush_without_new_chunks(self):
+        rec = _Recorder()
+        sender = BackgroundFrameSender(rec, max_bytes=1000, max_latency_ms=20)
+        sender.submit_chunk('a')
+        sender.submit_chunk('b')
+
+        deadline = time.monotonic() + 2
+        while len(rec.frames) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert rec.frames[-1] == {'type': 'chunk', 'content': 'b'}
+        sender.close()
+        assert sender.metrics()['flushReasons'].get('deadline') == 1
+
+    def test_gone_aborts_early(self):
+        rec = _Recorder(alive=False)
+        sender = BackgroundFrameSender(rec)
+        sender.submit_chunk('a')
+
+        deadline = time.monotonic() + 2
+        while sender.alive and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert sender.alive is False
+        assert sender.submit_chunk('b') is False
+        assert sender.submit_event({'type': 'boundary'}) is False
+        assert sender.close() is False
+        assert len(rec.frames) == 1
+
+    def test_close_drains_queue(self):
+        rec = _Recorder(delay=0.002)
+        sender = BackgroundFrameSender(rec, max_queue=2, max_bytes=1, max_latency_ms=1000)
+        for i in range(10):
+            sender.submit_chunk(str(i))
+        sender.close()
+
+        assert ''.join(f['content'] for f in rec.frames) == '0123456789'
+        metrics = sender.metrics()
+        assert metrics['framesSent'] == 10
+        assert metrics['maxQueueDepth'] <= 2
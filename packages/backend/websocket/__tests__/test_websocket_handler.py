@@ -0,0 +1,193 @@
+"""
+websocket_handler.py 단위 테스트
+
+테스트 시나리오:
+1. API Gateway Management API 클라이언트 풀: endpoint별 재사용
+2. sendMessage 스트리밍: 청크 병합/순서, 봇 메시지 저장
+3. 고객 턴 저장 병렬화 및 봇 메시지 + 완료 플래그 트랜잭션
+"""
+
+import os
+import sys
+from unittest.mock import patch, MagicMock
+
+# shared 모듈 경로 추가
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..', '..', 'shared')
+)
+# websocket 도메인 경로 추가
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), '..')
+)
+
+# 핸들러 임포트 전 환경변수 설정
+os.environ['SESSIONS_TABLE'] = 'test-sessions-table'
+os.environ['MESSAGES_TABLE'] = 'test-messages-table'
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+
+import websocket_handler as handler  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Management API 클라이언트 풀
+# ---------------------------------------------------------------------------
+
+class TestApigwManagementClientPool:
+
+    def setup_method(self):
+        handler._apigw_management_clients.clear()
+
+    def teardown_method(self):
+        handler._apigw_management_clients.clear()
+
+    @patch.object(handler.boto3, 'client')
+    def test_client_reused_per_endpoint(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: MagicMock()
+
+        first = handler._get_apigw_management_client('https://a.example.com/dev')
+        second = handler._get_apigw_management_client('https://a.example.com/dev')
+        other = handler._get_apigw_management_client('https://b.example.com/dev')
+
+        assert first is second
+        assert first is not other
+        assert mock_client.call_count == 2
+        _args, kwargs = mock_client.call_args
+        assert kwargs['config'] is handler.APIGW_MANAGEMENT_CONFIG
+
+
+# ---------------------------------------------------------------------------
+# sendMessage 스트리밍
+# ---------------------------------------------------------------------------
+
+def _make_send_event(body):
+    import json
+    return {
+        'requestContext': {
+            'connectionId': 'conn-1',
+            'domainName': 'ws.example.com',
+            'stage': 'dev',
+        },
+        'body': json.dumps(body),
+    }
+
+
+def _sent_frames(apigw):
+    import json
+    return [
+        json.loads(c.kwargs['Data'].decode('utf-8'))
+        for c in apigw.post_to_connection.call_args_list
+    ]
+
+
+class TestHandleSendMessageStreaming:
+
+    def _run(self, stream_events, body=None, customer_put_error=None, apigw=None):
+        apigw = apigw or MagicMock()
+        sessions_table = MagicMock()
+        sessions_table.get_item.return_value = {
+            'Item': {'PK': 'SESSION#s1', 'SK': 'METADATA', 'status': 'active'}
+        }
+        messages_table = MagicMock()
+        if customer_put_error:
+            messages_table.put_item.side_effect = customer_put_error
+        fake_dynamodb = MagicMock()
+        fake_dynamodb.Table.side_effect = lambda name: (
+            sessions_table if name == 'test-sessions-table' else messages_table
+        )
+        agentcore = MagicMock()
+        agentcore.invoke_stream_chunks.return_value = iter(stream_events)
+
+        with patch.object(handler, '_get_apigw_management_client', return_value=apigw), \
+                patch.object(handler, 'dynamodb', fake_dynamodb), \
+                patch.object(handler, 'SESSIONS_TABLE', 'test-sessions-table'), \
+                patch.object(handler, 'MESSAGES_TABLE', 'test-messages-table'), \
+                patch.object(handler, 'agentcore_client', agentcore), \
+                patch.object(handler, 'get_agent_runtime_arn', return_value='arn:agent'), \
+                patch.object(handler, 'get_agent_config_for_session', return_value=('arn:agent', None)):
+            handler.handle_send_message(
+                _make_send_event(body or {'sessionId': 's1', 'message': 'hello', 'messageId': '10'}),
+                None,
+            )
+        self.dynamodb = fake_dynamodb
+        return apigw, sessions_table, messages_table
+
+    def test_chunks_coalesced_and_order_preserved(self):
+        events = [{'type': 'chunk', 'content': f'tok{i} '} for i in range(20)]
+        events.insert(10, {'type': 'boundary'})
+        apigw, _, _ = self._run(events)
+
+        frames = _sent_frames(apigw)
+        assert frames[-1]['type'] == 'done'
+        chunk_text = ''.join(f['content'] for f in frames if f['type'] == 'chunk')
+        assert chunk_text == ''.join(f'tok{i} ' for i in range(20))
+        # boundary 이전 청크는 모두 boundary보다 먼저 전송
+        boundary_idx = [f['type'] for f in frames].index('boundary')
+        before = ''.join(f['content'] for f in frames[:boundary_idx] if f['type'] == 'chunk')
+        assert before == ''.join(f'tok{i} ' for i in range(10))
+        # 청크 20개 + boundary + done 보다 훨씬 적은 프레임
+        assert len(frames) < 22
+
+    def test_bot_message_saved_with_full_text(self):
+        events = [{'type': 'chunk', 'content': 'Hello '}, {'type': 'chunk', 'content': 'world'}]
+        _, _, messages_table = self._run(events)
+
+        saved = [c.kwargs['Item'] for c in messages_table.put_item.call_args_list]
+        bot = [item for item in saved if item['sender'] == 'bot']
+        assert bot and bot[0]['content'] == 'Hello world'
+        assert bot[0]['SK'] == 'MESSAGE#11'
+
+    def test_customer_turn_persisted(self):
+        _, sessions_table, messages_table = self._run([{'type': 'chunk', 'content': 'ok'}])
+
+        saved = [c.kwargs['Item'] for c in messages_table.put_item.call_args_list]
+        customer = [item for item in saved if item['sender'] == 'customer']
+        assert customer and customer[0]['SK'] == 'MESSAGE#10'
+        locale_updates = [
+            c for c in sessions_table.update_item.call_args_list
+            if c.kwargs.get('UpdateExpression') == 'SET locale = :locale'
+        ]
+        assert len(locale_updates) == 1
+
+    def test_completion_written_in_one_transaction(self):
+        events = [{'type': 'chunk', 'content': 'Thanks! '}, {'type': 'chunk', 'content': 'EOF'}]
+        apigw, sessions_table, messages_table = self._run(events)
+
+        transact = self.dynamodb.meta.client.transact_write_items
+        assert transact.call_count == 1
+        items = transact.call_args.kwargs['TransactItems']
+        assert items[0]['Put']['TableName'] == 'test-messages-table'
+        assert items[0]['Put']['Item']['content'] == 'Thanks!'
+        assert items[1]['Update']['TableName'] == 'test-sessions-table'
+        assert items[1]['Update']['ExpressionAttributeValues'][':status'] == 'completed'
+        # 봇 메시지는 트랜잭션으로만 저장
+        saved = [c.kwargs['Item'] for c in messages_table.put_item.call_args_list]
+        assert [item['sender'] for item in saved] == ['customer']
+        assert _sent_frames(apigw)[-1]['isComplete'] is True
+
+    def test_customer_save_failure_skips_bot_message(self):
+        apigw, _, messages_table = self._run(
+            [{'type': 'chunk', 'content': 'EOF'}],
+            customer_put_error=Exception('throttled'),
+        )
+
+        assert messages_table.put_item.call_count == 1
+        self.dynamodb.meta.client.transact_write_items.assert_not_called()
+        # 저장되지 않은 턴에 대한 응답은 한 프레임도 보내지 않는다
+        assert _sent_frames(apigw) == [{'type': 'error', 'message': '메시지 저장에 실패했습니다.'}]
+
+    def test_customer_message_saved_before_first_frame(self):
+        import time
+        order = []
+
+        def slow_save(_table, _msg):
+            time.sleep(0.05)
+            order.append('customer_saved')
+            return True
+
+        apigw = MagicMock()
+        apigw.post_to_connection.side_effect = lambda **kwargs: order.append('frame')
+        with patch.object(handler, '_save_customer_message', side_effect=slow_save):
+            self._run([{'type': 'chunk', 'content': 'hi'}], apigw=apigw)
+
+        assert order[0] == 'customer_saved'
+        assert 'frame' in order
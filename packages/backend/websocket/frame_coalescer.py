@@ -0,0 +1,131 @@
+"""스트리밍 청크 프레임 병합기
+
+AgentCore 스트림의 chunk 이벤트를 그대로 PostToConnection 하면
+긴 답변 하나가 수백 번의 동기 API 호출이 된다.
+FrameCoalescer는 chunk 이벤트를 버퍼링하여 다음 조건 중 하나가 충족되면
+하나의 chunk 프레임으로 합쳐 전송한다.
+
+  - 버퍼 크기가 max_bytes 이상 (size)
+  - 가장 오래된 버퍼 청크가 max_latency_ms 이상 대기 (deadline)
+  - boundary / tool / error 등 비-chunk 이벤트 전송 직전 (event)
+  - 스트림 종료 또는 result 이벤트 (final)
+
+첫 번째 청크는 TTFT(첫 토큰 지연)를 늘리지 않도록 즉시 전송한다 (first).
+클라이언트는 chunk content를 이어붙이므로 병합해도 표시 결과는 동일하다.
+"""
+
+import time
+from typing import Callable
+
+
+class FrameCoalescer:
+    """chunk 이벤트를 크기/시간 기준 WebSocket 프레임으로 병합"""
+
+    def __init__(
+        self,
+        send: Callable[[dict], bool],
+        max_bytes: int = 1024,
+        max_latency_ms: float = 50,
+        flush_first: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            send: 프레임 전송 함수. 연결이 끊어졌으면 False를 반환해야 한다.
+            max_bytes: 버퍼가 이 크기(UTF-8 바이트) 이상이면 즉시 전송
+            max_latency_ms: 버퍼의 첫 청크가 이 시간 이상 대기하면 전송
+            flush_first: 첫 청크는 버퍼링 없이 바로 전송
+            clock: 테스트용 시계 주입
+        """
+        self._send = send
+        self.max_bytes = max(1, int(max_bytes))
+        self.max_latency = max(0.0, float(max_latency_ms)) / 1000.0
+        self._flush_first = flush_first
+        self._clock = clock
+
+        self._parts: list[str] = []
+        self._buffered_bytes = 0
+        self._buffer_started_at = 0.0
+        self._first_sent = False
+
+        self.alive = True
+        self.chunks_in = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.flush_reasons: dict[str, int] = {}
+
+    def add_chunk(self, content: str) -> bool:
+        """chunk 텍스트를 버퍼에 추가하고 조건 충족 시 전송합니다.
+
+        Returns:
+            연결 유지 여부 (False면 호출자는 스트리밍을 중단해야 함)
+        """
+        if not self.alive:
+            return False
+        if not content:
+            return self.alive
+
+        self.chunks_in += 1
+        now = self._clock()
+        if not self._parts:
+            self._buffer_started_at = now
+        self._parts.append(content)
+        self._buffered_bytes += len(content.encode('utf-8'))
+
+        if self._flush_first and not self._first_sent:
+            return self._flush('first')
+        if self._buffered_bytes >= self.max_bytes:
+            return self._flush('size')
+        if now - self._buffer_started_at >= self.max_latency:
+            return self._flush('deadline')
+        return self.alive
+
+    def poll(self) -> bool:
+        """deadline이 지난 버퍼를 전송합니다 (새 청크가 없는 동안 호출)."""
+        if self._parts and self._clock() - self._buffer_started_at >= self.max_latency:
+            return self._flush('deadline')
+        return self.alive
+
+    def time_until_deadline(self) -> float | None:
+        """버퍼 deadline까지 남은 시간(초). 버퍼가 비어 있으면 None."""
+        if not self._parts:
+            return None
+        return max(0.0, self._buffer_started_at + self.max_latency - self._clock())
+
+    def send_event(self, event: dict) -> bool:
+        """버퍼를 먼저 비운 뒤 비-chunk 이벤트를 전송합니다 (순서 보장)."""
+        self._flush('event')
+        if not self.alive:
+            return False
+        return self._emit(event)
+
+    def flush(self, reason: str = 'final') -> bool:
+        """버퍼에 남은 청크를 전송합니다."""
+        return self._flush(reason)
+
+    def _flush(self, reason: str) -> bool:
+        if not self._parts or not self.alive:
+            return self.alive
+        content = ''.join(self._parts)
+        size = self._buffered_bytes
+        self._parts = []
+        self._buffered_bytes = 0
+        self._first_sent = True
+        self.flush_reasons[reason] = self.flush_reasons.get(reason, 0) + 1
+        self.bytes_sent += size
+        return self._emit({'type': 'chunk', 'content': content})
+
+    def _emit(self, frame: dict) -> bool:
+        self.frames_sent += 1
+        if not self._send(frame):
+            self.alive = False
+        return self.alive
+
+    def metrics(self) -> dict:
+        """응답 단위 프레임 전송 메트릭"""
+        return {
+            'chunksIn': self.chunks_in,
+            'framesSent': self.frames_sent,
+            'chunkBytes': self.bytes_sent,
+            'flushReasons': dict(self.flush_reasons),
+        }
@@ -0,0 +1,137 @@
+"""백그라운드 WebSocket 프레임 전송기
+
+PostToConnection은 블로킹 호출이므로 AgentCore SSE 읽기 루프 안에서 직접 호출하면
+API Gateway가 느릴 때 스트림 읽기도 함께 멈춘다.
+BackgroundFrameSender는 전송을 단일 워커 스레드로 분리하여
+스트림 읽기와 프레임 전송을 겹쳐 실행한다.
+
+  - 단일 워커 + FIFO 큐 → 이벤트 순서 보장
+  - 큐 크기 제한 → API Gateway가 계속 느리면 읽기 쪽에 backpressure
+  - 워커가 FrameCoalescer를 소유하여 deadline 기반 flush를 새 청크 없이도 수행
+  - GoneException(send=False) 발생 시 gone 플래그 설정 → 호출자가 스트리밍 조기 중단
+"""
+
+import queue
+import threading
+import time
+from typing import Callable
+
+from frame_coalescer import FrameCoalescer
+
+_CLOSE = object()
+
+
+class BackgroundFrameSender:
+    """순서가 보장되는 백그라운드 WebSocket 프레임 전송기"""
+
+    def __init__(
+        self,
+        send: Callable[[dict], bool],
+        max_queue: int = 256,
+        max_bytes: int = 1024,
+        max_latency_ms: float = 50,
+    ):
+        """
+        Args:
+            send: 프레임 전송 함수. 연결이 끊어졌으면 False를 반환해야 한다.
+            max_queue: 전송 대기 이벤트 최대 개수 (초과 시 submit이 블로킹)
+            max_bytes, max_latency_ms: FrameCoalescer 병합 기준
+        """
+        self._coalescer = FrameCoalescer(send, max_bytes=max_bytes, max_latency_ms=max_latency_ms)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._gone = threading.Event()
+        self._closed = False
+        self._max_queue_depth = 0
+        self._send_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name='ws-frame-sender', daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        """연결 유지 여부 (GoneException 이후 False)"""
+        return not self._gone.is_set()
+
+    def submit_chunk(self, content: str) -> bool:
+        """chunk 텍스트를 전송 큐에 넣습니다. 연결이 끊어졌으면 False."""
+        return self._submit(('chunk', content))
+
+    def submit_event(self, event: dict) -> bool:
+        """비-chunk 이벤트를 전송 큐에 넣습니다 (앞선 청크 이후 전송)."""
+        return self._submit(('event', event))
+
+    def flush(self) -> bool:
+        """버퍼된 청크를 즉시 전송하도록 요청합니다 (비동기)."""
+        return self._submit(('flush', None))
+
+    def _submit(self, item) -> bool:
+        if self._closed or self._gone.is_set():
+            return False
+        self._queue.put(item)
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return not self._gone.is_set()
+
+    def close(self, timeout: float | None = 30.0) -> bool:
+        """남은 이벤트를 모두 전송하고 워커를 종료합니다.
+
+        Lambda 반환 전에 반드시 호출해야 한다 (반환 후 스레드가 동결됨).
+
+        Returns:
+            연결 유지 여부
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"[WARN] WebSocket frame sender did not finish within {timeout}s")
+        return self.alive
+
+    def _run(self):
+        coalescer = self._coalescer
+        while True:
+            try:
+                item = self._queue.get(timeout=coalescer.time_until_deadline())
+            except queue.Empty:
+                self._timed(coalescer.poll)
+                self._check_gone()
+                continue
+
+            if item is _CLOSE:
+                self._timed(coalescer.flush)
+                self._check_gone()
+                return
+
+            # 연결이 끊어진 뒤의 이벤트는 버리고 큐만 비운다
+            if self._gone.is_set():
+                continue
+
+            kind, payload = item
+            try:
+                if kind == 'chunk':
+                    self._timed(coalescer.add_chunk, payload)
+                elif kind == 'event':
+                    self._timed(coalescer.send_event, payload)
+                else:
+                    self._timed(coalescer.flush)
+            except Exception as e:
+                print(f"[ERROR] WebSocket frame sender error: {str(e)}")
+            self._check_gone()
+
+    def _timed(self, fn, *args):
+        started = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            self._send_seconds += time.monotonic() - started
+
+    def _check_gone(self):
+        if not self._coalescer.alive:
+            self._gone.set()
+
+    def metrics(self) -> dict:
+        """응답 단위 전송 메트릭 (close() 이후 호출 권장)"""
+        return {
+            **self._coalescer.metrics(),
+            'maxQueueDepth': self._max_queue_depth,
+            'sendMs': round(self._send_seconds * 1000, 1),
+        }
@@ -9,8 +9,12 @@ Requirements: 1.1, 1.2, 1.3, 1.5, 2.1, 2.2, 2.3, 2.4, 2.5, 2.6
 import json
 import boto3
 import os
+import threading
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from utils import get_timestamp, generate_id, get_ttl_timestamp
+from frame_sender import BackgroundFrameSender
 from agent_runtime import (
     AgentCoreClient,
     get_agent_config_for_session,
@@ -28,6 +32,29 @@ agentcore_client = AgentCoreClient()
 # Div Return Protocol: contentType 감지 마커
 DIV_RETURN_MARKER = '<div class="prechat-form" data-form-type="div-return">'
 
+# API Gateway Management API 클라이언트 풀 (endpoint URL별)
+# warm 인스턴스에서 클라이언트와 keep-alive 커넥션을 재사용하여
+# 메시지마다 클라이언트 생성 + TLS 핸드셰이크 비용을 반복하지 않는다.
+APIGW_MANAGEMENT_CONFIG = Config(
+    max_pool_connections=int(os.environ.get('APIGW_MANAGEMENT_MAX_POOL_CONNECTIONS', '10')),
+    connect_timeout=float(os.environ.get('APIGW_MANAGEMENT_CONNECT_TIMEOUT', '2')),
+    read_timeout=float(os.environ.get('APIGW_MANAGEMENT_READ_TIMEOUT', '5')),
+    retries={'max_attempts': 3, 'mode': 'standard'},
+    tcp_keepalive=True,
+)
+_apigw_management_clients = {}
+_apigw_management_lock = threading.Lock()
+
+# 스트리밍 chunk 프레임 병합 기준 (FrameCoalescer)
+WS_FRAME_MAX_BYTES = int(os.environ.get('WS_FRAME_MAX_BYTES', '1024'))
+WS_FRAME_MAX_LATENCY_MS = float(os.environ.get('WS_FRAME_MAX_LATENCY_MS', '50'))
+# 백그라운드 전송 큐 크기 (초과 시 스트림 읽기에 backpressure)
+WS_SEND_QUEUE_SIZE = int(os.environ.get('WS_SEND_QUEUE_SIZE', '256'))
+
+# 고객 턴 저장(locale 업데이트, 고객 메시지)을 AgentCore 호출과 병렬 실행하기 위한 실행기
+# warm 인스턴스에서 재사용하며, 핸들러는 반환 전에 항상 Future 완료를 기다린다.
+_persist_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ws-persist')
+
 
 def handle_connect(event, context):
     """$connect 라우트 핸들러
@@ -193,10 +220,7 @@ def handle_default(event, context):
     if connection_id and domain_name and stage:
         try:
             endpoint_url = f'https://{domain_name}/{stage}'
-            apigw_management = boto3.client(
-                'apigatewaymanagementapi',
-                endpoint_url=endpoint_url,
-            )
+            apigw_management = _get_apigw_management_client(endpoint_url)
 
             error_message = json.dumps({
                 'type': 'error',
@@ -213,6 +237,30 @@ def handle_default(event, context):
     return {'statusCode': 200}
 
 
+def _get_apigw_management_client(endpoint_url: str):
+    """endpoint URL별로 캐시된 API Gateway Management API 클라이언트를 반환합니다.
+
+    Args:
+        endpoint_url: https://{domainName}/{stage}
+
+    Returns:
+        apigatewaymanagementapi 클라이언트 (프로세스 내 재사용)
+    """
+    client = _apigw_management_clients.get(endpoint_url)
+    if client is not None:
+        return client
+    with _apigw_management_lock:
+        client = _apigw_management_clients.get(endpoint_url)
+        if client is None:
+            client = boto3.client(
+                'apigatewaymanagementapi',
+                endpoint_url=endpoint_url,
+                config=APIGW_MANAGEMENT_CONFIG,
+            )
+            _apigw_management_clients[endpoint_url] = client
+        return client
+
+
 def _detect_content_type(content: str) -> str:
     """에이전트 응답에서 contentType을 감지합니다.
 
@@ -250,6 +298,35 @@ def _format_form_submission(message: str) -> str:
         return message
 
 
+def _update_session_locale(sessions_table, session_id: str, locale: str) -> bool:
+    """세션에 locale 저장 (비동기 분석 에이전트에서 참조). 실패는 경고만 남긴다."""
+    try:
+        sessions_table.update_item(
+            Key={'PK': f'SESSION#{session_id}', 'SK': 'METADATA'},
+            UpdateExpression='SET locale = :locale',
+            ExpressionAttributeValues={':locale': locale},
+        )
+    except Exception as e:
+        print(f"[WARN] 세션 locale 업데이트 실패: {str(e)}")
+    return True
+
+
+def _save_customer_message(messages_table, customer_msg: dict) -> bool:
+    """고객 메시지 저장
+
+    Returns:
+        저장 성공 여부
+    """
+    try:
+        messages_table.put_item(Item=customer_msg)
+        print(f"[INFO] 고객 메시지 저장 완료: messageId={customer_msg['SK'][len('MESSAGE#'):]}, "
+              f"sessionId={customer_msg['sessionId']}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] 고객 메시지 저장 실패: {str(e)}")
+        return False
+
+
 def _post_to_connection(apigw_management, connection_id: str, data: dict) -> bool:
     """Management API를 통해 WebSocket 클라이언트에 메시지를 전송합니다.
 
@@ -305,13 +382,10 @@ def handle_send_message(event, context):
     domain_name = event.get('requestContext', {}).get('domainName', '')
     stage = event.get('requestContext', {}).get('stage', '')
 
-    # Management API 클라이언트 초기화
+    # Management API 클라이언트 (endpoint별 풀에서 재사용)
     endpoint_url = f'https://{domain_name}/{stage}'
     print(f"[DEBUG] WebSocket Management API endpoint: {endpoint_url}, connectionId: {connection_id}")
-    apigw_management = boto3.client(
-        'apigatewaymanagementapi',
-        endpoint_url=endpoint_url,
-    )
+    apigw_management = _get_apigw_management_client(endpoint_url)
 
     # 요청 body 파싱
     body = {}
@@ -377,20 +451,12 @@ def handle_send_message(event, context):
 
     # 1. 고객 메시지 DynamoDB 저장 (Requirement 2.1)
     # stateless 모드는 저장 및 세션 상태 변경을 스킵한다.
+    # locale 업데이트와 고객 메시지 저장은 AgentCore 호출 준비와 병렬로 실행하고,
+    # 첫 프레임을 보내기 전에 고객 메시지 저장 결과를 확인한다.
+    # 저장에 실패하면 기존과 같이 에러만 보내고 응답을 스트리밍하지 않는다.
     timestamp = get_timestamp()
     ttl_value = get_ttl_timestamp(30)
 
-    if not stateless:
-        # 세션에 locale 저장 (비동기 분석 에이전트에서 참조)
-        try:
-            sessions_table.update_item(
-                Key={'PK': f'SESSION#{session_id}', 'SK': 'METADATA'},
-                UpdateExpression='SET locale = :locale',
-                ExpressionAttributeValues={':locale': locale},
-            )
-        except Exception as e:
-            print(f"[WARN] 세션 locale 업데이트 실패: {str(e)}")
-
     customer_msg = {
         'PK': f'SESSION#{session_id}',
         'SK': f'MESSAGE#{message_id}',
@@ -403,17 +469,14 @@ def handle_send_message(event, context):
         'ttl': ttl_value,
     }
 
+    persist_futures = []
+    customer_save = None
     if not stateless:
-        try:
-            messages_table.put_item(Item=customer_msg)
-            print(f"[INFO] 고객 메시지 저장 완료: messageId={message_id}, sessionId={session_id}")
-        except Exception as e:
-            print(f"[ERROR] 고객 메시지 저장 실패: {str(e)}")
-            _post_to_connection(apigw_management, connection_id, {
-                'type': 'error',
-                'message': '메시지 저장에 실패했습니다.',
-            })
-            return {'statusCode': 200}
+        customer_save = _persist_executor.submit(_save_customer_message, messages_table, customer_msg)
+        persist_futures = [
+            _persist_executor.submit(_update_session_locale, sessions_table, session_id, locale),
+            customer_save,
+        ]
 
     # 2. form-submission 메시지 텍스트 변환 (Requirement 2.6)
     if request_content_type == 'form-submission':
@@ -426,6 +489,14 @@ def handle_send_message(event, context):
     is_complete = False
     response_content_type = 'text'
     connection_alive = True
+    # 프레임 전송은 백그라운드 스레드에서 수행하여 SSE 읽기와 PostToConnection을 겹친다.
+    # chunk 이벤트는 크기/시간 기준 프레임으로 병합되며 이벤트 순서는 보장된다.
+    frame_sender = BackgroundFrameSender(
+        lambda frame: _post_to_connection(apigw_management, connection_id, frame),
+        max_queue=WS_SEND_QUEUE_SIZE,
+        max_bytes=WS_FRAME_MAX_BYTES,
+        max_latency_ms=WS_FRAME_MAX_LATENCY_MS,
+    )
 
     try:
         # 프론트엔드가 지정한 에이전트 역할로 ARN 조회 (기본: consultation)
@@ -489,31 +560,38 @@ def handle_send_message(event, context):
         ):
             event_type = stream_event.get('type', '')
 
+            # 첫 이벤트에서 고객 메시지 저장 완료를 기다린다 (저장되지 않은 턴에 대한 응답은 보내지 않음)
+            if customer_save is not None:
+                customer_saved = customer_save.result()
+                customer_save = None
+                if not customer_saved:
+                    _post_to_connection(apigw_management, connection_id, {
+                        'type': 'error',
+                        'message': '메시지 저장에 실패했습니다.',
+                    })
+                    return {'statusCode': 200}
+
             if event_type == 'chunk':
                 # 텍스트 청크 누적 및 클라이언트 전달 (Requirement 2.2)
                 content = stream_event.get('content', '')
                 full_text += content
 
                 if connection_alive:
-                    connection_alive = _post_to_connection(
-                        apigw_management, connection_id, stream_event
-                    )
+                    connection_alive = frame_sender.submit_chunk(content)
 
             elif event_type == 'boundary':
-                # 의미론적 말풍선 경계 이벤트 클라이언트 전달
+                # 의미론적 말풍선 경계 이벤트 클라이언트 전달 (버퍼된 청크 먼저 전송)
                 if connection_alive:
-                    connection_alive = _post_to_connection(
-                        apigw_management, connection_id, {'type': 'boundary'}
-                    )
+                    connection_alive = frame_sender.submit_event({'type': 'boundary'})
 
             elif event_type == 'tool':
-                # 도구 사용 이벤트 클라이언트 전달
+                # 도구 사용 이벤트 클라이언트 전달 (버퍼된 청크 먼저 전송)
                 if connection_alive:
-                    connection_alive = _post_to_connection(
-                        apigw_management, connection_id, stream_event
-                    )
+                    connection_alive = frame_sender.submit_event(stream_event)
 
             elif event_type == 'result':
+                if connection_alive:
+                    connection_alive = frame_sender.flush()
                 # 최종 결과 이벤트 - result의 message에서 텍스트 추출
                 result_message = stream_event.get('message', '')
                 if result_message:
@@ -532,19 +610,13 @@ def handle_send_message(event, context):
                 # 에이전트 에러 이벤트
                 print(f"[ERROR] 에이전트 에러: {stream_event.get('message', '')}")
                 if connection_alive:
-                    _post_to_connection(apigw_management, connection_id, stream_event)
+                    frame_sender.submit_event(stream_event)
                 return {'statusCode': 200}
 
             # GoneException으로 연결이 끊어진 경우 스트리밍 중단
+            connection_alive = connection_alive and frame_sender.alive
             if not connection_alive:
                 print(f"[WARN] 클라이언트 연결 끊김, 스트리밍 중단: connectionId={connection_id}")
-                # Connection Store에서 제거
-                try:
-                    sessions_table.delete_item(
-                        Key={'PK': f'WSCONN#{connection_id}', 'SK': 'METADATA'}
-                    )
-                except Exception:
-                    pass
                 break
 
     except Exception as e:
@@ -552,12 +624,36 @@ def handle_send_message(event, context):
         import traceback
         print(f"[ERROR] Traceback: {traceback.format_exc()}")
         if connection_alive:
-            _post_to_connection(apigw_management, connection_id, {
+            frame_sender.submit_event({
                 'type': 'error',
                 'message': '죄송합니다. 응답 생성 중 오류가 발생했습니다.',
             })
         return {'statusCode': 200}
 
+    finally:
+        # 남은 프레임 전송과 고객 턴 저장을 모두 마친 뒤 반환 (Lambda 반환 후에는 스레드가 동결됨)
+        connection_alive = frame_sender.close() and connection_alive
+        print(f"[METRIC] ws_frames {json.dumps({'sessionId': session_id, **frame_sender.metrics()})}")
+        customer_saved = all(f.result() for f in persist_futures)
+
+    if not connection_alive:
+        # Connection Store에서 제거
+        try:
+            sessions_table.delete_item(
+                Key={'PK': f'WSCONN#{connection_id}', 'SK': 'METADATA'}
+            )
+        except Exception:
+            pass
+
+    # 고객 메시지가 저장되지 않았으면 봇 응답도 저장하지 않는다 (대화 이력 짝 유지)
+    if not customer_saved:
+        if connection_alive:
+            _post_to_connection(apigw_management, connection_id, {
+                'type': 'error',
+                'message': '메시지 저장에 실패했습니다.',
+            })
+        return {'statusCode': 200}
+
     # 4. EOF 토큰 감지 및 세션 완료 처리 (Requirement 2.4)
     # stateless 모드에서는 EOF를 감지해도 세션 상태를 변경하지 않는다.
     if 'EOF' in full_text:
@@ -581,28 +677,33 @@ def handle_send_message(event, context):
         'ttl': ttl_value,
     }
 
-    if not stateless:
-        try:
-            messages_table.put_item(Item=bot_msg)
-            print(f"[INFO] 봇 메시지 저장 완료: messageId={bot_message_id}, sessionId={session_id}")
-        except Exception as e:
-            print(f"[ERROR] 봇 메시지 저장 실패: {str(e)}")
-
     # 7. 세션 완료 처리 (Requirement 2.4)
-    if is_complete and not stateless:
-        try:
-            sessions_table.update_item(
-                Key={'PK': f'SESSION#{session_id}', 'SK': 'METADATA'},
-                UpdateExpression='SET #status = :status, completedAt = :completed_at',
-                ExpressionAttributeNames={'#status': 'status'},
-                ExpressionAttributeValues={
-                    ':status': 'completed',
-                    ':completed_at': timestamp,
-                },
-            )
-            print(f"[INFO] 세션 완료 처리: sessionId={session_id}")
-        except Exception as e:
-            print(f"[WARN] 세션 완료 상태 업데이트 실패: {str(e)}")
+    # 완료 시 봇 메시지와 완료 플래그를 하나의 TransactWriteItems로 기록한다.
+    if not stateless:
+        if is_complete:
+            try:
+                dynamodb.meta.client.transact_write_items(TransactItems=[
+                    {'Put': {'TableName': MESSAGES_TABLE, 'Item': bot_msg}},
+                    {'Update': {
+                        'TableName': SESSIONS_TABLE,
+                        'Key': {'PK': f'SESSION#{session_id}', 'SK': 'METADATA'},
+                        'UpdateExpression': 'SET #status = :status, completedAt = :completed_at',
+                        'ExpressionAttributeNames': {'#status': 'status'},
+                        'ExpressionAttributeValues': {
+                            ':status': 'completed',
+                            ':completed_at': timestamp,
+                        },
+                    }},
+                ])
+                print(f"[INFO] 봇 메시지 저장 및 세션 완료 처리: messageId={bot_message_id}, sessionId={session_id}")
+            except Exception as e:
+                print(f"[ERROR] 봇 메시지/세션 완료 트랜잭션 실패: {str(e)}")
+        else:
+            try:
+                messages_table.put_item(Item=bot_msg)
+                print(f"[INFO] 봇 메시지 저장 완료: messageId={bot_message_id}, sessionId={session_id}")
+            except Exception as e:
+                print(f"[ERROR] 봇 메시지 저장 실패: {str(e)}")
 
     # 8. 완료 메타데이터 전송 (type: done)
     if connection_alive:
@@ -1,28 +1,25 @@
+import { useCallback, useEffect, useState } from 'react'
 import {
   Box,
+  Button,
   Container,
   Header,
   Table,
   SpaceBetween,
   Badge
 } from '@cloudscape-design/components'
-import type { CampaignAnalytics } from '../types'
+import type { CampaignAnalytics, CampaignCSATFeedback } from '../types'
+import { campaignApi } from '../services/api'
 import { useI18n } from '../i18n'
 
+// CSAT 피드 한 페이지 크기
+const CSAT_FEED_PAGE_SIZE = 20
+
 interface CampaignCSATTableProps {
   analytics: CampaignAnalytics
   loading?: boolean
 }
 
-interface CSATFeedback {
-  sessionId: string
-  customerName: string
-  customerCompany: string
-  rating: number
-  narrative: string
-  completedAt: string
-}
-
 export function CampaignCSATTable({ analytics, loading = false }: CampaignCSATTableProps) {
   const { t } = useI18n()
 
@@ -36,7 +33,33 @@ export function CampaignCSATTable({ analytics, loading = false }: CampaignCSATTa
     }
   }
 
-  const csatData = analytics.csatFeedback || []
+  // 피드백 목록은 분석 응답에 포함되지 않으므로 CSAT 피드 API에서 페이지 단위로 불러온다
+  const [csatData, setCsatData] = useState<CampaignCSATFeedback[]>([])
+  const [nextToken, setNextToken] = useState<string | null>(null)
+  const [feedLoading, setFeedLoading] = useState(false)
+
+  const loadFeed = useCallback(async (token: string | null) => {
+    setFeedLoading(true)
+    try {
+      const page = await campaignApi.getCampaignCSATFeed(analytics.campaignId, {
+        limit: CSAT_FEED_PAGE_SIZE,
+        nextToken: token,
+      })
+      setCsatData(prev => (token ? [...prev, ...page.feedback] : page.feedback))
+      setNextToken(page.nextToken)
+    } catch (error) {
+      console.error('Failed to load CSAT feed:', error)
+    } finally {
+      setFeedLoading(false)
+    }
+  }, [analytics.campaignId])
+
+  useEffect(() => {
+    if (analytics.campaignId) {
+      loadFeed(null)
+    }
+  }, [analytics.campaignId, loadFeed])
+
   const averageCSAT = analytics.averageCSAT || 0
   const totalResponses = analytics.totalCSATResponses || 0
 
@@ -61,7 +84,7 @@ export function CampaignCSATTable({ analytics, loading = false }: CampaignCSATTa
           {t('adminCampaignDetail.csatTable.title')}
         </Header>
         
-        {loading ? (
+        {loading || (feedLoading && csatData.length === 0) ? (
           <Box textAlign="center" padding="l">
             <Box variant="p">{t('adminCampaignDetail.csatTable.loading')}...</Box>
           </Box>
@@ -71,7 +94,7 @@ export function CampaignCSATTable({ analytics, loading = false }: CampaignCSATTa
               {
                 id: 'customer',
                 header: t('adminCampaignDetail.csatTable.customerHeader'),
-                cell: (item: CSATFeedback) => (
+                cell: (item: CampaignCSATFeedback) => (
                   <Box>
                     <Box fontWeight="bold">{item.customerName}</Box>
                     <Box fontSize="body-s" color="text-status-inactive">
@@ -83,12 +106,12 @@ export function CampaignCSATTable({ analytics, loading = false }: CampaignCSATTa
               {
                 id: 'rating',
                 header: t('adminCampaignDetail.csatTable.ratingHeader'),
-                cell: (item: CSATFeedback) => getRatingBadge(item.rating)
+                cell: (item: CampaignCSATFeedback) => getRatingBadge(item.rating)
               },
               {
                 id: 'narrative',
                 header: t('adminCampaignDetail.csatTable.feedbackHeader'),
-                cell: (item: CSATFeedback) => (
+                cell: (item: CampaignCSATFeedback) => (
                   <Box>
                     {item.narrative || (
                       <Box color="text-status-inactive">{t('adminCampaignDetail.csatTable.noNarrativeProvided')}</Box>
@@ -99,13 +122,22 @@ export function CampaignCSATTable({ analytics, loading = false }: CampaignCSATTa
               {
                 id: 'completedAt',
                 header: t('adminCampaignDetail.csatTable.completionDateHeader'),
-                cell: (item: CSATFeedback) => 
+                cell: (item: CampaignCSATFeedback) => 
                   item.completedAt ? new Date(item.completedAt).toLocaleDateString() : '-'
               }
             ]}
             items={csatData}
             loading={loading}
             sortingDisabled
+            footer={
+              nextToken ? (
+                <Box textAlign="center">
+                  <Button onClick={() => loadFeed(nextToken)} loading={feedLoading}>
+                    {t('adminCampaignDetail.csatTable.loadMore')}
+                  </Button>
+                </Box>
+              ) : undefined
+            }
             empty={
               <Box textAlign="center" color="inherit">
                 <Box variant="strong" textAlign="center" color="inherit">
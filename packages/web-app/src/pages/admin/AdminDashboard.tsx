@@ -1,5 +1,5 @@
 // nosemgrep
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useNavigate, useSearchParams } from 'react-router-dom'
 import {
   Container,
@@ -43,13 +43,25 @@ export default function AdminDashboard() {
   const { t } = useI18n()
   const [sessions, setSessions] = useState<SessionSummary[]>([])
   const [loading, setLoading] = useState(true)
+  // 다음 페이지 커서 — null이면 마지막 페이지
+  const [nextToken, setNextToken] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [showMySessionsOnly, setShowMySessionsOnly] = useState(true)
   const [currentUserEmail, setCurrentUserEmail] = useState<string>('')
+  const [currentUserLoaded, setCurrentUserLoaded] = useState(false)
   const [sortingColumn, setSortingColumn] = useState<any>({})
   const [sortingDescending, setSortingDescending] = useState(false)
   const [campaigns, setCampaigns] = useState<Campaign[]>([])
   const [selectedCampaign, setSelectedCampaign] = useState<{ label: string; value: string } | null>({ label: t('adminSessions.filter.allCampaigns'), value: 'all' })
   const [campaignsLoading, setCampaignsLoading] = useState(false)
+  // 필터가 바뀐 뒤 도착한 이전 요청의 응답을 버리기 위한 요청 번호
+  const sessionsRequestRef = useRef(0)
+
+  // 담당자/캠페인 필터와 생성일 정렬은 서버(GSI1/GSI2/GSI4)에서 적용하고,
+  // 그 외 컬럼 정렬만 불러온 행에 대해 브라우저에서 적용한다
+  const campaignFilter = selectedCampaign?.value ?? 'all'
+  const sortOrder: 'asc' | 'desc' =
+    sortingColumn.sortingField === 'created' && !sortingDescending ? 'asc' : 'desc'
 
   // 컬럼 너비 상태 (localStorage에 저장하여 사용자 조정값 유지)
   const COLUMN_WIDTHS_STORAGE_KEY = 'adminDashboard.sessionTable.columnWidths'
@@ -88,7 +100,6 @@ export default function AdminDashboard() {
 
   useEffect(() => {
     loadCurrentUser()
-    loadSessions()
     loadCampaigns()
     
     // Handle URL query parameters
@@ -130,17 +141,63 @@ export default function AdminDashboard() {
       setCurrentUserEmail(user.email)
     } catch (err) {
       console.error('Failed to get current user:', err)
+    } finally {
+      setCurrentUserLoaded(true)
     }
   }
 
+  // 필터/생성일 정렬이 바뀌면 불러온 행과 커서를 버리고 첫 페이지부터 다시 불러온다
+  useEffect(() => {
+    if (showMySessionsOnly && !currentUserLoaded) return
+    loadSessions()
+  }, [showMySessionsOnly, currentUserLoaded, currentUserEmail, campaignFilter, sortOrder])
+
+  const sessionListOptions = (token?: string | null) => ({
+    limit: 100,
+    nextToken: token,
+    salesRepId: showMySessionsOnly ? currentUserEmail : undefined,
+    noCampaign: campaignFilter === 'none',
+    sortOrder
+  })
+
+  const sessionListCampaignId = campaignFilter !== 'all' && campaignFilter !== 'none' ? campaignFilter : undefined
+
+  // 첫 페이지만 불러오고 이후 페이지는 '더 보기'로 요청할 때 이어 붙인다
   const loadSessions = async () => {
+    const requestId = ++sessionsRequestRef.current
+    setSessions([])
+    setNextToken(null)
+    if (showMySessionsOnly && !currentUserEmail) {
+      // 현재 사용자를 알 수 없으면 '내 세션'은 비어 있다
+      setLoading(false)
+      return
+    }
+    setLoading(true)
     try {
-      const response = await adminApi.listSessions()
+      const response = await adminApi.listSessions(sessionListCampaignId, sessionListOptions())
+      if (requestId !== sessionsRequestRef.current) return
       setSessions(response.sessions || [])
+      setNextToken(response.nextToken || null)
     } catch (err) {
       console.error('Failed to load sessions:', err)
     } finally {
-      setLoading(false)
+      if (requestId === sessionsRequestRef.current) setLoading(false)
+    }
+  }
+
+  const loadMoreSessions = async () => {
+    if (!nextToken) return
+    const requestId = sessionsRequestRef.current
+    setLoadingMore(true)
+    try {
+      const response = await adminApi.listSessions(sessionListCampaignId, sessionListOptions(nextToken))
+      if (requestId !== sessionsRequestRef.current) return
+      setSessions(prev => [...prev, ...(response.sessions || [])])
+      setNextToken(response.nextToken || null)
+    } catch (err) {
+      console.error('Failed to load more sessions:', err)
+    } finally {
+      setLoadingMore(false)
     }
   }
 
@@ -190,24 +247,8 @@ export default function AdminDashboard() {
     downloadCSV(csvContent, filename)
   }
 
-  // Filter and sort sessions
-  let filteredSessions = showMySessionsOnly 
-    ? sessions.filter(session => session.salesRepEmail === currentUserEmail)
-    : sessions
-
-  // Apply campaign filter
-  if (selectedCampaign && selectedCampaign.value !== 'all') {
-    if (selectedCampaign.value === 'none') {
-      filteredSessions = filteredSessions.filter(session => !session.campaignId)
-    } else {
-      filteredSessions = filteredSessions.filter(session => session.campaignId === selectedCampaign.value)
-    }
-  }
-
-
-
-  // Sort sessions based on current sorting state
-  const sortedSessions = [...filteredSessions].sort((a, b) => {
+  // Sort loaded sessions based on current sorting state (필터는 서버에서 적용됨)
+  const sortedSessions = [...sessions].sort((a, b) => {
     if (!sortingColumn.sortingField) return 0
     
     let aValue: any, bValue: any
@@ -469,6 +510,15 @@ export default function AdminDashboard() {
             ]}
             items={sortedSessions}
             loading={loading}
+            footer={
+              nextToken ? (
+                <Box textAlign="center">
+                  <Button onClick={loadMoreSessions} loading={loadingMore}>
+                    {t('adminSessions.table.loadMore')}
+                  </Button>
+                </Box>
+              ) : undefined
+            }
             sortingColumn={sortingColumn}
             sortingDescending={sortingDescending}
             onSortingChange={({ detail }) => {
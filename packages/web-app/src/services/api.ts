@@ -6,6 +6,7 @@ import type {
   AnalysisResults,
   Campaign,
   CampaignAnalytics,
+  CampaignCSATFeedResponse,
   CreateCampaignRequest,
   UpdateCampaignRequest,
   CampaignListResponse,
@@ -205,10 +206,28 @@ export const adminApi = {
     }
   },
 
-  listSessions: async (campaignId?: string): Promise<any> => {
+  // 커서 기반 페이지 조회 — 응답의 nextToken이 null이면 마지막 페이지
+  listSessions: async (
+    campaignId?: string,
+    page?: {
+      limit?: number
+      nextToken?: string | null
+      salesRepId?: string
+      // 캠페인 미연결 세션만 (campaignId와 함께 쓸 수 없음)
+      noCampaign?: boolean
+      // createdAt 기준 정렬 (기본 desc)
+      sortOrder?: 'asc' | 'desc'
+    }
+  ): Promise<any> => {
     try {
       return await retryWithBackoff(async () => {
-        const params = campaignId ? { campaignId } : {}
+        const params: Record<string, string | number> = {}
+        if (campaignId) params.campaignId = campaignId
+        if (page?.limit) params.limit = page.limit
+        if (page?.nextToken) params.nextToken = page.nextToken
+        if (page?.salesRepId) params.salesRepId = page.salesRepId
+        if (page?.noCampaign) params.noCampaign = 'true'
+        if (page?.sortOrder) params.sortOrder = page.sortOrder
         const response = await api.get('/admin/sessions', { params })
         return response.data
       })
@@ -575,7 +594,7 @@ export const campaignApi = {
           topConsultationPurposes: analytics.topConsultationPurposes || [],
           sessionsByDate: analytics.sessionsByDate || [],
           customerCompanies: analytics.customerCompanies || [],
-          csatFeedback: analytics.csatFeedback || [],
+          csatHistogram: analytics.csatHistogram || [],
           averageCSAT: analytics.averageCSAT || 0,
           totalCSATResponses: analytics.totalCSATResponses || 0,
         }
@@ -585,6 +604,32 @@ export const campaignApi = {
     }
   },
 
+  /**
+   * Get campaign CSAT feedback feed (newest first, cursor paging)
+   */
+  getCampaignCSATFeed: async (
+    campaignId: string,
+    page?: { limit?: number; nextToken?: string | null; minRating?: number; maxRating?: number }
+  ): Promise<CampaignCSATFeedResponse> => {
+    try {
+      if (!campaignId?.trim()) {
+        throw new Error('Campaign ID is required')
+      }
+
+      return await retryWithBackoff(async () => {
+        const params: Record<string, string | number> = {}
+        if (page?.limit) params.limit = page.limit
+        if (page?.nextToken) params.nextToken = page.nextToken
+        if (page?.minRating !== undefined) params.minRating = page.minRating
+        if (page?.maxRating !== undefined) params.maxRating = page.maxRating
+        const response = await api.get(`/admin/campaigns/${campaignId}/analytics/csat`, { params })
+        return response.data
+      })
+    } catch (error) {
+      return handleApiError(error, 'Get Campaign CSAT Feed')
+    }
+  },
+
   /**
    * Associate a session with a campaign (via PATCH)
    */
@@ -648,8 +693,8 @@ export const campaignApi = {
         throw new Error('Campaign IDs are required')
       }
 
-      if (campaignIds.length > 10) {
-        throw new Error('Maximum 10 campaigns can be compared at once')
+      if (campaignIds.length > 50) {
+        throw new Error('Maximum 50 campaigns can be compared at once')
       }
 
       return await retryWithBackoff(async () => {
@@ -188,18 +188,32 @@ export interface CampaignAnalytics {
     company: string;
     sessionCount: number;
   }>;
-  csatFeedback: Array<{
-    sessionId: string;
-    customerName: string;
-    customerCompany: string;
+  distinctCompanies?: number;
+  csatHistogram: Array<{
     rating: number;
-    narrative: string;
-    completedAt: string;
+    count: number;
   }>;
   averageCSAT: number;
   totalCSATResponses: number;
 }
 
+// 캠페인 CSAT 피드 항목 (완료 시각 최신순 커서 페이지)
+export interface CampaignCSATFeedback {
+  sessionId: string;
+  customerName: string;
+  customerCompany: string;
+  rating: number;
+  narrative: string;
+  completedAt: string;
+  submittedAt: string;
+}
+
+export interface CampaignCSATFeedResponse {
+  campaignId: string;
+  feedback: CampaignCSATFeedback[];
+  nextToken: string | null;
+}
+
 export interface ChatMessageRequest {
   sessionId: string;
   message: string;
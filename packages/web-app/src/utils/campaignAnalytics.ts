@@ -88,7 +88,7 @@ export function calculateCampaignMetrics(sessions: Session[]): Omit<CampaignAnal
     topConsultationPurposes,
     sessionsByDate,
     customerCompanies,
-    csatFeedback: [],
+    csatHistogram: [],
     averageCSAT: 0,
     totalCSATResponses: 0,
   }